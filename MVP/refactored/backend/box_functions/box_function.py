@@ -1,8 +1,8 @@
 import os
 from typing import Optional, List
 
+from MVP.refactored.backend.box_functions.box_function_cache import BoxFunctionCache
 from MVP.refactored.backend.box_functions.function_structure.function_structure import FunctionStructure
-from MVP.refactored.backend.code_generation.code_inspector import CodeInspector
 from MVP.refactored.backend.box_functions.function_structure.function_parser import FunctionParser
 
 
@@ -32,7 +32,8 @@ class BoxFunction:
                  file_code: Optional[str] = None,
                  is_predefined_function: bool = False,
                  predefined_function_file_name: Optional[str] = None,
-                 main_function_name: Optional[str] = None):
+                 main_function_name: Optional[str] = None,
+                 function_structure: Optional[FunctionStructure] = None):
 
         self.main_function_name: str = main_function_name or INVOKE_METHOD
         self.imports: List[str] = imports or []
@@ -43,6 +44,8 @@ class BoxFunction:
         self.min_args: Optional[int] = min_args
         self.max_args: Optional[int] = max_args
         self.code: str = file_code or ""
+        # structure of the main function, if given, the function is not parsed again
+        self.function_structure: Optional[FunctionStructure] = function_structure
 
         if is_predefined_function:
             predefined_file_code = predefined_functions[predefined_function_file_name]
@@ -67,18 +70,22 @@ class BoxFunction:
         This method processes the given Python file code to extract the main function,
         helper functions, imports, and global statements. These components are then
         assigned to the respective attributes of the `BoxFunction` instance.
+        Parsed file code is taken from `BoxFunctionCache`, so equal file codes are parsed only once.
         """
-        self.main_function = CodeInspector.get_main_function(file_code, self.main_function_name)
-        self.helper_functions = CodeInspector.get_help_methods(file_code, self.main_function_name)
-        self.imports = CodeInspector.get_imports(file_code)
-        self.global_statements = list(CodeInspector.get_global_statements(file_code))
+        parsed = BoxFunctionCache.get(file_code, self.main_function_name)
+        self.main_function = parsed.main_function
+        self.helper_functions = parsed.helper_functions
+        self.imports = parsed.imports
+        self.global_statements = parsed.global_statements
+        self.function_structure = parsed.function_structure
         self.code = file_code
 
     def _create_function_structure(self):
         if not self.main_function:
             raise ValueError("Cannot create function structure without a main function.")
 
-        self.function_structure: FunctionStructure = FunctionParser.parse_function_code(self.main_function)
+        if self.function_structure is None:
+            self.function_structure = FunctionParser.parse_function_code(self.main_function)
 
     def __eq__(self, other):
         """
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import ast
+import copy
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from MVP.refactored.backend.box_functions.function_structure.function_parser import FunctionParser
+from MVP.refactored.backend.box_functions.function_structure.function_structure import FunctionStructure
+from MVP.refactored.backend.code_generation.code_inspector import CodeInspector
+
+
+class ParsedFileCode:
+    """Parts of box function file code that are extracted when a BoxFunction is created."""
+
+    def __init__(self,
+                 main_function: Optional[str],
+                 helper_functions: list[str],
+                 imports: list[str],
+                 global_statements: list[str],
+                 function_structure: Optional[FunctionStructure]):
+        self.main_function: Optional[str] = main_function
+        self.helper_functions: list[str] = helper_functions
+        self.imports: list[str] = imports
+        self.global_statements: list[str] = global_statements
+        self.function_structure: Optional[FunctionStructure] = function_structure
+
+
+class BoxFunctionCache:
+    """
+    Bounded LRU cache of parsed box function file code.
+
+    Entries are keyed by the sha256 hash of the file code and the main function name, so boxes
+    that share one function file are parsed (and formatted with autopep8) only once.
+    Cached entries are never handed out directly, every BoxFunction gets its own copies.
+    """
+    max_size: int = 256
+    entries: OrderedDict[tuple[str, str], ParsedFileCode] = OrderedDict()
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def get(cls, file_code: str, main_function_name: str) -> ParsedFileCode:
+        """Return a copy of the parsed file code, parse the file code if it is not in the cache."""
+        key = (hashlib.sha256(file_code.encode()).hexdigest(), main_function_name)
+        parsed = cls.entries.get(key)
+        if parsed is None:
+            cls.misses += 1
+            parsed = cls.parse(file_code, main_function_name)
+            cls.entries[key] = parsed
+            if len(cls.entries) > cls.max_size:
+                cls.entries.popitem(last=False)
+        else:
+            cls.hits += 1
+            cls.entries.move_to_end(key)
+
+        return ParsedFileCode(parsed.main_function,
+                              list(parsed.helper_functions),
+                              list(parsed.imports),
+                              list(parsed.global_statements),
+                              copy.deepcopy(parsed.function_structure))
+
+    @staticmethod
+    def parse(file_code: str, main_function_name: str) -> ParsedFileCode:
+        """Extract all parts of the file code from a single parsed tree."""
+        tree = ast.parse(file_code)
+        main_function_node = CodeInspector.get_main_function_node(tree, main_function_name)
+        function_structure = None
+        if main_function_node is not None:
+            function_structure = FunctionParser.parse_function_tree(main_function_node)
+
+        return ParsedFileCode(CodeInspector.get_main_function(file_code, main_function_name, tree),
+                              CodeInspector.get_help_methods(file_code, main_function_name, tree),
+                              CodeInspector.get_imports(file_code, tree),
+                              list(CodeInspector.get_global_statements(file_code, tree)),
+                              function_structure)
+
+    @classmethod
+    def get_info(cls) -> dict[str, int]:
+        """Return hit and miss counters and the size of the cache, for profiling."""
+        return {"hits": cls.hits, "misses": cls.misses, "size": len(cls.entries), "max_size": cls.max_size}
+
+    @classmethod
+    def clear(cls):
+        cls.entries.clear()
+        cls.hits = 0
+        cls.misses = 0
@@ -6,7 +6,7 @@ from MVP.refactored.backend.box_functions.function_structure.assigned_value.code
 from MVP.refactored.backend.box_functions.function_structure.code_line import CodeLine
 from MVP.refactored.backend.box_functions.function_structure.assigned_value.function_call import FunctionCall
 from MVP.refactored.backend.box_functions.function_structure.function_structure import FunctionStructure
-from MVP.refactored.util.string_util import StringUtil
+from MVP.refactored.util.name_allocator import NameAllocator
 
 
 class FunctionParser(ast.NodeVisitor):
@@ -18,7 +18,10 @@ class FunctionParser(ast.NodeVisitor):
         self.functions_to_ignore = {"print"}
 
         self.parsed_nodes = set()
-        self.current_expression: str = ""
+        self.names = NameAllocator()
+        self.expression_root: ast.AST | None = None
+        # nested function calls of the current expression that were moved to body lines, by their variables
+        self.replaced_calls: dict[ast.Call, str] = {}
 
     @staticmethod
     def parse_function_code(function_code: str) -> FunctionStructure:
@@ -37,10 +40,21 @@ class FunctionParser(ast.NodeVisitor):
     @staticmethod
     def parse_function_tree(function_tree):
         parser = FunctionParser()
+        parser.names = NameAllocator(FunctionParser._get_used_names(function_tree))
         parser.visit(function_tree)
 
         return FunctionStructure(arguments=parser.arguments, body_lines=parser.body_lines, return_line=parser.return_line)
 
+    @staticmethod
+    def _get_used_names(function_tree: ast.AST) -> set[str]:
+        used_names = set()
+        for node in ast.walk(function_tree):
+            if isinstance(node, ast.Name):
+                used_names.add(node.id)
+            elif isinstance(node, ast.arg):
+                used_names.add(node.arg)
+        return used_names
+
     def visit_FunctionDef(self, node: ast.FunctionDef):
         self.arguments = []
         for arg in node.args.args:
@@ -66,7 +80,8 @@ class FunctionParser(ast.NodeVisitor):
         self.return_line = CodeLine(assigned_value=assigned_value)
 
     def _parse_expression(self, node: ast.AST) -> AssignedValue:
-        self.current_expression = ast.unparse(node)
+        self.expression_root = node
+        self.replaced_calls = {}
 
         expression_elements: list[CodeElement] = []
         function_call: FunctionCall | None = None
@@ -86,7 +101,7 @@ class FunctionParser(ast.NodeVisitor):
         if function_call:
             return function_call
         else:
-            return CodeExpression(self.current_expression, expression_elements)
+            return CodeExpression(self._get_expression_code(node), expression_elements)
 
     def _parse_arguments(self, node: ast.Call) -> list[CodeElement]:
         arguments = []
@@ -114,19 +129,39 @@ class FunctionParser(ast.NodeVisitor):
             if function_name not in self.functions_to_ignore:
                 arguments = self._parse_arguments(node)
                 function_call = FunctionCall(function_name, arguments)
-                variable_name = StringUtil.generate_new_variable_name_from(function_name)
 
-                function_call_str = str(function_call)
-                if self.current_expression != function_call_str:
+                if (node is not self.expression_root
+                        or str(function_call) != self._get_expression_code(self.expression_root)):
+                    variable_name = self.names.new_name(function_name)
                     code_line = CodeLine(assigned_variables=[variable_name], assigned_value=function_call)
                     self.body_lines.append(code_line)
-                    self.current_expression = self.current_expression.replace(function_call_str, variable_name)
+                    self.replaced_calls[node] = variable_name
                     return CodeElement(variable_name, CodeElementType.VARIABLE)
 
                 return function_call
 
         return None
 
+    def _get_expression_code(self, node: ast.AST) -> str:
+        """Return code of the expression where function calls moved to body lines are replaced with their variables."""
+        if not self.replaced_calls:
+            return ast.unparse(node)
+        return ast.unparse(self._replace_calls(node))
+
+    def _replace_calls(self, node):
+        """Return copy of the node where the replaced calls are names of their variables."""
+        if not isinstance(node, ast.AST):
+            return node
+        if node in self.replaced_calls:
+            return ast.Name(id=self.replaced_calls[node])
+        fields = {}
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, list):
+                fields[field] = [self._replace_calls(item) for item in value]
+            else:
+                fields[field] = self._replace_calls(value)
+        return type(node)(**fields)
+
     def _is_function_name(self, name_node: ast.Name, context_node: ast.AST) -> bool:
         for parent in ast.walk(context_node):
             if isinstance(parent, ast.Call) and isinstance(parent.func, ast.Name):
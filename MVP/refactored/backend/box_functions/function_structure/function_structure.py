@@ -1,6 +1,6 @@
 from MVP.refactored.backend.box_functions.function_structure.code_element import CodeElementType, CodeElement
 from MVP.refactored.backend.box_functions.function_structure.code_line import CodeLine
-from MVP.refactored.util.string_util import StringUtil
+from MVP.refactored.util.name_allocator import NameAllocator
 
 
 class FunctionStructure:
@@ -29,27 +29,30 @@ class FunctionStructure:
         return hash((tuple(self.body_lines), self.return_line))
 
     def convert_mutable_variables_to_immutable(self) -> None:
-        used_variable_names = set(self.arguments)
-        for code_line in self.body_lines:
+        variable_names = NameAllocator(self.arguments)
+        for code_line in self.body_lines + ([self.return_line] if self.return_line else []):
             for assigned_variable in code_line.assigned_variables:
-                used_variable_names.add(assigned_variable)
+                variable_names.reserve(assigned_variable)
+            for element in code_line.assigned_value.elements:
+                if element.type == CodeElementType.VARIABLE:
+                    variable_names.reserve(element.value)
 
         declared_variable_names = set(self.arguments)
         variables_new_names = {}
 
         for code_line in self.body_lines:
             self._convert_code_line_mutable_variables_to_immutable(
-                code_line, used_variable_names, declared_variable_names, variables_new_names
+                code_line, variable_names, declared_variable_names, variables_new_names
             )
 
         if self.return_line:
             self._convert_code_line_mutable_variables_to_immutable(
-                self.return_line, used_variable_names, declared_variable_names, variables_new_names
+                self.return_line, variable_names, declared_variable_names, variables_new_names
             )
 
     def _convert_code_line_mutable_variables_to_immutable(self,
                                                           code_line: CodeLine,
-                                                          used_variable_names: set[str],
+                                                          variable_names: NameAllocator,
                                                           declared_variable_names: set[str],
                                                           variables_new_names: dict[str, str]) -> None:
         assigned_value_elements: list[CodeElement] = code_line.assigned_value.elements
@@ -65,10 +68,7 @@ class FunctionStructure:
             assigned_variable = assigned_variables[index]
 
             if assigned_variable in declared_variable_names:
-                new_variable_name = assigned_variable
-                while new_variable_name in used_variable_names:
-                    new_variable_name = StringUtil.generate_new_variable_name_from(assigned_variable)
-
+                new_variable_name = variable_names.new_name(assigned_variable)
                 assigned_variables[index] = new_variable_name
                 variables_new_names[assigned_variable] = new_variable_name
             else:
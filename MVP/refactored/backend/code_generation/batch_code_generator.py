@@ -0,0 +1,141 @@
+"""
+Headless batch code generation over project JSON files.
+
+Every project saved by ProjectExporter is loaded straight into the Receiver (no Tk objects are created),
+code is generated for its main canvas and written to <output directory>/<project name>.py.
+Code can not be generated for label-only boxes of old projects, such projects fail. With --stub-label-only
+these boxes are generated as stubs that raise NotImplementedError (see HeadlessJsonImporter), and the projects
+are reported as stubbed instead of ok, so their placeholder code is not mistaken for real output.
+Projects are processed in a process pool, every worker process handles one project at a time.
+Code of a project that is processed in this process is generated with parallel=True, only this headless
+entry point uses process pools inside code generation.
+
+Run from the repository root:
+    python -m MVP.refactored.backend.code_generation.batch_code_generator example_projects -o generated [--jobs N]
+        [--stub-label-only]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.code_generation.code_inspector import CodeInspector
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.tracing import Tracing
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.backend.types.trace_subsystem import TraceSubsystem
+from MVP.refactored.util.importer.json_importer.headless_json_importer import HeadlessJsonImporter
+
+
+def generate_project_code(json_file_path: str, mode: FormattingMode = FormattingMode.PRETTY,
+                          parallel: bool = False, stub_label_only: bool = False) -> str:
+    """Load the project file without Tk and generate code of its main canvas."""
+    return generate_project(json_file_path, mode, parallel, stub_label_only)[0]
+
+
+def generate_project(json_file_path: str, mode: FormattingMode = FormattingMode.PRETTY,
+                     parallel: bool = False, stub_label_only: bool = False) -> tuple[str, list[int]]:
+    """
+    Load the project file without Tk and generate code of its main canvas.
+
+    :param stub_label_only: generate label-only boxes as stubs that raise NotImplementedError
+    :return: generated code and ids of the stubbed label-only boxes
+    """
+    HypergraphManager.clear()
+    importer = HeadlessJsonImporter(stub_label_only_boxes=stub_label_only)
+    canvas_id = importer.load_project(json_file_path)
+    return CodeGenerator.generate_diagram_code(importer.receiver, canvas_id, mode, parallel), importer.stubbed_boxes
+
+
+def generate_project_file(json_file_path: str, output_directory: str, mode: FormattingMode,
+                          parallel: bool = False, stub_label_only: bool = False) -> tuple[str | None, list[int]]:
+    """
+    Generate code of the project and write it to the output directory.
+
+    :return: None on success or error message, and ids of the stubbed label-only boxes
+    """
+    try:
+        code, stubbed_boxes = generate_project(json_file_path, mode, parallel, stub_label_only)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", []
+    Path(output_directory, Path(json_file_path).stem + ".py").write_text(code)
+    return None, stubbed_boxes
+
+
+def generate_directory(project_directory: str,
+                       output_directory: str,
+                       mode: FormattingMode = FormattingMode.PRETTY,
+                       jobs: int | None = None,
+                       stub_label_only: bool = False) -> dict[str, tuple[str | None, list[int]]]:
+    """
+    Generate code of every project JSON file in the directory.
+
+    Projects are processed in worker processes. If they are processed in this process (jobs is 1 or there is only
+    one project), code of a single project is generated in parallel unless jobs is 1.
+
+    :param jobs: number of worker processes, projects are processed in this process if it is 1
+    :param stub_label_only: generate label-only boxes as stubs that raise NotImplementedError
+    :return: {project file path: (None on success or error message, ids of the stubbed label-only boxes)}
+    """
+    json_file_paths = sorted(str(path) for path in Path(project_directory).glob("*.json"))
+    os.makedirs(output_directory, exist_ok=True)
+
+    if jobs == 1 or len(json_file_paths) < 2:
+        results = [generate_project_file(path, output_directory, mode, jobs != 1, stub_label_only)
+                   for path in json_file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(generate_project_file,
+                                        json_file_paths,
+                                        [output_directory] * len(json_file_paths),
+                                        [mode] * len(json_file_paths),
+                                        [False] * len(json_file_paths),
+                                        [stub_label_only] * len(json_file_paths)))
+    return dict(zip(json_file_paths, results))
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate code of project JSON files without Tk.")
+    parser.add_argument("project_directory", help="directory with project JSON files")
+    parser.add_argument("-o", "--output", default="generated", help="directory for generated .py files")
+    parser.add_argument("--mode", choices=[mode.value for mode in FormattingMode], default=FormattingMode.PRETTY,
+                        help="fast output skips autopep8")
+    parser.add_argument("--jobs", type=int, default=None, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--stub-label-only", action="store_true",
+                        help="generate label-only boxes of old projects as stubs that raise NotImplementedError")
+    parser.add_argument("--verbose", action="store_true", help="show receiver and hypergraph logs")
+    args = parser.parse_args(arguments)
+
+    Tracing.configure_from_environment()
+    if args.verbose:
+        for subsystem in TraceSubsystem:
+            Tracing.set_level(subsystem, logging.DEBUG)
+
+    try:
+        results = generate_directory(args.project_directory, args.output, FormattingMode(args.mode), args.jobs,
+                                     args.stub_label_only)
+    finally:
+        CodeInspector.shutdown_executor()
+    failed = stubbed = 0
+    for json_file_path, (error, stubbed_boxes) in results.items():
+        if error:
+            failed += 1
+            print(f"{'failed':<8}{json_file_path}: {error}")
+        elif stubbed_boxes:
+            stubbed += 1
+            print(f"{'stubbed':<8}{json_file_path}: label-only boxes without box function "
+                  f"{', '.join(map(str, stubbed_boxes))}")
+        else:
+            print(f"{'ok':<8}{json_file_path}")
+    print(f"{len(results) - failed - stubbed} generated, {stubbed} stubbed, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
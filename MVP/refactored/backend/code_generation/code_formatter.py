@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+
+import autopep8
+
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+
+INDENT = " " * 4
+FRAGMENT_MARKER = "# --- generated code fragment ---"
+
+
+class CodeFormatter:
+    """
+    Formats generated code fragment by fragment.
+
+    Fragments (imports, global statements and functions) are emitted from the AST, so they already have
+    PEP 8 indentation. In fast mode they are only joined with PEP 8 blank lines. In pretty mode every
+    fragment is formatted with autopep8; formatted fragments are stored by the sha256 hash of their source,
+    so on the next code generation only fragments that changed are formatted again.
+    """
+    max_size: int = 4096
+    formatted_fragments: OrderedDict[str, str] = OrderedDict()
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def fix_code(cls, code: str) -> str:
+        """Format the code with autopep8, reuse the result if the same code was formatted before."""
+        return cls.fix_fragments([code])[0]
+
+    @classmethod
+    def fix_fragments(cls, fragments: list[str]) -> list[str]:
+        """
+        Format every fragment with autopep8, reuse the results of fragments that were formatted before.
+
+        Fragments that are not in the cache are formatted in a single autopep8 run,
+        separated by marker comments, as every autopep8 run has a big constant cost.
+        """
+        keys = [hashlib.sha256(fragment.encode()).hexdigest() for fragment in fragments]
+        missing: dict[str, str] = {}
+        for key, fragment in zip(keys, fragments):
+            if key in cls.formatted_fragments:
+                cls.hits += 1
+                cls.formatted_fragments.move_to_end(key)
+            elif key not in missing:
+                cls.misses += 1
+                missing[key] = fragment
+
+        for key, formatted in zip(missing, cls._fix_together(list(missing.values()))):
+            cls.formatted_fragments[key] = formatted
+        result = [cls.formatted_fragments[key] for key in keys]
+        while len(cls.formatted_fragments) > cls.max_size:
+            cls.formatted_fragments.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _fix_together(fragments: list[str]) -> list[str]:
+        if len(fragments) < 2:
+            return [autopep8.fix_code(fragment) for fragment in fragments]
+
+        separator = f"\n\n\n{FRAGMENT_MARKER}\n\n\n"
+        parts = autopep8.fix_code(separator.join(fragment.strip("\n") for fragment in fragments)).split(FRAGMENT_MARKER)
+        if len(parts) != len(fragments):  # marker was changed by autopep8, format fragments one by one
+            return [autopep8.fix_code(fragment) for fragment in fragments]
+        return [part.strip("\n") + "\n" for part in parts]
+
+    @classmethod
+    def format_fragments(cls, fragments: list[str], mode: FormattingMode) -> list[str]:
+        """Return fragments without surrounding blank lines, formatted with autopep8 in pretty mode."""
+        if mode == FormattingMode.PRETTY:
+            fragments = cls.fix_fragments(fragments)
+        return [fragment.strip("\n") for fragment in fragments]
+
+    @classmethod
+    def join_module(cls,
+                    imports: list[str],
+                    global_statements: list[str],
+                    functions: list[str],
+                    mode: FormattingMode) -> str:
+        """
+        Join fragments of the module.
+
+        Imports and global statements are separated by one blank line, top level functions by two blank lines.
+        """
+        header_imports, header_globals, *functions = cls.format_fragments(
+            ["".join(imports), "".join(global_statements)] + functions, mode)
+        parts = ["\n\n".join(part for part in (header_imports, header_globals) if part)] + functions
+        return "\n\n\n".join(part for part in parts if part) + "\n"
+
+    @classmethod
+    def get_info(cls) -> dict[str, int]:
+        """Return hit and miss counters and the size of the formatted fragment cache, for profiling."""
+        return {"hits": cls.hits, "misses": cls.misses, "size": len(cls.formatted_fragments),
+                "max_size": cls.max_size}
+
+    @classmethod
+    def clear(cls):
+        cls.formatted_fragments.clear()
+        cls.hits = 0
+        cls.misses = 0
@@ -1,72 +1,248 @@
-from queue import Queue
-from typing import Tuple
+from __future__ import annotations
 
-import autopep8
+import itertools
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Tuple, TYPE_CHECKING
 
 from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.code_generation.code_formatter import CodeFormatter, INDENT
 from MVP.refactored.backend.code_generation.code_inspector import CodeInspector
-from MVP.refactored.backend.diagram import Diagram
+from MVP.refactored.backend.code_generation.hypergraph_optimizer import HypergraphOptimizer
+from MVP.refactored.backend.code_generation.node_group_resolver import NodeGroupResolver
 from MVP.refactored.backend.diagram_callback import Receiver
 from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
 from MVP.refactored.backend.hypergraph.hypergraph import Hypergraph
 from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
 from MVP.refactored.backend.hypergraph.node import Node
-from MVP.refactored.backend.resource import Resource
-from MVP.refactored.backend.types.connection_info import ConnectionInfo
-from MVP.refactored.frontend.components.custom_canvas import CustomCanvas
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+
+if TYPE_CHECKING:
+    from MVP.refactored.frontend.components.custom_canvas import CustomCanvas
+
+# placeholders of the main function name and of box function names in main function templates, see HypergraphCode
+FUNCTION_NAME_PLACEHOLDER = "\x00name\x00"
+PLACEHOLDER_PATTERN = re.compile("\x00(?:[0-9]+|name)\x00")
+# (hypergraphs, renamed functions, function names, resolver) of the main functions that are constructed
+# in a worker process, it is set only in forked workers by their initializer, never in the parent process
+_main_function_tasks: tuple[list[Hypergraph], dict[BoxFunction, str], list[str], NodeGroupResolver] | None = None
+
+
+def _set_main_function_tasks(tasks: tuple[list[Hypergraph], dict[BoxFunction, str], list[str], NodeGroupResolver]):
+    global _main_function_tasks
+    _main_function_tasks = tasks
+
+
+def _construct_main_functions(start: int, stop: int) -> list[str]:
+    hypergraphs, renamed_functions, function_names, resolver = _main_function_tasks
+    return [CodeGenerator.construct_main_function(hypergraphs[i], renamed_functions, function_names[i], resolver)
+            for i in range(start, stop)]
+
+
+class MainFunctionNames:
+    """
+    Naming context of one main function.
+
+    Every main function gets its own context, so main functions do not share any state
+    and can be constructed in any order or in parallel.
+    """
+
+    def __init__(self):
+        self.spider_index = 0
+
+    def new_spider_variable(self) -> str:
+        variable = f"spider_{self.spider_index}"
+        self.spider_index += 1
+        return variable
+
+
+class HypergraphCode:
+    """
+    Code generation results of one hypergraph.
+
+    Results are valid while the stamp (versions of the hypergraph and of hypergraphs inside its compound boxes)
+    stays the same. Main function is stored as a template with placeholders instead of the function name and
+    box function names (see CodeGenerator.construct_main_function_templates), so it does not have to be
+    constructed again when only names change (e.g. hypergraphs before it were added or removed, or box functions were renamed).
+    """
+
+    def __init__(self, receiver: Receiver, hypergraph: Hypergraph, stamp: tuple, box_functions: set[BoxFunction]):
+        self.receiver: Receiver = receiver
+        self.hypergraph: Hypergraph = hypergraph
+        self.stamp: tuple = stamp
+        self.box_functions: set[BoxFunction] = box_functions
+        self.main_function_template: str | None = None
+        # box functions that the main function template calls, optimized templates can call only some of them
+        self.called_functions: set[BoxFunction] = set()
+        self.main_function_key: tuple | None = None  # (function name, new names of the box functions)
+        self.main_function: str | None = None
+
+    def set_main_function_template(self, template: str, placeholders: dict[BoxFunction, str]):
+        self.main_function_template = template
+        self.called_functions = {box_function for box_function in self.box_functions
+                                 if placeholders[box_function] in template}
+
+    def get_main_function(self, function_name: str, renamed_functions: dict[BoxFunction, str],
+                          names_by_placeholder: dict[str, str]) -> str:
+        key = (function_name, tuple(renamed_functions[box_function] for box_function in self.called_functions))
+        if key != self.main_function_key:
+            self.main_function = PLACEHOLDER_PATTERN.sub(
+                lambda match: function_name if match[0] == FUNCTION_NAME_PLACEHOLDER
+                else names_by_placeholder[match[0]],
+                self.main_function_template)
+            self.main_function_key = key
+        return self.main_function
 
-spider_index = 0
 
 class CodeGenerator:
+    # main functions are constructed in worker processes if at least this many of them must be constructed
+    PARALLEL_MAIN_FUNCTION_THRESHOLD = 64
+    # main functions are optimized before emission (see HypergraphOptimizer), clear the cache after changing it.
+    # Optimization is opt-in: a removed dead box does not raise the exception it would raise without it
+    OPTIMIZE_MAIN_FUNCTIONS = False
+    # {canvas id: {hypergraph id: code of the hypergraph}}, results of the last code generation of every canvas
+    hypergraph_codes: dict[int, dict[int, HypergraphCode]] = {}
+    # {box function: placeholder of its name in main function templates}, placeholders are never reused,
+    # box functions that are not used by any hypergraph code are evicted after every generation
+    box_function_placeholders: dict[BoxFunction, str] = {}
+    placeholder_counter: Iterator[int] = itertools.count()
+
     @classmethod
-    def generate_code(cls, canvas: CustomCanvas) -> str:
+    def generate_code(cls, canvas: CustomCanvas, mode: FormattingMode = FormattingMode.PRETTY) -> str:
         """
         Generates Python code based on the structure and functional elements of the provided canvas and related canvasses.
 
         This method processes a set of box functions associated with the given canvas, extracts global statements, helper
         functions, and main functions, renames them for uniqueness, and constructs the final composite Python script.
-        The resulting script is formatted using the autopep8 library and written to a file named "diagram.py".
-        The formatted code is also returned by the method as a string.
+        In pretty mode every fragment of the script is formatted using the autopep8 library (only fragments that
+        changed since the last generation are formatted again), in fast mode autopep8 is skipped.
+        The formatted code is returned by the method as a string.
 
         Arguments:
             canvas (CustomCanvas): The main canvas from which the function hierarchy
                 and code elements are derived.
+            mode (FormattingMode): "fast" or "pretty" output.
 
         Returns:
-            str: The generated and auto formatted Python code as a single string.
+            str: The generated and formatted Python code as a single string.
         """
-        global spider_index
-        spider_index = 0
-        hypergraphs_on_this_canvas: list[Hypergraph] = HypergraphManager.get_graphs_by_canvas_id(canvas.id)
+        return cls.generate_diagram_code(canvas.receiver, canvas.id, mode)
 
-        box_functions: set[BoxFunction] = set()
-        for hypergraph in hypergraphs_on_this_canvas:
-            box_functions.update(cls.get_all_box_functions(hypergraph))
+    @classmethod
+    def generate_diagram_code(cls,
+                              receiver: Receiver,
+                              canvas_id: int,
+                              mode: FormattingMode = FormattingMode.PRETTY,
+                              parallel: bool = False) -> str:
+        """
+        Generate Python code of the diagram on the given canvas id.
+
+        Works only with backend objects, so code can be generated without Tk (see `generate_code`).
+        Code is generated incrementally: box functions and main functions of hypergraphs that did not change
+        since the last generation of the canvas are reused (see HypergraphCode), renamed box function code
+        is reused by CodeInspector.rename.
+        With parallel, work is done in process pools (see CodeInspector.rename and construct_main_functions),
+        only headless callers (batch code generation) should set it, the GUI never starts worker processes.
+        """
+        previous_codes = cls.hypergraph_codes.get(canvas_id, {})
+        codes: list[HypergraphCode] = [cls.get_hypergraph_code(receiver, hypergraph, previous_codes)
+                                       for hypergraph in HypergraphManager.get_graphs_by_canvas_id(canvas_id)]
+        cls.hypergraph_codes[canvas_id] = {code.hypergraph.id: code for code in codes}
 
-        box_functions_items_names: dict[BoxFunction, set[str]] = cls.get_box_functions_items_names(box_functions)
+        box_functions: set[BoxFunction] = set()
+        for code in codes:
+            box_functions.update(code.box_functions)
+
+        # main functions, only templates of changed hypergraphs are constructed again
+        placeholders = {f: cls.get_box_function_placeholder(f) for f in box_functions}
+        cls.evict_box_function_placeholders()
+        outdated = [code for code in codes if code.main_function_template is None]
+        templates = cls.construct_main_function_templates([code.hypergraph for code in outdated],
+                                                          placeholders,
+                                                          NodeGroupResolver(receiver),
+                                                          parallel)
+        for code, template in zip(outdated, templates):
+            code.set_main_function_template(template, placeholders)
+
+        # box functions whose calls were all removed or aliased by HypergraphOptimizer are not emitted
+        called_functions: set[BoxFunction] = set()
+        for code in codes:
+            called_functions.update(code.called_functions)
+
+        box_functions_items_names: dict[BoxFunction, set[str]] = cls.get_box_functions_items_names(called_functions)
 
         (global_statements,
          helper_functions,
          main_functions,
-         main_functions_new_names) = CodeInspector.rename(box_functions_items_names)
-
-        # imports
-        file_content: str = "\n".join(set(imp for f in box_functions for imp in f.imports))
-        # global statements
-        file_content += "".join(global_statements) + "\n"
-        # helper functions
-        file_content += "\n\n".join(helper_functions) + "\n\n"
-        # functions
-        file_content += "\n\n".join(main_functions)
-        # main functions
-        for i, hypergraph in enumerate(hypergraphs_on_this_canvas):
-            func_name = f"main_{i}"
-            file_content += "\n\n" + cls.construct_main_function(hypergraph,
-                                                                 main_functions_new_names,
-                                                                 func_name,
-                                                                 canvas.receiver)
-
-        return autopep8.fix_code(file_content)
+         main_functions_new_names) = CodeInspector.rename(box_functions_items_names, parallel)
+
+        names_by_placeholder = {placeholders[f]: main_functions_new_names[f] for f in called_functions}
+        functions: list[str] = list(helper_functions) + list(main_functions)
+        functions.extend(code.get_main_function(f"main_{i}", main_functions_new_names, names_by_placeholder)
+                         for i, code in enumerate(codes))
+
+        imports: list[str] = list(set(imp for f in called_functions for imp in f.imports))
+        return CodeFormatter.join_module(imports, list(global_statements), functions, mode)
+
+    @classmethod
+    def get_hypergraph_code(cls,
+                            receiver: Receiver,
+                            hypergraph: Hypergraph,
+                            previous_codes: dict[int, HypergraphCode]) -> HypergraphCode:
+        """Return code of the previous generation if the hypergraph did not change since, otherwise empty code."""
+        stamp = cls.get_hypergraph_stamp(hypergraph)
+        code = previous_codes.get(hypergraph.id)
+        if code is None or code.receiver is not receiver or code.hypergraph is not hypergraph or code.stamp != stamp:
+            code = HypergraphCode(receiver, hypergraph, stamp, cls.get_all_box_functions(hypergraph))
+        return code
+
+    @classmethod
+    def get_hypergraph_stamp(cls, hypergraph: Hypergraph) -> tuple:
+        """
+        Return ids and versions of the hypergraph and hypergraphs inside its compound hyper edges.
+
+        Hypergraph version changes on every structural change and when Receiver marks a hyper edge changed,
+        so the stamp changes whenever code generated from the hypergraph can change.
+        """
+        stamp = [(hypergraph.id, hypergraph.version)]
+        for hyper_edge in hypergraph.get_all_hyper_edges():
+            for subgraph in hyper_edge.get_hypergraphs_inside():
+                stamp.extend(cls.get_hypergraph_stamp(subgraph))
+        return tuple(stamp)
+
+    @classmethod
+    def get_box_function_placeholder(cls, box_function: BoxFunction) -> str:
+        if box_function not in cls.box_function_placeholders:
+            cls.box_function_placeholders[box_function] = f"\x00{next(cls.placeholder_counter)}\x00"
+        return cls.box_function_placeholders[box_function]
+
+    @classmethod
+    def evict_box_function_placeholders(cls):
+        """
+        Forget placeholders of box functions that are not used by code of any canvas.
+
+        Every used box function has a placeholder, so placeholders are filtered only if there are more of them.
+        """
+        used = set()
+        for codes in cls.hypergraph_codes.values():
+            for code in codes.values():
+                used.update(code.box_functions)
+        if len(used) < len(cls.box_function_placeholders):
+            cls.box_function_placeholders = {box_function: placeholder
+                                             for box_function, placeholder in cls.box_function_placeholders.items()
+                                             if box_function in used}
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget code of previous generations, next generation is done from scratch."""
+        cls.hypergraph_codes.clear()
+        cls.box_function_placeholders.clear()
+        cls.placeholder_counter = itertools.count()
+        CodeInspector.clear_cache()
+        HypergraphOptimizer.clear_cache()
 
     @classmethod
     def get_all_box_functions(cls, hypergraph: Hypergraph) -> set[BoxFunction]:
@@ -82,6 +258,8 @@ class CodeGenerator:
             if hyper_edge.is_compound():
                 for subgraph in hyper_edge.get_hypergraphs_inside():
                     box_functions.update(cls.get_all_box_functions(subgraph))
+            elif hyper_edge.box_function is None:
+                raise ValueError(f"Box {hyper_edge.id} has no function, code can not be generated")
             else:
                 box_functions.add(hyper_edge.box_function)
         return box_functions
@@ -103,12 +281,62 @@ class CodeGenerator:
             box_functions_items_names[box_function] = variables
         return box_functions_items_names
 
+    @classmethod
+    def construct_main_function_templates(cls,
+                                          hypergraphs: list[Hypergraph],
+                                          placeholders: dict[BoxFunction, str],
+                                          resolver: NodeGroupResolver,
+                                          parallel: bool = False
+                                          ) -> list[str]:
+        """
+        Construct main function templates of the hypergraphs, in the order of the hypergraphs.
+
+        Templates contain FUNCTION_NAME_PLACEHOLDER instead of the function name and the given placeholders
+        instead of box function names, HypergraphCode.get_main_function fills them in.
+        """
+        return cls.construct_main_functions(hypergraphs, placeholders, resolver,
+                                            [FUNCTION_NAME_PLACEHOLDER] * len(hypergraphs), parallel)
+
+    @classmethod
+    def construct_main_functions(cls,
+                                 hypergraphs: list[Hypergraph],
+                                 renamed_functions: dict[BoxFunction, str],
+                                 resolver: NodeGroupResolver,
+                                 function_names: list[str] = None,
+                                 parallel: bool = False
+                                 ) -> list[str]:
+        """
+        Construct main functions of the hypergraphs, in the order of the hypergraphs.
+
+        Functions are named main_0 .. main_n, unless function names are given.
+        Hypergraphs are independent, so with parallel, if there are at least PARALLEL_MAIN_FUNCTION_THRESHOLD
+        of them and processes can be forked, they are split into contiguous chunks that are constructed in worker
+        processes. Chunks are joined in their order, so the result is the same as with serial construction.
+        Workers are forked, so they inherit the hypergraphs instead of receiving them pickled. Only headless callers
+        should set parallel, forking a process that runs Tk is not safe.
+        """
+        if function_names is None:
+            function_names = [f"main_{i}" for i in range(len(hypergraphs))]
+        workers = min(os.cpu_count() or 1, len(hypergraphs))
+        if (not parallel or len(hypergraphs) < cls.PARALLEL_MAIN_FUNCTION_THRESHOLD or workers < 2
+                or "fork" not in multiprocessing.get_all_start_methods()):
+            return [cls.construct_main_function(hypergraph, renamed_functions, function_name, resolver)
+                    for hypergraph, function_name in zip(hypergraphs, function_names)]
+
+        bounds = [len(hypergraphs) * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("fork"),
+                                 initializer=_set_main_function_tasks,
+                                 initargs=((hypergraphs, renamed_functions, function_names, resolver),)) as executor:
+            chunks = list(executor.map(_construct_main_functions, bounds[:-1], bounds[1:]))
+        return [function for chunk in chunks for function in chunk]
+
     @classmethod
     def construct_main_function(cls,
                                 hypergraph: Hypergraph,
                                 renamed_functions: dict[BoxFunction, str],
                                 func_name: str,
-                                receiver: Receiver
+                                resolver: NodeGroupResolver
                                 ) -> str:
         """
         Construct the main function for a given hypergraph.
@@ -116,26 +344,37 @@ class CodeGenerator:
         This method generates the complete main function for a hypergraph, including its
         definition, body, and return statement. It processes the hypergraph's structure,
         resolves input and output nodes, and ensures that all hyper edges are executed
-        in the correct order.
+        in the correct order. Variable names depend only on the hypergraph (see MainFunctionNames).
+        If OPTIMIZE_MAIN_FUNCTIONS is set, dead boxes are removed, repeated pure calls and copy boxes
+        are not emitted (see HypergraphOptimizer), box functions that are not called any more are not
+        emitted by `generate_diagram_code`.
         """
-        diagram_inputs_as_nodes: list[Node] = cls.get_sorted_diagram_inputs(hypergraph, receiver, hypergraph.canvas_id)
+        diagram_inputs_as_nodes: list[Node] = cls.get_sorted_diagram_inputs(hypergraph, resolver.receiver,
+                                                                             hypergraph.canvas_id)
+        names = MainFunctionNames()
 
-        function_definition, name_map = cls.create_definition_of_main_function(func_name, receiver, diagram_inputs_as_nodes)
+        function_definition, name_map = cls.create_definition_of_main_function(func_name, resolver,
+                                                                               diagram_inputs_as_nodes, names)
 
-        hyper_edge_queue: Queue[HyperEdge] = Queue()
+        hyper_edge_queue: deque[HyperEdge] = deque()
         cls.get_queue_of_hyper_edges(hypergraph, hyper_edge_queue)
+        if cls.OPTIMIZE_MAIN_FUNCTIONS:
+            outputs = cls.get_sorted_diagram_outputs(hypergraph, resolver.receiver, hypergraph.canvas_id)
+            hyper_edge_queue = HypergraphOptimizer.remove_dead_hyper_edges(hyper_edge_queue, outputs, resolver)
 
-        function_body, name_map = cls.create_main_function_content(hyper_edge_queue, renamed_functions, name_map, receiver)
+        function_body, name_map = cls.create_main_function_content(hyper_edge_queue, renamed_functions, name_map,
+                                                                   resolver, names, cls.OPTIMIZE_MAIN_FUNCTIONS)
 
-        function_return = cls.create_main_function_return(receiver, hypergraph, name_map)
+        function_return = cls.create_main_function_return(resolver, hypergraph, name_map)
 
         return function_definition + function_body + function_return
 
     @classmethod
     def create_definition_of_main_function(cls,
                                            func_name: str,
-                                           receiver: Receiver,
-                                           diagram_inputs_as_nodes: list[Node]
+                                           resolver: NodeGroupResolver,
+                                           diagram_inputs_as_nodes: list[Node],
+                                           names: MainFunctionNames = None
                                            ) -> (str, dict[int, str]):
         """
         Create the definition of a main function for the given hypergraph.
@@ -143,14 +382,14 @@ class CodeGenerator:
         This method generates the function signature for a main function, including
         input parameters based on the source nodes of the provided diagram.
         """
-        global spider_index
+        names = names or MainFunctionNames()
         definition: str = f"def {func_name}("
 
         node_and_hyper_edge_to_variable_name: dict[int, str] = dict()
         index: int = -1
         spiders: set[int] = set()
         for node in diagram_inputs_as_nodes:
-            actual_hash: int = cls.get_input_actual_node_group_hash(node, receiver)
+            actual_hash: int = resolver.get_input_actual_node_group_hash(node)
             index += 1
             var_name = f"input_{index}"
             definition += f"{var_name}, "
@@ -165,20 +404,21 @@ class CodeGenerator:
         definition = (definition[:-2] if index >= 0 else definition) + "):"
 
         for spider in spiders:
-            spider_variable = f"spider_{spider_index}"
+            spider_variable = names.new_spider_variable()
             spider_definition = f"{spider_variable} = {node_and_hyper_edge_to_variable_name[spider]}"
             node_and_hyper_edge_to_variable_name[spider] = spider_variable
-            spider_index += 1
-            definition += f"\n\t{spider_definition}"
+            definition += f"\n{INDENT}{spider_definition}"
 
         return definition, node_and_hyper_edge_to_variable_name
 
     @classmethod
     def create_main_function_content(cls,
-                                     queue: Queue[HyperEdge],
+                                     queue: deque[HyperEdge],
                                      renamed_functions: dict[BoxFunction, str],
                                      node_and_hyper_edge_to_variable_name: dict[int, str],
-                                     receiver: Receiver
+                                     resolver: NodeGroupResolver,
+                                     names: MainFunctionNames = None,
+                                     optimize: bool = False
                                      ) -> (str, dict[int, str]):
         """
         Generate the content of the main function for a given hypergraph.
@@ -186,68 +426,78 @@ class CodeGenerator:
         This method processes a queue of hyper edges and generates Python code
         for executing each hyper edge in the correct order. It maps source nodes
         to input variables and target nodes to output variables or tuple elements.
+        If optimize is set, a pure call that repeats an earlier call with the same arguments reuses
+        its result variable and outputs of copy boxes are aliases of their argument (see HypergraphOptimizer).
         """
-        global spider_index
+        names = names or MainFunctionNames()
         main_function_content = ""
         index = 0
-        while not queue.empty():
-            hyper_edge = queue.get()
+        pure_calls: dict[tuple[BoxFunction, str], str] = {}  # {(box function, arguments): result variable}
+        while queue:
+            hyper_edge = queue.popleft()
+            box_function = hyper_edge.get_box_function()
 
-            variable = f"res_{index}"
-            variable_definition = f"{variable} = {renamed_functions[hyper_edge.get_box_function()]}("
+            arguments = []
             for source_node in hyper_edge.get_source_nodes():
-                actual_hash: int = cls.get_output_actual_node_group_hash(source_node, receiver)
-                actual_hash2 = cls.get_input_actual_node_group_hash(source_node, receiver)
+                actual_hash: int = resolver.get_output_actual_node_group_hash(source_node)
+                actual_hash2 = resolver.get_input_actual_node_group_hash(source_node)
                 if actual_hash in node_and_hyper_edge_to_variable_name:
-                    variable_definition += f"{node_and_hyper_edge_to_variable_name[actual_hash]}, "
+                    arguments.append(node_and_hyper_edge_to_variable_name[actual_hash])
                 elif actual_hash2 in node_and_hyper_edge_to_variable_name:
-                    variable_definition += f"{node_and_hyper_edge_to_variable_name[actual_hash2]}, "
+                    arguments.append(node_and_hyper_edge_to_variable_name[actual_hash2])
                 else:
                     raise RuntimeError("Can`t find variable name")
-                    # pass
-
-                # variable_definition += f"{node_and_hyper_edge_to_variable_name[actual_hash2]}, "
-            if len(hyper_edge.get_source_nodes()) > 0:
-                variable_definition = variable_definition[:-2]
-            variable_definition += ")"
-            main_function_content += f"\n\t{variable_definition}"
+            arguments_code = ", ".join(arguments)
 
-            if len(hyper_edge.get_target_nodes()) > 1:
+            target_count = len(hyper_edge.get_target_nodes())
+            analysis = HypergraphOptimizer.analyze(box_function) if optimize else None
+            if analysis and target_count > 1 and analysis.copies == target_count and len(arguments) == 1:
+                outputs = [arguments_code] * target_count
+            else:
+                call_key = (box_function, arguments_code)
+                if analysis and analysis.is_pure and call_key in pure_calls:
+                    variable = pure_calls[call_key]
+                else:
+                    variable = f"res_{index}"
+                    variable_definition = f"{variable} = {renamed_functions[box_function]}({arguments_code})"
+                    main_function_content += f"\n{INDENT}{variable_definition}"
+                    index += 1
+                    if analysis and analysis.is_pure:
+                        pure_calls[call_key] = variable
+                outputs = [f"{variable}[{i}]" for i in range(target_count)] if target_count > 1 else [variable]
+
+            if target_count > 1:
                 spiders: set[int] = set()
                 for i, target_node in enumerate(hyper_edge.get_target_nodes()):
-                    actual_hash: int = cls.get_input_actual_node_group_hash(target_node, receiver)
+                    actual_hash: int = resolver.get_input_actual_node_group_hash(target_node)
                     if actual_hash in node_and_hyper_edge_to_variable_name: # in case of spider
-                        node_and_hyper_edge_to_variable_name[actual_hash] += f", {variable}[{i}]"
+                        node_and_hyper_edge_to_variable_name[actual_hash] += f", {outputs[i]}"
                         spiders.add(actual_hash)
                     else:
-                        node_and_hyper_edge_to_variable_name[actual_hash] = f"{variable}[{i}]"
+                        node_and_hyper_edge_to_variable_name[actual_hash] = outputs[i]
                 for spider in spiders:
-                    spider_variable = f"spider_{spider_index}"
+                    spider_variable = names.new_spider_variable()
                     spider_definition = f"{spider_variable} = {node_and_hyper_edge_to_variable_name[spider]}"
-                    main_function_content += f"\n\t{spider_definition}"
+                    main_function_content += f"\n{INDENT}{spider_definition}"
                     node_and_hyper_edge_to_variable_name[spider] = spider_variable
-                    spider_index += 1
             else:
                 target_node = hyper_edge.get_target_nodes()[0]
-                actual_hash: int = cls.get_input_actual_node_group_hash(target_node, receiver)
+                actual_hash: int = resolver.get_input_actual_node_group_hash(target_node)
                 if actual_hash in node_and_hyper_edge_to_variable_name: # in case of spider
-                    node_and_hyper_edge_to_variable_name[actual_hash] += f", {variable}"
+                    node_and_hyper_edge_to_variable_name[actual_hash] += f", {outputs[0]}"
 
-                    spider_variable = f"spider_{spider_index}"
+                    spider_variable = names.new_spider_variable()
                     spider_definition = f"{spider_variable} = {node_and_hyper_edge_to_variable_name[actual_hash]}"
-                    main_function_content += f"\n\t{spider_definition}"
+                    main_function_content += f"\n{INDENT}{spider_definition}"
                     node_and_hyper_edge_to_variable_name[actual_hash] = spider_variable
-                    spider_index += 1
                 else:
-                    node_and_hyper_edge_to_variable_name[actual_hash] = variable
-                # node_and_hyper_edge_to_variable_name[actual_hash] = variable
+                    node_and_hyper_edge_to_variable_name[actual_hash] = outputs[0]
 
-            index += 1
         return main_function_content, node_and_hyper_edge_to_variable_name
 
     @classmethod
     def create_main_function_return(cls,
-                                    receiver: Receiver,
+                                    resolver: NodeGroupResolver,
                                     hypergraph: Hypergraph,
                                     node_and_hyper_edge_to_variable_name: dict[int, str]
                                     ) -> str:
@@ -258,12 +508,13 @@ class CodeGenerator:
         over the output nodes of the hypergraph. It ensures that each output node is
         mapped to its corresponding variable name and includes it in the return statement.
         """
-        main_function_return = "\n\treturn "
+        main_function_return = f"\n{INDENT}return "
         added: set[int] = set()
-        for output in cls.get_sorted_diagram_outputs(hypergraph, receiver, hypergraph.canvas_id):
-            if cls.get_output_actual_node_group_hash(output, receiver) in node_and_hyper_edge_to_variable_name:
-                main_function_return += f"{node_and_hyper_edge_to_variable_name[cls.get_output_actual_node_group_hash(output, receiver)]}, "
-                added.add(cls.get_output_actual_node_group_hash(output, receiver))
+        for output in cls.get_sorted_diagram_outputs(hypergraph, resolver.receiver, hypergraph.canvas_id):
+            actual_hash: int = resolver.get_output_actual_node_group_hash(output)
+            if actual_hash in node_and_hyper_edge_to_variable_name:
+                main_function_return += f"{node_and_hyper_edge_to_variable_name[actual_hash]}, "
+                added.add(actual_hash)
         main_function_return = main_function_return[:-2 if len(added) > 0 else -1]
         return main_function_return
 
@@ -276,10 +527,10 @@ class CodeGenerator:
         to the inputs of a diagram. It then sorts these nodes according to the index
         of their corresponding input connections in the diagram.
         """
+        connections_by_id = receiver.diagrams[canvas_id].inputs_by_id
         return sorted(
-            (s for s in hypergraph.get_hypergraph_source()
-             if receiver.diagrams[canvas_id].get_input_by_id(s.id) is not None),
-            key=lambda s: receiver.diagrams[canvas_id].get_input_by_id(s.id).index
+            (s for s in hypergraph.get_hypergraph_source() if s.id in connections_by_id),
+            key=lambda s: connections_by_id[s.id].index
         )
 
     @classmethod
@@ -291,10 +542,10 @@ class CodeGenerator:
         to the inputs of a diagram. It then sorts these nodes according to the index
         of their corresponding input connections in the diagram.
         """
+        connections_by_id = receiver.diagrams[canvas_id].outputs_by_id
         return sorted(
-            (s for s in hypergraph.get_hypergraph_target()
-             if receiver.diagrams[canvas_id].get_output_by_id(s.id) is not None),
-            key=lambda s: receiver.diagrams[canvas_id].get_output_by_id(s.id).index
+            (s for s in hypergraph.get_hypergraph_target() if s.id in connections_by_id),
+            key=lambda s: connections_by_id[s.id].index
         )
 
     @classmethod
@@ -303,22 +554,10 @@ class CodeGenerator:
         Retrieve the actual node group hash for a given input node.
 
         This method determines the actual node group hash by traversing compound hyper edges
-        and resolving nested connections within sub-diagrams. If the node is part of a compound
-        hyper edge, it recursively explores the sub-diagram to find the corresponding deeper node
-        and retrieves its group hash. Otherwise, it returns the node's own group hash.
+        and resolving nested connections within sub-diagrams (see NodeGroupResolver).
+        Code generation uses one NodeGroupResolver for all lookups instead.
         """
-        for hyper_edge in node.get_output_hyper_edges():
-            if hyper_edge.is_compound():
-                con_i: int = next(
-                    (k for k, v in hyper_edge.source_nodes.items() if v.node_group_hash() == node.node_group_hash()),
-                    None)
-                sub_diagram: Diagram = receiver.diagrams[hyper_edge.id]
-                sub_diagram_input: ConnectionInfo = sub_diagram.get_input_by_index(con_i)
-                resource: Resource = next(r for r in sub_diagram.resources if
-                                          sub_diagram_input in (r.get_left_connections() + r.get_right_connections()))
-                deeper_node: Node = HypergraphManager.get_node_by_node_id(resource.id)
-                return cls.get_input_actual_node_group_hash(deeper_node, receiver)
-        return node.node_group_hash()
+        return NodeGroupResolver(receiver).get_input_actual_node_group_hash(node)
 
     @classmethod
     def get_output_actual_node_group_hash(cls, node: Node, receiver: Receiver) -> int:
@@ -326,70 +565,37 @@ class CodeGenerator:
         Retrieve the actual node group hash for a given output node.
 
         This method determines the actual node group hash by traversing compound hyper edges
-        and resolving nested connections within sub-diagrams. If the node is part of a compound
-        hyper edge, it recursively explores the sub-diagram to find the corresponding deeper node
-        and retrieves its group hash. Otherwise, it returns the node's own group hash.
+        and resolving nested connections within sub-diagrams (see NodeGroupResolver).
+        Code generation uses one NodeGroupResolver for all lookups instead.
         """
-        for hyper_edge in node.get_input_hyper_edges():
-            if hyper_edge.is_compound():
-                con_i: int = next(
-                    (k for k, v in hyper_edge.target_nodes.items() if v.node_group_hash() == node.node_group_hash()),
-                    None)
-                sub_diagram: Diagram = receiver.diagrams[hyper_edge.id]
-                sub_diagram_output: ConnectionInfo = sub_diagram.get_output_by_index(con_i)
-                resource: Resource = next(r for r in sub_diagram.resources if
-                                          sub_diagram_output in (r.get_left_connections() + r.get_right_connections()))
-                deeper_node: Node = HypergraphManager.get_node_by_node_id(resource.id)
-                return cls.get_output_actual_node_group_hash(deeper_node, receiver)
-        return node.node_group_hash()
+        return NodeGroupResolver(receiver).get_output_actual_node_group_hash(node)
 
     @classmethod
     def get_queue_of_hyper_edges(cls,
                                  hypergraph: Hypergraph,
-                                 hyper_edge_queue: Queue[HyperEdge],
+                                 hyper_edge_queue: deque[HyperEdge],
                                  seen_hyper_edges: set[HyperEdge] = None
                                  ):
         """
         Generate a queue of hyper edges for a given hypergraph in topological order.
 
-        This method processes the hypergraph to ensure that all hyper edges are added
-        to the queue in an order that respects their dependencies. It recursively explores
-        nested hypergraphs and ensures that each hyper edge is processed only once.
+        This method adds hyper edges to the queue in the order returned by
+        Hypergraph.get_hyper_edges_in_topological_order, which is cached per hypergraph.
+        Compound hyper edges are not added, instead their nested hypergraphs are processed
+        recursively right after them. Each hyper edge is processed only once.
+
+        Raises:
+            ValueError: If hyper edges of the hypergraph form a cycle.
         """
         if seen_hyper_edges is None:
             seen_hyper_edges = set()
 
-        nodes_with_inputs: set[Node] = set(hypergraph.get_hypergraph_source())
-        to_check: list[HyperEdge] = hypergraph.get_all_hyper_edges()
-        hyper_edge_input_count_check: dict[HyperEdge, int] = {}
-
-        while to_check:
-            to_check_new: list[HyperEdge] = []
-            for hyper_edge in to_check:
-                if hyper_edge in seen_hyper_edges:
-                    continue
-
-                if hyper_edge not in hyper_edge_input_count_check:
-                    hyper_edge_input_count_check[hyper_edge] = 0
-                for node in hyper_edge.get_source_nodes():
-                    if node in nodes_with_inputs:
-                        hyper_edge_input_count_check[hyper_edge] += 1
-                if hyper_edge_input_count_check[hyper_edge] >= len(hyper_edge.get_source_nodes()):
-                    # Process this edge first
-                    if hyper_edge.box_function is not None:
-                        hyper_edge_queue.put(hyper_edge)
-                    seen_hyper_edges.add(hyper_edge)
-                    for target_node in hyper_edge.get_target_nodes():
-                        nodes_with_inputs.add(target_node)
-                        nodes_with_inputs.update(target_node.get_united_with_nodes())
-
-                    # Then recursive process inside graphs
-                    for subgraph in hyper_edge.get_hypergraphs_inside():
-                        cls.get_queue_of_hyper_edges(subgraph, hyper_edge_queue, seen_hyper_edges)
-                else:
-                    to_check_new.append(hyper_edge)
-                    hyper_edge_input_count_check[hyper_edge] = 0
+        for hyper_edge in hypergraph.get_hyper_edges_in_topological_order():
+            if hyper_edge in seen_hyper_edges:
+                continue
+            if hyper_edge.box_function is not None:
+                hyper_edge_queue.append(hyper_edge)
+            seen_hyper_edges.add(hyper_edge)
 
-            if to_check == to_check_new:
-                break
-            to_check = to_check_new
+            for subgraph in hyper_edge.get_hypergraphs_inside():
+                cls.get_queue_of_hyper_edges(subgraph, hyper_edge_queue, seen_hyper_edges)
@@ -1,17 +1,30 @@
 from __future__ import annotations
 import ast
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional, TYPE_CHECKING
 import astor  # Requires pip install astor
-import autopep8
+
+from MVP.refactored.backend.code_generation.code_formatter import CodeFormatter
 
 if TYPE_CHECKING:
     from MVP.refactored.backend.box_functions.box_function import BoxFunction
 
 
 class CodeInspector(ast.NodeTransformer):
-    def __init__(self, target_name: str = None, new_name: str = None):
-        self.target_name = target_name
-        self.new_name = new_name
+    # with parallel rename, box functions are renamed in a process pool when there are at least that many of them
+    PARALLEL_RENAME_THRESHOLD = 64
+    # process pool of parallel renames, started on first use and reused by later code generations
+    executor: ProcessPoolExecutor | None = None
+    # renamed code of box functions, {(box function, sorted rename map items): renamed code}
+    max_renamed_size: int = 1024
+    renamed_box_functions: OrderedDict[tuple[BoxFunction, tuple], tuple[list[str], list[str], str]] = OrderedDict()
+
+    def __init__(self, target_name: str = None, new_name: str = None, names: dict[str, str] = None):
+        self.names: dict[str, str] = dict(names) if names else {}  # {old name: new name}
+        if target_name:
+            self.names[target_name] = new_name
         self.current_function_globals = set()
         self.current_function_params = set()
         self.main_function_body = None
@@ -30,49 +43,54 @@ class CodeInspector(ast.NodeTransformer):
 
     def visit_FunctionDef(self, node):
         self.function_names.add(node.name)
-        if node.name == self.target_name:
-            node.name = self.new_name
+        node.name = self.names.get(node.name, node.name)
 
+        outer_function_globals = self.current_function_globals
+        outer_function_params = self.current_function_params
         self.current_function_params = {arg.arg for arg in node.args.args}
+        self.current_function_globals = set()
 
         for stmt in node.body:
             if isinstance(stmt, ast.Global):
-                stmt.names = [
-                    self.new_name if name == self.target_name else name
-                    for name in stmt.names
-                ]
-                self.global_statements.update(stmt.names)
                 self.current_function_globals.update(stmt.names)
+                stmt.names = [self.names.get(name, name) for name in stmt.names]
+                self.global_statements.update(stmt.names)
 
         self.generic_visit(node)
 
-        self.current_function_globals.clear()
-        self.current_function_params.clear()
+        self.current_function_globals = outer_function_globals
+        self.current_function_params = outer_function_params
 
         return node
 
     def visit_Call(self, node):
-        if isinstance(node.func, ast.Name) and node.func.id == self.target_name:
-            node.func.id = self.new_name
+        if isinstance(node.func, ast.Name) and node.func.id in self.names:
+            node.func.id = self.names[node.func.id]
         self.generic_visit(node)
         return node
 
     def visit_Name(self, node):
         if (
-                node.id == self.target_name
+                node.id in self.names
                 and (
                 node.id in self.current_function_globals
                 or not self.current_function_params)
         ):
-            node.id = self.new_name
+            node.id = self.names[node.id]
 
         return node
 
     def refactor_code(self, code_str: str, target_name: str, new_name: str):
         if target_name:
-            self.target_name = target_name
-        if new_name:
-            self.new_name = new_name
+            self.names = {target_name: new_name}
+        return self.rename_code(code_str)
+
+    def rename_code(self, code_str: str, names: dict[str, str] = None) -> str:
+        """
+        Rename all names of the rename map in the given code, code is parsed and converted back to source once.
+        """
+        if names is not None:
+            self.names = names
         tree = ast.parse(code_str)
         self.visit(tree)
         return astor.to_source(tree)
@@ -105,16 +123,21 @@ class CodeInspector(ast.NodeTransformer):
         self.function_names.clear()
 
     @classmethod
-    def rename(cls, box_functions_items_names: dict[BoxFunction, set[str]]) \
+    def rename(cls, box_functions_items_names: dict[BoxFunction, set[str]], parallel: bool = False) \
             -> tuple[set[str], set[str], set[str], dict[BoxFunction, str]]:
         """
             Renames box function item names for a given dictionary of box functions and their associated
             item names. Each item name will be appended with an index to make it unique.
+            Renamed code is cached by the box function and its rename map, so on the next code generation
+            only box functions that are new or got other names are renamed again.
 
             Parameters:
                 cls: The class on which this class method is invoked.
                 box_functions_items_names: A dictionary where keys are BoxFunction instances and values
                     are sets of strings representing item names associated with each BoxFunction.
+                parallel: If at least PARALLEL_RENAME_THRESHOLD box functions must be renamed, rename them in
+                    the process pool of CodeInspector. Only headless callers (batch code generation) should set it,
+                    the GUI renames in its own process.
 
             Returns:
                 A tuple containing:
@@ -128,25 +151,32 @@ class CodeInspector(ast.NodeTransformer):
         renamed_main_functions: set[str] = set()
         main_functions_new_names: dict[BoxFunction, str] = dict()
 
+        keys = []
+        arguments = {}
         for i, (box_function, names) in enumerate(box_functions_items_names.items()):
-            renamer = CodeInspector()
-
-            global_statements: set[str] = box_function.global_statements
-            helper_functions: set[str] = box_function.helper_functions
-            main_function: str = box_function.main_function
-
-            for name in names:
-                new_name = f'{name}_{i}'
-                # rename name to new_name in all global_statements, helper_functions or main_function if it contains it
-                global_statements = [renamer.refactor_code(global_statement, name, new_name)
-                                     for global_statement in global_statements]
-                helper_functions = [renamer.refactor_code(helper_function, name, new_name)
-                                    for helper_function in helper_functions]
-                main_function = renamer.refactor_code(main_function, name, new_name)
-
-                if name == box_function.main_function_name:
-                    main_functions_new_names[box_function] = new_name
-
+            new_names = {name: f'{name}_{i}' for name in names}
+            if box_function.main_function_name in new_names:
+                main_functions_new_names[box_function] = new_names[box_function.main_function_name]
+            key = (box_function, tuple(sorted(new_names.items())))
+            keys.append(key)
+            if key in cls.renamed_box_functions:
+                cls.renamed_box_functions.move_to_end(key)
+            else:
+                arguments[key] = (list(box_function.global_statements),
+                                  list(box_function.helper_functions),
+                                  box_function.main_function,
+                                  new_names)
+
+        if parallel and len(arguments) >= cls.PARALLEL_RENAME_THRESHOLD:
+            renamed = list(cls.get_executor().map(_rename_box_function_code, *zip(*arguments.values())))
+        else:
+            renamed = [_rename_box_function_code(*argument) for argument in arguments.values()]
+        cls.renamed_box_functions.update(zip(arguments, renamed))
+        results = [cls.renamed_box_functions[key] for key in keys]
+        while len(cls.renamed_box_functions) > max(cls.max_renamed_size, len(keys)):
+            cls.renamed_box_functions.popitem(last=False)
+
+        for global_statements, helper_functions, main_function in results:
             renamed_global_statements.update(global_statements)
             renamed_helper_functions.update(helper_functions)
             renamed_main_functions.add(main_function)
@@ -154,28 +184,51 @@ class CodeInspector(ast.NodeTransformer):
         return renamed_global_statements, renamed_helper_functions, renamed_main_functions, main_functions_new_names
 
     @classmethod
-    def get_main_function(cls, code_str: str, main_method_name: str) -> Optional[str]:
+    def clear_cache(cls):
+        cls.renamed_box_functions.clear()
+
+    @classmethod
+    def get_executor(cls) -> ProcessPoolExecutor:
+        """Return the process pool of parallel renames, workers are spawned so they do not inherit any Tk state."""
+        if cls.executor is None:
+            cls.executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        return cls.executor
+
+    @classmethod
+    def shutdown_executor(cls):
+        if cls.executor is not None:
+            cls.executor.shutdown()
+            cls.executor = None
+
+    @classmethod
+    def get_main_function(cls, code_str: str, main_method_name: str, tree: ast.Module = None) -> Optional[str]:
         """
         Extracts the source code for a function matching `main_method_name` from the given code string.
-        """
-        tree = ast.parse(code_str)
-        main_method = None
-        for node in tree.body:
-            if isinstance(node, ast.FunctionDef) and node.name == main_method_name:
-                main_method = node
-                break
 
+        If `tree` is given, it is used instead of parsing the code string again.
+        """
+        main_method = cls.get_main_function_node(tree or ast.parse(code_str), main_method_name)
         if main_method is None:
             return None
 
-        return autopep8.fix_code(astor.to_source(main_method))
+        return CodeFormatter.fix_code(astor.to_source(main_method))
 
     @classmethod
-    def get_help_methods(cls, code_str: str, main_method_name: str) -> list[str]:
+    def get_main_function_node(cls, tree: ast.Module, main_method_name: str) -> Optional[ast.FunctionDef]:
+        """
+        Find the top level function definition matching `main_method_name` in the parsed module.
+        """
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name == main_method_name:
+                return node
+        return None
+
+    @classmethod
+    def get_help_methods(cls, code_str: str, main_method_name: str, tree: ast.Module = None) -> list[str]:
         """
         Extracts all method definitions from the given code string, excluding the main method.
         """
-        tree = ast.parse(code_str)
+        tree = tree or ast.parse(code_str)
         methods = set()
         for node in tree.body:
             if isinstance(node, ast.FunctionDef) and node.name != main_method_name:
@@ -187,11 +240,11 @@ class CodeInspector(ast.NodeTransformer):
         return [astor.to_source(method) for method in methods]
 
     @classmethod
-    def get_imports(cls, code_str) -> list[str]:
+    def get_imports(cls, code_str, tree: ast.Module = None) -> list[str]:
         """
         Parse the provided Python code string and extract import statements.
         """
-        tree = ast.parse(code_str)
+        tree = tree or ast.parse(code_str)
         imports = set()
 
         for node in tree.body:
@@ -206,11 +259,11 @@ class CodeInspector(ast.NodeTransformer):
         return [astor.to_source(ast_import) for ast_import in imports]
 
     @classmethod
-    def get_global_statements(cls, code_str: str) -> list[str]:
+    def get_global_statements(cls, code_str: str, tree: ast.Module = None) -> list[str]:
         """
         Extract the global variable declarations from the given Python code string.
         """
-        tree = ast.parse(code_str)
+        tree = tree or ast.parse(code_str)
         global_vars = set()
         assignments = []
         assigned_vars = set()  # Keep track of assigned global variables
@@ -250,3 +303,17 @@ class CodeInspector(ast.NodeTransformer):
                             names.add(target.id)
 
         return list(names) if names else []
+
+
+def _rename_box_function_code(global_statements: list[str],
+                              helper_functions: list[str],
+                              main_function: str,
+                              names: dict[str, str]) -> tuple[list[str], list[str], str]:
+    """
+    Rename all names of one box function, every code element is parsed once.
+    Module level function, so it can be run in a process pool.
+    """
+    renamer = CodeInspector(names=names)
+    return ([renamer.rename_code(global_statement) for global_statement in global_statements],
+            [renamer.rename_code(helper_function) for helper_function in helper_functions],
+            renamer.rename_code(main_function))
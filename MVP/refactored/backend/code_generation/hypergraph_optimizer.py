@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import ast
+from collections import OrderedDict
+from collections import deque
+from typing import TYPE_CHECKING
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+
+if TYPE_CHECKING:
+    from MVP.refactored.backend.code_generation.node_group_resolver import NodeGroupResolver
+    from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+    from MVP.refactored.backend.hypergraph.node import Node
+
+# builtins that do not have side effects and always give the same result for the same arguments
+PURE_BUILTINS = frozenset({
+    "abs", "all", "any", "bool", "divmod", "float", "int", "len", "list", "max", "min", "pow", "range", "round",
+    "sorted", "str", "sum", "tuple", "ArithmeticError", "TypeError", "ValueError", "ZeroDivisionError",
+})
+# modules whose functions do not have side effects
+PURE_MODULES = frozenset({"math", "cmath", "operator"})
+
+
+class BoxFunctionAnalysis:
+    """Properties of a box function that the optimization of main functions needs."""
+
+    def __init__(self, is_pure: bool, copies: int):
+        self.is_pure: bool = is_pure
+        # number of returned copies of the only argument if the main function only copies it, otherwise 0
+        self.copies: int = copies
+
+
+class HypergraphOptimizer:
+    """
+    Optimization of main functions of hypergraphs.
+
+    Hyper edges of a main function are optimized before their code is emitted:
+    - pure box whose outputs do not reach any diagram output is removed (`remove_dead_hyper_edges`),
+    - pure box that is applied to the same values as an earlier box with the same function
+      reuses the result of the earlier box,
+    - box that only copies its argument (like the predefined copy box) is not called,
+      its outputs are aliases of the argument.
+
+    Box function is pure if it does not declare globals, does not assign to attributes or items, does not
+    augment its parameters in place (`x += [1]` changes a list argument), calls only its helper functions,
+    PURE_BUILTINS and functions of PURE_MODULES and passes no other functions to the calls (`sorted(x, key=print)`).
+    Boxes with side effects are never removed.
+    Exceptions are not side effects, a removed box does not raise the exception (e.g. ZeroDivisionError)
+    it would raise in code without optimization, so optimization is opt-in (CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS).
+    """
+    max_size: int = 1024
+    analyses: OrderedDict[BoxFunction, BoxFunctionAnalysis] = OrderedDict()
+
+    @classmethod
+    def analyze(cls, box_function: BoxFunction) -> BoxFunctionAnalysis:
+        """Return analysis of the box function, every box function is analyzed only once."""
+        analysis = cls.analyses.get(box_function)
+        if analysis is None:
+            analysis = BoxFunctionAnalysis(cls._is_pure(box_function), cls._get_copies(box_function))
+            cls.analyses[box_function] = analysis
+            if len(cls.analyses) > cls.max_size:
+                cls.analyses.popitem(last=False)
+        else:
+            cls.analyses.move_to_end(box_function)
+        return analysis
+
+    @classmethod
+    def clear_cache(cls):
+        cls.analyses.clear()
+
+    @classmethod
+    def remove_dead_hyper_edges(cls,
+                                hyper_edges: deque[HyperEdge],
+                                outputs: list[Node],
+                                resolver: NodeGroupResolver) -> deque[HyperEdge]:
+        """
+        Return hyper edges without pure hyper edges whose outputs do not reach any of the diagram outputs.
+
+        Hyper edges must be in the order of the main function (every hyper edge after the hyper edges
+        that give its inputs), they are checked in reverse order starting from node groups of the outputs.
+        Node group hashes are resolved in the same way as variables of the main function are looked up.
+        """
+        live_groups: set[int] = {resolver.get_output_actual_node_group_hash(output) for output in outputs}
+        live_hyper_edges: list[HyperEdge] = []
+        for hyper_edge in reversed(hyper_edges):
+            if (cls.analyze(hyper_edge.get_box_function()).is_pure
+                    and not any(resolver.get_input_actual_node_group_hash(target) in live_groups
+                                for target in hyper_edge.get_target_nodes())):
+                continue
+            live_hyper_edges.append(hyper_edge)
+            for source_node in hyper_edge.get_source_nodes():
+                live_groups.add(resolver.get_output_actual_node_group_hash(source_node))
+                live_groups.add(resolver.get_input_actual_node_group_hash(source_node))
+        live_hyper_edges.reverse()
+        return deque(live_hyper_edges)
+
+    @classmethod
+    def _is_pure(cls, box_function: BoxFunction) -> bool:
+        try:
+            trees = [ast.parse(code) for code in box_function.helper_functions + [box_function.main_function]]
+        except SyntaxError:
+            return False
+        local_functions = {node.name for tree in trees for node in tree.body if isinstance(node, ast.FunctionDef)}
+        parameters = {argument.arg for tree in trees for node in ast.walk(tree) if isinstance(node, ast.arguments)
+                      for argument in node.posonlyargs + node.args + node.kwonlyargs + [node.vararg, node.kwarg]
+                      if argument is not None}
+        # names that hold values of the box function itself, other loaded names are globals and builtins
+        local_names = parameters | {node.id for tree in trees for node in ast.walk(tree)
+                                    if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load)}
+
+        for tree in trees:
+            for node in ast.walk(tree):
+                if isinstance(node, (ast.Global, ast.Nonlocal, ast.Yield, ast.YieldFrom, ast.Await, ast.Delete)):
+                    return False
+                if isinstance(node, (ast.Attribute, ast.Subscript)) and not isinstance(node.ctx, ast.Load):
+                    return False
+                if (isinstance(node, ast.AugAssign) and isinstance(node.target, ast.Name)
+                        and node.target.id in parameters):
+                    return False
+                if isinstance(node, ast.Call) and not cls._is_pure_call(node, local_functions, local_names):
+                    return False
+        return True
+
+    @classmethod
+    def _is_pure_call(cls, node: ast.Call, local_functions: set[str], local_names: set[str]) -> bool:
+        if not cls._is_pure_function(node.func, local_functions):
+            return False
+        for argument in node.args + [keyword.value for keyword in node.keywords]:
+            if isinstance(argument, ast.Starred):
+                argument = argument.value
+            if isinstance(argument, ast.Name) and argument.id not in local_names \
+                    and not cls._is_pure_function(argument, local_functions):
+                return False
+            if isinstance(argument, ast.Attribute) and not cls._is_pure_function(argument, local_functions):
+                return False
+        return True
+
+    @staticmethod
+    def _is_pure_function(function: ast.expr, local_functions: set[str]) -> bool:
+        if isinstance(function, ast.Name):
+            return function.id in local_functions or function.id in PURE_BUILTINS
+        return (isinstance(function, ast.Attribute) and isinstance(function.value, ast.Name)
+                and function.value.id in PURE_MODULES)
+
+    @staticmethod
+    def _get_copies(box_function: BoxFunction) -> int:
+        try:
+            function = ast.parse(box_function.main_function).body[0]
+        except (SyntaxError, IndexError):
+            return 0
+        if (not isinstance(function, ast.FunctionDef) or len(function.args.args) != 1 or function.args.vararg
+                or function.args.kwonlyargs or function.args.kwarg or len(function.body) != 1
+                or not isinstance(function.body[0], ast.Return)
+                or not isinstance(function.body[0].value, (ast.Tuple, ast.List))):
+            return 0
+        argument = function.args.args[0].arg
+        items = function.body[0].value.elts
+        if all(isinstance(item, ast.Name) and item.id == argument for item in items):
+            return len(items)
+        return 0
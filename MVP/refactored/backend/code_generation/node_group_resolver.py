@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+
+if TYPE_CHECKING:
+    from MVP.refactored.backend.diagram import Diagram
+    from MVP.refactored.backend.diagram_callback import Receiver
+    from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+    from MVP.refactored.backend.hypergraph.node import Node
+
+
+class NodeGroupResolver:
+    """
+    Resolves node groups that are connected to compound boxes to the innermost node groups.
+
+    Value that goes into a compound box is used by the node group that is connected to the matching
+    input inside the sub diagram (and so on, if that node group is connected to one more compound box).
+    Resolver is created once per code generation. Connection lookups of every sub diagram
+    and resolved hashes of every node group are stored in tables, so each lookup is done only once.
+    """
+
+    def __init__(self, receiver: Receiver):
+        self.receiver: Receiver = receiver
+        # {(compound hyper edge id, port index, is input): node inside of the sub diagram}
+        self.port_nodes: dict[tuple[int, int, bool], Node] = {}
+        self.resolved_hyper_edges: set[int] = set()  # compound hyper edges whose ports are in the table
+        # {node group hash: innermost node group hash}
+        self.input_hashes: dict[int, int] = {}
+        self.output_hashes: dict[int, int] = {}
+
+    def get_input_actual_node_group_hash(self, node: Node) -> int:
+        """
+        Retrieve the actual node group hash for a given input node.
+
+        If the node is a source of a compound hyper edge, the node that is connected to the matching input
+        of the sub diagram is resolved instead. Otherwise, node's own group hash is returned.
+        """
+        group_hash = node.node_group_hash()
+        if group_hash not in self.input_hashes:
+            self.input_hashes[group_hash] = self._resolve(node, is_input=True)
+        return self.input_hashes[group_hash]
+
+    def get_output_actual_node_group_hash(self, node: Node) -> int:
+        """
+        Retrieve the actual node group hash for a given output node.
+
+        If the node is a target of a compound hyper edge, the node that is connected to the matching output
+        of the sub diagram is resolved instead. Otherwise, node's own group hash is returned.
+        """
+        group_hash = node.node_group_hash()
+        if group_hash not in self.output_hashes:
+            self.output_hashes[group_hash] = self._resolve(node, is_input=False)
+        return self.output_hashes[group_hash]
+
+    def _resolve(self, node: Node, is_input: bool) -> int:
+        group_hash = node.node_group_hash()
+        hyper_edges = node.get_output_hyper_edges() if is_input else node.get_input_hyper_edges()
+        for hyper_edge in hyper_edges:
+            if hyper_edge.is_compound():
+                port_nodes = hyper_edge.source_nodes if is_input else hyper_edge.target_nodes
+                port: int | None = next((k for k, v in port_nodes.items() if v.node_group_hash() == group_hash), None)
+                deeper_node = self._get_port_node(hyper_edge, port, is_input)
+                if deeper_node is None:
+                    raise RuntimeError(f"Can`t find node connected to the port {port} of the box {hyper_edge.id}")
+                if is_input:
+                    return self.get_input_actual_node_group_hash(deeper_node)
+                return self.get_output_actual_node_group_hash(deeper_node)
+        return group_hash
+
+    def _get_port_node(self, hyper_edge: HyperEdge, port: int | None, is_input: bool) -> Node | None:
+        if hyper_edge.id not in self.resolved_hyper_edges:
+            self._add_sub_diagram_ports(hyper_edge)
+        return self.port_nodes.get((hyper_edge.id, port, is_input))
+
+    def _add_sub_diagram_ports(self, hyper_edge: HyperEdge):
+        """Add nodes connected to all inputs and outputs of the compound hyper edge sub diagram to the table."""
+        sub_diagram: Diagram = self.receiver.diagrams[hyper_edge.id]
+        resource_by_connection_id: dict[int, int] = {}
+        for resource in sub_diagram.resources:
+            for connection in resource.left_connection + resource.right_connection:
+                resource_by_connection_id.setdefault(connection.id, resource.id)
+
+        for is_input, connections in ((True, sub_diagram.input), (False, sub_diagram.output)):
+            for connection in connections:
+                key = (hyper_edge.id, connection.index, is_input)
+                if key in self.port_nodes or connection.id not in resource_by_connection_id:
+                    continue
+                self.port_nodes[key] = HypergraphManager.get_node_by_node_id(resource_by_connection_id[connection.id])
+        self.resolved_hyper_edges.add(hyper_edge.id)
@@ -7,6 +7,14 @@ from MVP.refactored.backend.types.connection_info import ConnectionInfo
 
 
 class Diagram:
+    """
+    Backend representation of a canvas.
+
+    Ordered lists are kept for iteration, lookups by id go through dicts that are updated by the add and
+    remove methods. Lookups by input/output index go through the ordered lists, because connection indexes
+    are changed in place when other connections are removed.
+    """
+
     def __init__(self):
         self.input: list[ConnectionInfo] = []
         self.output: list[ConnectionInfo] = []
@@ -16,39 +24,47 @@ class Diagram:
         self.sub_diagrams: list[
             Diagram] = []  # There is sub diagram of diagram. If sub diagram contains one more sub diagram.
         # It won't be added here. Only to sub diagram's sub diagram
+        self.boxes_by_id: dict[int, Generator] = {}
+        self.resources_by_id: dict[int, Resource] = {}
+        self.spiders_by_id: dict[int, Resource] = {}
+        self.inputs_by_id: dict[int, ConnectionInfo] = {}
+        self.outputs_by_id: dict[int, ConnectionInfo] = {}
 
     def get_generator_by_id(self, box_id: int) -> Generator:
-        return next((b for b in self.boxes if b.id == box_id), None)
+        return self.boxes_by_id.get(box_id)
 
     def get_resource_by_id(self, resource_id: int) -> Resource:
-        return next((r for r in self.resources if r.id == resource_id), None)
+        return self.resources_by_id.get(resource_id)
 
     def get_spider_by_id(self, spider_id: int) -> Resource | None:
-        return next((s for s in self.spiders if s.id == spider_id), None)
+        return self.spiders_by_id.get(spider_id)
 
     def get_input_by_id(self, input_id):
-        return next((i for i in self.input if i.id == input_id), None)
+        return self.inputs_by_id.get(input_id)
 
     def get_input_by_index(self, index):
         return next((i for i in self.input if i.index == index), None)
 
     def get_output_by_id(self, output_id):
-        return next((o for o in self.output if o.id == output_id), None)
+        return self.outputs_by_id.get(output_id)
 
     def get_output_by_index(self, index):
         return next((o for o in self.output if o.index == index), None)
 
     def add_resource(self, resource: Resource):
-        if resource not in self.resources:
+        if resource.id not in self.resources_by_id:
             self.resources.append(resource)
+            self.resources_by_id[resource.id] = resource
 
     def add_box(self, box: Generator):
-        if box not in self.boxes:
+        if box.id not in self.boxes_by_id:
             self.boxes.append(box)
+            self.boxes_by_id[box.id] = box
 
     def add_spider(self, spider: Resource):
-        if spider not in self.spiders:
+        if spider.id not in self.spiders_by_id:
             self.spiders.append(spider)
+            self.spiders_by_id[spider.id] = spider
 
     def add_resources(self, resources: list[Resource]):
         for resource in resources:
@@ -64,59 +80,62 @@ class Diagram:
 
     def add_input(self, connection_info: ConnectionInfo):
         self.input.insert(connection_info.index, connection_info)
+        self.inputs_by_id[connection_info.id] = connection_info
 
     def add_output(self, connection_info: ConnectionInfo):
         self.output.insert(connection_info.index, connection_info)
+        self.outputs_by_id[connection_info.id] = connection_info
 
     def add_sub_diagram(self, diagram: Self):
         if diagram not in self.sub_diagrams:
             self.sub_diagrams.append(diagram)
 
+    def set_box_id(self, box_id: int, new_id: int):
+        box = self.boxes_by_id.pop(box_id, None)
+        if box is not None:
+            box.set_id(new_id)
+            self.boxes_by_id[new_id] = box
+
     def remove_input(self, connection_id: int):
-        for i in self.input:
-            if i.id == connection_id:
-                self.input.remove(i)
-                return
+        connection = self.inputs_by_id.pop(connection_id, None)
+        if connection is not None:
+            self.input.remove(connection)
 
     def remove_output(self, connection_id: int):
-        for i in self.output:
-            if i.id == connection_id:
-                self.output.remove(i)
-                return
+        connection = self.outputs_by_id.pop(connection_id, None)
+        if connection is not None:
+            self.output.remove(connection)
 
     def remove_box_by_id(self, box_id: int):
-        for box in self.boxes:
-            if box.id == box_id:
-                self.boxes.remove(box)
-                return
+        box = self.boxes_by_id.pop(box_id, None)
+        if box is not None:
+            self.boxes.remove(box)
 
     def remove_resource_by_id(self, resource_id: int):
-        for resource in self.resources:
-            if resource.id == resource_id:
-                self.resources.remove(resource)
-                if not resource.spider:  # if it is wire, we need to remove connections from spiders, because spider connections live as long as they connected to smt
-                    for connection in resource.get_spider_connections():
-                        spider = self.get_spider_by_id(connection.id)
-                        spider.remove_spider_connection_by_index(connection.index)
-                return
+        resource = self.resources_by_id.pop(resource_id, None)
+        if resource is None:
+            return
+        self.resources.remove(resource)
+        if not resource.spider:  # if it is wire, we need to remove connections from spiders, because spider connections live as long as they connected to smt
+            for connection in resource.get_spider_connections():
+                spider = self.get_spider_by_id(connection.id)
+                spider.remove_spider_connection_by_index(connection.index)
 
     def remove_spider_by_id(self, spider_id: int):
-        for spider in self.spiders:
-            if spider.id == spider_id:
-                self.spiders.remove(spider)
-                return
+        spider = self.spiders_by_id.pop(spider_id, None)
+        if spider is not None:
+            self.spiders.remove(spider)
 
     def remove_box(self, box: Generator):
-        if box in self.boxes:
-            self.boxes.remove(box)
+        if box.id in self.boxes_by_id:
+            self.remove_box_by_id(box.id)
 
     def remove_resource(self, resource: Resource):
-        if resource in self.resources:
-            self.resources.remove(resource)
+        if resource.id in self.resources_by_id:
+            self.resources.remove(self.resources_by_id.pop(resource.id))
 
     def remove_spider(self, spider: Resource):
-        if spider in self.spiders:
-            self.resources.remove(spider)
+        self.remove_spider_by_id(spider.id)
 
     def remove_boxes(self, boxes: list[Generator]):
         for box in boxes:
@@ -149,7 +168,13 @@ class Diagram:
         }
 
     def _from_dict(self, data):
-        self.input = data.get("input", [])
-        self.output = data.get("output", [])
+        self.input = [ConnectionInfo.from_data(c) for c in data.get("input", [])]
+        self.output = [ConnectionInfo.from_data(c) for c in data.get("output", [])]
         self.boxes = [Generator.from_dict(box_data) for box_data in data.get("boxes", [])]
         self.resources = [Resource.from_dict(resource_data) for resource_data in data.get("resources", [])]
+        self.spiders = [resource for resource in self.resources if resource.spider]
+        self.boxes_by_id = {box.id: box for box in self.boxes}
+        self.resources_by_id = {resource.id: resource for resource in self.resources}
+        self.spiders_by_id = {spider.id: spider for spider in self.spiders}
+        self.inputs_by_id = {connection.id: connection for connection in self.input}
+        self.outputs_by_id = {connection.id: connection for connection in self.output}
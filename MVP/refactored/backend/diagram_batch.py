@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from MVP.refactored.backend.types.ActionType import ActionType
+
+if TYPE_CHECKING:
+    from MVP.refactored.backend.box_functions.box_function import BoxFunction
+    from MVP.refactored.backend.types.connection_info import ConnectionInfo
+
+
+class DiagramBatch:
+    """
+    Boxes, spiders, diagram inputs/outputs and wires that are added to the Receiver with one `build_diagram` call.
+
+    Resources are built in the order they are added to the batch, the same order in which
+    receiver callbacks would be sent for them. Resources of sub diagrams are added with the canvas id
+    of the sub diagram.
+    """
+
+    def __init__(self):
+        # (action, canvas id, arguments)
+        self.records: list[tuple[ActionType, int, tuple]] = []
+
+    def add_box(self,
+                canvas_id: int,
+                box_id: int,
+                left_connection_ids: list[int],
+                right_connection_ids: list[int],
+                box_function: BoxFunction | None = None,
+                sub_diagram_id: int = -1,
+                operand: str | None = None):
+        """Add box with connections in index order. Sub diagram id is -1 if the box is atomic."""
+        self.records.append((ActionType.BOX_CREATE, canvas_id,
+                             (box_id, left_connection_ids, right_connection_ids, box_function, sub_diagram_id,
+                              operand)))
+
+    def add_spider(self, canvas_id: int, spider_id: int):
+        self.records.append((ActionType.SPIDER_CREATE, canvas_id, (spider_id,)))
+
+    def add_input(self, canvas_id: int, connection_id: int, index: int):
+        self.records.append((ActionType.DIAGRAM_ADD_INPUT, canvas_id, (connection_id, index)))
+
+    def add_output(self, canvas_id: int, connection_id: int, index: int):
+        self.records.append((ActionType.DIAGRAM_ADD_OUTPUT, canvas_id, (connection_id, index)))
+
+    def add_wire(self, canvas_id: int, wire_id: int, start_connection: ConnectionInfo, end_connection: ConnectionInfo):
+        self.records.append((ActionType.WIRE_CREATE, canvas_id, (wire_id, start_connection, end_connection)))
+
+    def __len__(self):
+        return len(self.records)
@@ -1,18 +1,17 @@
-import logging
-
 from MVP.refactored.backend.box_functions.box_function import BoxFunction
 from MVP.refactored.backend.types.ActionType import ActionType
 from MVP.refactored.backend.types.GeneratorType import GeneratorType
 from MVP.refactored.backend.types.connection_info import ConnectionInfo
 from MVP.refactored.backend.types.connection_side import ConnectionSide
 from MVP.refactored.backend.diagram import Diagram
+from MVP.refactored.backend.diagram_batch import DiagramBatch
 from MVP.refactored.backend.generator import Generator
 from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
 from MVP.refactored.backend.hypergraph.node import Node
 from MVP.refactored.backend.resource import Resource
+from MVP.refactored.backend.tracing import Tracer, Tracing
 
-logging.basicConfig(level=logging.INFO, format='%(asc_time)s - %(level_name)s - %(message)s')
-logger = logging.getLogger(__name__)
+tracer = Tracer(__name__)
 
 
 class Receiver:
@@ -20,13 +19,23 @@ class Receiver:
         self.listener = True
         # self.diagram = Diagram()
         self.diagrams: dict[int, Diagram] = {}  # key is canvas_id where diagram located
-        logger.info("Receiver initialized.")
+        tracer.info("Receiver initialized.")
 
     def add_new_canvas(self, canvas_id: int):
         self.diagrams[canvas_id] = Diagram()
         return self.diagrams[canvas_id]
 
     def receiver_callback(self, action: ActionType, **kwargs):
+        """Apply frontend change to the diagrams and hypergraphs, recorded trace events are dumped if it fails."""
+        tracer.debug("receiver_callback invoked with action: %s, kwargs: %s", action, kwargs)
+        try:
+            self.handle_callback(action, **kwargs)
+        except Exception:
+            tracer.warning("receiver_callback failed with action: %s, kwargs: %s", action, kwargs)
+            Tracing.dump_recording()
+            raise
+
+    def handle_callback(self, action: ActionType, **kwargs):
         resource_id = kwargs.get('resource_id')
         start_connection: ConnectionInfo | None = kwargs.get('start_connection')
         end_connection: ConnectionInfo | None = kwargs.get('end_connection')
@@ -43,7 +52,6 @@ class Receiver:
         generator_ids: list[int] = kwargs.get('generator_ids')
         box_function: BoxFunction = kwargs.get('box_function')
 
-        logger.info(f"receiver_callback invoked with action: {action}, kwargs: {kwargs}")
         if action == ActionType.WIRE_CREATE:
             new_node = HypergraphManager.create_new_node(resource_id, canvas_id)
 
@@ -117,6 +125,7 @@ class Receiver:
             hyper_edge = HypergraphManager.get_hyper_edge_by_id(generator_id)
             if hyper_edge:
                 hyper_edge.set_sub_diagram_canvas_id(new_canvas_id)
+                HypergraphManager.mark_hyper_edge_changed(generator_id)
         elif action == ActionType.BOX_ATOMIC:
             box = self.get_generator_by_id(generator_id, canvas_id)
             box.set_type(GeneratorType.ATOMIC)
@@ -125,6 +134,7 @@ class Receiver:
             hyper_edge = HypergraphManager.get_hyper_edge_by_id(generator_id)
             if hyper_edge:
                 hyper_edge.set_sub_diagram_canvas_id(-1)
+                HypergraphManager.mark_hyper_edge_changed(generator_id)
         elif action == ActionType.BOX_SUB_BOX:
             pass
         elif action == ActionType.BOX_ADD_OPERATOR:
@@ -137,11 +147,12 @@ class Receiver:
             hyper_edge = HypergraphManager.get_hyper_edge_by_id(generator_id)
             if hyper_edge:
                 hyper_edge.set_box_function(box_function)
+                HypergraphManager.mark_hyper_edge_changed(generator_id)
         elif action == ActionType.BOX_SWAP_ID:
-            box = self.get_generator_by_id(generator_id, canvas_id)
-            box.set_id(new_id)
+            self.diagrams[canvas_id].set_box_id(generator_id, new_id)
 
             HypergraphManager.swap_hyper_edge_id(generator_id, new_id)
+            HypergraphManager.mark_hyper_edge_changed(new_id)
         elif action == ActionType.BOX_SWAP_CONNECTION_ID:
             pass  # In the original diagram callback that events are not in use. In project there are no occurrences for this event
         elif action == ActionType.DIAGRAM_ADD_INPUT:
@@ -186,16 +197,17 @@ class Receiver:
 
     def add_connections_to_resource(self, resource: Resource, connections: list[ConnectionInfo | None], canvas_id: int,
                                     node: Node | None = None):
+        diagram = self.diagrams[canvas_id]
         for connection in connections:
             if connection is None:
                 continue
 
             if connection.side == ConnectionSide.LEFT:
                 if connection.has_box():
-                    box = self.get_generator_by_id(connection.get_box_id(), canvas_id)
+                    box = diagram.get_generator_by_id(connection.get_box_id())
                     if box is None:
                         # TODO it is sub diagram output, that connection from frontend have box = sub diagram box
-                        output = self.get_output_by_id(connection.get_id(), canvas_id)
+                        output = diagram.get_output_by_id(connection.get_id())
                         resource.add_left_connection(output)
 
                         HypergraphManager.union_nodes(node, output.get_id())
@@ -208,16 +220,16 @@ class Receiver:
                     hyper_edge.set_box_function(box.get_box_function())
                     hyper_edge.set_sub_diagram_canvas_id(box.get_sub_diagram_id())
                 else:  # it is output
-                    output = self.get_output_by_id(connection.get_id(), canvas_id)
+                    output = diagram.get_output_by_id(connection.get_id())
                     resource.add_left_connection(output)
 
                     HypergraphManager.union_nodes(node, output.get_id())
             elif connection.side == ConnectionSide.RIGHT:
                 if connection.has_box():
-                    box = self.get_generator_by_id(connection.get_box_id(), canvas_id)
+                    box = diagram.get_generator_by_id(connection.get_box_id())
                     if box is None:
                         # TODO it is sub diagram input, that connection from frontend have box = sub diagram box
-                        diagram_input = self.get_input_by_id(connection.get_id(), canvas_id)
+                        diagram_input = diagram.get_input_by_id(connection.get_id())
                         resource.add_right_connection(diagram_input)
 
                         HypergraphManager.union_nodes(node, diagram_input.get_id())
@@ -228,12 +240,12 @@ class Receiver:
                     hyper_edge.set_box_function(box.get_box_function())
                     hyper_edge.set_sub_diagram_canvas_id(box.get_sub_diagram_id())
                 else:  # it is input
-                    diagram_input = self.get_input_by_id(connection.get_id(), canvas_id)
+                    diagram_input = diagram.get_input_by_id(connection.get_id())
                     resource.add_right_connection(diagram_input)
 
                     HypergraphManager.union_nodes(node, diagram_input.get_id())
             elif connection.side == ConnectionSide.SPIDER:
-                spider = self.get_spider_by_id(connection.get_id(), canvas_id)
+                spider = diagram.get_spider_by_id(connection.get_id())
                 connection.index = len(
                     spider.get_spider_connections())  # we use here that rule, that when we add wire to spider
                 connection.set_related_object(spider)
@@ -243,6 +255,50 @@ class Receiver:
 
                 HypergraphManager.union_nodes(node, spider.id)
 
+    def build_diagram(self, batch: DiagramBatch):
+        """
+        Build diagrams and hypergraphs of all resources in the batch in one pass.
+
+        The result is the same as if receiver callbacks were sent for every box, spider, diagram input/output
+        and wire of the batch, but nothing is logged per resource.
+        """
+        for action, canvas_id, arguments in batch.records:
+            diagram = self.diagrams[canvas_id] if canvas_id in self.diagrams else self.add_new_canvas(canvas_id)
+
+            if action == ActionType.BOX_CREATE:
+                box_id, left_connection_ids, right_connection_ids, box_function, sub_diagram_id, operand = arguments
+                box = Generator(box_id)
+                for i, connection_id in enumerate(left_connection_ids):
+                    box.add_left(ConnectionInfo(i, ConnectionSide.LEFT, connection_id, related_object=box))
+                for i, connection_id in enumerate(right_connection_ids):
+                    box.add_right(ConnectionInfo(i, ConnectionSide.RIGHT, connection_id, related_object=box))
+                box.set_box_function(box_function)
+                if operand:
+                    box.add_operand(operand)
+                if sub_diagram_id != -1:
+                    box.set_type(GeneratorType.COMPOUND)
+                    box.set_sub_diagram_id(sub_diagram_id)
+                diagram.add_box(box)
+            elif action == ActionType.SPIDER_CREATE:
+                spider_id, = arguments
+                HypergraphManager.create_new_node(spider_id, canvas_id)
+                spider = Resource(spider_id)
+                spider.spider = True
+                diagram.add_spider(spider)
+            elif action in (ActionType.DIAGRAM_ADD_INPUT, ActionType.DIAGRAM_ADD_OUTPUT):
+                connection_id, connection_nr = arguments
+                if action == ActionType.DIAGRAM_ADD_INPUT:
+                    diagram.add_input(ConnectionInfo(connection_nr, ConnectionSide.RIGHT, connection_id))
+                else:
+                    diagram.add_output(ConnectionInfo(connection_nr, ConnectionSide.LEFT, connection_id))
+                HypergraphManager.create_new_node(connection_id, canvas_id)
+            elif action == ActionType.WIRE_CREATE:
+                wire_id, start_connection, end_connection = arguments
+                new_node = HypergraphManager.create_new_node(wire_id, canvas_id)
+                wire = self.create_new_resource(wire_id, canvas_id)
+                self.add_connections_to_resource(wire, [start_connection, end_connection], canvas_id, node=new_node)
+        tracer.info("Diagram built from batch of %s resources.", len(batch))
+
     def create_new_generator(self, box_id: int, canvas_id: int) -> Generator:
         box = Generator(box_id)
         self.diagrams[canvas_id].add_box(box)
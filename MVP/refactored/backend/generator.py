@@ -11,13 +11,20 @@ if TYPE_CHECKING:
 
 
 class Generator:
-    """Backend representation of frontend box."""
+    """
+    Backend representation of frontend box.
+
+    Left and right connections are kept in index order, lookups by id go through dicts that are
+    updated by the add and remove methods.
+    """
 
     def __init__(self, generator_id):
         self.id = generator_id
         self.type: GeneratorType = GeneratorType.ATOMIC  # 0-atomic 1-compound None-undefined
         self.left: list[ConnectionInfo] = []
         self.right: list[ConnectionInfo] = []
+        self.left_by_id: dict[int, ConnectionInfo] = {}
+        self.right_by_id: dict[int, ConnectionInfo] = {}
         self.left_inner: list[ConnectionInfo] = []
         self.right_inner: list[ConnectionInfo] = []
         self.sub_diagram_id: int = -1  # -1 if does`t have
@@ -35,14 +42,10 @@ class Generator:
         self.sub_diagram_id = sub_diagram_id
 
     def get_left_by_id(self, left_id: int):
-        for left in self.left:
-            if left.id == left_id:
-                return left
+        return self.left_by_id.get(left_id)
 
     def get_right_by_id(self, right_id: int):
-        for right in self.right:
-            if right.id == right_id:
-                return right
+        return self.right_by_id.get(right_id)
 
     def get_left(self) -> list[ConnectionInfo]:
         return self.left
@@ -52,17 +55,27 @@ class Generator:
 
     def add_left(self, left: ConnectionInfo):
         if left.side != ConnectionSide.SPIDER:  # because connection info with spider will always have the same id
-            if left not in self.left:
+            if left.id not in self.left_by_id:
                 self.left.insert(left.index, left)
         else:
             self.left.insert(left.index, left)
+        self.left_by_id.setdefault(left.id, left)
 
     def add_right(self, right: ConnectionInfo):
         if right.side != ConnectionSide.SPIDER:  # because connection info with spider will always have the same id
-            if right not in self.right:
+            if right.id not in self.right_by_id:
                 self.right.insert(right.index, right)
         else:
             self.right.insert(right.index, right)
+        self.right_by_id.setdefault(right.id, right)
+
+    @staticmethod
+    def index_connections(connections: list[ConnectionInfo]) -> dict[int, ConnectionInfo]:
+        """Return connections by id, the first connection in the list is kept for the same id."""
+        connections_by_id = {}
+        for connection in connections:
+            connections_by_id.setdefault(connection.id, connection)
+        return connections_by_id
 
     def add_left_inner(self, left: ConnectionInfo):
         self.left_inner.insert(left.index, left)
@@ -95,11 +108,13 @@ class Generator:
         for left in self.left:
             left.set_box_id(None)
         self.left.clear()
+        self.left_by_id.clear()
 
     def remove_all_right(self):
         for right in self.right:
             right.set_box_id(None)
         self.right.clear()
+        self.right_by_id.clear()
 
     def remove_left(self, connection_id: int = None):
         # self.left.pop(connection_id)
@@ -116,6 +131,7 @@ class Generator:
                 connection.index -= 1
         if to_be_removed is not None:
             self.left.remove(to_be_removed)
+            self.left_by_id = self.index_connections(self.left)
 
     def remove_right(self, connection_id: int = None):
         # self.right.pop(connection_id)
@@ -132,6 +148,7 @@ class Generator:
                 connection.index -= 1
         if to_be_removed is not None:
             self.right.remove(to_be_removed)
+            self.right_by_id = self.index_connections(self.right)
 
     def remove_left_inner(self, connection_id: int = None):
         # self.left_inner.pop(connection_id)
@@ -167,11 +184,13 @@ class Generator:
 
     def remove_left_atomic(self, connection_id: int):
         self.left.pop(connection_id)
+        self.left_by_id = self.index_connections(self.left)
         for i, resource in enumerate(self.left):
             resource.index = i
 
     def remove_right_atomic(self, connection_id: int):
         self.right.pop(connection_id)
+        self.right_by_id = self.index_connections(self.right)
         for i, resource in enumerate(self.left):
             resource.index = i
 
@@ -188,12 +207,16 @@ class Generator:
 
     @classmethod
     def from_dict(cls, data):
+        from MVP.refactored.backend.types.connection_info import ConnectionInfo
+
         box = cls(data["id"])
         box.type = data.get("type")
-        box.left = data.get("left", [])
-        box.right = data.get("right", [])
-        box.left_inner = data.get("left_inner", [])
-        box.right_inner = data.get("right_inner", [])
+        box.left = [ConnectionInfo.from_data(c) for c in data.get("left", [])]
+        box.right = [ConnectionInfo.from_data(c) for c in data.get("right", [])]
+        box.left_by_id = cls.index_connections(box.left)
+        box.right_by_id = cls.index_connections(box.right)
+        box.left_inner = [ConnectionInfo.from_data(c) for c in data.get("left_inner", [])]
+        box.right_inner = [ConnectionInfo.from_data(c) for c in data.get("right_inner", [])]
         box.operand = data.get("operand")
         return box
 
@@ -26,8 +26,8 @@ class HyperEdge:
 
     def get_hypergraphs_inside(self) -> list[Hypergraph]:
         # why dynamically get hypergraphs?
-        # Because in sub diagram hypergraphs can be modified, deleted, added and that handling is tricky,
-        # so it is easier to do that in this way.
+        # Because in sub diagram hypergraphs can be modified, deleted, added, HypergraphManager keeps
+        # its component index up to date, so this lookup is cheap.
         from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
 
         if self.sub_diagram_canvas_id == -1:
@@ -1,20 +1,18 @@
 from __future__ import annotations
 
-import logging
-from queue import Queue
+import heapq
 from typing import TYPE_CHECKING
 
+from MVP.refactored.backend.hypergraph import traversal
 from MVP.refactored.backend.id_generator import IdGenerator
+from MVP.refactored.backend.tracing import Tracer
 
 if TYPE_CHECKING:
     from MVP.refactored.backend.hypergraph.node import Node
 
 from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s', )
-logger = logging.getLogger(__name__)
-message_start = "\x1b[33;20m"
-message_end = "\x1b[0m"
+tracer = Tracer(__name__)
 
 
 class Hypergraph:
@@ -28,8 +26,10 @@ class Hypergraph:
         self.hypergraph_source: dict[int, Node] = {}
         self.nodes: dict[int, Node] = {}
         self.edges: dict[int, HyperEdge] = {}
+        self._hyper_edge_order: list[HyperEdge] | None = None  # cached topological order of hyper edges
+        self.version = 0  # incremented on every change, code generated from the hypergraph is cached by it
 
-        logger.debug(message_start + f"Creating hypergraph with id {self.id}" + message_end)
+        tracer.debug("Creating hypergraph with id %s", self.id)
 
     def get_node_by_id(self, node_id: int) -> Node | None:
         return self.nodes.get(node_id)
@@ -53,25 +53,12 @@ class Hypergraph:
         return list(self.hypergraph_source.keys())
 
     def get_hypergraph_target(self) -> list[Node]:
-        queue = Queue()
         target_nodes: dict[int, Node] = dict()
-        visited: set[Node] = set()
-        for node in self.get_hypergraph_source():
-            queue.put(node)
-
-        while not queue.empty():
-            node = queue.get()
-            visited.add(node)
-            output_hyper_edges: list[HyperEdge] = node.get_output_hyper_edges()
-            if len(output_hyper_edges) == 0:
+        for node in traversal.bfs(self.get_hypergraph_source(), traversal.get_output_nodes):
+            if len(node.get_output_hyper_edges()) == 0:
                 target_nodes[node.id] = node
                 for united_with in node.get_united_with_nodes():
                     target_nodes[united_with.id] = united_with
-
-            for output_hyper_edge in output_hyper_edges:
-                for target_node in output_hyper_edge.get_target_nodes():
-                    if target_node not in visited:
-                        queue.put(target_node)
         return list(target_nodes.values())
 
     def get_canvas_id(self) -> int:
@@ -101,6 +88,7 @@ class Hypergraph:
 
     def add_edge(self, edge: HyperEdge):
         self.edges[edge.id] = edge
+        self.invalidate_hyper_edge_order()
 
     def add_edges(self, edges: list[HyperEdge]):
         for edge in edges:
@@ -113,6 +101,7 @@ class Hypergraph:
     #     return list(self.hypergraph_source.values())
 
     def remove_node(self, node_to_remove_id: int):
+        self.invalidate_hyper_edge_order()
         removed_node = self.nodes.pop(node_to_remove_id)
         removed_node_united_with_nodes = removed_node.get_united_with_nodes()
         removed_node.remove_self()
@@ -129,6 +118,7 @@ class Hypergraph:
                     break
 
     def remove_hyper_edge(self, edge_to_remove_id: int) -> HyperEdge:
+        self.invalidate_hyper_edge_order()
         self.edges[edge_to_remove_id].remove_self()
         return self.edges.pop(edge_to_remove_id)
 
@@ -159,27 +149,90 @@ class Hypergraph:
         for node in nodes:
             self.add_hypergraph_source(node)
 
+    def get_hyper_edges_in_topological_order(self) -> list[HyperEdge]:
+        """
+        Return hyper edges in the order they can be executed.
+
+        Hyper edge can be executed when all of its source node groups have values. Node group has a value when
+        it contains a hypergraph source node or when one of the hyper edges that outputs to it has been executed.
+        Hyper edges are taken in passes over the hypergraph edges, the same hyper edge order is kept as when
+        all edges are checked again and again until nothing changes, but dependencies are counted only once
+        (Kahn's algorithm), heap is ordered by (pass, position of hyper edge).
+
+        Order is cached until the hypergraph structure changes (see invalidate_hyper_edge_order).
+
+        :raises ValueError: if hyper edges form a cycle, so some of them can not be executed.
+        """
+        if self._hyper_edge_order is not None:
+            return list(self._hyper_edge_order)
+
+        hyper_edges: list[HyperEdge] = self.get_all_hyper_edges()
+        ready_groups: set[int] = {node.node_group_hash() for node in self.get_hypergraph_source()}
+        waiting_hyper_edges: dict[int, list[int]] = {}  # {node group hash: positions of hyper edges waiting for it}
+        missing_inputs_count: list[int] = []
+        heap: list[tuple[int, int]] = []  # (pass, position of hyper edge)
+
+        for position, hyper_edge in enumerate(hyper_edges):
+            missing_groups = {node.node_group_hash() for node in hyper_edge.get_source_nodes()} - ready_groups
+            missing_inputs_count.append(len(missing_groups))
+            for group_hash in missing_groups:
+                waiting_hyper_edges.setdefault(group_hash, []).append(position)
+            if not missing_groups:
+                heap.append((0, position))
+        heapq.heapify(heap)
+
+        order: list[HyperEdge] = []
+        while heap:
+            current_pass, position = heapq.heappop(heap)
+            hyper_edge = hyper_edges[position]
+            order.append(hyper_edge)
+            for target_node in hyper_edge.get_target_nodes():
+                group_hash = target_node.node_group_hash()
+                if group_hash in ready_groups:
+                    continue
+                ready_groups.add(group_hash)
+                for waiting_position in waiting_hyper_edges.pop(group_hash, []):
+                    missing_inputs_count[waiting_position] -= 1
+                    if missing_inputs_count[waiting_position] == 0:
+                        # edges after the current one are reached in the same pass, others in the next pass
+                        next_pass = current_pass if waiting_position > position else current_pass + 1
+                        heapq.heappush(heap, (next_pass, waiting_position))
+
+        if len(order) != len(hyper_edges):
+            ordered = set(order)
+            cycle_ids = ", ".join(str(hyper_edge.id) for hyper_edge in hyper_edges if hyper_edge not in ordered)
+            raise ValueError(f"Diagram contains a cycle, boxes with following ids can not be ordered: {cycle_ids}")
+
+        self._hyper_edge_order = order
+        return list(order)
+
+    def invalidate_hyper_edge_order(self):
+        """Must be called when hyper edges, nodes or connections between them change."""
+        self._hyper_edge_order = None
+        self.version += 1
+
+    def update_hypergraph_source(self):
+        """
+        Recalculate hypergraph source nodes.
+        Node is a source node if it does not have parent nodes.
+        """
+        self.hypergraph_source = {node_id: node for node_id, node in self.nodes.items()
+                                  if len(node.get_parent_nodes()) == 0}
+
     def update_source_nodes_descendants(self):
         """
         Update all hypergraph nodes.
         Must be called when the source node is added.
         """
         self.nodes.clear()
-        queue: Queue[Node] = Queue()
-        visited: set[int] = set()
+        start_nodes: list[Node] = []
         for source_node in self.get_hypergraph_source():
-            queue.put(source_node)
-            for connected_node in source_node.get_children_nodes() + source_node.get_united_with_nodes():
-                queue.put(connected_node)
+            start_nodes.append(source_node)
+            start_nodes.extend(traversal.get_children_and_united_nodes(source_node))
 
-        while not queue.empty():
-            child_node = queue.get()
+        for child_node in traversal.bfs(start_nodes, traversal.get_children_and_united_nodes):
             # self.add_node(child_node) TODO maybe use this? (not good because adds complexity, but exclude some possible errors with hypergraph source)
             self.nodes[child_node.id] = child_node
-            visited.add(child_node.id)
-            for connected_node in child_node.get_children_nodes() + child_node.get_united_with_nodes():
-                if connected_node.id not in visited:
-                    queue.put(connected_node)
 
     def update_edges(self):
         """
@@ -187,23 +240,9 @@ class Hypergraph:
         Must be called when the source node is added.
         """
         self.edges.clear()
-        queue: Queue[Node] = Queue()
-        visited_nodes: set[int] = set()
-        for source_node in self.get_hypergraph_source():
-            hyper_edges: list[HyperEdge] = source_node.get_output_hyper_edges() + source_node.get_input_hyper_edges()
-            for hyper_edge in hyper_edges:
-                self.edges[hyper_edge.id] = hyper_edge  # update hyper edges
-            for connected_node in source_node.get_children_nodes() + source_node.get_united_with_nodes():
-                queue.put(connected_node)  # add next level nodes to queue
-
-        while not queue.empty():
-            node = queue.get()  # current level node
-            visited_nodes.add(node.id)
-            for hyper_edge in node.get_output_hyper_edges() + node.get_input_hyper_edges():
+        for node in traversal.bfs(self.get_hypergraph_source(), traversal.get_children_and_united_nodes):
+            for hyper_edge in traversal.get_hyper_edges(node):
                 self.edges[hyper_edge.id] = hyper_edge  # update hyper edges
-            for connected_node in node.get_children_nodes() + node.get_united_with_nodes():
-                if connected_node.id not in visited_nodes:
-                    queue.put(connected_node)  # add next level nodes to queue
 
     def get_node_groups(self) -> list[list[int]]:
         """
@@ -1,33 +1,40 @@
 from __future__ import annotations
 
 import logging
-from queue import Queue
 from typing import TYPE_CHECKING
 
+from MVP.refactored.backend.hypergraph import traversal
 from MVP.refactored.backend.hypergraph.hypergraph import Hypergraph
 from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
 from MVP.refactored.backend.hypergraph.node import Node
+from MVP.refactored.backend.tracing import Tracer
 
 if TYPE_CHECKING:
     pass
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s', )
-logger = logging.getLogger(__name__)
-
-message_start = "\x1b[33;20m"
-message_end = "\x1b[0m"
-
-def debug(x):
-    logger.debug(message_start + x + message_end)
+tracer = Tracer(__name__)
 
 
 class HypergraphManager:
-    # hypergraphs: set[Hypergraph] = set()
+    hypergraphs: set[Hypergraph] = set()
     nodes: dict[int, Node] = dict()
     edges: dict[int, HyperEdge] = dict()
 
     source_nodes_group: dict[int, set[Node]] = dict()
 
+    # Connected component index. Every node and hyper edge that is connected to some node points to
+    # the hypergraph (component) it belongs to. Index is updated on every structural change, so reading
+    # hypergraphs does not need to walk the whole graph.
+    node_hypergraph: dict[int, Hypergraph] = dict()
+    hyper_edge_hypergraph: dict[int, Hypergraph] = dict()
+    canvas_hypergraphs: dict[int, dict[int, Hypergraph]] = dict()  # {canvas_id: {hypergraph_id: hypergraph}}
+    hypergraphs_by_id: dict[int, Hypergraph] = dict()
+    # Hypergraphs are returned in the order of their first created node
+    node_creation_order: dict[int, int] = dict()
+    hypergraph_order: dict[int, int] = dict()
+    # Hypergraphs whose source nodes must be recalculated before reading
+    changed_hypergraphs: set[Hypergraph] = set()
+
     @staticmethod
     def remove_node(node_id: int):
         """
@@ -37,17 +44,24 @@ class HypergraphManager:
         This function performs the following steps:
         1. Removes the specified node from its hypergraph.
         2. Checks if removing the node causes the hypergraph to split into multiple disconnected hypergraphs.
-        3. If the hypergraph splits, removes the original hypergraph and creates new hypergraphs for each disconnected component.
+        3. If the hypergraph splits, keeps the original hypergraph for the first component and creates new
+        hypergraphs for the other disconnected components.
 
         :param node_id: The unique identifier of the node to be removed.
         """
-        logger.debug(message_start + f"Removing node with id {node_id}" + message_end)
+        tracer.debug("Removing node with id %s", node_id)
 
         node = HypergraphManager.get_node_by_node_id(node_id)
         if node:
             node.remove_self()
             HypergraphManager.nodes.pop(node_id)
 
+            hypergraph = HypergraphManager.node_hypergraph.pop(node_id, None)
+            if hypergraph is not None:
+                hypergraph.nodes.pop(node_id, None)
+                hypergraph.hypergraph_source.pop(node_id, None)
+                HypergraphManager._split_hypergraph(hypergraph)
+
     @staticmethod
     def remove_hyper_edge(hyper_edge_id: int):
         """
@@ -57,18 +71,23 @@ class HypergraphManager:
         This function performs the following steps:
         1. Removes the specified hyper edge from its hypergraph.
         2. Checks if removing the hyper edge causes the hypergraph to split into multiple disconnected hypergraphs.
-        3. If the hypergraph splits, removes the original hypergraph and creates new hypergraphs for each disconnected component.
+        3. If the hypergraph splits, keeps the original hypergraph for the first component and creates new
+        hypergraphs for the other disconnected components.
 
         :param hyper_edge_id: The unique identifier of the node to be removed.
         """
-        logger.debug(
-            message_start + f"Removing hyper edge with id {hyper_edge_id}" + message_end)
+        tracer.debug("Removing hyper edge with id %s", hyper_edge_id)
 
         hyper_edge = HypergraphManager.get_hyper_edge_by_id(hyper_edge_id)
         if hyper_edge:
             hyper_edge.remove_self()
             HypergraphManager.edges.pop(hyper_edge_id)
 
+            hypergraph = HypergraphManager.hyper_edge_hypergraph.pop(hyper_edge_id, None)
+            if hypergraph is not None:
+                hypergraph.edges.pop(hyper_edge_id, None)
+                HypergraphManager._split_hypergraph(hypergraph)
+
     @staticmethod
     def swap_hyper_edge_id(prev_id: int, new_id: int):
         """
@@ -77,14 +96,29 @@ class HypergraphManager:
         :param prev_id: The current hyper-edge ID.
         :param new_id: The new hyper-edge ID.
         """
-        logger.debug(message_start + f"Swapping hyper edge id from {prev_id} to {new_id}" + message_end)
+        tracer.debug("Swapping hyper edge id from %s to %s", prev_id, new_id)
+
+        hypergraph = HypergraphManager.get_graph_by_hyper_edge_id(prev_id)
+        if hypergraph is not None:
+            hypergraph.swap_hyper_edge_id(prev_id, new_id)
+            HypergraphManager.hyper_edge_hypergraph.pop(prev_id, None)
+            HypergraphManager.hyper_edge_hypergraph[new_id] = hypergraph
 
-        hyper_edge = HypergraphManager.get_hyper_edge_by_id(prev_id)
+        hyper_edge = HypergraphManager.edges.pop(prev_id, None)
         if hyper_edge:
-            HypergraphManager.edges.pop(hyper_edge.id)
             hyper_edge.swap_id(new_id)
             HypergraphManager.edges[new_id] = hyper_edge
 
+    @staticmethod
+    def mark_hyper_edge_changed(hyper_edge_id: int):
+        """
+        Mark hypergraph of the hyper edge changed when the hyper edge itself changes (e.g. its box function),
+        so code generated from the hypergraph is not reused. Structural changes are marked automatically.
+        """
+        hypergraph = HypergraphManager.hyper_edge_hypergraph.get(hyper_edge_id)
+        if hypergraph is not None:
+            hypergraph.version += 1
+
     @staticmethod
     def create_new_node(node_id: int, canvas_id: int) -> Node:
         """
@@ -92,21 +126,30 @@ class HypergraphManager:
 
         :return: Created node
         """
-        logger.debug(message_start + f"Creating new node with id {node_id}" + message_end)
+        tracer.debug("Creating new node with id %s", node_id)
 
         new_node = Node(node_id, canvas_id=canvas_id)
         HypergraphManager.nodes[new_node.id] = new_node
+        HypergraphManager.node_creation_order[new_node.id] = len(HypergraphManager.node_creation_order)
+
+        hypergraph = Hypergraph(canvas_id=canvas_id)
+        hypergraph.nodes[new_node.id] = new_node
+        hypergraph.hypergraph_source[new_node.id] = new_node
+        HypergraphManager._register_hypergraph(hypergraph)
         return new_node
 
     @staticmethod
     def union_nodes(node: Node, unite_with_id: int):
-        logger.debug(
-            message_start + f"Union node with id {node.id} with other node with id {unite_with_id}" + message_end)
+        tracer.debug("Union node with id %s with other node with id %s", node.id, unite_with_id)
 
         unite_with = HypergraphManager.get_node_by_node_id(unite_with_id)
 
         node.union(unite_with)
 
+        hypergraph = HypergraphManager._get_or_create_hypergraph_of_node(node)
+        unite_with_hypergraph = HypergraphManager._get_or_create_hypergraph_of_node(unite_with)
+        HypergraphManager.combine_hypergraphs([hypergraph, unite_with_hypergraph])
+
     @staticmethod
     def connect_node_with_input_hyper_edge(node: Node, hyper_edge_id: int) -> HyperEdge:
         """
@@ -116,8 +159,7 @@ class HypergraphManager:
 
         :return: HyperEdge that was added to the node
         """
-        logger.debug(
-            message_start + f"Connecting to node with id {node.id} input a hyper edge with id {hyper_edge_id}" + message_end)
+        tracer.debug("Connecting to node with id %s input a hyper edge with id %s", node.id, hyper_edge_id)
 
         hyper_edge: HyperEdge | None = HypergraphManager.get_hyper_edge_by_id(hyper_edge_id)
         if hyper_edge is None:
@@ -125,6 +167,8 @@ class HypergraphManager:
             HypergraphManager.edges[hyper_edge.id] = hyper_edge
         hyper_edge.append_target_node(node)
         node.append_input(hyper_edge)
+
+        HypergraphManager._add_hyper_edge_to_hypergraph_of_node(hyper_edge, node)
         return hyper_edge
 
     @staticmethod
@@ -136,8 +180,7 @@ class HypergraphManager:
 
         :return: HyperEdge that was added to the node
         """
-        logger.debug(
-            message_start + f"Connecting to node with id {node.id} output a hyper edge with id {hyper_edge_id}" + message_end)
+        tracer.debug("Connecting to node with id %s output a hyper edge with id %s", node.id, hyper_edge_id)
 
         hyper_edge: HyperEdge | None = HypergraphManager.get_hyper_edge_by_id(hyper_edge_id)
         if hyper_edge is None:
@@ -145,19 +188,46 @@ class HypergraphManager:
             HypergraphManager.edges[hyper_edge.id] = hyper_edge
         hyper_edge.append_source_node(node)
         node.append_output(hyper_edge)
+
+        HypergraphManager._add_hyper_edge_to_hypergraph_of_node(hyper_edge, node)
         return hyper_edge
 
     @staticmethod
-    def combine_hypergraphs(hypergraphs: list[Hypergraph]):
+    def combine_hypergraphs(hypergraphs: list[Hypergraph]) -> Hypergraph:
         """Combine two or more hypergraphs.
 
+        Smaller hypergraphs are merged into the biggest one, so the biggest hypergraph keeps its id.
+
         NB!!!
         When combining hypergraphs from different canvases, new hypergraph will have canvas id from the first element!!!
         """
 
-        logger.debug(message_start + f"Combining hypergraphs with following ids: " + ", ".join(
-            map(lambda x: str(x.id), hypergraphs)) + message_end)
-        pass
+        if tracer.is_enabled_for(logging.DEBUG):
+            tracer.debug("Combining hypergraphs with following ids: %s", ", ".join(str(x.id) for x in hypergraphs))
+
+        canvas_id = hypergraphs[0].canvas_id
+        combined = max(hypergraphs, key=lambda hypergraph: len(hypergraph.nodes) + len(hypergraph.edges))
+        if combined.canvas_id != canvas_id:
+            HypergraphManager._unregister_hypergraph(combined)
+            combined.set_canvas_id(canvas_id)
+            HypergraphManager._register_hypergraph(combined)
+
+        for hypergraph in hypergraphs:
+            if hypergraph is combined:
+                continue
+            HypergraphManager._unregister_hypergraph(hypergraph)
+            combined.nodes.update(hypergraph.nodes)
+            combined.edges.update(hypergraph.edges)
+            for node_id in hypergraph.nodes:
+                HypergraphManager.node_hypergraph[node_id] = combined
+            for hyper_edge_id in hypergraph.edges:
+                HypergraphManager.hyper_edge_hypergraph[hyper_edge_id] = combined
+            HypergraphManager.hypergraph_order[combined.id] = min(
+                HypergraphManager.hypergraph_order[combined.id],
+                HypergraphManager._get_hypergraph_order(hypergraph))
+
+        HypergraphManager._mark_changed(combined)
+        return combined
 
     @staticmethod
     def get_node_by_node_id(node_id: int):
@@ -169,134 +239,174 @@ class HypergraphManager:
 
     @staticmethod
     def get_graph_by_node_id(node_id: int) -> Hypergraph | None:
-        node = HypergraphManager.nodes.get(node_id)
-        hypergraph = Hypergraph(canvas_id=node.canvas_id)
-        hypergraph.nodes[node.id] = node
-
-        visited: set[int] = set()
-        queue: Queue[Node | HyperEdge] = Queue()
-        visited.add(node.id)
-        for hyper_edge in node.get_output_hyper_edges() + node.get_input_hyper_edges():
-            if hyper_edge.id not in visited:
-                queue.put(hyper_edge)
-
-        while not queue.empty():
-            element = queue.get()
-            visited.add(element.id)
-            if isinstance(element, HyperEdge):
-                hypergraph.edges[element.id] = element
-                for node in element.get_target_nodes() + element.get_source_nodes():
-                    if node.id not in visited:
-                        queue.put(node)
-            else:
-                hypergraph.nodes[element.id] = element
-                for hyper_edge in element.get_output_hyper_edges() + element.get_input_hyper_edges():
-                    if hyper_edge.id not in visited:
-                        queue.put(hyper_edge)
-
+        hypergraph = HypergraphManager.node_hypergraph.get(node_id)
+        HypergraphManager._update_changed_hypergraphs()
         return hypergraph
 
     @staticmethod
     def get_graph_by_hyper_edge_id(hyper_edge_id: int) -> Hypergraph | None:
-        hyper_edge = HypergraphManager.edges.get(hyper_edge_id)
-        hypergraph = Hypergraph(canvas_id=-1)
-        hypergraph.edges[hyper_edge.id] = hyper_edge
-
-        visited: set[int] = set()
-        queue: Queue[Node|HyperEdge] = Queue()
-        visited.add(hyper_edge.id)
-        for node in hyper_edge.get_target_nodes() + hyper_edge.get_source_nodes():
-            if node.id not in visited:
-                queue.put(node)
-
-        while not queue.empty():
-            element = queue.get()
-            visited.add(element.id)
-            if isinstance(element, HyperEdge):
-                hypergraph.edges[element.id] = element
-                for node in element.get_target_nodes() + element.get_source_nodes():
-                    if node.id not in visited:
-                        queue.put(node)
-            else:
-                hypergraph.nodes[element.id] = element
-                for hyper_edge in element.get_output_hyper_edges() + element.get_input_hyper_edges():
-                    if hyper_edge.id not in visited:
-                        queue.put(hyper_edge)
-
+        hypergraph = HypergraphManager.hyper_edge_hypergraph.get(hyper_edge_id)
+        HypergraphManager._update_changed_hypergraphs()
         return hypergraph
 
-
     @staticmethod
     def get_graph_by_source_node_id(source_node_id: int) -> Hypergraph | None:
         return HypergraphManager.get_graph_by_node_id(source_node_id)
 
     @staticmethod
     def get_graphs_by_canvas_id(canvas_id: int) -> list[Hypergraph]:
-        element_in_graph: dict[int, Hypergraph] = {}
-        hypergraphs: list[Hypergraph] = []
-
-        visited: set[int] = set()
-        queue: Queue[Node | HyperEdge] = Queue()
-
-        for node in HypergraphManager.nodes.values():
-            if node.id not in visited and node.canvas_id == canvas_id:
-                hypergraph = Hypergraph(canvas_id=canvas_id)
-                element_in_graph[node.id] = hypergraph
-                hypergraph.nodes[node.id] = node
-                if len(node.get_parent_nodes()) == 0:
-                    hypergraph.hypergraph_source[node.id] = node
-
-                visited.add(node.id)
-                for hyper_edge in node.get_output_hyper_edges() + node.get_input_hyper_edges():
-                    if hyper_edge.id not in visited:
-                        queue.put(hyper_edge)
-
-                for directly_connected_node in node.get_directly_connected_to():
-                    if directly_connected_node.id not in visited:
-                        queue.put(directly_connected_node)
-
-                while not queue.empty():
-                    element = queue.get()
-                    visited.add(element.id)
-                    element_in_graph[element.id] = hypergraph
-
-                    if isinstance(element, HyperEdge):
-                        hypergraph.edges[element.id] = element
-                        for elements_node in element.get_target_nodes() + element.get_source_nodes():
-                            if elements_node.id not in visited:
-                                queue.put(elements_node)
-
-                                for directly_connected_node in elements_node.get_directly_connected_to():
-                                    if directly_connected_node.id not in visited:
-                                        queue.put(directly_connected_node)
-                    else:
-                        hypergraph.nodes[element.id] = element
-                        if len(element.get_parent_nodes()) == 0:
-                            hypergraph.hypergraph_source[element.id] = element
-                        for hyper_edge in element.get_output_hyper_edges() + element.get_input_hyper_edges():
-                            if hyper_edge.id not in visited:
-                                queue.put(hyper_edge)
-
-                        for directly_connected_node in element.get_directly_connected_to():
-                            if directly_connected_node.id not in visited:
-                                queue.put(directly_connected_node)
-
-                hypergraphs.append(hypergraph)
-        return hypergraphs
+        HypergraphManager._update_changed_hypergraphs()
+        return sorted(HypergraphManager.canvas_hypergraphs.get(canvas_id, {}).values(),
+                      key=HypergraphManager._get_hypergraph_order)
 
     @staticmethod
     def get_graph_by_id(graph_id: int) -> Hypergraph | None:
-        pass
+        HypergraphManager._update_changed_hypergraphs()
+        return HypergraphManager.hypergraphs_by_id.get(graph_id)
 
     @staticmethod
     def add_hypergraph(hypergraph: Hypergraph):
-        logger.debug(message_start + f"Adding hypergraph with id {hypergraph.id}" + message_end)
+        tracer.debug("Adding hypergraph with id %s", hypergraph.id)
 
-        HypergraphManager.hypergraphs.add(hypergraph)
+        HypergraphManager._register_hypergraph(hypergraph)
+        for node in hypergraph.get_all_nodes():
+            HypergraphManager.nodes[node.id] = node
+            HypergraphManager.node_hypergraph[node.id] = hypergraph
+        for hyper_edge in hypergraph.get_all_hyper_edges():
+            HypergraphManager.edges[hyper_edge.id] = hyper_edge
+            HypergraphManager.hyper_edge_hypergraph[hyper_edge.id] = hypergraph
 
     @staticmethod
     def remove_hypergraph(hypergraph: Hypergraph):
-        logger.debug(
-            message_start + f"Removing hypergraph with id {hypergraph.id}" + message_end)
+        tracer.debug("Removing hypergraph with id %s", hypergraph.id)
+
+        HypergraphManager._unregister_hypergraph(hypergraph)
+        for node_id in hypergraph.get_all_nodes_ids():
+            if HypergraphManager.node_hypergraph.get(node_id) is hypergraph:
+                HypergraphManager.node_hypergraph.pop(node_id)
+                HypergraphManager.nodes.pop(node_id, None)
+        for hyper_edge in hypergraph.get_all_hyper_edges():
+            if HypergraphManager.hyper_edge_hypergraph.get(hyper_edge.id) is hypergraph:
+                HypergraphManager.hyper_edge_hypergraph.pop(hyper_edge.id)
+                HypergraphManager.edges.pop(hyper_edge.id, None)
 
-        pass
+    @staticmethod
+    def clear():
+        """Forget all nodes, hyper edges and hypergraphs."""
+        HypergraphManager.hypergraphs.clear()
+        HypergraphManager.nodes.clear()
+        HypergraphManager.edges.clear()
+        HypergraphManager.source_nodes_group.clear()
+        HypergraphManager.node_hypergraph.clear()
+        HypergraphManager.hyper_edge_hypergraph.clear()
+        HypergraphManager.canvas_hypergraphs.clear()
+        HypergraphManager.hypergraphs_by_id.clear()
+        HypergraphManager.node_creation_order.clear()
+        HypergraphManager.hypergraph_order.clear()
+        HypergraphManager.changed_hypergraphs.clear()
+
+    @staticmethod
+    def _register_hypergraph(hypergraph: Hypergraph):
+        HypergraphManager.hypergraphs.add(hypergraph)
+        HypergraphManager.hypergraphs_by_id[hypergraph.id] = hypergraph
+        HypergraphManager.canvas_hypergraphs.setdefault(hypergraph.canvas_id, {})[hypergraph.id] = hypergraph
+        for node_id in hypergraph.nodes:
+            HypergraphManager.node_hypergraph[node_id] = hypergraph
+        for hyper_edge_id in hypergraph.edges:
+            HypergraphManager.hyper_edge_hypergraph[hyper_edge_id] = hypergraph
+        HypergraphManager.hypergraph_order[hypergraph.id] = HypergraphManager._calculate_hypergraph_order(hypergraph)
+        HypergraphManager._mark_changed(hypergraph)
+
+    @staticmethod
+    def _unregister_hypergraph(hypergraph: Hypergraph):
+        HypergraphManager.hypergraphs.discard(hypergraph)
+        if HypergraphManager.hypergraphs_by_id.get(hypergraph.id) is hypergraph:
+            HypergraphManager.hypergraphs_by_id.pop(hypergraph.id)
+        HypergraphManager.canvas_hypergraphs.get(hypergraph.canvas_id, {}).pop(hypergraph.id, None)
+        HypergraphManager.hypergraph_order.pop(hypergraph.id, None)
+        HypergraphManager.changed_hypergraphs.discard(hypergraph)
+
+    @staticmethod
+    def _get_or_create_hypergraph_of_node(node: Node) -> Hypergraph:
+        hypergraph = HypergraphManager.node_hypergraph.get(node.id)
+        if hypergraph is None:
+            hypergraph = Hypergraph(canvas_id=node.canvas_id)
+            hypergraph.nodes[node.id] = node
+            HypergraphManager._register_hypergraph(hypergraph)
+        return hypergraph
+
+    @staticmethod
+    def _add_hyper_edge_to_hypergraph_of_node(hyper_edge: HyperEdge, node: Node):
+        hypergraph = HypergraphManager._get_or_create_hypergraph_of_node(node)
+        hyper_edge_hypergraph = HypergraphManager.hyper_edge_hypergraph.get(hyper_edge.id)
+        if hyper_edge_hypergraph is not None and hyper_edge_hypergraph is not hypergraph:
+            hypergraph = HypergraphManager.combine_hypergraphs([hypergraph, hyper_edge_hypergraph])
+        hypergraph.edges[hyper_edge.id] = hyper_edge
+        HypergraphManager.hyper_edge_hypergraph[hyper_edge.id] = hypergraph
+        HypergraphManager._mark_changed(hypergraph)
+
+    @staticmethod
+    def _split_hypergraph(hypergraph: Hypergraph):
+        """
+        Split hypergraph into connected components after node or hyper edge was removed from it.
+
+        The first component keeps the original hypergraph (and its id), for other components new hypergraphs
+        are created. If nothing is left, hypergraph is removed.
+        """
+        components: list[tuple[dict[int, Node], dict[int, HyperEdge]]] = []
+        visited: set[int] = set()
+        visited_edges: set[int] = set()
+
+        for start_node in hypergraph.get_all_nodes():
+            if start_node.id in visited:
+                continue
+            component_nodes: dict[int, Node] = {}
+            component_edges: dict[int, HyperEdge] = {}
+            for element in traversal.bfs_connected([start_node], visited, visited_edges):
+                if isinstance(element, Node):
+                    component_nodes[element.id] = element
+                else:
+                    component_edges[element.id] = element
+            components.append((component_nodes, component_edges))
+
+        for hyper_edge_id in hypergraph.edges:
+            if hyper_edge_id not in visited_edges \
+                    and HypergraphManager.hyper_edge_hypergraph.get(hyper_edge_id) is hypergraph:
+                HypergraphManager.hyper_edge_hypergraph.pop(hyper_edge_id)
+
+        if not components:
+            HypergraphManager._unregister_hypergraph(hypergraph)
+            return
+
+        first_nodes, first_edges = components[0]
+        hypergraph.nodes = first_nodes
+        hypergraph.edges = first_edges
+        hypergraph.hypergraph_source.clear()
+        HypergraphManager.hypergraph_order[hypergraph.id] = HypergraphManager._calculate_hypergraph_order(hypergraph)
+        HypergraphManager._mark_changed(hypergraph)
+
+        for component_nodes, component_edges in components[1:]:
+            new_hypergraph = Hypergraph(canvas_id=hypergraph.canvas_id)
+            new_hypergraph.nodes = component_nodes
+            new_hypergraph.edges = component_edges
+            HypergraphManager._register_hypergraph(new_hypergraph)
+
+    @staticmethod
+    def _mark_changed(hypergraph: Hypergraph):
+        hypergraph.invalidate_hyper_edge_order()
+        HypergraphManager.changed_hypergraphs.add(hypergraph)
+
+    @staticmethod
+    def _update_changed_hypergraphs():
+        for hypergraph in HypergraphManager.changed_hypergraphs:
+            hypergraph.update_hypergraph_source()
+        HypergraphManager.changed_hypergraphs.clear()
+
+    @staticmethod
+    def _calculate_hypergraph_order(hypergraph: Hypergraph) -> int:
+        return min((HypergraphManager.node_creation_order.get(node_id, -1) for node_id in hypergraph.nodes),
+                   default=-1)
+
+    @staticmethod
+    def _get_hypergraph_order(hypergraph: Hypergraph) -> int:
+        return HypergraphManager.hypergraph_order.get(hypergraph.id, -1)
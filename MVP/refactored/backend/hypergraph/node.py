@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from queue import Queue
 from typing import Self
 from typing import TYPE_CHECKING
 
+from MVP.refactored.backend.hypergraph import traversal
+from MVP.refactored.backend.hypergraph.node_group import NodeGroup
 from MVP.refactored.backend.id_generator import IdGenerator
 
 if TYPE_CHECKING:
@@ -17,59 +18,97 @@ class Node:
         self.canvas_id = canvas_id
         self.id = node_id
         self.hypergraph_id = hypergraph_id
-        self.inputs: list[HyperEdge] = []
-        self.outputs: list[HyperEdge] = []
+        # disjoint-set forest of node groups, group object is owned by the root node
+        self._group_parent: Node = self
+        self._group: NodeGroup | None = NodeGroup(self)
+        self._inputs: list[HyperEdge] = []
+        self._outputs: list[HyperEdge] = []
         self.is_special = is_special  # if it diagram input/output
         self.is_compound = False  # if it is several nodes, for example, input/output and wire => two nodes in one, spider and wire.
-        self.directly_connected_to: list[Node] = []
+        self._directly_connected_to: list[Node] = []
         # Should be modified that we can determine how each node connected to another
 
+    @property
+    def inputs(self) -> list[HyperEdge]:
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, inputs: list[HyperEdge]):
+        self._inputs = inputs
+        self.get_node_group().invalidate_hyper_edges()
+
+    @property
+    def outputs(self) -> list[HyperEdge]:
+        return self._outputs
+
+    @outputs.setter
+    def outputs(self, outputs: list[HyperEdge]):
+        self._outputs = outputs
+        self.get_node_group().invalidate_hyper_edges()
+
+    @property
+    def directly_connected_to(self) -> list[Node]:
+        return self._directly_connected_to
+
+    @directly_connected_to.setter
+    def directly_connected_to(self, nodes: list[Node]):
+        affected_nodes: dict[int, Node] = self.get_node_group().members.copy()
+        self._directly_connected_to = nodes
+        for node in nodes:
+            affected_nodes.update(node.get_node_group().members)
+        Node._rebuild_node_groups(list(affected_nodes.values()))
+
     def get_directly_connected_to(self) -> list[Node]:
         return self.directly_connected_to
 
+    def get_node_group(self) -> NodeGroup:
+        """
+        Return the group of nodes this node is united with.
+
+        Finds the root of the node in the disjoint-set forest and compresses the path on the way,
+        so repeated lookups are O(1) amortized.
+        """
+        root = self
+        while root._group_parent is not root:
+            root = root._group_parent
+        node = self
+        while node._group_parent is not root:
+            node._group_parent, node = root, node._group_parent
+        return root._group
+
+    def _unite_node_groups(self, other: Node):
+        group = self.get_node_group()
+        other_group = other.get_node_group()
+        if group is other_group:
+            return
+        if len(group) < len(other_group):  # union by size, smaller group is attached under bigger one
+            group, other_group = other_group, group
+        other_group.root._group_parent = group.root
+        other_group.root._group = None
+        group.merge(other_group)
+
+    @staticmethod
+    def _rebuild_node_groups(nodes: list[Node]):
+        """
+        Recalculate node groups of given nodes from their direct connections.
+
+        Disjoint-set can not split groups, so it is used when connection between nodes is removed.
+        Given nodes must contain all members of the groups that are rebuilt.
+        """
+        for node in nodes:
+            node._group_parent = node
+            node._group = NodeGroup(node)
+        for node in nodes:
+            for connected_node in node.directly_connected_to:
+                node._unite_node_groups(connected_node)
+
     def get_hypergraph_source_nodes(self) -> list[Self]:
-        visited: set[int] = set()
-        source_nodes: list[Node] = list()
-        queue: Queue[Node] = Queue()
-        visited.add(self.id)
-        if len(self.get_input_hyper_edges()) == 0:
-            source_nodes.append(self)
-        for hyper_edge in self.get_input_hyper_edges() + self.get_output_hyper_edges():
-            for node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
-                queue.put(node)
-        while not queue.empty():
-            node: Node = queue.get()
-            visited.add(node.id)
-            if len(node.get_input_hyper_edges()) == 0:
-                source_nodes.append(node)
-            else:
-                for hyper_edge in self.get_input_hyper_edges() + self.get_output_hyper_edges():
-                    for hyper_edge_node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
-                        if hyper_edge_node.id not in visited:
-                            queue.put(hyper_edge_node)
-        return list(source_nodes)
+        return [node for node in traversal.bfs([self], traversal.get_connected_nodes)
+                if len(node.get_input_hyper_edges()) == 0]
 
     def get_hypergraph_target_nodes(self) -> list[Self]:
-        visited: set[int] = set()
-        target_nodes: list[Node] = list()
-        queue: Queue[Node] = Queue()
-        visited.add(self.id)
-        if len(self.get_output_hyper_edges()) == 0:
-            target_nodes.append(self)
-        for hyper_edge in self.get_input_hyper_edges() + self.get_output_hyper_edges():
-            for node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
-                queue.put(node)
-        while not queue.empty():
-            node: Node = queue.get()
-            visited.add(node.id)
-            if len(node.get_output_hyper_edges()) == 0:
-                target_nodes.append(node)
-            else:
-                for hyper_edge in self.get_input_hyper_edges() + self.get_output_hyper_edges():
-                    for hyper_edge_node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
-                        if hyper_edge_node.id not in visited:
-                            queue.put(hyper_edge_node)
-        return target_nodes
+        return [node for node in traversal.bfs([self], traversal.get_connected_nodes)
+                if len(node.get_output_hyper_edges()) == 0]
 
     def get_children_nodes(self) -> list[Self]:
         children_nodes: dict[int, Node] = dict()
@@ -92,57 +131,13 @@ class Node:
         return list(parent_nodes.values())
 
     def get_input_hyper_edges(self) -> list[HyperEdge]:
-        inputs = []
-        visited = set()
-        queue = Queue()
-        visited.add(self)
-        inputs.extend(self.inputs)
-        for other in self.directly_connected_to:
-            queue.put(other)
-
-        while not queue.empty():
-            node = queue.get()
-            if node not in visited:
-                visited.add(node)
-                inputs.extend(node.inputs)
-                for other in node.directly_connected_to:
-                    queue.put(other)
-        return inputs
+        return self.get_node_group().get_input_hyper_edges()
 
     def get_output_hyper_edges(self) -> list[HyperEdge]:
-        outputs: set[HyperEdge] = set()
-        visited = set()
-        queue = Queue()
-        visited.add(self)
-        outputs.update(self.outputs)
-        for other in self.directly_connected_to:
-            queue.put(other)
-
-        while not queue.empty():
-            node = queue.get()
-            if node not in visited:
-                visited.add(node)
-                outputs.update(node.outputs)
-                for other in node.directly_connected_to:
-                    queue.put(other)
-        return list(outputs)
+        return self.get_node_group().get_output_hyper_edges()
 
     def get_united_with_nodes(self) -> list[Node]:
-        united_with_nodes: set[Node] = set()
-        visited: set = set()
-        queue: Queue[Node] = Queue()
-        visited.add(self)
-        for directly_connected_to_node in self.directly_connected_to:
-            queue.put(directly_connected_to_node)
-        while not queue.empty():
-            node: Node = queue.get()
-            if node not in visited:
-                united_with_nodes.add(node)
-                visited.add(node)
-            for directly_connected_to_node in node.directly_connected_to:
-                if directly_connected_to_node not in visited:
-                    queue.put(directly_connected_to_node)
-        return list(united_with_nodes)
+        return [node for node in self.get_node_group().members.values() if node is not self]
 
     def set_inputs(self, inputs: list[HyperEdge]):
         self.inputs = inputs
@@ -150,12 +145,15 @@ class Node:
     def append_input(self, input_hyper_edge: HyperEdge):
         if input_hyper_edge not in self.inputs:
             self.inputs.append(input_hyper_edge)
+            self.get_node_group().invalidate_hyper_edges()
 
     def append_output(self, output: HyperEdge):
         if output not in self.outputs:
             self.outputs.append(output)
+            self.get_node_group().invalidate_hyper_edges()
 
     def remove_self(self):
+        group_members = self.get_node_group().get_members()
         for connected_to_node in self.directly_connected_to:
             connected_to_node.directly_connected_to.remove(self)
         self.directly_connected_to.clear()
@@ -166,40 +164,28 @@ class Node:
 
         self.inputs.clear()
         self.outputs.clear()
+        # removing the node can split its group into several groups
+        Node._rebuild_node_groups(group_members)
 
     def remove_input(self, input_hyper_edge: HyperEdge):
         if input_hyper_edge in self.inputs:
             self.inputs.remove(input_hyper_edge)
+            self.get_node_group().invalidate_hyper_edges()
 
     def remove_output(self, output_hyper_edge: HyperEdge):
         if output_hyper_edge in self.outputs:
             self.outputs.remove(output_hyper_edge)
+            self.get_node_group().invalidate_hyper_edges()
 
     def union(self, other: Self):
         if other == self: raise ValueError('Cannot union node with itself')
         self.directly_connected_to.append(other)
         other.directly_connected_to.append(self)
+        self._unite_node_groups(other)
 
     def is_connected_to(self, target_node: Self) -> bool:
-        if self.equals_to_node_group(target_node):
-            return True
-        visited: set[int] = set()
-        queue: Queue[Node] = Queue()
-        visited.add(self.id)
-        for hyper_edge in self.get_input_hyper_edges() + self.get_output_hyper_edges():
-            for node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
-                if node.id not in visited:
-                    queue.put(node)
-        while not queue.empty():
-            node: Node = queue.get()
-            visited.add(node.id)
-            if node.equals_to_node_group(target_node):
-                return True
-            for hyper_edge in node.get_input_hyper_edges() + node.get_output_hyper_edges():
-                for hyper_edge_node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
-                    if hyper_edge_node.id not in visited:
-                        queue.put(hyper_edge_node)
-        return False
+        return any(node.equals_to_node_group(target_node)
+                   for node in traversal.bfs([self], traversal.get_connected_nodes))
 
     def __str__(self) -> str:
         """Return a string representation of the node."""
@@ -210,7 +196,7 @@ class Node:
             return False
         if self.id == other.id:
             return True
-        return any(node.id == other.id for node in self.get_united_with_nodes())
+        return self.get_node_group().contains_node_id(other.id)
 
     def __eq__(self, other):
         if not isinstance(other, Node):
@@ -221,7 +207,4 @@ class Node:
         return hash(self.id)
 
     def node_group_hash(self):
-        group = [self.id]
-        for node in self.get_united_with_nodes():
-            group.append(node.id)
-        return hash(tuple(sorted(group)))
+        return self.get_node_group().group_hash()
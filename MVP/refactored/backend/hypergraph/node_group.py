@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+    from MVP.refactored.backend.hypergraph.node import Node
+
+
+class NodeGroup:
+    """
+    Set of nodes that are united with each other.
+
+    For example wire, spider and diagram input/output that are connected together represent one
+    value in the diagram, so they form one node group. Groups are stored in a disjoint-set forest
+    (see Node.get_node_group), only the root node of the forest owns the group object.
+    Group members, aggregated input/output hyper edges and group hash are cached,
+    so queries about the group do not need to traverse directly connected nodes.
+    """
+
+    def __init__(self, root: Node):
+        self.root: Node = root  # root node of the group in the disjoint-set forest
+        self.members: dict[int, Node] = {root.id: root}
+
+        self._input_hyper_edges: list[HyperEdge] | None = None
+        self._output_hyper_edges: list[HyperEdge] | None = None
+        self._id: int | None = None
+        self._hash: int | None = None
+
+    @property
+    def id(self) -> int:
+        """Stable id of the group, it changes only when group members change."""
+        if self._id is None:
+            self._id = min(self.members)
+        return self._id
+
+    def get_members(self) -> list[Node]:
+        return list(self.members.values())
+
+    def contains_node_id(self, node_id: int) -> bool:
+        return node_id in self.members
+
+    def get_input_hyper_edges(self) -> list[HyperEdge]:
+        if self._input_hyper_edges is None:
+            self._input_hyper_edges = list(dict.fromkeys(
+                hyper_edge for node in self.members.values() for hyper_edge in node.inputs))
+        return list(self._input_hyper_edges)
+
+    def get_output_hyper_edges(self) -> list[HyperEdge]:
+        if self._output_hyper_edges is None:
+            self._output_hyper_edges = list(dict.fromkeys(
+                hyper_edge for node in self.members.values() for hyper_edge in node.outputs))
+        return list(self._output_hyper_edges)
+
+    def group_hash(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(sorted(self.members)))
+        return self._hash
+
+    def merge(self, other: NodeGroup):
+        """Add all members of other group to this group."""
+        self.members.update(other.members)
+        self.invalidate()
+
+    def invalidate_hyper_edges(self):
+        """Must be called when inputs or outputs of any group member change."""
+        self._input_hyper_edges = None
+        self._output_hyper_edges = None
+
+    def invalidate(self):
+        """Must be called when group members change."""
+        self.invalidate_hyper_edges()
+        self._id = None
+        self._hash = None
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __str__(self) -> str:
+        return f"Node group ID: {self.id}"
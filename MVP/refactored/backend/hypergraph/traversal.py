@@ -0,0 +1,144 @@
+"""
+Hypergraph traversals.
+
+Traversals use deque (or list as a stack), hypergraph is traversed in a single thread, so there is no need
+for synchronized queue.Queue. Nodes are marked as visited when they are added to the queue, so every node is
+returned only once. Visited sets can be passed in and reused between traversals, for example when all
+connected components of a hypergraph are searched.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+    from MVP.refactored.backend.hypergraph.node import Node
+
+
+def bfs(start_nodes: Iterable[Node],
+        get_neighbours: Callable[[Node], Iterable[Node]],
+        visited: set[int] | None = None) -> Iterator[Node]:
+    """
+    Breadth-first traversal over nodes.
+
+    :param start_nodes: Nodes where traversal starts, they are returned first.
+    :param get_neighbours: Function that returns next nodes of the given node.
+    :param visited: Ids of nodes that must not be returned, it is updated during traversal.
+    :return: Iterator over reached nodes.
+    """
+    if visited is None:
+        visited = set()
+    queue: deque[Node] = deque()
+    for node in start_nodes:
+        if node.id not in visited:
+            visited.add(node.id)
+            queue.append(node)
+
+    while queue:
+        node = queue.popleft()
+        yield node
+        for neighbour in get_neighbours(node):
+            if neighbour.id not in visited:
+                visited.add(neighbour.id)
+                queue.append(neighbour)
+
+
+def dfs(start_nodes: Iterable[Node],
+        get_neighbours: Callable[[Node], Iterable[Node]],
+        visited: set[int] | None = None) -> Iterator[Node]:
+    """
+    Depth-first traversal over nodes.
+
+    :param start_nodes: Nodes where traversal starts.
+    :param get_neighbours: Function that returns next nodes of the given node.
+    :param visited: Ids of nodes that must not be returned, it is updated during traversal.
+    :return: Iterator over reached nodes.
+    """
+    if visited is None:
+        visited = set()
+    stack: list[Node] = []
+    for node in reversed(list(start_nodes)):
+        if node.id not in visited:
+            visited.add(node.id)
+            stack.append(node)
+
+    while stack:
+        node = stack.pop()
+        yield node
+        for neighbour in get_neighbours(node):
+            if neighbour.id not in visited:
+                visited.add(neighbour.id)
+                stack.append(neighbour)
+
+
+def bfs_connected(start_nodes: Iterable[Node],
+                  visited_nodes: set[int] | None = None,
+                  visited_hyper_edges: set[int] | None = None) -> Iterator[Node | HyperEdge]:
+    """
+    Breadth-first traversal over nodes and hyper edges of connected component.
+
+    Nodes are connected through hyper edges and through node groups (united nodes).
+    Hyper edge is returned when it is reached for the first time, before nodes that are reached through it.
+
+    :param start_nodes: Nodes where traversal starts.
+    :param visited_nodes: Ids of nodes that must not be returned, it is updated during traversal.
+    :param visited_hyper_edges: Ids of hyper edges that must not be returned, it is updated during traversal.
+    :return: Iterator over reached nodes and hyper edges.
+    """
+    if visited_nodes is None:
+        visited_nodes = set()
+    if visited_hyper_edges is None:
+        visited_hyper_edges = set()
+    queue: deque[Node] = deque()
+    for node in start_nodes:
+        if node.id not in visited_nodes:
+            visited_nodes.add(node.id)
+            queue.append(node)
+
+    while queue:
+        node = queue.popleft()
+        yield node
+        for hyper_edge in get_hyper_edges(node):
+            if hyper_edge.id in visited_hyper_edges:
+                continue
+            visited_hyper_edges.add(hyper_edge.id)
+            yield hyper_edge
+            for hyper_edge_node in get_hyper_edge_nodes(hyper_edge):
+                if hyper_edge_node.id not in visited_nodes:
+                    visited_nodes.add(hyper_edge_node.id)
+                    queue.append(hyper_edge_node)
+        for united_node in node.get_united_with_nodes():
+            if united_node.id not in visited_nodes:
+                visited_nodes.add(united_node.id)
+                queue.append(united_node)
+
+
+def get_hyper_edges(node: Node) -> Iterator[HyperEdge]:
+    """Output and input hyper edges of the node group."""
+    yield from node.get_output_hyper_edges()
+    yield from node.get_input_hyper_edges()
+
+
+def get_hyper_edge_nodes(hyper_edge: HyperEdge) -> Iterator[Node]:
+    """Source and target nodes of the hyper edge."""
+    yield from hyper_edge.get_source_nodes()
+    yield from hyper_edge.get_target_nodes()
+
+
+def get_connected_nodes(node: Node) -> Iterator[Node]:
+    """Nodes that are connected to the node group through hyper edges."""
+    for hyper_edge in get_hyper_edges(node):
+        yield from get_hyper_edge_nodes(hyper_edge)
+
+
+def get_output_nodes(node: Node) -> Iterator[Node]:
+    """Target nodes of node group output hyper edges."""
+    for hyper_edge in node.get_output_hyper_edges():
+        yield from hyper_edge.get_target_nodes()
+
+
+def get_children_and_united_nodes(node: Node) -> Iterator[Node]:
+    yield from node.get_children_nodes()
+    yield from node.get_united_with_nodes()
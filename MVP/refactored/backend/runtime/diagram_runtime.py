@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections import deque
+from functools import partial
+from typing import Callable, TYPE_CHECKING
+
+import numpy as np
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.code_generation.hypergraph_optimizer import HypergraphOptimizer
+from MVP.refactored.backend.code_generation.node_group_resolver import NodeGroupResolver
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+from MVP.refactored.backend.hypergraph.hypergraph import Hypergraph
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+
+if TYPE_CHECKING:
+    from MVP.refactored.frontend.components.custom_canvas import CustomCanvas
+
+# (slot, index), value in the slot or its item at the index of a tuple output, index is None for the whole value
+Reference = tuple[int, int | None]
+
+
+def _pack(*values) -> tuple:
+    """Value of a spider that gets more than one value, the same tuple as in generated code."""
+    return values
+
+
+def _call_per_row(function: Callable, *arguments):
+    """
+    Call the function once per row of the argument arrays.
+
+    Rows of one-dimensional arrays are given as Python values, so the function works as when the hypergraph
+    is called on the row. Result is an array of the row results, or a tuple of such arrays if the function returns
+    tuples (several outputs). Array type is found from all row results, so it does not depend on the result
+    of the first row.
+    """
+    columns = np.broadcast_arrays(*arguments)
+    if columns[0].ndim == 0:
+        return function(*arguments)
+    results = [function(*row) for row in zip(*[column.tolist() if column.ndim == 1 else column
+                                               for column in columns])]
+    if results and isinstance(results[0], tuple):
+        return tuple(_to_array(output) for output in zip(*results))
+    return _to_array(results)
+
+
+def _to_array(values) -> np.ndarray:
+    if all(np.ndim(value) == 0 for value in values):
+        return np.array(values)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def _is_batch_result(result) -> bool:
+    """Return whether the box function result holds arrays of rows (for every output of the box)."""
+    if isinstance(result, (tuple, list)):
+        return len(result) > 0 and all(np.ndim(item) > 0 for item in result)
+    return np.ndim(result) > 0
+
+
+class CompiledHypergraph:
+    """
+    Executable hypergraph, works like the main function that CodeGenerator generates for it.
+
+    Values are kept in slots: inputs of the main function first, then results of the steps. Every step calls
+    a compiled box function (or packs values that go into one spider) with values of its argument references
+    and stores the result in its own slot. Box with several outputs stores the returned tuple,
+    its targets refer to the items of the tuple.
+
+    Hypergraph can also be run on batches (`run_batch`, `run_frame`): inputs are NumPy arrays of rows
+    and every box is called once with whole arrays, see DiagramRuntime.call_batch.
+    """
+
+    def __init__(self, receiver: Receiver, hypergraph: Hypergraph, input_count: int):
+        self.receiver: Receiver = receiver
+        self.hypergraph: Hypergraph = hypergraph
+        self.stamp: tuple | None = None
+        self.input_count: int = input_count
+        self.slot_count: int = input_count
+        self.steps: list[tuple[Callable, tuple[Reference, ...], int]] = []
+        self.result: tuple[Reference, ...] = ()
+
+    def add_step(self, function: Callable, arguments: list[Reference]) -> int:
+        """Add step that calls the function, return slot of its result."""
+        slot = self.slot_count
+        self.slot_count += 1
+        self.steps.append((function, tuple(arguments), slot))
+        return slot
+
+    def __call__(self, *inputs):
+        if len(inputs) != self.input_count:
+            raise ValueError(f"Hypergraph {self.hypergraph.id} takes {self.input_count} inputs, got {len(inputs)}")
+        values = list(inputs)
+        values.extend([None] * (self.slot_count - self.input_count))
+        for function, arguments, slot in self.steps:
+            values[slot] = function(*[values[s] if index is None else values[s][index] for s, index in arguments])
+        return self._get_result(values)
+
+    def run_batch(self, *inputs):
+        """
+        Run the hypergraph on arrays of inputs, every array holds one input of all rows.
+
+        Result is the same as of calling the hypergraph on every row, but with arrays of the rows instead of values.
+        Rows that raise an error (division by zero, float overflow) raise the same error as when they are called
+        one by one. Integer arrays are the exception: box functions called with whole arrays compute in
+        fixed width NumPy integers, which wrap around where Python integers of a single row would grow.
+        """
+        if len(inputs) != self.input_count:
+            raise ValueError(f"Hypergraph {self.hypergraph.id} takes {self.input_count} inputs, got {len(inputs)}")
+        values = [np.asarray(value) for value in inputs]
+        values.extend([None] * (self.slot_count - self.input_count))
+        for function, arguments, slot in self.steps:
+            argument_values = [values[s] if index is None else values[s][index] for s, index in arguments]
+            if function is _pack:
+                values[slot] = _pack(*argument_values)
+            else:
+                values[slot] = DiagramRuntime.call_batch(function, argument_values)
+        return self._get_result(values)
+
+    def run_frame(self, frame, columns: list[str] = None):
+        """
+        Run the hypergraph on columns of a pandas DataFrame, see `run_batch`.
+
+        :param frame: DataFrame (or other mapping of column names to columns) with a row per run
+        :param columns: names of the columns of the inputs in the order of the inputs, all columns by default
+        """
+        columns = list(frame.columns) if columns is None else columns
+        return self.run_batch(*[np.asarray(frame[column]) for column in columns])
+
+    def _get_result(self, values: list):
+        result = [values[s] if index is None else values[s][index] for s, index in self.result]
+        if len(result) == 1:
+            return result[0]
+        return tuple(result) if result else None
+
+
+class DiagramRuntime:
+    """
+    Runs diagrams without generating code.
+
+    Every box function is compiled once into a callable (in its own namespace, so names of different box functions
+    do not need renaming), every hypergraph is compiled once into a CompiledHypergraph.
+    Compiled hypergraphs are reused while their stamp stays the same (see CodeGenerator.get_hypergraph_stamp).
+    """
+    max_functions_size: int = 1024
+    # {box function: its compiled main function}
+    functions: OrderedDict[BoxFunction, Callable] = OrderedDict()
+    # {canvas id: {hypergraph id: compiled hypergraph}}, results of the last compilation of every canvas
+    compiled_hypergraphs: dict[int, dict[int, CompiledHypergraph]] = {}
+    # {compiled function: function that is called with arrays, the function itself or its per row call},
+    # functions evicted from `functions` are evicted from here too
+    batch_functions: OrderedDict[Callable, Callable] = OrderedDict()
+
+    @classmethod
+    def compile(cls, canvas: CustomCanvas) -> list[CompiledHypergraph]:
+        """Compile hypergraphs of the canvas, see `compile_diagram`."""
+        return cls.compile_diagram(canvas.receiver, canvas.id)
+
+    @classmethod
+    def compile_diagram(cls, receiver: Receiver, canvas_id: int) -> list[CompiledHypergraph]:
+        """
+        Compile hypergraphs of the diagram on the given canvas id.
+
+        Compiled hypergraphs are in the same order as main functions of generated code (main_0 .. main_n),
+        calling one of them with the inputs gives the same result as calling its main function.
+        """
+        previous = cls.compiled_hypergraphs.get(canvas_id, {})
+        resolver = NodeGroupResolver(receiver)
+        compiled_hypergraphs = []
+        for hypergraph in HypergraphManager.get_graphs_by_canvas_id(canvas_id):
+            stamp = CodeGenerator.get_hypergraph_stamp(hypergraph)
+            compiled = previous.get(hypergraph.id)
+            if (compiled is None or compiled.receiver is not receiver or compiled.hypergraph is not hypergraph
+                    or compiled.stamp != stamp):
+                compiled = cls.compile_hypergraph(hypergraph, resolver)
+                compiled.stamp = stamp
+            compiled_hypergraphs.append(compiled)
+        cls.compiled_hypergraphs[canvas_id] = {compiled.hypergraph.id: compiled for compiled in compiled_hypergraphs}
+        return compiled_hypergraphs
+
+    @classmethod
+    def compile_hypergraph(cls, hypergraph: Hypergraph, resolver: NodeGroupResolver) -> CompiledHypergraph:
+        """
+        Compile the hypergraph into steps in the order of CodeGenerator.construct_main_function.
+
+        Node group that gets more than one value (spider) gets a tuple of them, like spider variables
+        of generated code. Node groups used by several boxes refer to the same slot.
+        Hyper edges are optimized like main functions of generated code if CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS
+        is set: dead pure boxes are removed, repeated pure calls reuse the slot of the first call
+        and outputs of copy boxes refer to their argument.
+
+        Raises:
+            ValueError: If a box has no function or hyper edges of the hypergraph form a cycle.
+            RuntimeError: If a box uses a node group that does not get a value.
+        """
+        CodeGenerator.get_all_box_functions(hypergraph)
+        inputs = CodeGenerator.get_sorted_diagram_inputs(hypergraph, resolver.receiver, hypergraph.canvas_id)
+        compiled = CompiledHypergraph(resolver.receiver, hypergraph, len(inputs))
+        # {node group hash: references of the values that go into the node group}
+        references: dict[int, list[Reference]] = {}
+
+        for index, node in enumerate(inputs):
+            references.setdefault(resolver.get_input_actual_node_group_hash(node), []).append((index, None))
+        for group_hash in list(references):
+            cls._pack_node_group(compiled, references, group_hash)
+
+        hyper_edge_queue: deque[HyperEdge] = deque()
+        CodeGenerator.get_queue_of_hyper_edges(hypergraph, hyper_edge_queue)
+        outputs = CodeGenerator.get_sorted_diagram_outputs(hypergraph, resolver.receiver, hypergraph.canvas_id)
+        optimize = CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS
+        if optimize:
+            hyper_edge_queue = HypergraphOptimizer.remove_dead_hyper_edges(hyper_edge_queue, outputs, resolver)
+        pure_calls: dict[tuple[BoxFunction, tuple[Reference, ...]], int] = {}  # {(box function, arguments): slot}
+        for hyper_edge in hyper_edge_queue:
+            arguments = []
+            for source_node in hyper_edge.get_source_nodes():
+                group_references = (references.get(resolver.get_output_actual_node_group_hash(source_node))
+                                    or references.get(resolver.get_input_actual_node_group_hash(source_node)))
+                if group_references is None:
+                    raise RuntimeError(f"Can`t find value of the input of the box {hyper_edge.id}")
+                arguments.extend(group_references)
+            target_nodes = hyper_edge.get_target_nodes()
+            box_function = hyper_edge.get_box_function()
+            analysis = HypergraphOptimizer.analyze(box_function) if optimize else None
+            if analysis and len(target_nodes) > 1 and analysis.copies == len(target_nodes) and len(arguments) == 1:
+                target_references = arguments * len(target_nodes)
+            else:
+                call_key = (box_function, tuple(arguments))
+                if analysis and analysis.is_pure and call_key in pure_calls:
+                    slot = pure_calls[call_key]
+                else:
+                    slot = compiled.add_step(cls.get_function(box_function), arguments)
+                    if analysis and analysis.is_pure:
+                        pure_calls[call_key] = slot
+                target_references = ([(slot, index) for index in range(len(target_nodes))] if len(target_nodes) > 1
+                                     else [(slot, None)])
+
+            if len(target_nodes) > 1:
+                spiders = set()
+                for target_node, reference in zip(target_nodes, target_references):
+                    group_hash = resolver.get_input_actual_node_group_hash(target_node)
+                    if group_hash in references:
+                        spiders.add(group_hash)
+                    references.setdefault(group_hash, []).append(reference)
+                for group_hash in spiders:
+                    cls._pack_node_group(compiled, references, group_hash)
+            elif target_nodes:
+                group_hash = resolver.get_input_actual_node_group_hash(target_nodes[0])
+                references.setdefault(group_hash, []).append(target_references[0])
+                cls._pack_node_group(compiled, references, group_hash)
+
+        result = []
+        for output in outputs:
+            result.extend(references.get(resolver.get_output_actual_node_group_hash(output), []))
+        compiled.result = tuple(result)
+        return compiled
+
+    @classmethod
+    def _pack_node_group(cls, compiled: CompiledHypergraph, references: dict[int, list[Reference]], group_hash: int):
+        """Replace several values of the node group with one tuple of them."""
+        if len(references[group_hash]) > 1:
+            references[group_hash] = [(compiled.add_step(_pack, references[group_hash]), None)]
+
+    @classmethod
+    def get_function(cls, box_function: BoxFunction) -> Callable:
+        """Return compiled main function of the box function, box function code is executed only once."""
+        function = cls.functions.get(box_function)
+        if function is None:
+            source = "\n".join(box_function.imports + box_function.global_statements
+                               + box_function.helper_functions + [box_function.main_function])
+            namespace = {"__name__": "box_function"}
+            exec(compile(source, f"<box function {box_function.main_function_name}>", "exec"), namespace)
+            function = namespace[box_function.main_function_name]
+            cls.functions[box_function] = function
+            if not HypergraphOptimizer.analyze(box_function).is_pure:
+                # side effects must happen once per row, so the function is never tried with arrays
+                cls._set_batch_function(function, partial(_call_per_row, function))
+            if len(cls.functions) > cls.max_functions_size:
+                cls.batch_functions.pop(cls.functions.popitem(last=False)[1], None)
+        else:
+            cls.functions.move_to_end(box_function)
+        return function
+
+    @classmethod
+    def call_batch(cls, function: Callable, arguments: list):
+        """
+        Call the compiled box function once with arrays of all rows.
+
+        Arithmetic box functions work on arrays elementwise. Pure function that rejects arrays (raises an error
+        or does not return arrays, e.g. because it branches on its arguments) is called once per row.
+        Which way works is found out on the first call and remembered for the function. Impure functions
+        are always called once per row (see `get_function`), so they are never called more times than rows.
+
+        Calls with whole arrays raise on NumPy floating point errors, the rows are then called one by one so that
+        the failing row raises the error of Python values (ZeroDivisionError, OverflowError) instead of
+        silently giving inf or nan.
+        """
+        batch_function = cls.batch_functions.get(function)
+        if batch_function is not None:
+            cls.batch_functions.move_to_end(function)
+            if batch_function is not function:
+                return batch_function(*arguments)
+            try:
+                with np.errstate(all="raise"):
+                    return function(*arguments)
+            except FloatingPointError:
+                return _call_per_row(function, *arguments)
+        if not arguments:
+            return function()
+
+        try:
+            with np.errstate(all="raise"):
+                result = function(*arguments)
+            if _is_batch_result(result):
+                cls._set_batch_function(function, function)
+                return result
+        except FloatingPointError:
+            # error comes from values of some rows, the function is tried with arrays again on the next call
+            return _call_per_row(function, *arguments)
+        except Exception:
+            pass
+        batch_function = partial(_call_per_row, function)
+        result = batch_function(*arguments)
+        cls._set_batch_function(function, batch_function)
+        return result
+
+    @classmethod
+    def _set_batch_function(cls, function: Callable, batch_function: Callable):
+        cls.batch_functions[function] = batch_function
+        if len(cls.batch_functions) > cls.max_functions_size:
+            cls.batch_functions.popitem(last=False)
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget compiled box functions and hypergraphs."""
+        cls.functions.clear()
+        cls.compiled_hypergraphs.clear()
+        cls.batch_functions.clear()
+        HypergraphOptimizer.clear_cache()
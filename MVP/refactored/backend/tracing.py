@@ -0,0 +1,130 @@
+"""
+Lazily formatted tracing of the backend hot paths.
+
+Modules create a Tracer with their module name, so every subsystem (a package or module, see TraceSubsystem)
+can have its own level through the standard logger hierarchy. Messages use %-style arguments and are formatted
+only when a handler emits them or the event recorder is dumped, so disabled tracing costs one level check.
+
+Tracing can be turned on from the environment:
+    IVALDI_TRACE="hypergraph=debug,receiver=info"   levels of subsystems
+    IVALDI_TRACE_BUFFER=1000                        keep the last 1000 events in memory and dump them on error
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from collections import deque
+from typing import TextIO
+
+from MVP.refactored.backend.types.trace_subsystem import TraceSubsystem
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+
+
+class EventRecorder:
+    """Ring buffer of the last trace events, events are formatted only when the buffer is dumped."""
+
+    def __init__(self, size: int = 1000, level: int = logging.DEBUG):
+        self.level: int = level
+        # (time, logger name, level, message, arguments)
+        self.events: deque[tuple[float, str, int, str, tuple]] = deque(maxlen=size)
+
+    def record(self, name: str, level: int, message: str, args: tuple):
+        self.events.append((time.time(), name, level, message, args))
+
+    def get_lines(self) -> list[str]:
+        lines = []
+        for created, name, level, message, args in self.events:
+            timestamp = time.strftime("%H:%M:%S", time.localtime(created)) + f".{int(created * 1000) % 1000:03d}"
+            lines.append(f"{timestamp} - {logging.getLevelName(level)} - {name} - {message % args if args else message}")
+        return lines
+
+    def dump(self, stream: TextIO | None = None):
+        """Write recorded events to the stream (stderr by default) and clear the buffer."""
+        stream = stream or sys.stderr
+        stream.write(f"--- last {len(self.events)} trace events ---\n")
+        for line in self.get_lines():
+            stream.write(line + "\n")
+        stream.flush()
+        self.events.clear()
+
+
+class Tracer:
+    """Logger of one module that also sends events to the recorder of Tracing."""
+
+    def __init__(self, name: str):
+        self.logger: logging.Logger = logging.getLogger(name)
+
+    def debug(self, message: str, *args):
+        self.log(logging.DEBUG, message, args)
+
+    def info(self, message: str, *args):
+        self.log(logging.INFO, message, args)
+
+    def warning(self, message: str, *args):
+        self.log(logging.WARNING, message, args)
+
+    def log(self, level: int, message: str, args: tuple):
+        recorder = Tracing.recorder
+        if recorder is not None and level >= recorder.level:
+            recorder.record(self.logger.name, level, message, args)
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, stacklevel=3)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """True if event of the level is logged or recorded, use it before building costly arguments."""
+        recorder = Tracing.recorder
+        return (recorder is not None and level >= recorder.level) or self.logger.isEnabledFor(level)
+
+
+class Tracing:
+    """Levels of subsystems and the optional event recorder that is shared by all tracers."""
+
+    recorder: EventRecorder | None = None
+
+    @staticmethod
+    def set_level(subsystem: TraceSubsystem, level: int | str):
+        """Set level of the subsystem and make sure that its messages have a handler."""
+        if not logging.getLogger().handlers:
+            logging.basicConfig(format=LOG_FORMAT)
+        logging.getLogger(subsystem.value).setLevel(level)
+
+    @staticmethod
+    def start_recording(size: int = 1000, level: int = logging.DEBUG) -> EventRecorder:
+        Tracing.recorder = EventRecorder(size, level)
+        return Tracing.recorder
+
+    @staticmethod
+    def stop_recording():
+        Tracing.recorder = None
+
+    @staticmethod
+    def dump_recording(stream: TextIO | None = None):
+        """Dump recorded events, nothing is done if recording is not started."""
+        if Tracing.recorder is not None:
+            Tracing.recorder.dump(stream)
+
+    @staticmethod
+    def configure(levels: str = "", buffer_size: int = 0):
+        """
+        Configure tracing from strings like in the environment variables.
+
+        :param levels: comma separated subsystem=level pairs, for example "hypergraph=debug,receiver=info"
+        :param buffer_size: size of the event recorder, recording is not started if it is 0
+        """
+        for pair in filter(None, (part.strip() for part in levels.split(","))):
+            subsystem, _, level = pair.partition("=")
+            try:
+                Tracing.set_level(TraceSubsystem[subsystem.strip().upper()], level.strip().upper())
+            except (KeyError, ValueError):
+                raise ValueError(f"Invalid trace level '{pair}', expected <subsystem>=<level> with subsystem one of "
+                                 f"{', '.join(subsystem.name.lower() for subsystem in TraceSubsystem)}")
+        if buffer_size > 0:
+            Tracing.start_recording(buffer_size)
+
+    @staticmethod
+    def configure_from_environment():
+        Tracing.configure(os.environ.get("IVALDI_TRACE", ""), int(os.environ.get("IVALDI_TRACE_BUFFER", "0")))
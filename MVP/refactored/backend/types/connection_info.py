@@ -62,6 +62,11 @@ class ConnectionInfo:
     def from_list(cls, data) -> Self:
         return ConnectionInfo(data[0], data[2], data[3], data[1])
 
+    @classmethod
+    def from_data(cls, data: list | ConnectionInfo) -> ConnectionInfo:
+        """Return connection of imported data, connections read from JSON are in the `to_list` form."""
+        return cls.from_list(data) if isinstance(data, list) else data
+
     def __eq__(self, __value):
         return isinstance(__value, ConnectionInfo) and self.id == __value.id
 
@@ -0,0 +1,6 @@
+from enum import StrEnum
+
+
+class FormattingMode(StrEnum):
+    FAST = "fast"  # code is emitted from the AST and joined with PEP 8 blank lines, autopep8 is not used
+    PRETTY = "pretty"  # every code fragment is formatted with autopep8
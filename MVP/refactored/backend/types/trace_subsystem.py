@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class TraceSubsystem(StrEnum):
+    # values are names of the parent loggers of the subsystem modules
+    RECEIVER = "MVP.refactored.backend.diagram_callback"
+    HYPERGRAPH = "MVP.refactored.backend.hypergraph"
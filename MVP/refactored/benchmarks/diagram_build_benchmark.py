@@ -0,0 +1,38 @@
+"""
+Benchmark of diagram construction.
+
+Builds diagrams of example_python_code/efficiency_test files once through per-resource Receiver callbacks
+and once through a DiagramBatch with one `Receiver.build_diagram` call, as the importers do.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.diagram_build_benchmark [--repeat N] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+from MVP.refactored.benchmarks.diagram_builder import EFFICIENCY_TEST_DIR, build_diagram_from_file
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+
+DEFAULT_FILES = ["500.py", "1000.py", "5000.py"]
+
+
+def run(file_names: list[str], repeat: int):
+    print(f"{'file':<10}{'callbacks ms':>14}{'batch ms':>12}{'speedup':>9}")
+    for file_name in file_names:
+        file_path = os.path.join(EFFICIENCY_TEST_DIR, file_name)
+        callback_time = measure(lambda: build_diagram_from_file(file_path), repeat)
+        batch_time = measure(lambda: build_diagram_from_file(file_path, use_batch=True), repeat)
+        print(f"{file_name:<10}{callback_time:>14.1f}{batch_time:>12.1f}{callback_time / batch_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare diagram construction through callbacks and batch.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every construction is measured")
+    args = parser.parse_args()
+    run(args.files, args.repeat)
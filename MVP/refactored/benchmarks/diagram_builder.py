@@ -0,0 +1,134 @@
+"""
+Builds diagrams of example_python_code/efficiency_test files through Receiver callbacks, without Tk.
+
+Every function of the file becomes a box function, every call in the main block becomes a box,
+every variable becomes a spider, constants become diagram inputs and the last variable is the diagram output.
+With use_batch the resources are collected to a DiagramBatch and built with one `Receiver.build_diagram` call.
+"""
+
+from __future__ import annotations
+
+import ast
+import copy
+import os
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.diagram_batch import DiagramBatch
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+
+EFFICIENCY_TEST_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "example_python_code", "efficiency_test")
+CANVAS_ID = 0
+
+
+class DiagramBuilder:
+    """Creates diagram resources with unique ids through Receiver callbacks or a DiagramBatch."""
+
+    def __init__(self, receiver: Receiver = None, canvas_id: int = CANVAS_ID, use_batch: bool = False):
+        self.receiver: Receiver = receiver or Receiver()
+        self.canvas_id: int = canvas_id
+        self.next_id: int = canvas_id
+        self.batch: DiagramBatch | None = DiagramBatch() if use_batch else None
+        self.receiver.add_new_canvas(canvas_id)
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def add_box(self, inputs: int, outputs: int, box_function: BoxFunction) -> tuple[list[ConnectionInfo], list[ConnectionInfo]]:
+        """Add box with given box function, return its left and right connections."""
+        box_id = self.new_id()
+        if self.batch is not None:
+            left = [ConnectionInfo(i, ConnectionSide.LEFT, self.new_id(), box_id) for i in range(inputs)]
+            right = [ConnectionInfo(i, ConnectionSide.RIGHT, self.new_id(), box_id) for i in range(outputs)]
+            self.batch.add_box(self.canvas_id, box_id, [c.id for c in left], [c.id for c in right], box_function)
+            return left, right
+        self.receiver.receiver_callback(ActionType.BOX_CREATE, generator_id=box_id, canvas_id=self.canvas_id)
+        left, right = [], []
+        for connections, action, side, amount in ((left, ActionType.BOX_ADD_LEFT, ConnectionSide.LEFT, inputs),
+                                                  (right, ActionType.BOX_ADD_RIGHT, ConnectionSide.RIGHT, outputs)):
+            for i in range(amount):
+                connection_id = self.new_id()
+                self.receiver.receiver_callback(action, generator_id=box_id, connection_nr=i,
+                                                connection_id=connection_id, canvas_id=self.canvas_id)
+                connections.append(ConnectionInfo(i, side, connection_id, box_id))
+        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box_id, canvas_id=self.canvas_id,
+                                        box_function=box_function)
+        return left, right
+
+    def add_input(self, index: int) -> ConnectionInfo:
+        connection_id = self.new_id()
+        if self.batch is not None:
+            self.batch.add_input(self.canvas_id, connection_id, index)
+            return ConnectionInfo(index, ConnectionSide.RIGHT, connection_id)
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_INPUT, connection_id=connection_id, connection_nr=index,
+                                        connection_side=ConnectionSide.RIGHT, canvas_id=self.canvas_id)
+        return ConnectionInfo(index, ConnectionSide.RIGHT, connection_id)
+
+    def add_output(self, index: int) -> ConnectionInfo:
+        connection_id = self.new_id()
+        if self.batch is not None:
+            self.batch.add_output(self.canvas_id, connection_id, index)
+            return ConnectionInfo(index, ConnectionSide.LEFT, connection_id)
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_OUTPUT, connection_id=connection_id, connection_nr=index,
+                                        connection_side=ConnectionSide.LEFT, canvas_id=self.canvas_id)
+        return ConnectionInfo(index, ConnectionSide.LEFT, connection_id)
+
+    def add_spider(self) -> ConnectionInfo:
+        spider_id = self.new_id()
+        if self.batch is not None:
+            self.batch.add_spider(self.canvas_id, spider_id)
+            return ConnectionInfo(0, ConnectionSide.SPIDER, spider_id)
+        self.receiver.receiver_callback(ActionType.SPIDER_CREATE, resource_id=spider_id, canvas_id=self.canvas_id)
+        return ConnectionInfo(0, ConnectionSide.SPIDER, spider_id)
+
+    def add_wire(self, start: ConnectionInfo, end: ConnectionInfo):
+        if self.batch is not None:
+            # Receiver changes connection info of the spider side, batch build happens later
+            self.batch.add_wire(self.canvas_id, self.new_id(), copy.copy(start), copy.copy(end))
+            return
+        self.receiver.receiver_callback(ActionType.WIRE_CREATE, resource_id=self.new_id(), canvas_id=self.canvas_id,
+                                        start_connection=start, end_connection=end)
+
+    def finish(self):
+        """Build the collected batch, nothing is done when resources were sent through callbacks."""
+        if self.batch is not None:
+            self.receiver.build_diagram(self.batch)
+            self.batch = DiagramBatch()
+
+
+def build_diagram_from_file(file_path: str, use_batch: bool = False) -> DiagramBuilder:
+    """Clear the HypergraphManager and build the diagram of the efficiency test file."""
+    HypergraphManager.clear()
+    with open(file_path) as file:
+        source_code = file.read()
+    module = ast.parse(source_code)
+
+    box_functions: dict[str, BoxFunction] = {}
+    for statement in module.body:
+        if isinstance(statement, ast.FunctionDef):
+            box_functions[statement.name] = BoxFunction(file_code=ast.get_source_segment(source_code, statement),
+                                                        main_function_name=statement.name)
+    main_block = next(statement for statement in module.body if isinstance(statement, ast.If))
+
+    builder = DiagramBuilder(use_batch=use_batch)
+    variables: dict[str, ConnectionInfo] = {}
+    inputs = 0
+    for statement in main_block.body:
+        spider = builder.add_spider()
+        if isinstance(statement.value, ast.Call):
+            left, right = builder.add_box(len(statement.value.args), 1, box_functions[statement.value.func.id])
+            for argument, connection in zip(statement.value.args, left):
+                builder.add_wire(variables[argument.id], connection)
+            builder.add_wire(right[0], spider)
+        else:
+            builder.add_wire(builder.add_input(inputs), spider)
+            inputs += 1
+        variables[statement.targets[0].id] = spider
+
+    builder.add_wire(spider, builder.add_output(0))
+    builder.finish()
+    return builder
@@ -0,0 +1,92 @@
+"""
+Benchmark of running a diagram with DiagramRuntime.
+
+Writes a synthetic project, loads it without Tk and compares running every hypergraph of the diagram through
+generated code (code generation, compilation and execution of the module, then calls of the main functions)
+with calls of the hypergraphs compiled by DiagramRuntime. Compilation time is measured separately.
+Then diagrams of example_python_code/efficiency_test files are run on random rows, once row by row
+and once on whole arrays (CompiledHypergraph.run_batch).
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.diagram_runtime_benchmark [--boxes N] [--hypergraphs N] [--runs N]
+        [--rows N] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.runtime.diagram_runtime import DiagramRuntime
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.benchmarks.diagram_builder import EFFICIENCY_TEST_DIR, build_diagram_from_file
+from MVP.refactored.benchmarks.synthetic_project_generator import SyntheticProjectGenerator
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+from MVP.refactored.util.importer.json_importer.headless_json_importer import HeadlessJsonImporter
+
+DEFAULT_FILES = ["500.py", "2000.py", "5000.py"]
+
+
+def run(box_count: int, hypergraphs: int, runs: int, repeat: int):
+    generator = SyntheticProjectGenerator(box_count=box_count, hypergraphs=hypergraphs)
+    with tempfile.TemporaryDirectory() as directory:
+        importer = HeadlessJsonImporter()
+        canvas_id = importer.load_project(generator.write(directory))
+
+    def run_generated_code():
+        namespace = {}
+        exec(CodeGenerator.generate_diagram_code(importer.receiver, canvas_id, FormattingMode.FAST), namespace)
+        return [namespace[f"main_{i}"](1) for i in range(hypergraphs)]
+
+    def compile_from_scratch():
+        DiagramRuntime.clear_cache()
+        DiagramRuntime.compile_diagram(importer.receiver, canvas_id)
+
+    generated_time = measure(run_generated_code, repeat)
+    compile_time = measure(compile_from_scratch, repeat)
+    compiled_hypergraphs = DiagramRuntime.compile_diagram(importer.receiver, canvas_id)
+    if run_generated_code() != [compiled(1) for compiled in compiled_hypergraphs]:
+        raise RuntimeError("Results of the generated code and the runtime differ")
+
+    def run_compiled():
+        for _ in range(runs):
+            for compiled in compiled_hypergraphs:
+                compiled(1)
+
+    runtime_time = measure(run_compiled, repeat) / runs
+    print(f"{generator.element_count} elements, {hypergraphs} hypergraphs")
+    print(f"    generate, exec and run {generated_time:>10.3f} ms")
+    print(f"    compile                {compile_time:>10.3f} ms")
+    print(f"    run compiled           {runtime_time:>10.3f} ms ({1000 / runtime_time:.0f} runs per second)")
+
+
+def run_batches(file_names: list[str], row_count: int, repeat: int):
+    random = np.random.default_rng(0)
+    print(f"{'file':<10}{'rows':>8}{'row by row ms':>15}{'batch ms':>10}{'speedup':>9}")
+    for file_name in file_names:
+        builder = build_diagram_from_file(os.path.join(EFFICIENCY_TEST_DIR, file_name), use_batch=True)
+        for compiled in DiagramRuntime.compile_diagram(builder.receiver, builder.canvas_id):
+            inputs = [random.uniform(1, 2, row_count) for _ in range(compiled.input_count)]
+            with np.errstate(all="ignore"):
+                rows_time = measure(lambda: [compiled(*row) for row in zip(*inputs)], repeat)
+                batch_time = measure(lambda: compiled.run_batch(*inputs), repeat)
+            print(f"{file_name:<10}{row_count:>8}{rows_time:>15.1f}{batch_time:>10.1f}{rows_time / batch_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare running generated code and compiled hypergraphs.")
+    parser.add_argument("--boxes", type=int, default=200, help="number of boxes in the project")
+    parser.add_argument("--hypergraphs", type=int, default=4, help="number of independent hypergraphs")
+    parser.add_argument("--runs", type=int, default=1000, help="runs of the compiled diagram in one measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every measurement is taken")
+    parser.add_argument("--rows", type=int, default=10_000, help="number of rows of the batches")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    args = parser.parse_args()
+    run(args.boxes, args.hypergraphs, args.runs, args.repeat)
+    run_batches(args.files, args.rows, args.repeat)
@@ -0,0 +1,57 @@
+"""
+Benchmark of code generation formatting modes.
+
+Builds the diagram of an example_python_code/efficiency_test file and measures code generation from scratch in
+"fast" mode, in "pretty" mode with an empty formatted fragment cache and in "pretty" mode
+when every fragment is already generated and formatted (as on a repeated generation of an unchanged diagram).
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.formatting_benchmark [--repeat N] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from types import SimpleNamespace
+
+from MVP.refactored.backend.code_generation.code_formatter import CodeFormatter
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.benchmarks.diagram_builder import EFFICIENCY_TEST_DIR, build_diagram_from_file
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+
+DEFAULT_FILES = ["5000.py"]
+
+
+def run(file_names: list[str], repeat: int):
+    print(f"{'file':<10}{'boxes':>7}{'fast ms':>12}{'pretty cold ms':>16}{'pretty warm ms':>16}{'cold / fast':>13}")
+    for file_name in file_names:
+        builder = build_diagram_from_file(os.path.join(EFFICIENCY_TEST_DIR, file_name))
+        canvas = SimpleNamespace(id=builder.canvas_id, receiver=builder.receiver)
+        boxes = len(builder.receiver.diagrams[builder.canvas_id].boxes)
+
+        def generate_fast():
+            CodeGenerator.clear_cache()
+            CodeGenerator.generate_code(canvas, FormattingMode.FAST)
+
+        def generate_pretty_cold():
+            CodeFormatter.clear()
+            CodeGenerator.clear_cache()
+            CodeGenerator.generate_code(canvas, FormattingMode.PRETTY)
+
+        fast_time = measure(generate_fast, repeat)
+        cold_time = measure(generate_pretty_cold, repeat)
+        warm_time = measure(lambda: CodeGenerator.generate_code(canvas, FormattingMode.PRETTY), repeat)
+        print(f"{file_name:<10}{boxes:>7}{fast_time:>12.1f}{cold_time:>16.1f}{warm_time:>16.1f}"
+              f"{cold_time / fast_time:>12.1f}x")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare fast and pretty code generation.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every generation is measured")
+    args = parser.parse_args()
+    run(args.files, args.repeat)
@@ -0,0 +1,67 @@
+"""
+Benchmark of incremental code generation.
+
+Writes a synthetic project, loads it without Tk and measures code generation from scratch, repeated generation
+of the unchanged diagram and generation after the box function of one box was changed through a Receiver callback
+(as when a box is edited in the GUI between two "generate code" clicks).
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.incremental_generation_benchmark [--boxes N] [--hypergraphs N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+from itertools import cycle
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.benchmarks.synthetic_project_generator import SyntheticProjectGenerator
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+from MVP.refactored.util.importer.json_importer.headless_json_importer import HeadlessJsonImporter
+
+
+def run(box_count: int, hypergraphs: int, repeat: int, mode: FormattingMode):
+    generator = SyntheticProjectGenerator(box_count=box_count, hypergraphs=hypergraphs)
+    with tempfile.TemporaryDirectory() as directory:
+        importer = HeadlessJsonImporter()
+        canvas_id = importer.load_project(generator.write(directory))
+    box = next(box for box in generator.generate()["main_canvas"]["boxes"]
+               if box.get("box_function", {}).get("main_function_name") == "increment")
+    functions = cycle([BoxFunction(file_code="def double(x):\n    return 2 * x\n", main_function_name="double"),
+                       BoxFunction(file_code="def increment(x):\n    return x + 1\n", main_function_name="increment")])
+
+    def generate():
+        CodeGenerator.generate_diagram_code(importer.receiver, canvas_id, mode)
+
+    def generate_from_scratch():
+        CodeGenerator.clear_cache()
+        generate()
+
+    def edit_and_generate():
+        importer.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box["id"], canvas_id=canvas_id,
+                                            box_function=next(functions))
+        generate()
+
+    scratch_time = measure(generate_from_scratch, repeat)
+    unchanged_time = measure(generate, repeat)
+    edit_time = measure(edit_and_generate, repeat)
+    print(f"{generator.element_count} elements, {hypergraphs} hypergraphs, {mode} mode")
+    print(f"    from scratch       {scratch_time:>10.1f} ms")
+    print(f"    unchanged          {unchanged_time:>10.1f} ms")
+    print(f"    one box edited     {edit_time:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare code generation from scratch and incremental generation.")
+    parser.add_argument("--boxes", type=int, default=2000, help="number of boxes in the project")
+    parser.add_argument("--hypergraphs", type=int, default=20, help="number of independent hypergraphs")
+    parser.add_argument("--repeat", type=int, default=5, help="how many times every generation is measured")
+    parser.add_argument("--mode", choices=[mode.value for mode in FormattingMode], default=FormattingMode.FAST)
+    args = parser.parse_args()
+    run(args.boxes, args.hypergraphs, args.repeat, FormattingMode(args.mode))
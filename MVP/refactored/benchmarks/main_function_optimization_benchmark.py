@@ -0,0 +1,68 @@
+"""
+Benchmark of the optimization of generated main functions (HypergraphOptimizer).
+
+For every example_python_code/efficiency_test file the diagram is built without Tk and code is generated
+with and without CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS. Reported are the numbers of emitted box calls,
+times of calling the generated main function and whether both versions return the same result.
+Inputs are NumPy floats, so division by zero in removed boxes gives inf or nan instead of an exception.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.main_function_optimization_benchmark [--runs N] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+
+import numpy as np
+
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.benchmarks.diagram_builder import EFFICIENCY_TEST_DIR, build_diagram_from_file
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+
+DEFAULT_FILES = ["500.py", "1000.py", "2000.py", "3000.py", "4000.py", "5000.py"]
+
+
+def generate_main_function(builder, optimize: bool) -> tuple[callable, int]:
+    """Return main function of the generated code and the number of box calls in it."""
+    optimize_main_functions = CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS
+    CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS = optimize
+    CodeGenerator.clear_cache()
+    try:
+        code = CodeGenerator.generate_diagram_code(builder.receiver, builder.canvas_id, FormattingMode.FAST)
+    finally:
+        CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS = optimize_main_functions
+        CodeGenerator.clear_cache()
+    namespace = {}
+    exec(code, namespace)
+    main_function = code[code.index("def main_0"):]
+    return namespace["main_0"], sum(1 for line in main_function.splitlines() if line.lstrip().startswith("res_"))
+
+
+def run(file_names: list[str], runs: int, repeat: int):
+    print(f"{'file':<10}{'calls':>7}{'optimized':>11}{'run ms':>10}{'optimized ms':>14}{'speedup':>9}  same result")
+    for file_name in file_names:
+        builder = build_diagram_from_file(os.path.join(EFFICIENCY_TEST_DIR, file_name), use_batch=True)
+        main_function, calls = generate_main_function(builder, False)
+        optimized_main_function, optimized_calls = generate_main_function(builder, True)
+        inputs = [np.float64(1.5 + i) for i in range(main_function.__code__.co_argcount)]
+
+        with np.errstate(all="ignore"):
+            time = measure(lambda: [main_function(*inputs) for _ in range(runs)], repeat) / runs
+            optimized_time = measure(lambda: [optimized_main_function(*inputs) for _ in range(runs)], repeat) / runs
+            same_result = np.allclose(main_function(*inputs), optimized_main_function(*inputs), equal_nan=True)
+        print(f"{file_name:<10}{calls:>7}{optimized_calls:>11}{time:>10.3f}{optimized_time:>14.3f}"
+              f"{time / optimized_time:>8.1f}x  {same_result}")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare generated main functions with and without optimization.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    parser.add_argument("--runs", type=int, default=100, help="calls of the main function in one measurement")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every measurement is taken")
+    args = parser.parse_args()
+    run(args.files, args.runs, args.repeat)
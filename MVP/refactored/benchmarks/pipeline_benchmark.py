@@ -0,0 +1,198 @@
+"""
+Benchmark of the headless pipeline stages over example_python_code/efficiency_test files.
+
+For every file the stages are run in order: Python import (PythonImporter._extract_data_from_file),
+FunctionParser on the main block, diagram construction, reading hypergraphs of the canvas, code generation,
+HypergraphExporter content and the diagram and hypergraph notations. The pseudo notation needs Tk canvas objects
+and is not measured. Time of a stage is the best of --repeat runs, peak memory is measured with tracemalloc
+in a separate run, so tracing does not slow down the timed runs.
+
+Results are written to JSON and compared with the stored baseline. A stage is reported as a regression
+when its growth exponent over all files (time ~ size ^ exponent) grows more than --exponent-tolerance,
+e.g. when a linear stage becomes quadratic. Exponents do not depend on the speed of the machine, so the default
+run can be used as a CI gate. Absolute times are compared only with --tolerance (a stage is reported when its
+time grows more than --tolerance times), they are comparable only with a baseline saved on the same machine
+with --save-baseline.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.pipeline_benchmark [--repeat N] [--output results.json] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Callable
+
+from MVP.refactored.backend.box_functions.function_structure.function_parser import FunctionParser
+from MVP.refactored.backend.code_generation.code_formatter import CodeFormatter
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.benchmarks.diagram_builder import EFFICIENCY_TEST_DIR, build_diagram_from_file
+from MVP.refactored.modules.notations.diagram_notation.diagram_notation import DiagramNotation
+from MVP.refactored.modules.notations.hypergraph_notation.hypergraph_notation import HypergraphNotation
+from MVP.refactored.util.exporter.hypergraph_exporter import HypergraphExporter
+from MVP.refactored.util.importer.python_importer.python_importer import PythonImporter
+
+DEFAULT_FILES = ["500.py", "1000.py", "2000.py", "3000.py", "4000.py", "5000.py"]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "pipeline_baseline.json")
+STAGES = ["python_import", "function_parser", "diagram_construction", "get_graphs_by_canvas_id",
+          "code_generation", "hypergraph_export", "diagram_notation", "hypergraph_notation"]
+
+
+def create_stages(file_path: str) -> tuple[list[tuple[str, Callable[[], object]]], SimpleNamespace]:
+    """
+    Return stages of the pipeline in the order they must be run and the state they share.
+
+    Later stages use results of earlier ones from the state.
+    """
+    state = SimpleNamespace()
+
+    def python_import():
+        with open(file_path) as file:
+            state.functions, state.imports, state.main_logic = PythonImporter._extract_data_from_file(file)
+        with open(file_path) as file:
+            state.main_block = next(node for node in ast.parse(file.read()).body if isinstance(node, ast.If))
+
+    def diagram_construction():
+        state.builder = build_diagram_from_file(file_path, use_batch=True)
+        state.canvas = SimpleNamespace(id=state.builder.canvas_id, receiver=state.builder.receiver)
+
+    def code_generation():
+        CodeFormatter.clear()
+        CodeGenerator.clear_cache()
+        return CodeGenerator.generate_code(state.canvas)
+
+    return [
+        ("python_import", python_import),
+        ("function_parser", lambda: FunctionParser.parse_function_tree(state.main_block)),
+        ("diagram_construction", diagram_construction),
+        ("get_graphs_by_canvas_id", lambda: HypergraphManager.get_graphs_by_canvas_id(state.canvas.id)),
+        ("code_generation", code_generation),
+        ("hypergraph_export", lambda: HypergraphExporter(state.canvas).create_file_content("")),
+        ("diagram_notation",
+         lambda: DiagramNotation(state.canvas.receiver.diagrams[state.canvas.id]).get_graph_string()),
+        ("hypergraph_notation", lambda: HypergraphNotation().get_all_hypergraph_notations()),
+    ], state
+
+
+def measure_file(file_path: str, repeat: int, memory: bool) -> dict:
+    stages: dict[str, dict] = {stage: {"seconds": float("inf")} for stage in STAGES}
+    for _ in range(repeat):
+        pipeline, state = create_stages(file_path)
+        for stage, function in pipeline:
+            start = time.perf_counter()
+            function()
+            stages[stage]["seconds"] = min(stages[stage]["seconds"], time.perf_counter() - start)
+
+    if memory:
+        tracemalloc.start()
+        pipeline, state = create_stages(file_path)
+        for stage, function in pipeline:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            function()
+            stages[stage]["peak_bytes"] = tracemalloc.get_traced_memory()[1] - current
+        tracemalloc.stop()
+
+    diagram = state.canvas.receiver.diagrams[state.canvas.id]
+    HypergraphManager.clear()
+    return {"elements": len(diagram.boxes) + len(diagram.spiders) + len(diagram.resources), "stages": stages}
+
+
+def growth_exponents(files: dict[str, dict]) -> dict[str, float]:
+    """Return exponent k of time ~ elements ^ k of every stage, fitted with least squares on log-log scale."""
+    if len(files) < 2:
+        return {}
+    sizes = [math.log(result["elements"]) for result in files.values()]
+    mean_size = sum(sizes) / len(sizes)
+    variance = sum((size - mean_size) ** 2 for size in sizes)
+    exponents = {}
+    for stage in STAGES:
+        times = [math.log(max(result["stages"][stage]["seconds"], 1e-9)) for result in files.values()]
+        mean_time = sum(times) / len(times)
+        covariance = sum((size - mean_size) * (t - mean_time) for size, t in zip(sizes, times))
+        exponents[stage] = round(covariance / variance, 2)
+    return exponents
+
+
+def run(file_names: list[str], repeat: int, memory: bool) -> dict:
+    files = {}
+    for file_name in file_names:
+        files[file_name] = measure_file(os.path.join(EFFICIENCY_TEST_DIR, file_name), repeat, memory)
+        print_file(file_name, files[file_name])
+    return {"python": platform.python_version(), "machine": platform.machine(), "repeat": repeat,
+            "files": files, "growth_exponents": growth_exponents(files)}
+
+
+def print_file(file_name: str, result: dict):
+    print(f"{file_name} ({result['elements']} elements)")
+    for stage, measurement in result["stages"].items():
+        peak = f"{measurement['peak_bytes'] / 2 ** 20:>10.1f} MiB" if "peak_bytes" in measurement else ""
+        print(f"    {stage:<26}{measurement['seconds'] * 1000:>12.1f} ms{peak}")
+
+
+def compare(results: dict, baseline: dict, exponent_tolerance: float, tolerance: float | None = None) -> list[str]:
+    """
+    Return descriptions of stages that grow faster than in the baseline.
+
+    :param tolerance: if given, also stages whose time is more than tolerance times the baseline time
+    """
+    regressions = []
+    for file_name, result in results["files"].items():
+        baseline_file = baseline["files"].get(file_name)
+        if tolerance is None or baseline_file is None:
+            continue
+        for stage, measurement in result["stages"].items():
+            baseline_seconds = baseline_file["stages"].get(stage, {}).get("seconds")
+            if baseline_seconds and measurement["seconds"] > baseline_seconds * tolerance:
+                regressions.append(f"{file_name} {stage}: {measurement['seconds'] * 1000:.1f} ms, "
+                                   f"baseline {baseline_seconds * 1000:.1f} ms")
+    for stage, exponent in results["growth_exponents"].items():
+        baseline_exponent = baseline.get("growth_exponents", {}).get(stage)
+        if baseline_exponent is not None and exponent > baseline_exponent + exponent_tolerance:
+            regressions.append(f"{stage}: grows as elements ^ {exponent}, baseline elements ^ {baseline_exponent}")
+    return regressions
+
+
+def main(arguments: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure headless pipeline stages and compare with the baseline.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every stage is measured")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure peak memory")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON file of the baseline results")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="also compare absolute times, allowed slowdown of a stage (baseline of the same machine)")
+    parser.add_argument("--exponent-tolerance", type=float, default=0.3, help="allowed growth of the exponent")
+    args = parser.parse_args(arguments)
+
+    results = run(args.files, args.repeat, not args.no_memory)
+    print("growth exponents: " + ", ".join(f"{stage} {exponent}"
+                                           for stage, exponent in results["growth_exponents"].items()))
+    for path in filter(None, (args.output, args.baseline if args.save_baseline else None)):
+        with open(path, "w") as file:
+            json.dump(results, file, indent=4)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as file:
+        regressions = compare(results, json.load(file), args.exponent_tolerance, args.tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    sys.exit(main())
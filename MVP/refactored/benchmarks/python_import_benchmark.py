@@ -0,0 +1,92 @@
+"""
+Benchmark of extracting functions and main logic from Python files.
+
+Compares PythonImporter._extract_data_from_source with the previous extraction, which got every function source
+with ast.get_source_segment (the whole source is split into lines on every call) and parsed every function again
+when its BoxFunction was created. Then all files are extracted at once with PythonImporter.extract_data_from_files,
+serially and in a process pool.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.python_import_benchmark [--repeat N] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import io
+import logging
+import os
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.box_functions.function_structure.function_parser import FunctionParser
+from MVP.refactored.benchmarks.diagram_builder import EFFICIENCY_TEST_DIR
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+from MVP.refactored.util.importer.python_importer.python_importer import PythonImporter
+
+DEFAULT_FILES = ["500.py", "1000.py", "2000.py", "5000.py"]
+
+
+def extract_data_previous(source_code: str) -> tuple:
+    """Previous PythonImporter._extract_data_from_file."""
+    functions = {}
+    tree = ast.parse(source_code)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            num_inputs = len(node.args.args)
+            box_function = BoxFunction(main_function_name=node.name, function=ast.get_source_segment(source_code, node),
+                                       min_args=num_inputs, max_args=num_inputs)
+            box_function.function_structure.convert_mutable_variables_to_immutable()
+            functions[node.name] = box_function
+
+    main_logic = None
+    for node in tree.body:
+        if isinstance(node, ast.If):
+            main_logic = FunctionParser.parse_function_tree(node)
+            main_logic.convert_mutable_variables_to_immutable()
+    return functions, main_logic
+
+
+def check_same_result(source_code: str):
+    previous_functions, previous_main_logic = extract_data_previous(source_code)
+    functions, _, main_logic = PythonImporter._extract_data_from_source(source_code)
+    if (previous_functions != functions or str(previous_main_logic) != str(main_logic)
+            or [f.function_structure for f in previous_functions.values()]
+            != [f.function_structure for f in functions.values()]):
+        raise RuntimeError("Extraction results differ")
+
+
+def run(file_names: list[str], repeat: int):
+    source_codes = []
+    print(f"{'file':<10}{'lines':>7}{'previous ms':>13}{'new ms':>10}{'speedup':>9}")
+    for file_name in file_names:
+        with open(os.path.join(EFFICIENCY_TEST_DIR, file_name)) as file:
+            source_code = file.read()
+        source_codes.append(source_code)
+        check_same_result(source_code)
+        previous_time = measure(lambda: extract_data_previous(source_code), repeat)
+        new_time = measure(lambda: PythonImporter._extract_data_from_source(source_code), repeat)
+        print(f"{file_name:<10}{source_code.count(chr(10)):>7}{previous_time:>13.1f}{new_time:>10.1f}"
+              f"{previous_time / new_time:>8.1f}x")
+
+    def extract_all():
+        PythonImporter.extract_data_from_files([io.StringIO(source_code) for source_code in source_codes],
+                                               parallel=True)
+
+    threshold, min_files = PythonImporter.PARALLEL_IMPORT_THRESHOLD, PythonImporter.PARALLEL_IMPORT_MIN_FILES
+    PythonImporter.PARALLEL_IMPORT_THRESHOLD = float("inf")
+    serial_time = measure(extract_all, repeat)
+    PythonImporter.PARALLEL_IMPORT_THRESHOLD, PythonImporter.PARALLEL_IMPORT_MIN_FILES = 0, 2
+    parallel_time = measure(extract_all, repeat)
+    PythonImporter.PARALLEL_IMPORT_THRESHOLD, PythonImporter.PARALLEL_IMPORT_MIN_FILES = threshold, min_files
+    print(f"all {len(source_codes)} files: serial {serial_time:.1f} ms, "
+          f"process pool {parallel_time:.1f} ms ({os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare previous and new extraction of Python files.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every extraction is measured")
+    args = parser.parse_args()
+    run(args.files, args.repeat)
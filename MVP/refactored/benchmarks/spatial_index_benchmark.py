@@ -0,0 +1,109 @@
+"""
+Benchmark of canvas hit-testing with the spatial index.
+
+Places boxes in a grid like a big diagram on a CustomCanvas and simulates dragging one box across the canvas.
+Every motion event snaps the box to the x-axis of other boxes, moves the box in the index and tests a point for
+a Connection. The previous handlers checked every box of the canvas on every event. Tk is not needed, the benchmark
+only uses frontend/util/spatial_index.py.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.spatial_index_benchmark [--boxes N] [--events N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+from MVP.refactored.frontend.util.spatial_index import SpatialIndex
+
+BOX_SIZE = 60
+GAP = 40
+
+
+class BenchmarkBox:
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+        self.size = (BOX_SIZE, BOX_SIZE)
+
+    def get_bounds(self):
+        return self.x, self.y, self.x + self.size[0], self.y + self.size[1]
+
+
+def create_boxes(box_count: int) -> list[BenchmarkBox]:
+    columns = math.ceil(math.sqrt(box_count))
+    return [BenchmarkBox((i % columns) * (BOX_SIZE + GAP), (i // columns) * (BOX_SIZE + GAP))
+            for i in range(box_count)]
+
+
+def drag_previous(boxes: list[BenchmarkBox], dragged: BenchmarkBox, events: list[tuple[float, float]]) -> list:
+    """Previous Box.on_drag snapping and CustomCanvas.get_connection_from_location loops."""
+    results = []
+    for x, y in events:
+        go_to_x = x
+        found = False
+        for box in boxes:
+            if box is dragged:
+                continue
+            if abs(box.x + box.size[0] / 2 - (go_to_x + dragged.size[0] / 2)) < box.size[0] / 2 + dragged.size[0] / 2:
+                go_to_x = box.x + box.size[0] / 2 - dragged.size[0] / 2
+                found = True
+        dragged.x, dragged.y = go_to_x, y
+        hit = next((box for box in boxes if box.x <= x <= box.x + box.size[0] and box.y <= y <= box.y + box.size[1]),
+                   None)
+        results.append((round(go_to_x, 6), found, hit))
+    return results
+
+
+def drag_indexed(index: SpatialIndex, dragged: BenchmarkBox, events: list[tuple[float, float]]) -> list:
+    results = []
+    for x, y in events:
+        center_x, found = index.snap_x(x + dragged.size[0] / 2, dragged.size[0] / 2, lambda item: item is not dragged)
+        go_to_x = center_x - dragged.size[0] / 2 if found else x
+        dragged.x, dragged.y = go_to_x, y
+        index.insert(dragged, dragged.get_bounds())
+        hit = next(iter(index.query_point(x, y)), None)
+        results.append((round(go_to_x, 6), found, hit))
+    return results
+
+
+def run(box_count: int, event_count: int, repeat: int):
+    boxes = create_boxes(box_count)
+    width = max(box.x for box in boxes) + BOX_SIZE
+    height = max(box.y for box in boxes) + BOX_SIZE
+    events = [(width * i / event_count, height * i / event_count) for i in range(event_count)]
+    start = (boxes[0].x, boxes[0].y)
+
+    def previous():
+        boxes[0].x, boxes[0].y = start
+        return drag_previous(boxes, boxes[0], events)
+
+    index = SpatialIndex()
+    for box in boxes:
+        index.insert(box, box.get_bounds())
+
+    def indexed():
+        boxes[0].x, boxes[0].y = start
+        index.insert(boxes[0], boxes[0].get_bounds())
+        return drag_indexed(index, boxes[0], events)
+
+    if previous() != indexed():
+        raise RuntimeError("Snapping results differ")
+    previous_time = measure(previous, repeat)
+    indexed_time = measure(indexed, repeat)
+    print(f"{box_count} boxes, {event_count} motion events")
+    print(f"    previous loops     {previous_time:>10.1f} ms ({previous_time / event_count:.3f} ms per event)")
+    print(f"    spatial index      {indexed_time:>10.1f} ms ({indexed_time / event_count:.3f} ms per event)")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare canvas hit-testing loops with the spatial index.")
+    parser.add_argument("--boxes", type=int, default=5000, help="number of boxes on the canvas")
+    parser.add_argument("--events", type=int, default=500, help="number of motion events of the drag")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times the drag is measured")
+    args = parser.parse_args()
+    run(args.boxes, args.events, args.repeat)
@@ -0,0 +1,215 @@
+"""
+Seeded generator of big synthetic projects for scaling tests.
+
+Projects are written in the ProjectExporter schema (main_canvas with boxes, spiders, io, wires and nested
+sub_diagram, box functions in the box_functions folder next to the JSON file), so they can be loaded with
+JsonImporter or HeadlessJsonImporter. Every canvas contains parallel chains, every chain is a separate hypergraph:
+
+    input -> spider -> box -> spider -> box -> ... -> spider -> output
+
+Every box takes the latest spider of its chain, "add" boxes take a second input from a random earlier spider
+of the chain that has less than spider_degree consumers, so early spiders get wide fan-out.
+On canvases above the nesting depth every chain gets `width` compound boxes at even positions
+(code generation does not support two compound boxes connected through a spider),
+their sub diagrams are generated the same way with sub_box_count boxes in one chain.
+The same parameters and seed always give the same project.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.synthetic_project_generator output_dir --boxes 10000 --hypergraphs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+
+BOX_FUNCTIONS = {
+    "increment": "def increment(x):\n    return x + 1\n",
+    "add": "def add(a, b):\n    return a + b\n",
+}
+BOX_SIZE = 60
+GAP = 120
+
+
+class SyntheticProjectGenerator:
+    """Builds project dicts, ids are unique over the project and given in creation order."""
+
+    def __init__(self,
+                 box_count: int = 1000,
+                 hypergraphs: int = 1,
+                 spider_degree: int = 4,
+                 depth: int = 0,
+                 width: int = 0,
+                 sub_box_count: int = 10,
+                 add_probability: float = 0.5,
+                 seed: int = 0):
+        """
+        :param box_count: number of boxes on the main canvas
+        :param hypergraphs: number of parallel chains (hypergraphs) on every canvas
+        :param spider_degree: maximum number of box inputs connected to one spider
+        :param depth: nesting depth of sub diagrams, 0 creates atomic boxes only
+        :param width: number of compound boxes in every chain of canvases above the nesting depth
+        :param sub_box_count: number of boxes in every sub diagram
+        :param add_probability: probability that a box takes two inputs
+        :param seed: seed of the random choices
+        """
+        if box_count < hypergraphs or hypergraphs < 1:
+            raise ValueError("Every hypergraph needs at least one box")
+        if spider_degree < 1:
+            raise ValueError("Spider degree must be at least 1")
+        self.box_count = box_count
+        self.hypergraphs = hypergraphs
+        self.spider_degree = spider_degree
+        self.depth = depth
+        self.width = width
+        self.sub_box_count = sub_box_count
+        self.add_probability = add_probability
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.next_id = 0
+        self.element_count = 0
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def generate(self) -> dict:
+        """Return project dict, can be called again to get the same project."""
+        self.random.seed(self.seed)
+        self.next_id = 0
+        self.element_count = 0
+        return {"file_name": "synthetic.json",
+                "date": 0,
+                "main_canvas": self.create_canvas(self.box_count, self.hypergraphs, self.depth, None)}
+
+    def write(self, directory: str, name: str = "synthetic") -> str:
+        """Write project JSON and box functions to the directory, return path of the JSON file."""
+        project = self.generate()
+        project["file_name"] = f"{name}.json"
+        os.makedirs(os.path.join(directory, "box_functions"), exist_ok=True)
+        for function_name, code in BOX_FUNCTIONS.items():
+            with open(os.path.join(directory, "box_functions", f"{function_name}.py"), "w") as file:
+                file.write(code)
+        json_file_path = os.path.join(directory, f"{name}.json")
+        with open(json_file_path, "w") as file:
+            json.dump(project, file)
+        return json_file_path
+
+    def create_canvas(self, box_count: int, chains: int, depth: int, source_box_id: int | None) -> dict:
+        """
+        Create canvas dict with parallel chains.
+
+        :param source_box_id: id of the compound box of the sub diagram, None for the main canvas
+        """
+        canvas = {"boxes": [], "spiders": [], "io": {"inputs": [], "outputs": []}, "wires": []}
+        for chain in range(chains):
+            chain_box_count = box_count // chains + (1 if chain < box_count % chains else 0)
+            self.add_chain(canvas, chain, chain_box_count, depth, source_box_id)
+        return canvas
+
+    def add_chain(self, canvas: dict, chain: int, box_count: int, depth: int, source_box_id: int | None):
+        y = chain * GAP
+        diagram_input = self.create_connection(self.new_id(), "right", chain, source_box_id)
+        canvas["io"]["inputs"].append(diagram_input)
+        spiders = [self.add_spider(canvas, 0, y)]
+        self.add_wire(canvas, diagram_input, spiders[0])
+        consumers = {spiders[0]["id"]: 0}
+
+        for step in range(box_count):
+            x = (step + 1) * GAP
+            if depth > 0 and step % 2 == 0 and step // 2 < self.width:
+                box, left, right = self.add_box(canvas, x, y, 1, None)
+                box["sub_diagram"] = self.create_canvas(self.sub_box_count, 1, depth - 1, box["id"])
+                box["label"] = f"sub_{box['id']}"
+            elif self.random.random() < self.add_probability:
+                box, left, right = self.add_box(canvas, x, y, 2, "add")
+            else:
+                box, left, right = self.add_box(canvas, x, y, 1, "increment")
+
+            inputs = [spiders[-1]]
+            if len(left) == 2:
+                candidates = [spider for spider in spiders if consumers[spider["id"]] < self.spider_degree]
+                inputs.append(self.random.choice(candidates) if candidates else spiders[-1])
+            for spider, connection in zip(inputs, left):
+                self.add_wire(canvas, spider, connection)
+                consumers[spider["id"]] += 1
+
+            spider = self.add_spider(canvas, x + GAP // 2, y)
+            self.add_wire(canvas, right[0], spider)
+            spiders.append(spider)
+            consumers[spider["id"]] = 0
+
+        diagram_output = self.create_connection(self.new_id(), "left", chain, source_box_id)
+        canvas["io"]["outputs"].append(diagram_output)
+        self.add_wire(canvas, spiders[-1], diagram_output)
+
+    def add_box(self, canvas: dict, x: float, y: float, inputs: int,
+                function_name: str | None) -> tuple[dict, list[dict], list[dict]]:
+        box_id = self.new_id()
+        left = [self.create_connection(self.new_id(), "left", i, box_id) for i in range(inputs)]
+        right = [self.create_connection(self.new_id(), "right", 0, box_id)]
+        box = {"id": box_id, "x": x, "y": y, "size": [BOX_SIZE, BOX_SIZE * max(inputs, 1)], "label": "",
+               "connections": left + right, "sub_diagram": None, "locked": True, "shape": "rectangle"}
+        if function_name:
+            box["box_function"] = {"relative_location": f"./box_functions/{function_name}.py",
+                                   "name": f"{function_name}.py", "main_function_name": function_name}
+        else:
+            box["box_function_relative_location"] = ""
+        canvas["boxes"].append(box)
+        self.element_count += 1
+        return box, left, right
+
+    def add_spider(self, canvas: dict, x: float, y: float) -> dict:
+        spider = {"id": self.new_id(), "x": x, "y": y, "connections": [], "type": "GENERIC"}
+        canvas["spiders"].append(spider)
+        self.element_count += 1
+        return spider
+
+    def add_wire(self, canvas: dict, start: dict, end: dict):
+        wire_id = self.new_id()
+        start_connection, end_connection = (self.get_wire_end(canvas_object, wire_id) for canvas_object in (start, end))
+        canvas["wires"].append({"id": wire_id, "start_c": start_connection, "end_c": end_connection})
+        self.element_count += 1
+
+    @staticmethod
+    def get_wire_end(canvas_object: dict, wire_id: int) -> dict:
+        """Return connection dict of the wire end, spider gets a new spider connection."""
+        if "side" in canvas_object:
+            canvas_object["has_wire"] = True
+            canvas_object["wire_id"] = wire_id
+            return canvas_object
+        connection = SyntheticProjectGenerator.create_connection(canvas_object["id"], "spider",
+                                                                 len(canvas_object["connections"]), None)
+        connection.update({"spider": True, "has_wire": True, "wire_id": wire_id})
+        canvas_object["connections"].append(connection)
+        return connection
+
+    @staticmethod
+    def create_connection(connection_id: int, side: str, index: int, box_id: int | None) -> dict:
+        return {"id": connection_id, "side": side, "index": index, "spider": False, "box_id": box_id,
+                "has_wire": False, "wire_id": None, "type": "GENERIC"}
+
+
+def main(arguments: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Write a synthetic project in the ProjectExporter schema.")
+    parser.add_argument("directory", help="output directory of the project")
+    parser.add_argument("--name", default="synthetic", help="project file name without extension")
+    parser.add_argument("--boxes", type=int, default=1000, help="number of boxes on the main canvas")
+    parser.add_argument("--hypergraphs", type=int, default=1, help="number of parallel chains on every canvas")
+    parser.add_argument("--spider-degree", type=int, default=4, help="maximum box inputs of one spider")
+    parser.add_argument("--depth", type=int, default=0, help="nesting depth of sub diagrams")
+    parser.add_argument("--width", type=int, default=0, help="compound boxes in every chain above the depth")
+    parser.add_argument("--sub-boxes", type=int, default=10, help="number of boxes in every sub diagram")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(arguments)
+
+    generator = SyntheticProjectGenerator(args.boxes, args.hypergraphs, args.spider_degree, args.depth, args.width,
+                                          args.sub_boxes, seed=args.seed)
+    json_file_path = generator.write(args.directory, args.name)
+    print(f"{json_file_path}: {generator.element_count} boxes, spiders and wires")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Microbenchmark of hypergraph traversals.
+
+Builds hypergraphs from example_python_code/efficiency_test files and compares traversals of
+backend/hypergraph/traversal.py with the previous queue.Queue based traversals.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.traversal_benchmark [--repeat N] [files...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import logging
+import os
+import time
+from queue import Queue
+from typing import Callable
+
+from MVP.refactored.backend.hypergraph import traversal
+from MVP.refactored.backend.hypergraph.hypergraph import Hypergraph
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.hypergraph.node import Node
+
+EFFICIENCY_TEST_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "example_python_code", "efficiency_test")
+DEFAULT_FILES = ["50.py", "500.py", "1000.py", "5000.py"]
+# Previous traversals put already queued nodes to the queue again, on bigger diagrams they take minutes
+DEFAULT_QUEUE_LIMIT = 200
+CANVAS_ID = 0
+
+
+def build_hypergraph(file_path: str) -> tuple[Hypergraph, Node, Node]:
+    """
+    Build hypergraph of efficiency test file main block.
+
+    Every function call is a hyper edge, every argument is a wire node that is united with the node of the variable,
+    like wires connected to a spider.
+
+    :return: hypergraph, node of the first variable and node of the last variable
+    """
+    HypergraphManager.clear()
+    with open(file_path) as file:
+        module = ast.parse(file.read())
+    main_block = next(statement for statement in module.body if isinstance(statement, ast.If))
+
+    next_id = iter(range(10 ** 6, 10 ** 7))
+    variables: dict[str, Node] = {}
+    for statement in main_block.body:
+        target = statement.targets[0].id
+        if not isinstance(statement.value, ast.Call):
+            variables[target] = HypergraphManager.create_new_node(next(next_id), CANVAS_ID)
+            continue
+        hyper_edge_id = next(next_id)
+        for argument in statement.value.args:
+            wire = HypergraphManager.create_new_node(next(next_id), CANVAS_ID)
+            HypergraphManager.union_nodes(wire, variables[argument.id].id)
+            HypergraphManager.connect_node_with_output_hyper_edge(wire, hyper_edge_id)
+        result = HypergraphManager.create_new_node(next(next_id), CANVAS_ID)
+        HypergraphManager.connect_node_with_input_hyper_edge(result, hyper_edge_id)
+        variables[target] = result
+
+    values = list(variables.values())
+    hypergraph = HypergraphManager.get_graph_by_node_id(values[-1].id)
+    return hypergraph, values[0], values[-1]
+
+
+# Previous queue.Queue based traversals, kept here for comparison.
+
+def queue_update_source_nodes_descendants(hypergraph: Hypergraph):
+    hypergraph.nodes.clear()
+    queue: Queue[Node] = Queue()
+    visited: set[int] = set()
+    for source_node in hypergraph.get_hypergraph_source():
+        queue.put(source_node)
+        for connected_node in source_node.get_children_nodes() + source_node.get_united_with_nodes():
+            queue.put(connected_node)
+
+    while not queue.empty():
+        child_node = queue.get()
+        hypergraph.nodes[child_node.id] = child_node
+        visited.add(child_node.id)
+        for connected_node in child_node.get_children_nodes() + child_node.get_united_with_nodes():
+            if connected_node.id not in visited:
+                queue.put(connected_node)
+
+
+def queue_update_edges(hypergraph: Hypergraph):
+    hypergraph.edges.clear()
+    queue: Queue[Node] = Queue()
+    visited_nodes: set[int] = set()
+    for source_node in hypergraph.get_hypergraph_source():
+        for hyper_edge in source_node.get_output_hyper_edges() + source_node.get_input_hyper_edges():
+            hypergraph.edges[hyper_edge.id] = hyper_edge
+        for connected_node in source_node.get_children_nodes() + source_node.get_united_with_nodes():
+            queue.put(connected_node)
+
+    while not queue.empty():
+        node = queue.get()
+        visited_nodes.add(node.id)
+        for hyper_edge in node.get_output_hyper_edges() + node.get_input_hyper_edges():
+            hypergraph.edges[hyper_edge.id] = hyper_edge
+        for connected_node in node.get_children_nodes() + node.get_united_with_nodes():
+            if connected_node.id not in visited_nodes:
+                queue.put(connected_node)
+
+
+def queue_get_hypergraph_target(hypergraph: Hypergraph) -> list[Node]:
+    queue = Queue()
+    target_nodes: dict[int, Node] = dict()
+    visited: set[Node] = set()
+    for node in hypergraph.get_hypergraph_source():
+        queue.put(node)
+
+    while not queue.empty():
+        node = queue.get()
+        visited.add(node)
+        output_hyper_edges = node.get_output_hyper_edges()
+        if len(output_hyper_edges) == 0:
+            target_nodes[node.id] = node
+            for united_with in node.get_united_with_nodes():
+                target_nodes[united_with.id] = united_with
+
+        for output_hyper_edge in output_hyper_edges:
+            for target_node in output_hyper_edge.get_target_nodes():
+                if target_node not in visited:
+                    queue.put(target_node)
+    return list(target_nodes.values())
+
+
+def queue_is_connected_to(node: Node, target_node: Node) -> bool:
+    if node.equals_to_node_group(target_node):
+        return True
+    visited: set[int] = set()
+    queue: Queue[Node] = Queue()
+    visited.add(node.id)
+    for hyper_edge in node.get_input_hyper_edges() + node.get_output_hyper_edges():
+        for next_node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
+            if next_node.id not in visited:
+                queue.put(next_node)
+    while not queue.empty():
+        next_node: Node = queue.get()
+        visited.add(next_node.id)
+        if next_node.equals_to_node_group(target_node):
+            return True
+        for hyper_edge in next_node.get_input_hyper_edges() + next_node.get_output_hyper_edges():
+            for hyper_edge_node in hyper_edge.get_source_nodes() + hyper_edge.get_target_nodes():
+                if hyper_edge_node.id not in visited:
+                    queue.put(hyper_edge_node)
+    return False
+
+
+def measure(function: Callable[[], object], repeat: int) -> float:
+    """Return the best time of the given function in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(file_names: list[str], repeat: int, queue_limit: int):
+    print(f"{'file':<10}{'edges':>7}  {'traversal':<34}{'queue ms':>10}{'deque ms':>10}{'speedup':>9}")
+    for file_name in file_names:
+        hypergraph, first_node, last_node = build_hypergraph(os.path.join(EFFICIENCY_TEST_DIR, file_name))
+        cases = [
+            ("update_source_nodes_descendants",
+             lambda: queue_update_source_nodes_descendants(hypergraph),
+             hypergraph.update_source_nodes_descendants),
+            ("update_edges",
+             lambda: queue_update_edges(hypergraph),
+             hypergraph.update_edges),
+            ("get_hypergraph_target",
+             lambda: queue_get_hypergraph_target(hypergraph),
+             hypergraph.get_hypergraph_target),
+            ("is_connected_to",
+             lambda: queue_is_connected_to(first_node, last_node),
+             lambda: first_node.is_connected_to(last_node)),
+            ("connected component",
+             None,
+             lambda: list(traversal.bfs_connected([first_node]))),
+        ]
+        for name, queue_function, deque_function in cases:
+            deque_time = measure(deque_function, repeat)
+            if queue_function is None or len(hypergraph.edges) > queue_limit:
+                print(f"{file_name:<10}{len(hypergraph.edges):>7}  {name:<34}{'-':>10}{deque_time:>10.2f}{'-':>9}")
+                continue
+            queue_time = measure(queue_function, repeat)
+            print(f"{file_name:<10}{len(hypergraph.edges):>7}  {name:<34}{queue_time:>10.2f}{deque_time:>10.2f}{queue_time / deque_time:>8.2f}x")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare queue.Queue and deque based hypergraph traversals.")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="efficiency_test file names")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times every traversal is measured")
+    parser.add_argument("--queue-limit", type=int, default=DEFAULT_QUEUE_LIMIT,
+                        help="measure queue.Queue traversals only for hypergraphs with up to this many hyper edges")
+    args = parser.parse_args()
+    run(args.files, args.repeat, args.queue_limit)
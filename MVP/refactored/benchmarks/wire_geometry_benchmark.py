@@ -0,0 +1,152 @@
+"""
+Benchmark of Wire geometry with NumPy.
+
+Creates random Wires like a big diagram and compares computing their curves one by one with the Python loop of
+the previous curved_line against WireGeometry.curved_lines, which computes all curves of the same level of detail
+at once. Also compares the previous pairwise PseudoNotation.get_wires_intersections against the vectorized one.
+Tk is not needed, Wires and Connections are plain objects.
+
+Run from the repository root:
+    python -m MVP.refactored.benchmarks.wire_geometry_benchmark [--wires N] [--crossing-wires N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from random import Random
+
+from MVP.refactored.benchmarks.traversal_benchmark import measure
+from MVP.refactored.frontend.util.wire_geometry import WireGeometry
+from MVP.refactored.modules.notations.pseudo_notation.pseudo_notation import PseudoNotation
+
+
+class BenchmarkConnection:
+    def __init__(self, id_: int, location: tuple[float, float]):
+        self.id = id_
+        self.location = location
+
+    def __eq__(self, other):
+        return isinstance(other, BenchmarkConnection) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class BenchmarkWire:
+    def __init__(self, id_: int, start_connection: BenchmarkConnection, end_connection: BenchmarkConnection):
+        self.id = id_
+        self.start_connection = start_connection
+        self.end_connection = end_connection
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class BenchmarkCanvas:
+    def __init__(self, wires: list[BenchmarkWire]):
+        self.wires = wires
+
+
+def create_wires(wire_count: int, seed: int = 0) -> list[BenchmarkWire]:
+    random = Random(seed)
+    wires = []
+    for i in range(wire_count):
+        start = BenchmarkConnection(2 * i, (random.uniform(0, 2000), random.uniform(0, 2000)))
+        end = BenchmarkConnection(2 * i + 1, (random.uniform(0, 2000), random.uniform(0, 2000)))
+        wires.append(BenchmarkWire(-i - 1, start, end))
+    return wires
+
+
+def curved_line_previous(start, end, det=15):
+    """Previous wire.curved_line."""
+    sx = start[0]
+    sy = start[1]
+    dx = end[0] - sx
+    dy = end[1] - sy
+
+    coordinates = [0] * (det * 2 + 2)
+    for i in range(det + 1):
+        t = i / det
+        coordinates[i * 2] = sx + dx * t
+        coordinates[i * 2 + 1] = sy + dy * (3 * t ** 2 - 2 * t ** 3)
+    return coordinates
+
+
+def intersections_previous(notation: PseudoNotation, canvas: BenchmarkCanvas) -> set:
+    """Previous PseudoNotation.get_wires_intersections."""
+    intersections = set()
+    for w1 in canvas.wires:
+        for w2 in canvas.wires:
+            if (w1 == w2 or w1.end_connection == w2.end_connection or w1.end_connection == w2.start_connection or
+                    w1.start_connection == w2.end_connection or w1.start_connection == w2.start_connection):
+                continue
+
+            w1_coordinates = notation.convert_coords(
+                curved_line_previous(w1.start_connection.location, w1.end_connection.location, det=5))
+            w2_coordinates = notation.convert_coords(
+                curved_line_previous(w2.start_connection.location, w2.end_connection.location, det=5))
+
+            for i in range(1, len(w1_coordinates)):
+                w1_1 = w1_coordinates[i - 1]
+                w1_2 = w1_coordinates[i]
+                for j in range(1, len(w2_coordinates)):
+                    w2_1 = w2_coordinates[j - 1]
+                    w2_2 = w2_coordinates[j]
+
+                    x, y = notation.get_intersect(w1_1, w1_2, w2_1, w2_2)
+                    x = round(x, 5)
+                    y = round(y, 5)
+                    first_x = sorted([round(w1_1[0], 5), round(w1_2[0], 5)])
+                    first_y = sorted([round(w1_1[1], 5), round(w1_2[1], 5)])
+
+                    second_x = sorted([round(w2_1[0], 5), round(w2_2[0], 5)])
+                    second_y = sorted([round(w2_1[1], 5), round(w2_2[1], 5)])
+
+                    if first_x[0] <= x <= first_x[1] and first_y[0] <= y <= first_y[1] \
+                            and second_x[0] <= x <= second_x[1] and second_y[0] <= y <= second_y[1]:
+                        intersections.add(((x, y), tuple(sorted((w1.id, w2.id)))))
+    return intersections
+
+
+def run(wire_count: int, crossing_wire_count: int, repeat: int):
+    wires = create_wires(wire_count)
+    starts = [wire.start_connection.location for wire in wires]
+    ends = [wire.end_connection.location for wire in wires]
+
+    def previous_lines():
+        return [curved_line_previous(start, end) for start, end in zip(starts, ends)]
+
+    def batched_lines():
+        return WireGeometry.curved_lines(starts, ends).tolist()
+
+    if previous_lines() != batched_lines():
+        raise RuntimeError("Wire coordinates differ")
+    previous_time = measure(previous_lines, repeat)
+    batched_time = measure(batched_lines, repeat)
+    print(f"{wire_count} wires, curves with 15 segments")
+    print(f"    previous curved_line    {previous_time:>10.1f} ms")
+    print(f"    curved_lines            {batched_time:>10.1f} ms")
+
+    notation = PseudoNotation()
+    canvas = BenchmarkCanvas(create_wires(crossing_wire_count, seed=1))
+    if intersections_previous(notation, canvas) != notation.get_wires_intersections(canvas):
+        raise RuntimeError("Wire intersections differ")
+    previous_time = measure(lambda: intersections_previous(notation, canvas), repeat)
+    vectorized_time = measure(lambda: notation.get_wires_intersections(canvas), repeat)
+    print(f"{crossing_wire_count} wires, intersections")
+    print(f"    previous pairs          {previous_time:>10.1f} ms")
+    print(f"    vectorized              {vectorized_time:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    parser = argparse.ArgumentParser(description="Compare Python and NumPy Wire geometry.")
+    parser.add_argument("--wires", type=int, default=5000, help="number of wires whose curves are computed")
+    parser.add_argument("--crossing-wires", type=int, default=30, help="number of wires that are intersected")
+    parser.add_argument("--repeat", type=int, default=3, help="how many times each computation is measured")
+    args = parser.parse_args()
+    run(args.wires, args.crossing_wires, args.repeat)
@@ -10,7 +10,9 @@ from MVP.refactored.backend.id_generator import IdGenerator
 from MVP.refactored.backend.types.ActionType import ActionType
 from MVP.refactored.backend.types.connection_side import ConnectionSide
 from MVP.refactored.frontend.canvas_objects.connection import Connection
+from MVP.refactored.frontend.canvas_objects.spider import Spider
 from MVP.refactored.frontend.canvas_objects.types.connection_type import ConnectionType
+from MVP.refactored.frontend.canvas_objects.types.detail_level import DetailLevel
 from MVP.refactored.frontend.canvas_objects.wire import Wire
 from MVP.refactored.frontend.windows.code_editor import CodeEditor
 from constants import *
@@ -83,8 +85,9 @@ class Box:
 
         self.is_snapped = False
 
-        self.collision_ids = [self.shape, self.resize_handle]
         self.box_function: BoxFunction = None
+        self.detail = DetailLevel.FULL
+        self.canvas.spatial_index.insert(self, self.get_bounds())
 
     def remove_wire(self, wire: Wire):
         self.wires.remove(wire)
@@ -207,8 +210,9 @@ class Box:
 
     def set_box_function(self, box_function: BoxFunction):
         self.box_function = box_function
-        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=self.id, canvas_id=self.canvas.id,
-                                        box_function=box_function)
+        if self.receiver.listener and not self.canvas.is_search:
+            self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=self.id,
+                                            canvas_id=self.canvas.id, box_function=box_function)
 
     def get_box_function(self) -> BoxFunction:
         return self.box_function
@@ -446,22 +450,14 @@ class Box:
         # snapping into place
         found = False
         if not from_configuration:
-            for box in self.canvas.boxes:
-                if box == self:
-                    continue
-
-                if abs(box.x + box.size[0] / 2 - (go_to_x + self.size[0] / 2)) < box.size[0] / 2 + self.size[0] / 2:
-                    go_to_x = box.x + box.size[0] / 2 - +self.size[0] / 2
-
-                    found = True
-            for spider in self.canvas.spiders:
-
-                if abs(spider.location[0] - (go_to_x + self.size[0] / 2)) < self.size[0] / 2 + spider.r:
-                    go_to_x = spider.x - +self.size[0] / 2
-
-                    found = True
-
+            center_x, found_box = self.canvas.spatial_index.snap_x(go_to_x + self.size[0] / 2, self.size[0] / 2,
+                                                                   lambda item: isinstance(item, Box) and item is not self)
+            center_x, found_spider = self.canvas.spatial_index.snap_x(center_x, self.size[0] / 2,
+                                                                      lambda item: isinstance(item, Spider))
+            found = found_box or found_spider
             if found:
+                go_to_x = center_x - self.size[0] / 2
+
                 collision = self.find_collisions(go_to_x, go_to_y)
 
                 if len(collision) != 0:
@@ -485,42 +481,21 @@ class Box:
         self.move(go_to_x, go_to_y, bypass_legality=from_configuration)
         self.move_label()
 
-    def update_self_collision_ids(self):
-        """
-        Update collision ids that are attached to the Box.
-
-        Will update collision_ids with new label tag or Connections tags.
-
-        :return: None
-        """
-        self.collision_ids = [self.shape, self.resize_handle]
-        if self.label:
-            self.collision_ids.append(self.label)
-        for connection in self.connections:
-            self.collision_ids.append(connection.circle)
-
     def find_collisions(self, go_to_x, go_to_y):
         """
-        Return list of tags that would be colliding with the Box if it was at go_to_x and go_to_y coordinates.
+        Return list of Boxes and Connections that would be colliding with the Box if it was at go_to_x and go_to_y
+        coordinates.
+
+        Collisions are found with the spatial index of the CustomCanvas. Wires are not in the index, so they are
+        never colliding. The Box and its own Connections are excluded.
 
         :param go_to_x: X coordinate where the Box would be.
         :param go_to_y: Y coordinate where the Box would be.
-        :return: List of tags that would be colliding with the Box in the given location.
-        """
-        self.update_self_collision_ids()
-        collision = self.canvas.find_overlapping(go_to_x, go_to_y, go_to_x + self.size[0], go_to_y + self.size[1])
-        collision = list(collision)
-        for index in self.collision_ids:
-            if index in collision:
-                collision.remove(index)
-        for wire_label in self.canvas.wire_label_tags:
-            if wire_label in collision:
-                collision.remove(wire_label)
-        for wire in self.canvas.wires:
-            tag = wire.line
-            if tag in collision:
-                collision.remove(tag)
-        return collision
+        :return: List of Boxes and Connections that would be colliding with the Box in the given location.
+        """
+        return [item for item in self.canvas.spatial_index.query(go_to_x, go_to_y,
+                                                                 go_to_x + self.size[0], go_to_y + self.size[1])
+                if item is not self and getattr(item, "box", None) is not self]
 
     def on_resize_scroll(self, event):
         """
@@ -668,7 +643,6 @@ class Box:
         if not self.label:
             self.label = self.canvas.create_text((self.x + self.size[0] / 2, self.y + self.size[1] / 2),
                                                  text=self.label_text, fill=const.BLACK, font=('Helvetica', 14))
-            self.collision_ids.append(self.label)
         else:
             self.canvas.itemconfig(self.label, text=self.label_text)
 
@@ -827,6 +801,62 @@ class Box:
                                self.x, self.y + self.size[1])
         self.canvas.coords(self.resize_handle, self.x + self.size[0] - 10, self.y + self.size[1] - 10,
                            self.x + self.size[0], self.y + self.size[1])
+        self.canvas.spatial_index.insert(self, self.get_bounds())
+
+    def update_layout(self):
+        """
+        Update Connection locations and the spatial index after the location or size of the Box has changed.
+
+        Unlike update_size, items on the CustomCanvas are not moved. They are moved later by `redraw()`.
+
+        :return: None
+        """
+        self.canvas.spatial_index.insert(self, self.get_bounds())
+        for c in self.connections:
+            c.set_location(self.get_connection_coordinates(c.side, c.index))
+
+    def redraw(self):
+        """
+        Move the Box shape, label and Connections on the CustomCanvas to the current location and size of the Box.
+
+        Label and Connections are hidden with low detail, they are moved when full detail is restored.
+
+        :return: None
+        """
+        self.update_position()
+        if self.detail == DetailLevel.FULL:
+            for c in self.connections:
+                c.redraw()
+            self.move_label()
+
+    def set_detail(self, detail):
+        """
+        Set the level of detail the Box is drawn with.
+
+        With low detail only the shape of the Box is shown. Collapsed and hidden Boxes are not shown at all.
+
+        :param detail: DetailLevel.
+        :return: None
+        """
+        if detail == self.detail:
+            return
+        self.detail = detail
+        shape_state = tk.NORMAL if detail in (DetailLevel.FULL, DetailLevel.LOW) else tk.HIDDEN
+        detail_state = tk.NORMAL if detail == DetailLevel.FULL else tk.HIDDEN
+        self.canvas.itemconfig(self.shape, state=shape_state)
+        self.canvas.itemconfig(self.resize_handle, state=detail_state)
+        if self.label:
+            self.canvas.itemconfig(self.label, state=detail_state)
+        for c in self.connections:
+            c.set_detail(detail)
+
+    def get_bounds(self):
+        """
+        Return the bounding box of the Box shape.
+
+        :return: Tuple of coordinates (x1, y1, x2, y2)
+        """
+        return self.x, self.y, self.x + self.size[0], self.y + self.size[1]
 
     def update_connections(self):
         """
@@ -846,7 +876,7 @@ class Box:
 
         :return: None
         """
-        [wire.update() for wire in self.wires]
+        Wire.update_all(self.wires)
 
     def update_io(self):
         """
@@ -908,7 +938,6 @@ class Box:
                                 connection_type=connection_type)
         self.left_connections += 1
         self.connections.append(connection)
-        self.collision_ids.append(connection.circle)
 
         self.update_connections()
         self.update_wires()
@@ -935,7 +964,6 @@ class Box:
                                 connection_type=connection_type)
         self.right_connections += 1
         self.connections.append(connection)
-        self.collision_ids.append(connection.circle)
 
         self.update_connections()
         self.update_wires()
@@ -972,7 +1000,6 @@ class Box:
             self.right_connections -= 1
 
         self.connections.remove(circle)
-        self.collision_ids.remove(circle.circle)
         circle.delete()
         self.update_connections()
         self.update_wires()
@@ -993,6 +1020,8 @@ class Box:
 
         self.canvas.delete(self.shape)
         self.canvas.delete(self.resize_handle)
+        self.canvas.spatial_index.remove(self)
+        self.canvas.redraw_scheduler.discard(self)
 
         if self in self.canvas.boxes:
             self.canvas.boxes.remove(self)
@@ -5,6 +5,7 @@ from MVP.refactored.backend.id_generator import IdGenerator
 from MVP.refactored.backend.types.connection_side import ConnectionSide
 
 from MVP.refactored.frontend.canvas_objects.types.connection_type import ConnectionType
+from MVP.refactored.frontend.canvas_objects.types.detail_level import DetailLevel
 import constants as const
 
 
@@ -52,7 +53,9 @@ class Connection:
                                               outline=ConnectionType.COLORS.value[self.type.value],
                                               width=round(min(self.r / 5, 5)))
         self.width_between_boxes = 1  # px
+        self.detail = DetailLevel.FULL
         self.bind_events()
+        self.canvas.spatial_index.insert(self, self.get_bounds())
 
     def update(self):
         """
@@ -256,7 +259,62 @@ class Connection:
         """
         self.canvas.coords(self.circle, location[0] - self.r, location[1] - self.r, location[0] + self.r,
                            location[1] + self.r)
+        self.set_location(location)
+
+    def set_location(self, location):
+        """
+        Set the location of the Connection without moving the circle on the canvas.
+
+        Used when many objects are moved at once, the circle is moved later by `redraw()`.
+
+        :param location: tuple of coordinates. (x, y)
+        :return: None
+        """
         self.location = location
+        self.canvas.spatial_index.insert(self, self.get_bounds())
+
+    def redraw(self):
+        """
+        Move and resize the Connection circle on the canvas to its location and radius.
+
+        :return: None
+        """
+        self.canvas.coords(self.circle, self.location[0] - self.r, self.location[1] - self.r,
+                           self.location[0] + self.r, self.location[1] + self.r)
+        self.canvas.itemconfig(self.circle, width=round(min(self.r / 5, 5)))
+
+    def set_detail(self, detail):
+        """
+        Set the level of detail the Connection is drawn with.
+
+        Connection circles are only shown with full detail.
+
+        :param detail: DetailLevel.
+        :return: None
+        """
+        if detail == self.detail:
+            return
+        self.detail = detail
+        self.canvas.itemconfig(self.circle, state=tk.NORMAL if self.is_shown(detail) else tk.HIDDEN)
+
+    @staticmethod
+    def is_shown(detail):
+        """
+        Check if the Connection circle is shown with the given level of detail.
+
+        :param detail: DetailLevel.
+        :return: boolean
+        """
+        return detail == DetailLevel.FULL
+
+    def get_bounds(self):
+        """
+        Return the bounding box of the Connection circle.
+
+        :return: Tuple of coordinates (x1, y1, x2, y2)
+        """
+        return (self.location[0] - self.r, self.location[1] - self.r,
+                self.location[0] + self.r, self.location[1] + self.r)
 
     def lessen_index_by_one(self):
         """
@@ -275,6 +333,8 @@ class Connection:
         :return: None
         """
         self.canvas.delete(self.circle)
+        self.canvas.spatial_index.remove(self)
+        self.canvas.redraw_scheduler.discard(self)
         if self.has_wire:
             self.canvas.delete(self.wire)
             self.wire.delete()
@@ -4,6 +4,7 @@ from MVP.refactored.backend.id_generator import IdGenerator
 from MVP.refactored.backend.types.ActionType import ActionType
 from MVP.refactored.frontend.canvas_objects.connection import Connection
 from MVP.refactored.frontend.canvas_objects.types.connection_type import ConnectionType
+from MVP.refactored.frontend.canvas_objects.types.detail_level import DetailLevel
 import constants as const
 
 
@@ -55,6 +56,18 @@ class Spider(Connection):
         """
         return True
 
+    @staticmethod
+    def is_shown(detail):
+        """
+        Check if the Spider is shown with the given level of detail.
+
+        Unlike other Connections, Spiders are also shown with low detail.
+
+        :param detail: DetailLevel.
+        :return: boolean
+        """
+        return detail in (DetailLevel.FULL, DetailLevel.LOW)
+
     def bind_events(self):
         """
         Bind events to circle created on CustomCanvas.
@@ -147,6 +160,7 @@ class Spider(Connection):
             return
         self.canvas.coords(self.circle, self.x - self.r, self.y - self.r, self.x + self.r,
                            self.y + self.r)
+        self.canvas.spatial_index.insert(self, self.get_bounds())
 
     # MOVING, CLICKING ETC.
     def on_press(self):
@@ -212,27 +226,12 @@ class Spider(Connection):
 
         # snapping into place
         found = False
-        if not from_configuration:
-            for box in self.canvas.boxes:
-                if abs(box.x + box.size[0] / 2 - go_to_x) < box.size[0] / 2 + self.r and move_legal:
-                    go_to_x = box.x + box.size[0] / 2
-
-                    found = True
-            for spider in self.canvas.spiders:
-                if spider == self:
-                    continue
-
-                cancel = False
-                for wire in spider.wires:
-                    if wire.end_connection == self or wire.start_connection == self:
-                        cancel = True
-                if cancel:
-                    continue
-
-                if abs(spider.location[0] - go_to_x) < self.r + spider.r and move_legal:
-                    go_to_x = spider.location[0]
-
-                    found = True
+        if not from_configuration and move_legal:
+            # Boxes are the only objects in the spatial index that are not Connections
+            go_to_x, found_box = self.canvas.spatial_index.snap_x(go_to_x, self.r,
+                                                                  lambda item: not isinstance(item, Connection))
+            go_to_x, found_spider = self.canvas.spatial_index.snap_x(go_to_x, self.r, self.can_snap_to)
+            found = found_box or found_spider
             if found:
                 collision = self.find_collisions(go_to_x, go_to_y)
                 if len(collision) != 0:
@@ -262,7 +261,22 @@ class Spider(Connection):
         self.rel_y = round(self.y / self.canvas.winfo_height(), 4)
         self.canvas.coords(self.circle, self.x - self.r, self.y - self.r, self.x + self.r,
                            self.y + self.r)
-        [w.update() for w in self.wires]
+        self.canvas.spatial_index.insert(self, self.get_bounds())
+        from MVP.refactored.frontend.canvas_objects.wire import Wire
+        Wire.update_all(self.wires)
+
+    def can_snap_to(self, item):
+        """
+        Check if the Spider can snap onto the x-axis of a canvas object.
+
+        Spider can snap onto other Spiders that are not connected to it with a Wire.
+
+        :param item: Canvas object from the spatial index of the CustomCanvas.
+        :return: boolean
+        """
+        if not isinstance(item, Spider) or item == self:
+            return False
+        return not any(wire.end_connection == self or wire.start_connection == self for wire in item.wires)
 
     def align_wire_ends(self):
         """
@@ -296,25 +310,16 @@ class Spider(Connection):
         Find collisions at the desired location.
 
         Takes x and y coordinates and checks the surrounding area, equal to the size of the Spider. Returns a list
-        of canvas tags that are in the location. Wires are excluded from this.
+        of Boxes and Connections that are in the location. Wires are not in the spatial index of the CustomCanvas,
+        so they are excluded from this.
 
         :param go_to_x: x coordinate for the center of the search.
         :param go_to_y: y coordinate for the center of the search.
-        :return: List of ints.
-        """
-        collision = self.canvas.find_overlapping(go_to_x - self.r, go_to_y - self.r, go_to_x + self.r,
-                                                 go_to_y + self.r)
-        collision = list(collision)
-        if self.circle in collision:
-            collision.remove(self.circle)
-        for wire_label in self.canvas.wire_label_tags:
-            if wire_label in collision:
-                collision.remove(wire_label)
-        for wire in self.canvas.wires:
-            tag = wire.line
-            if tag in collision:
-                collision.remove(tag)
-        return collision
+        :return: List of Boxes and Connections.
+        """
+        return [item for item in self.canvas.spatial_index.query(go_to_x - self.r, go_to_y - self.r,
+                                                                 go_to_x + self.r, go_to_y + self.r)
+                if item is not self]
 
     def is_illegal_move(self, new_x, bypass=False):
         """
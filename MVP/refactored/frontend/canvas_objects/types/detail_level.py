@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class DetailLevel(Enum):
+    FULL = "full"  # every item is drawn, wires are curved
+    LOW = "low"  # labels, connection circles and resize handles are hidden, wires are straight lines
+    COLLAPSED = "collapsed"  # Box is hidden, it is drawn as a part of the aggregate rectangle of a dense cluster
+    HIDDEN = "hidden"  # object is far outside the viewport, all its items are hidden
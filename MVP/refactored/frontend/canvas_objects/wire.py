@@ -3,12 +3,14 @@ from tkinter import simpledialog
 
 from MVP.refactored.backend.id_generator import IdGenerator
 from MVP.refactored.frontend.canvas_objects.types.connection_type import ConnectionType
+from MVP.refactored.frontend.canvas_objects.types.detail_level import DetailLevel
 from MVP.refactored.frontend.canvas_objects.types.wire_types import WireType
 import constants as const
 from MVP.refactored.backend.types.ActionType import ActionType
 from MVP.refactored.backend.types.connection_info import ConnectionInfo
 from MVP.refactored.frontend.canvas_objects.connection import Connection
 from MVP.refactored.frontend.canvas_objects.spider import Spider
+from MVP.refactored.frontend.util.wire_geometry import WireGeometry
 
 
 def curved_line(start, end, det=15):
@@ -20,17 +22,7 @@ def curved_line(start, end, det=15):
     :param det: (Optional) parameter used for calculating wire curvature.
     :return: List of coordinates for a curved line from start to end.
     """
-    sx = start[0]
-    sy = start[1]
-    dx = end[0] - sx
-    dy = end[1] - sy
-
-    coordinates = [0] * (det * 2 + 2)
-    for i in range(det + 1):
-        t = i / det
-        coordinates[i * 2] = sx + dx * t
-        coordinates[i * 2 + 1] = sy + dy * (3 * t ** 2 - 2 * t ** 3)
-    return coordinates
+    return WireGeometry.curved_line(start, end, det)
 
 
 class Wire:
@@ -78,6 +70,7 @@ class Wire:
         self.dash_style = wire_type.value[1]
         self.end_label = None
         self.start_label = None
+        self.detail = DetailLevel.FULL
         self.update()
 
     def delete(self, action=None):
@@ -93,6 +86,7 @@ class Wire:
         self.start_connection.remove_wire(self)
         self.end_connection.remove_wire(self)
         self.canvas.delete(self.line)
+        self.canvas.redraw_scheduler.discard(self)
         self.delete_labels()
         if not self.is_temporary:
             if self.start_connection.box:
@@ -111,6 +105,7 @@ class Wire:
             self.end_connection.remove_wire(self)
 
         self.canvas.delete(self.line)
+        self.canvas.redraw_scheduler.discard(self)
         if self.receiver.listener:
             self.receiver.receiver_callback(ActionType.WIRE_DELETE, resource_id=self.id, canvas_id=self.canvas.id)
 
@@ -159,27 +154,109 @@ class Wire:
         self.end_connection.add_wire(self)
         self.canvas.itemconfig(self.line, fill=self.type.value[0])
 
-    def update(self):
+    def update(self, coordinates=None):
         """
         Update Wire.
 
         If no line exists then a line will be created on the CustomCanvas along with labels if needed. If a line already
         exists then its location and labels are updated. Wire lines are moved to the lowest layer of CustomCanvas.
+        With low detail the line is straight and labels are not updated.
 
+        :param coordinates: (Optional) Coordinates of the line computed by `Wire.update_all`.
         :return: None
         """
         if self.end_connection:
+            if coordinates is None:
+                coordinates = curved_line(self.start_connection.location, self.end_connection.location,
+                                          self.get_det())
             if self.line:
-                self.canvas.coords(self.line,
-                                   *curved_line(self.start_connection.location, self.end_connection.location))
+                self.canvas.coords(self.line, *coordinates)
             else:
-                self.line = self.canvas.create_line(
-                    *curved_line(self.start_connection.location, self.end_connection.location),
-                    fill=self.color, width=self.wire_width, dash=self.dash_style)
+                self.line = self.canvas.create_line(*coordinates, fill=self.color, width=self.wire_width,
+                                                    dash=self.dash_style)
                 self.canvas.tag_bind(self.line, '<ButtonPress-3>', self.show_context_menu)
-            self.update_wire_label()
+            if self.detail == DetailLevel.FULL:
+                self.update_wire_label()
             self.canvas.tag_lower(self.line)
 
+    @staticmethod
+    def update_all(wires):
+        """
+        Update many Wires at once.
+
+        Lines of Wires with the same level of detail are computed together with `WireGeometry.curved_lines`, then
+        every Wire is updated with its coordinates.
+
+        :param wires: Iterable of Wires.
+        :return: None
+        """
+        groups = {}
+        for wire in wires:
+            if wire.end_connection:
+                groups.setdefault(wire.get_det(), []).append(wire)
+        for det, group in groups.items():
+            lines = WireGeometry.curved_lines([wire.start_connection.location for wire in group],
+                                              [wire.end_connection.location for wire in group], det).tolist()
+            for wire, coordinates in zip(group, lines):
+                wire.update(coordinates)
+
+    def get_det(self):
+        """
+        Return the number of segments of the Wire line.
+
+        :return: 15 for full detail, 1 (straight line) otherwise.
+        """
+        return 15 if self.detail == DetailLevel.FULL else 1
+
+    def redraw(self):
+        """
+        Redraw the Wire between the current locations of its Connections.
+
+        :return: None
+        """
+        self.update()
+
+    @staticmethod
+    def redraw_all(wires):
+        """
+        Redraw many Wires at once.
+
+        :param wires: Iterable of Wires.
+        :return: None
+        """
+        Wire.update_all(wires)
+
+    def set_detail(self, detail):
+        """
+        Set the level of detail the Wire is drawn with.
+
+        With low detail the Wire is drawn as a straight line without labels. Hidden Wires are not shown at all.
+
+        :param detail: DetailLevel.
+        :return: None
+        """
+        if detail == self.detail:
+            return
+        self.detail = detail
+        if self.line:
+            self.canvas.itemconfig(self.line, state=tk.HIDDEN if detail == DetailLevel.HIDDEN else tk.NORMAL)
+        for label in (self.start_label, self.end_label):
+            if label:
+                self.canvas.itemconfig(label, state=tk.NORMAL if detail == DetailLevel.FULL else tk.HIDDEN)
+
+    def get_bounds(self):
+        """
+        Return the bounding box of the Wire.
+
+        The curved line of the Wire stays between the locations of its Connections.
+
+        :return: Tuple of coordinates (x1, y1, x2, y2)
+        """
+        locations = [connection.location for connection in (self.start_connection, self.end_connection)
+                     if connection is not None]
+        return (min(location[0] for location in locations), min(location[1] for location in locations),
+                max(location[0] for location in locations), max(location[1] for location in locations))
+
     def update_wire_label(self):
         """
         Update Wire labels.
@@ -19,7 +19,9 @@ from MVP.refactored.frontend.canvas_objects.types.connection_type import Connect
 from MVP.refactored.frontend.canvas_objects.types.wire_types import WireType
 from MVP.refactored.frontend.canvas_objects.wire import Wire
 from MVP.refactored.frontend.components.search_result_button import SearchResultButton
+from MVP.refactored.frontend.util.redraw_scheduler import RedrawScheduler
 from MVP.refactored.frontend.util.selector import Selector
+from MVP.refactored.frontend.util.spatial_index import SpatialIndex
 from MVP.refactored.frontend.windows.tikz_window import TikzWindow
 from MVP.refactored.util.copier import Copier
 from MVP.refactored.util.exporter.hypergraph_exporter import HypergraphExporter
@@ -63,6 +65,8 @@ class CustomCanvas(tk.Canvas):
         self.spiders: list[Spider] = []
         self.wires: list[Wire] = []
         self.corners: list[Corner] = []
+        self.spatial_index = SpatialIndex()
+        self.redraw_scheduler = RedrawScheduler(self, collapsible=lambda item: isinstance(item, Box))
         self.temp_wire = None
         self.temp_end_connection = None
         self.pulling_wire = False
@@ -264,11 +268,13 @@ class CustomCanvas(tk.Canvas):
                 self.pan_speed = min(abs(1 - corner.location[0]), abs(self.winfo_width() - corner.location[0] - 1))
                 return
 
-        for connection in self.corners + self.inputs + self.outputs:
-            connection.location[0] = connection.location[0] + multiplier * self.pan_speed
-            self.coords(connection.circle,
-                        connection.location[0] - connection.r, connection.location[1] - connection.r,
-                        connection.location[0] + connection.r, connection.location[1] + connection.r)
+        for corner in self.corners:
+            corner.location[0] = corner.location[0] + multiplier * self.pan_speed
+            self.coords(corner.circle,
+                        corner.location[0] - corner.r, corner.location[1] - corner.r,
+                        corner.location[0] + corner.r, corner.location[1] + corner.r)
+        for connection in self.inputs + self.outputs:
+            connection.set_location([connection.location[0] + multiplier * self.pan_speed, connection.location[1]])
         self.move_boxes_spiders('x', multiplier)
         self.pan_speed = 20
 
@@ -294,11 +300,13 @@ class CustomCanvas(tk.Canvas):
                 self.pan_speed = min(abs(1 - corner.location[1]), abs(self.winfo_height() - corner.location[1] - 1))
                 return
 
-        for connection in self.corners + self.inputs + self.outputs:
-            connection.location[1] = connection.location[1] + multiplier * self.pan_speed
-            self.coords(connection.circle,
-                        connection.location[0] - connection.r, connection.location[1] - connection.r,
-                        connection.location[0] + connection.r, connection.location[1] + connection.r)
+        for corner in self.corners:
+            corner.location[1] = corner.location[1] + multiplier * self.pan_speed
+            self.coords(corner.circle,
+                        corner.location[0] - corner.r, corner.location[1] - corner.r,
+                        corner.location[0] + corner.r, corner.location[1] + corner.r)
+        for connection in self.inputs + self.outputs:
+            connection.set_location([connection.location[0], connection.location[1] + multiplier * self.pan_speed])
         self.move_boxes_spiders('y', multiplier)
         self.pan_speed = 20
 
@@ -306,19 +314,20 @@ class CustomCanvas(tk.Canvas):
         """
         Move boxes and spiders on the CustomCanvas along the x or y-axis.
 
+        Only coordinates are changed here, the moved objects, diagram inputs/outputs and wires are redrawn by
+        the redraw scheduler once per frame.
+
         :param attr: attribute to move items on.
         :param multiplier: move towards positive or negative coordinates.
         :return: None
         """
         for spider in self.spiders:
             setattr(spider, attr, getattr(spider, attr) + multiplier * self.pan_speed)
-            spider.move_to((spider.x, spider.y))
+            spider.set_location((spider.x, spider.y))
         for box in self.boxes:
             setattr(box, attr, getattr(box, attr) + multiplier * self.pan_speed)
-            box.update_size(box.size[0], box.size[1])
-            box.move_label()
-        for wire in self.wires:
-            wire.update()
+            box.update_layout()
+        self.redraw_scheduler.schedule(self.inputs + self.outputs + self.spiders + self.boxes + self.wires)
         if self.pulling_wire:
             self.temp_wire.update()
 
@@ -410,15 +419,17 @@ class CustomCanvas(tk.Canvas):
                 event.y += y_offset
 
         self.update_coordinates(denominator, event, scale)
-        self.update_inputs_outputs()
+        self.update_inputs_outputs(deferred=True)
         if self.total_scale - 1 < 0.1:
-            self.init_corners()
-        self.configure(scrollregion=self.bbox('all'))
+            self.init_corners(deferred=True)
+        self.redraw_scheduler.schedule([], update_scroll_region=True)
 
     def update_coordinates(self, denominator, event, scale):
         """
         Update/move all objects to new location after zooming.
 
+        Corners are moved immediately, other objects are redrawn by the redraw scheduler once per frame.
+
         :param denominator: Denominator used for calculating object movement.
         :param event: tkinter.Event
         :param scale: stating how much was scaled.
@@ -439,29 +450,23 @@ class CustomCanvas(tk.Canvas):
                 self.calculate_zoom_dif(event.y, i_o.location[1], denominator)
             ]
             i_o.r *= scale
-            i_o.location = i_o_location
-            self.coords(i_o.circle, i_o.location[0] - i_o.r, i_o.location[1] - i_o.r,
-                        i_o.location[0] + i_o.r, i_o.location[1] + i_o.r)
-            self.itemconfig(i_o.circle, width=i_o.r * 2 / 10)
+            i_o.set_location(i_o_location)
 
         for box in self.boxes:
             box.x = self.calculate_zoom_dif(event.x, box.x, denominator)
             box.y = self.calculate_zoom_dif(event.y, box.y, denominator)
-            box.update_size(box.size[0] * scale, box.size[1] * scale)
-            box.move_label()
+            box.size = (box.size[0] * scale, box.size[1] * scale)
+            box.update_layout()
 
         for spider in self.spiders:
             spider.x = self.calculate_zoom_dif(event.x, spider.x, denominator)
             spider.y = self.calculate_zoom_dif(event.y, spider.y, denominator)
-            spider.location = spider.x, spider.y
             spider.r *= scale
-            self.coords(spider.circle, spider.x - spider.r, spider.y - spider.r, spider.x + spider.r,
-                        spider.y + spider.r)
-            self.itemconfig(spider.circle, width=round(min(spider.r / 5, 5)))
+            spider.set_location((spider.x, spider.y))
 
         for wire in self.wires:
             wire.wire_width *= scale
-            wire.update()
+        self.redraw_scheduler.schedule(self.inputs + self.outputs + self.boxes + self.spiders + self.wires)
         if self.temp_wire:
             self.temp_wire.update()
 
@@ -637,13 +642,10 @@ class CustomCanvas(tk.Canvas):
         :return: Connection or None
         """
         if self.draw_wire_mode or self.quick_pull:
-            x, y = event.x, event.y
-            for circle in [c for box in self.boxes for c in
-                           box.connections] + self.outputs + self.inputs + self.spiders:
-
-                conn_x, conn_y, conn_x2, conn_y2 = self.coords(circle.circle)
-                if conn_x <= x <= conn_x2 and conn_y <= y <= conn_y2:
-                    return circle
+            for item in self.spatial_index.query_point(event.x, event.y):
+                # temporary Connections at the end of pulled wires have no side
+                if isinstance(item, Connection) and item.side is not None:
+                    return item
         return None
 
     def _fix_new_sub_diagram_box_wires(self, sub_diagram_box: Box) -> None:
@@ -941,7 +943,8 @@ class CustomCanvas(tk.Canvas):
         Handle canvas resizing.
 
         Updates the locations on Corner objects and diagram inputs and outputs along with previous winfo sizes and canvas
-        label location. This is activated when the application is configured.
+        label location, then schedules a redraw pass for the new viewport. This is activated when the application
+        is configured.
 
         :param _: tkinter.Event
         :return: None
@@ -957,6 +960,8 @@ class CustomCanvas(tk.Canvas):
         self.main_diagram.toolbar.update_canvas_label()
 
         self.__on_configure_move__()
+        # objects hidden outside the previous viewport may be in view after resizing
+        self.redraw_scheduler.schedule([], update_scroll_region=True)
 
     def __on_configure_move__(self):
         """
@@ -1003,10 +1008,11 @@ class CustomCanvas(tk.Canvas):
 
         return decorator
 
-    def init_corners(self):
+    def init_corners(self, deferred=False):
         """
         Set all Corner objects to CustomCanvas visual corners.
 
+        :param deferred: (Optional) Leave redrawing of diagram inputs/outputs and wires to the redraw scheduler.
         :return: None
         """
         min_x = self.canvasx(0)
@@ -1017,7 +1023,7 @@ class CustomCanvas(tk.Canvas):
         self.corners[1].move_to([min_x, max_y])
         self.corners[2].move_to([max_x, min_y])
         self.corners[3].move_to([max_x, max_y])
-        self.update_inputs_outputs()
+        self.update_inputs_outputs(deferred=deferred)
 
     @debounce(1)
     def update_corners(self):
@@ -1042,10 +1048,11 @@ class CustomCanvas(tk.Canvas):
         self.corners[3].move_to([(self.corners[3].location[0] + (max_x - self.prev_width_max) / self.delta),
                                  (self.corners[3].location[1] + (max_y - self.prev_height_max) / self.delta)])
 
-    def update_inputs_outputs(self):
+    def update_inputs_outputs(self, deferred=False):
         """
         Update input and output locations of diagram.
 
+        :param deferred: (Optional) Leave redrawing of diagram inputs/outputs and wires to the redraw scheduler.
         :return: None
         """
         x = self.corners[3].location[0]
@@ -1055,14 +1062,25 @@ class CustomCanvas(tk.Canvas):
         for o in self.outputs:
             i = o.index
             step = (y - min_y) / (output_index + 2)
-            o.move_to([x - 7, min_y + step * (i + 1)])
+            location = [x - 7, min_y + step * (i + 1)]
+            if deferred:
+                o.set_location(location)
+            else:
+                o.move_to(location)
 
         input_index = max([o.index for o in self.inputs] + [0])
         for o in self.inputs:
             i = o.index
             step = (y - min_y) / (input_index + 2)
-            o.move_to([6 + self.corners[0].location[0], min_y + step * (i + 1)])
-        [w.update() for w in self.wires]
+            location = [6 + self.corners[0].location[0], min_y + step * (i + 1)]
+            if deferred:
+                o.set_location(location)
+            else:
+                o.move_to(location)
+        if deferred:
+            self.redraw_scheduler.schedule(self.inputs + self.outputs + self.wires)
+        else:
+            Wire.update_all(self.wires)
 
     def delete_everything(self):
         """
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Iterable
+
+import constants as const
+from MVP.refactored.frontend.canvas_objects.types.detail_level import DetailLevel
+
+
+class RedrawScheduler:
+    """
+    Coalesces redrawing of canvas objects into one pass per frame and chooses their level of detail.
+
+    Zooming and panning only change the coordinates of Boxes, Connections and Wires and schedule the objects.
+    Scheduled objects are redrawn (their CustomCanvas items are moved with `redraw()`) in a single after_idle pass,
+    however many wheel or key events came before it. The pass only redraws objects whose bounding box is inside the
+    visible part of the CustomCanvas extended by `margin`. Other objects are hidden and stay scheduled, they are
+    redrawn by a later pass once they are moved into view, or by `flush()` when the whole CustomCanvas must be
+    up to date. `flush_full_detail()` also draws them with full detail, for exports that read the canvas items.
+
+    Below `low_detail_scale` zoom objects are drawn with DetailLevel.LOW and collapsible objects (Boxes) whose
+    top left corners are in the same `cluster_size` cell of the viewport are replaced by one aggregate rectangle
+    if there are at least `cluster_min_items` of them. Full detail is restored when zooming back in.
+
+    Scheduled objects need `get_bounds()`, `set_detail(detail)` and `redraw()` methods. Objects whose type has a
+    static `redraw_all(items)` method (Wires) are redrawn together after the other objects of the pass.
+    """
+
+    def __init__(self, canvas, margin: float = 100, collapsible: Callable[[Any], bool] | None = None):
+        self.canvas = canvas
+        self.margin: float = margin
+        self.collapsible: Callable[[Any], bool] | None = collapsible
+        self.low_detail_scale: float = 0.5
+        self.cluster_size: float = 100
+        self.cluster_min_items: int = 4
+        self.scheduled: dict[int, Any] = {}
+        self.collapsed: dict[int, Any] = {}
+        self.aggregates: list[int] = []
+        self.after_id: str | None = None
+        self.update_scroll_region: bool = False
+
+    def __contains__(self, item):
+        return id(item) in self.scheduled
+
+    def schedule(self, items: Iterable, update_scroll_region: bool = False):
+        """
+        Schedule objects to be redrawn in the next pass.
+
+        :param items: Canvas objects whose coordinates have changed.
+        :param update_scroll_region: (Optional) If the scroll region of the CustomCanvas should be updated after the
+        pass.
+        :return: None
+        """
+        for item in items:
+            self.scheduled[id(item)] = item
+        self.update_scroll_region = self.update_scroll_region or update_scroll_region
+        if self.after_id is None:
+            self.after_id = self.canvas.after_idle(self.redraw)
+
+    def discard(self, item):
+        """
+        Remove a deleted object from scheduled and collapsed objects.
+
+        :param item: Canvas object.
+        :return: None
+        """
+        self.scheduled.pop(id(item), None)
+        self.collapsed.pop(id(item), None)
+
+    def is_low_detail(self) -> bool:
+        return self.canvas.total_scale < self.low_detail_scale
+
+    def redraw(self, everything: bool = False, full_detail: bool = False):
+        """
+        Redraw scheduled objects that are in view.
+
+        :param everything: (Optional) Redraw all scheduled objects, also the ones that are not in view,
+        and expand collapsed clusters.
+        :param full_detail: (Optional) Draw objects with DetailLevel.FULL whatever the zoom.
+        :return: None
+        """
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        x1, y1, x2, y2 = viewport = self.get_viewport()
+        low_detail = self.is_low_detail()
+        self.update_clusters(viewport, low_detail and not everything)
+        detail = DetailLevel.LOW if low_detail and not full_detail else DetailLevel.FULL
+        batches: dict[type, list] = {}
+        for key, item in list(self.scheduled.items()):
+            if key in self.collapsed:
+                item.set_detail(DetailLevel.COLLAPSED)
+                continue
+            bounds = item.get_bounds()
+            if not everything and not (bounds[0] <= x2 and x1 <= bounds[2] and bounds[1] <= y2 and y1 <= bounds[3]):
+                item.set_detail(DetailLevel.HIDDEN)
+                continue
+            del self.scheduled[key]
+            item.set_detail(detail)
+            if hasattr(item, "redraw_all"):
+                batches.setdefault(type(item), []).append(item)
+            else:
+                item.redraw()
+        for item_type, items in batches.items():
+            item_type.redraw_all(items)
+        if self.update_scroll_region:
+            self.update_scroll_region = False
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def update_clusters(self, viewport: tuple[float, float, float, float], enabled: bool):
+        """
+        Replace aggregate rectangles of dense clusters in the viewport.
+
+        Objects that join or leave a cluster are scheduled, so their level of detail changes in the same pass.
+
+        :param viewport: Visible area of the CustomCanvas.
+        :param enabled: If clusters are collapsed, otherwise all clusters are expanded.
+        :return: None
+        """
+        for aggregate in self.aggregates:
+            self.canvas.delete(aggregate)
+        self.aggregates.clear()
+        previous = self.collapsed
+        self.collapsed = {}
+        if enabled and self.collapsible is not None:
+            cells: dict[tuple[int, int], list] = {}
+            for item in self.canvas.spatial_index.query(*viewport):
+                if self.collapsible(item):
+                    bounds = item.get_bounds()
+                    cell = (math.floor(bounds[0] / self.cluster_size), math.floor(bounds[1] / self.cluster_size))
+                    cells.setdefault(cell, []).append(item)
+            for items in cells.values():
+                if len(items) < self.cluster_min_items:
+                    continue
+                bounds = [item.get_bounds() for item in items]
+                self.aggregates.append(self.canvas.create_rectangle(
+                    min(b[0] for b in bounds), min(b[1] for b in bounds),
+                    max(b[2] for b in bounds), max(b[3] for b in bounds),
+                    fill=const.AGGREGATE_COLOR, outline=const.BLACK))
+                for item in items:
+                    self.collapsed[id(item)] = item
+        self.scheduled.update(previous)
+        self.scheduled.update(self.collapsed)
+
+    def flush(self):
+        """
+        Redraw all scheduled objects immediately.
+
+        :return: None
+        """
+        if self.scheduled or self.collapsed or self.after_id is not None:
+            self.redraw(everything=True)
+
+    def flush_full_detail(self, items: Iterable):
+        """
+        Redraw the objects and all scheduled objects immediately with DetailLevel.FULL, whatever the zoom.
+
+        Exports read the canvas items (Wire curves and labels), which are straight or hidden with lower detail.
+        At low zoom the objects are scheduled again, so the next pass draws them with low detail again.
+
+        :param items: All canvas objects of the CustomCanvas.
+        :return: None
+        """
+        items = list(items)
+        for item in items:
+            self.scheduled[id(item)] = item
+        self.redraw(everything=True, full_detail=True)
+        if self.is_low_detail():
+            self.schedule(items)
+
+    def get_viewport(self) -> tuple[float, float, float, float]:
+        """
+        Return the visible area of the CustomCanvas extended by margin.
+
+        :return: Tuple of coordinates (x1, y1, x2, y2)
+        """
+        return (self.canvas.canvasx(0) - self.margin, self.canvas.canvasy(0) - self.margin,
+                self.canvas.canvasx(self.canvas.winfo_width()) + self.margin,
+                self.canvas.canvasy(self.canvas.winfo_height()) + self.margin)
@@ -1,6 +1,7 @@
 import copy
 
 from MVP.refactored.frontend.canvas_objects.box import Box
+from MVP.refactored.frontend.canvas_objects.connection import Connection
 from MVP.refactored.frontend.canvas_objects.spider import Spider
 import constants as const
 
@@ -50,16 +51,21 @@ class Selector:
     def finalize_selection(self, boxes, spiders, wires):
         if self.selecting:
             selected_coordinates = self.canvas.coords(self.canvas.select_box)
+            # only objects whose bounding box intersects the selection can be selected
+            candidates = self.canvas.spatial_index.query(*selected_coordinates)
+            boxes, spiders = set(boxes), set(spiders)
 
-            self.selected_boxes = [box for box in boxes if self.is_within_selection(box.shape, selected_coordinates)]
+            self.selected_boxes = [item for item in candidates if isinstance(item, Box) and item in boxes
+                                   and self.is_within_selection(item, selected_coordinates)]
 
-            self.selected_spiders = [spider for spider in spiders if
-                                     self.is_within_selection_point(spider.location, selected_coordinates)]
+            self.selected_spiders = [item for item in candidates if isinstance(item, Spider) and item in spiders
+                                     and self.is_within_selection_point(item.location, selected_coordinates)]
 
-            self.selected_wires = [wire for wire in wires if
-                                   self.is_within_selection_point(wire.start_connection.location, selected_coordinates)
-                                   or self.is_within_selection_point(wire.end_connection.location,
-                                                                     selected_coordinates)]
+            # a Wire is selected if one of its ends is selected
+            selected_connections = {item for item in candidates if isinstance(item, Connection)
+                                    and self.is_within_selection_point(item.location, selected_coordinates)}
+            self.selected_wires = [wire for wire in wires if wire.start_connection in selected_connections
+                                   or wire.end_connection in selected_connections]
             self.selected_items = self.selected_boxes + self.selected_spiders + self.selected_wires
             for item in self.selected_items:
                 item.select()
@@ -115,17 +121,20 @@ class Selector:
         box.set_label(str(sub_diagram.id)[-6:])
         self.canvas.main_diagram.add_canvas(sub_diagram)
 
-    def is_within_selection(self, rect, selection_coords):
-        if len(self.canvas.coords(rect)) == 4:
-            x1, y1, x2, y2 = self.canvas.coords(rect)
-            x = (x1 + x2) / 2
-            y = (y1 + y2) / 2
-        elif len(self.canvas.coords(rect)) == 6:
-            x1, y1, x2, y2, x3, y3 = self.canvas.coords(rect)
-            x = (x1 + x2 + x3) / 3
-            y = (y1 + y2 + y3) / 3
+    @staticmethod
+    def is_within_selection(box, selection_coords):
+        """
+        Check if the center of the Box shape is within the selection area.
+
+        Location comes from the Box bounds, not from its canvas item, which is not moved while the Box is
+        collapsed or hidden by the RedrawScheduler.
+        """
+        x1, y1, x2, y2 = box.get_bounds()
+        if box.style == const.TRIANGLE:
+            x = (2 * x1 + x2) / 3
         else:
-            return False
+            x = (x1 + x2) / 2
+        y = (y1 + y2) / 2
         return selection_coords[0] <= x <= selection_coords[2] and selection_coords[1] <= y <= selection_coords[3]
 
     def delete_selected_items(self):
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+Bounds = tuple[float, float, float, float]
+
+
+class SpatialIndex:
+    """
+    Uniform grid of canvas objects for hit-testing, snapping and selection.
+
+    Every object is stored with its bounding box (x1, y1, x2, y2) in all grid cells and columns the bounding box
+    covers, so a query only checks objects near the queried area instead of all objects of the canvas.
+    Objects are kept by identity (Box and Connection hashes depend on ids that can change) and query results
+    are in the order the objects were inserted, which is the order of CustomCanvas lists.
+    """
+
+    def __init__(self, cell_size: float = 100):
+        self.cell_size: float = cell_size
+        self.items: dict[int, Any] = {}
+        self.bounds: dict[int, Bounds] = {}
+        self.orders: dict[int, int] = {}
+        self.cells: dict[tuple[int, int], set[int]] = {}
+        self.columns: dict[int, set[int]] = {}
+        self.next_order: int = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return id(item) in self.items
+
+    def insert(self, item, bounds: Bounds):
+        """
+        Insert the object with its bounding box, or move it if it is already in the index.
+
+        A moved object keeps its place in the order of query results.
+        """
+        key = id(item)
+        bounds = (min(bounds[0], bounds[2]), min(bounds[1], bounds[3]),
+                  max(bounds[0], bounds[2]), max(bounds[1], bounds[3]))
+        old_bounds = self.bounds.get(key)
+        if old_bounds is None:
+            self.items[key] = item
+            self.orders[key] = self.next_order
+            self.next_order += 1
+        elif self._get_cell_range(old_bounds) == self._get_cell_range(bounds):
+            self.bounds[key] = bounds
+            return
+        else:
+            self._remove_from_cells(key, old_bounds)
+        self.bounds[key] = bounds
+        x1, y1, x2, y2 = self._get_cell_range(bounds)
+        for column in range(x1, x2 + 1):
+            self.columns.setdefault(column, set()).add(key)
+            for row in range(y1, y2 + 1):
+                self.cells.setdefault((column, row), set()).add(key)
+
+    def remove(self, item):
+        """Remove the object, objects that are not in the index are ignored."""
+        key = id(item)
+        bounds = self.bounds.pop(key, None)
+        if bounds is None:
+            return
+        self._remove_from_cells(key, bounds)
+        del self.items[key]
+        del self.orders[key]
+
+    def clear(self):
+        self.items.clear()
+        self.bounds.clear()
+        self.orders.clear()
+        self.cells.clear()
+        self.columns.clear()
+
+    def get_bounds(self, item) -> Bounds | None:
+        return self.bounds.get(id(item))
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> list:
+        """Return objects whose bounding box intersects the rectangle, edges included."""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        column_1, row_1, column_2, row_2 = self._get_cell_range((x1, y1, x2, y2))
+        keys = set()
+        if (column_2 - column_1 + 1) * (row_2 - row_1 + 1) > len(self.cells):
+            keys.update(self.items)
+        else:
+            for column in range(column_1, column_2 + 1):
+                for row in range(row_1, row_2 + 1):
+                    keys.update(self.cells.get((column, row), ()))
+        return self._get_sorted_items(key for key in keys
+                                      if self.bounds[key][0] <= x2 and x1 <= self.bounds[key][2]
+                                      and self.bounds[key][1] <= y2 and y1 <= self.bounds[key][3])
+
+    def query_point(self, x: float, y: float) -> list:
+        """Return objects whose bounding box contains the point, edges included."""
+        return self.query(x, y, x, y)
+
+    def query_x_range(self, x1: float, x2: float) -> list:
+        """Return objects whose bounding box overlaps the x range [x1, x2] at any y coordinate."""
+        column_1 = self._get_cell(min(x1, x2))
+        column_2 = self._get_cell(max(x1, x2))
+        keys = set()
+        if column_2 - column_1 + 1 > len(self.columns):
+            keys.update(self.items)
+        else:
+            for column in range(column_1, column_2 + 1):
+                keys.update(self.columns.get(column, ()))
+        return self._get_sorted_items(key for key in keys
+                                      if self.bounds[key][0] <= max(x1, x2) and min(x1, x2) <= self.bounds[key][2])
+
+    def snap_x(self, center_x: float, half_width: float, accept: Callable[[Any], bool]) -> tuple[float, bool]:
+        """
+        Snap an object with the given center x coordinate and half width onto the x-axis of accepted objects.
+
+        Accepted objects are checked in order. If the x range of the snapped object strictly overlaps the x range
+        of an object, the center moves to the center of that object and the following objects are checked against
+        the moved center. This gives the same result as checking every object of the canvas in a loop.
+
+        :param center_x: x coordinate of the center of the snapped object.
+        :param half_width: Half of the width of the snapped object.
+        :param accept: Function that returns True for objects that can be snapped onto.
+        :return: Tuple of the snapped center x coordinate and whether it was snapped.
+        """
+        found = False
+        covered = (center_x - half_width, center_x + half_width)
+        candidates = self.query_x_range(*covered)
+        index = 0
+        while index < len(candidates):
+            item = candidates[index]
+            index += 1
+            x1, _, x2, _ = self.bounds[id(item)]
+            if not abs((x1 + x2) / 2 - center_x) < (x2 - x1) / 2 + half_width or not accept(item):
+                continue
+            center_x = (x1 + x2) / 2
+            found = True
+            if center_x - half_width < covered[0] or center_x + half_width > covered[1]:
+                covered = (min(covered[0], center_x - half_width), max(covered[1], center_x + half_width))
+                order = self.orders[id(item)]
+                candidates = [candidate for candidate in self.query_x_range(*covered)
+                              if self.orders[id(candidate)] > order]
+                index = 0
+        return center_x, found
+
+    def _get_sorted_items(self, keys) -> list:
+        return [self.items[key] for key in sorted(keys, key=self.orders.__getitem__)]
+
+    def _get_cell(self, coordinate: float) -> int:
+        return math.floor(coordinate / self.cell_size)
+
+    def _get_cell_range(self, bounds: Bounds) -> tuple[int, int, int, int]:
+        return (self._get_cell(bounds[0]), self._get_cell(bounds[1]),
+                self._get_cell(bounds[2]), self._get_cell(bounds[3]))
+
+    def _remove_from_cells(self, key: int, bounds: Bounds):
+        x1, y1, x2, y2 = self._get_cell_range(bounds)
+        for column in range(x1, x2 + 1):
+            self._discard(self.columns, column, key)
+            for row in range(y1, y2 + 1):
+                self._discard(self.cells, (column, row), key)
+
+    @staticmethod
+    def _discard(buckets: dict, bucket: Any, key: int):
+        keys = buckets.get(bucket)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del buckets[bucket]
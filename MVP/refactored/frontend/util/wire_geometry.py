@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class WireGeometry:
+    """
+    Smoothstep curves of Wires.
+
+    A Wire from (sx, sy) to (sx + dx, sy + dy) is a line through det + 1 points (sx + dx * t, sy + dy * s),
+    where t = i / det and s = 3 * t ** 2 - 2 * t ** 3. The t and s values only depend on det, they are computed
+    once for every det (level of detail). Coordinates of many Wires are computed at once as NumPy array operations,
+    they are equal to the coordinates computed for every Wire separately.
+    """
+    bases: dict[int, tuple[list[float], list[float]]] = {}
+    basis_arrays: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def get_basis(cls, det: int) -> tuple[list[float], list[float]]:
+        """Return t and smoothstep values of the det + 1 points of a curve."""
+        basis = cls.bases.get(det)
+        if basis is None:
+            t = [i / det for i in range(det + 1)]
+            basis = (t, [3 * value ** 2 - 2 * value ** 3 for value in t])
+            cls.bases[det] = basis
+            cls.basis_arrays[det] = (np.array(basis[0]), np.array(basis[1]))
+        return basis
+
+    @classmethod
+    def curved_line(cls, start, end, det: int = 15) -> list[float]:
+        """Return flat list of coordinates [x0, y0, x1, y1, ...] of the curve from start to end."""
+        t, s = cls.get_basis(det)
+        sx = start[0]
+        sy = start[1]
+        dx = end[0] - sx
+        dy = end[1] - sy
+
+        coordinates = [0] * (det * 2 + 2)
+        coordinates[0::2] = [sx + dx * value for value in t]
+        coordinates[1::2] = [sy + dy * value for value in s]
+        return coordinates
+
+    @classmethod
+    def curved_lines(cls, starts, ends, det: int = 15) -> np.ndarray:
+        """
+        Return coordinates of the curves from starts to ends.
+
+        :param starts: Start locations of the curves, sequence of (x, y) or array of shape (n, 2).
+        :param ends: End locations of the curves.
+        :param det: Number of segments of every curve.
+        :return: Array of shape (n, 2 * det + 2), every row is [x0, y0, x1, y1, ...] of one curve.
+        """
+        cls.get_basis(det)
+        t, s = cls.basis_arrays[det]
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        deltas = ends - starts
+
+        coordinates = np.empty((len(starts), det + 1, 2))
+        coordinates[:, :, 0] = starts[:, 0:1] + deltas[:, 0:1] * t
+        coordinates[:, :, 1] = starts[:, 1:2] + deltas[:, 1:2] * s
+        return coordinates.reshape(len(starts), det * 2 + 2)
+
+    @classmethod
+    def clear_cache(cls):
+        cls.bases.clear()
+        cls.basis_arrays.clear()
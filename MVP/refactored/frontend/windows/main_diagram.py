@@ -234,7 +234,11 @@ class MainDiagram(tk.Tk):
 
         :return: None
         """
-        code = CodeGenerator.generate_code(self.custom_canvas)
+        try:
+            code = CodeGenerator.generate_code(self.custom_canvas)
+        except ValueError as error:
+            messagebox.showerror("Code generation failed", str(error))
+            return
         CodeEditor(self, code=code, is_generated=True)
 
     def open_manage_methods_window(self):
@@ -950,6 +954,9 @@ class MainDiagram(tk.Tk):
         :param show_connections: Boolean to show Connections or not.
         :return: Generated Matplotlib figure and axes containing the drawn canvas elements.
         """
+        # Wire curves and labels are read from the canvas, they must be drawn with full detail even when zoomed out
+        canvas.redraw_scheduler.flush_full_detail(canvas.inputs + canvas.outputs + canvas.spiders + canvas.boxes
+                                                  + canvas.wires)
         x_max, y_max = canvas.winfo_width() / 100, canvas.winfo_height() / 100
         fig, ax = plt.subplots(1, figsize=(x_max, y_max))
         ax.set_aspect('equal', adjustable='box')
@@ -5,6 +5,7 @@ from tkinter import messagebox
 import hupper
 
 from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.tracing import Tracing
 from MVP.refactored.frontend.windows.main_diagram import MainDiagram
 
 
@@ -65,6 +66,7 @@ class Launcher:
 
 
 def start_program():
+    Tracing.configure_from_environment()
     Launcher()
 
 
@@ -4,7 +4,7 @@ from MVP.refactored.frontend.canvas_objects.box import Box
 from MVP.refactored.modules.notations.pseudo_notation.obj_structure import ColumnN, IdentityN, BoxN, DiagramN, \
     SymmetryN, SpiderN
 from MVP.refactored.frontend.canvas_objects.spider import Spider
-from MVP.refactored.frontend.canvas_objects.wire import curved_line
+from MVP.refactored.frontend.util.wire_geometry import WireGeometry
 
 
 class PseudoNotation:
@@ -109,7 +109,9 @@ class PseudoNotation:
             if wire.start_connection.location[0] < loc_x < wire.end_connection.location[0] or \
                     wire.end_connection.location[0] < loc_x < wire.start_connection.location[0]:
 
-                coordinates = self.convert_coords(canvas.coords(wire.line))
+                # the line on the canvas can be out of date or straight while the Wire is culled or drawn with low detail
+                coordinates = self.convert_coords(WireGeometry.curved_line(wire.start_connection.location,
+                                                                           wire.end_connection.location))
 
                 for i in range(1, len(coordinates)):
                     w1 = coordinates[i - 1]
@@ -122,38 +124,64 @@ class PseudoNotation:
         return wires_here
 
     def get_wires_intersections(self, canvas):
+        """
+        Find the points where Wires of the canvas cross each other.
+
+        Every Wire is approximated by 5 straight segments of its curve. Curves and their lines are computed once for
+        all Wires, then segments of each Wire are intersected with segments of all other Wires as NumPy arrays.
+        Wires that share a Connection do not cross.
+
+        :param canvas: CustomCanvas of the Wires.
+        :return: Set of intersections ((x, y), (wire_id, wire_id)).
+        """
         intersections = set()
-        for w1 in canvas.wires:
-            for w2 in canvas.wires:
-                if (w1 == w2 or w1.end_connection == w2.end_connection or w1.end_connection == w2.start_connection or
-                        w1.start_connection == w2.end_connection or w1.start_connection == w2.start_connection):
-                    continue
-
-                w1_coordinates = self.convert_coords(
-                    curved_line(w1.start_connection.location, w1.end_connection.location, det=5))
-                w2_coordinates = self.convert_coords(
-                    curved_line(w2.start_connection.location, w2.end_connection.location, det=5))
-
-                for i in range(1, len(w1_coordinates)):
-                    w1_1 = w1_coordinates[i - 1]
-                    w1_2 = w1_coordinates[i]
-                    for j in range(1, len(w2_coordinates)):
-                        w2_1 = w2_coordinates[j - 1]
-                        w2_2 = w2_coordinates[j]
-
-                        x, y = self.get_intersect(w1_1, w1_2, w2_1, w2_2)
-                        # if is intersection
-                        x = round(x, 5)
-                        y = round(y, 5)
-                        first_x = sorted([round(w1_1[0], 5), round(w1_2[0], 5)])
-                        first_y = sorted([round(w1_1[1], 5), round(w1_2[1], 5)])
-
-                        second_x = sorted([round(w2_1[0], 5), round(w2_2[0], 5)])
-                        second_y = sorted([round(w2_1[1], 5), round(w2_2[1], 5)])
-
-                        if first_x[0] <= x <= first_x[1] and first_y[0] <= y <= first_y[1] \
-                                and second_x[0] <= x <= second_x[1] and second_y[0] <= y <= second_y[1]:
-                            intersections.add(((x, y), tuple(sorted((w1.id, w2.id)))))
+        wires = list(canvas.wires)
+        if len(wires) < 2:
+            return intersections
+        points = WireGeometry.curved_lines([wire.start_connection.location for wire in wires],
+                                           [wire.end_connection.location for wire in wires], det=5).reshape(
+            len(wires), -1, 2)
+        # lines through segment ends in homogeneous coordinates, like np.cross((x1, y1, 1), (x2, y2, 1))
+        x1, y1 = points[:, :-1, 0], points[:, :-1, 1]
+        x2, y2 = points[:, 1:, 0], points[:, 1:, 1]
+        a, b, c = y1 - y2, x2 - x1, x1 * y2 - y1 * x2
+        # segment bounds are rounded like the Python coordinates of the curves
+        rounded = np.array([[round(value, 5) for value in row] for row in points.reshape(len(wires), -1).tolist()])
+        rounded = rounded.reshape(points.shape)
+        min_x = np.minimum(rounded[:, :-1, 0], rounded[:, 1:, 0])
+        max_x = np.maximum(rounded[:, :-1, 0], rounded[:, 1:, 0])
+        min_y = np.minimum(rounded[:, :-1, 1], rounded[:, 1:, 1])
+        max_y = np.maximum(rounded[:, :-1, 1], rounded[:, 1:, 1])
+
+        connection_indices = {}
+        starts = np.array([connection_indices.setdefault(wire.start_connection, len(connection_indices))
+                           for wire in wires])
+        ends = np.array([connection_indices.setdefault(wire.end_connection, len(connection_indices))
+                         for wire in wires])
+        wire_indices = {}
+        keys = np.array([wire_indices.setdefault(wire, len(wire_indices)) for wire in wires])
+
+        for i, wire in enumerate(wires):
+            others = np.flatnonzero((keys != keys[i]) & (starts != starts[i]) & (starts != ends[i])
+                                    & (ends != starts[i]) & (ends != ends[i]))
+            if not len(others):
+                continue
+            # (segment of wire, other wire, segment of other wire)
+            a1, b1, c1 = a[i][:, None, None], b[i][:, None, None], c[i][:, None, None]
+            a2, b2, c2 = a[others][None], b[others][None], c[others][None]
+            z = a1 * b2 - b1 * a2
+            parallel = z == 0
+            z[parallel] = 1
+            x = np.round((b1 * c2 - c1 * b2) / z, 5)
+            y = np.round((c1 * a2 - a1 * c2) / z, 5)
+            found = (~parallel
+                     & (min_x[i][:, None, None] <= x) & (x <= max_x[i][:, None, None])
+                     & (min_y[i][:, None, None] <= y) & (y <= max_y[i][:, None, None])
+                     & (min_x[others][None] <= x) & (x <= max_x[others][None])
+                     & (min_y[others][None] <= y) & (y <= max_y[others][None]))
+            for segment, other, other_segment in zip(*np.nonzero(found)):
+                intersections.add(((x[segment, other, other_segment], y[segment, other, other_segment]),
+                                   tuple(sorted((wire.id, wires[others[other]].id)))))
 
         return intersections
 
@@ -0,0 +1,39 @@
+from unittest import TestCase
+
+from MVP.refactored.backend.box_functions.function_structure.function_parser import FunctionParser
+
+FUNCTION_CODE = """def f(x, g_0):
+    y = g(h(x), 1)
+    z = g(x) + g(x)
+    return y + h(z) * g_0
+"""
+
+
+class TestFunctionParser(TestCase):
+
+    def test_nested_calls_should_get_numbered_variables(self):
+        function_structure = FunctionParser.parse_function_code(FUNCTION_CODE)
+
+        self.assertEqual("h_0 = h(x)\n"
+                         "y = g(h_0, 1)\n"
+                         "g_1 = g(x)\n"
+                         "g_2 = g(x)\n"
+                         "z = g_1 + g_2\n"
+                         "h_1 = h(z)\n"
+                         "return y + h_1 * g_0", str(function_structure))
+
+    def test_parsing_should_give_same_names_every_time(self):
+        first = FunctionParser.parse_function_code(FUNCTION_CODE)
+        first.convert_mutable_variables_to_immutable()
+        second = FunctionParser.parse_function_code(FUNCTION_CODE)
+        second.convert_mutable_variables_to_immutable()
+
+        self.assertEqual(first, second)
+        self.assertEqual(str(first), str(second))
+
+    def test_reassigned_variable_should_get_unused_name(self):
+        function_structure = FunctionParser.parse_function_code("def f(x, x_0):\n    x = x + x_0\n    return x\n")
+        function_structure.convert_mutable_variables_to_immutable()
+
+        self.assertEqual(["x_1"], function_structure.body_lines[0].assigned_variables)
+        self.assertEqual("x_1", function_structure.return_line.assigned_value.elements[0].value)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.box_functions.box_function_cache import BoxFunctionCache
+
+file_code = '''
+import math
+
+factor = 2
+
+def helper(x):
+    return x * factor
+
+def invoke(a, b):
+    c = helper(a)
+    return c + b
+'''
+
+
+class TestBoxFunctionCache(TestCase):
+
+    def setUp(self):
+        BoxFunctionCache.clear()
+
+    def tearDown(self):
+        BoxFunctionCache.clear()
+
+    def test_same_file_code_should_be_parsed_once(self):
+        with patch.object(BoxFunctionCache, "parse", wraps=BoxFunctionCache.parse) as parse:
+            first = BoxFunction(file_code=file_code)
+            second = BoxFunction(file_code=file_code)
+
+        parse.assert_called_once()
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1, "max_size": BoxFunctionCache.max_size},
+                         BoxFunctionCache.get_info())
+        self.assertEqual(first, second)
+        self.assertEqual(first.global_statements, second.global_statements)
+
+    def test_cached_parts_should_match_code_inspector(self):
+        box_function = BoxFunction(file_code=file_code)
+
+        self.assertEqual("def invoke(a, b):\n    c = helper(a)\n    return c + b\n",
+                         box_function.main_function)
+        self.assertEqual(["def helper(x):\n    return x * factor\n"], box_function.helper_functions)
+        self.assertEqual(["import math\n"], box_function.imports)
+        self.assertEqual(["factor = 2\n"], box_function.global_statements)
+        self.assertEqual(["a", "b"], box_function.function_structure.arguments)
+
+    def test_box_functions_should_not_share_mutable_parts(self):
+        first = BoxFunction(file_code=file_code)
+        second = BoxFunction(file_code=file_code)
+
+        first.helper_functions.append("def other():\n    pass\n")
+
+        self.assertEqual(1, len(second.helper_functions))
+        self.assertIsNot(first.function_structure, second.function_structure)
+
+    def test_main_function_name_should_be_part_of_key(self):
+        BoxFunction(file_code=file_code)
+        helper = BoxFunction(file_code=file_code, main_function_name="helper")
+
+        self.assertEqual(2, BoxFunctionCache.get_info()["misses"])
+        self.assertEqual(["def invoke(a, b):\n    c = helper(a)\n    return c + b\n"],
+                         helper.helper_functions)
+
+    def test_least_recently_used_entry_should_be_evicted(self):
+        codes = [f"def invoke(x):\n    return x + {i}\n" for i in range(3)]
+        with patch.object(BoxFunctionCache, "max_size", 2):
+            BoxFunction(file_code=codes[0])
+            BoxFunction(file_code=codes[1])
+            BoxFunction(file_code=codes[0])
+            BoxFunction(file_code=codes[2])  # evicts codes[1]
+            BoxFunction(file_code=codes[0])
+            BoxFunction(file_code=codes[1])
+
+        self.assertEqual(2, BoxFunctionCache.get_info()["hits"])
+        self.assertEqual(4, BoxFunctionCache.get_info()["misses"])
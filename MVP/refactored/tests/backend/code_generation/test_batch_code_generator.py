@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from MVP.refactored.backend.box_functions.box_function import predefined_functions
+from MVP.refactored.backend.code_generation.batch_code_generator import generate_directory, generate_project, \
+    generate_project_code, main
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+
+
+EXAMPLE_PROJECTS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "..", "example_projects")
+
+
+def _connection(connection_id: int, side: str, index: int, box_id: int = None, spider: bool = False) -> dict:
+    return {"id": connection_id, "side": side, "index": index, "spider": spider, "box_id": box_id}
+
+
+def _create_project() -> dict:
+    # input 10 -> spider 30 -> box 1 (add) both inputs -> output 12
+    return {"main_canvas": {
+        "boxes": [{"id": 1, "x": 0, "y": 0, "size": [60, 60], "label": "", "sub_diagram": None,
+                   "connections": [_connection(2, "left", 0, 1), _connection(3, "left", 1, 1),
+                                   _connection(4, "right", 0, 1)],
+                   "box_function": {"relative_location": "./box_functions/add.py", "name": "add.py",
+                                    "main_function_name": "invoke"}}],
+        "spiders": [{"id": 30, "x": 0, "y": 0, "connections": []}],
+        "io": {"inputs": [_connection(10, "right", 0)], "outputs": [_connection(12, "left", 0)]},
+        "wires": [{"id": 20, "start_c": _connection(10, "right", 0), "end_c": _connection(30, "spider", 0, spider=True)},
+                  {"id": 21, "start_c": _connection(30, "spider", 0, spider=True), "end_c": _connection(2, "left", 0, 1)},
+                  {"id": 22, "start_c": _connection(30, "spider", 0, spider=True), "end_c": _connection(3, "left", 1, 1)},
+                  {"id": 23, "start_c": _connection(4, "right", 0, 1), "end_c": _connection(12, "left", 0)}]
+    }}
+
+
+class TestBatchCodeGenerator(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.project_directory = self.temporary_directory.name
+        self.output_directory = os.path.join(self.project_directory, "generated")
+        os.makedirs(os.path.join(self.project_directory, "box_functions"))
+        with open(os.path.join(self.project_directory, "box_functions", "add.py"), "w") as file:
+            file.write(predefined_functions["add"])
+        for name in ("first", "second"):
+            self._write_project(name, _create_project())
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+        HypergraphManager.clear()
+
+    def _write_project(self, name: str, project: dict):
+        with open(os.path.join(self.project_directory, f"{name}.json"), "w") as file:
+            json.dump(project, file)
+
+    def test_project_code_should_be_generated_without_canvas(self):
+        code = generate_project_code(os.path.join(self.project_directory, "first.json"))
+
+        namespace = {}
+        exec(code, namespace)
+        self.assertEqual(6, namespace["main_0"](3))
+
+    def test_every_project_should_be_written_to_output_directory(self):
+        results = generate_directory(self.project_directory, self.output_directory, jobs=1)
+
+        self.assertEqual([(None, []), (None, [])], list(results.values()))
+        self.assertCountEqual(["first.py", "second.py"], os.listdir(self.output_directory))
+
+    def test_process_pool_should_give_same_code(self):
+        generate_directory(self.project_directory, self.output_directory, jobs=1)
+        with open(os.path.join(self.output_directory, "first.py")) as file:
+            sequential = file.read()
+
+        generate_directory(self.project_directory, self.output_directory, jobs=2)
+        with open(os.path.join(self.output_directory, "first.py")) as file:
+            self.assertEqual(sequential, file.read())
+
+    def test_failed_project_should_be_reported(self):
+        project = _create_project()
+        project["main_canvas"]["boxes"][0]["box_function"]["relative_location"] = "./box_functions/missing.py"
+        self._write_project("broken", project)
+
+        results = generate_directory(self.project_directory, self.output_directory, jobs=1)
+
+        self.assertIn("FileNotFoundError", results[os.path.join(self.project_directory, "broken.json")][0])
+        self.assertNotIn("broken.py", os.listdir(self.output_directory))
+
+    def _write_label_only_project(self):
+        project = _create_project()
+        del project["main_canvas"]["boxes"][0]["box_function"]
+        project["main_canvas"]["boxes"][0]["label"] = "add"
+        self._write_project("old", project)
+
+    def test_label_only_box_should_be_generated_as_stub(self):
+        self._write_label_only_project()
+
+        code, stubbed_boxes = generate_project(os.path.join(self.project_directory, "old.json"), stub_label_only=True)
+
+        self.assertEqual([1], stubbed_boxes)
+        namespace = {}
+        exec(code, namespace)
+        with self.assertRaisesRegex(NotImplementedError, "Box 1 \\(label 'add'\\) has no box function"):
+            namespace["main_0"](3)
+
+    def test_bundled_example_project_should_be_generated(self):
+        code, stubbed_boxes = generate_project(os.path.join(EXAMPLE_PROJECTS_DIR, "copy_to_sum_test.json"),
+                                               stub_label_only=True)
+
+        self.assertEqual(2, len(stubbed_boxes))
+        namespace = {}
+        exec(code, namespace)
+        with self.assertRaises(NotImplementedError):
+            namespace["main_0"](1)
+
+    def test_bundled_example_projects_with_label_only_boxes_should_be_generated(self):
+        projects = ("coffee.json", "copy_to_two_sum_test_with_sub_sub.json", "three_sum_to_copy_test.json")
+        for project in projects:
+            with open(os.path.join(EXAMPLE_PROJECTS_DIR, project)) as file:
+                self._write_project(project.removesuffix(".json"), json.load(file))
+
+        results = generate_directory(self.project_directory, self.output_directory, jobs=1, stub_label_only=True)
+
+        for project in projects:
+            error, stubbed_boxes = results[os.path.join(self.project_directory, project)]
+            self.assertIsNone(error)
+            self.assertTrue(stubbed_boxes)
+            with open(os.path.join(self.output_directory, project.replace(".json", ".py"))) as file:
+                compile(file.read(), project, "exec")
+
+    def test_label_only_project_should_fail_without_stubs(self):
+        self._write_label_only_project()
+
+        results = generate_directory(self.project_directory, self.output_directory, jobs=1)
+
+        error, stubbed_boxes = results[os.path.join(self.project_directory, "old.json")]
+        self.assertIn("Box 1 has no function", error)
+        self.assertEqual([], stubbed_boxes)
+
+    def test_stubbed_projects_should_be_reported_separately(self):
+        self._write_label_only_project()
+
+        with mock.patch("builtins.print") as print_mock:
+            exit_code = main([self.project_directory, "-o", self.output_directory, "--jobs", "1",
+                              "--stub-label-only"])
+
+        lines = [call.args[0] for call in print_mock.call_args_list]
+        self.assertEqual(0, exit_code)
+        self.assertIn(f"{'stubbed':<8}{os.path.join(self.project_directory, 'old.json')}: "
+                      f"label-only boxes without box function 1", lines)
+        self.assertEqual("2 generated, 1 stubbed, 0 failed", lines[-1])
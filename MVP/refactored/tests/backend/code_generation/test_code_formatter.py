@@ -0,0 +1,54 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import autopep8
+
+from MVP.refactored.backend.code_generation.code_formatter import CodeFormatter
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+
+helper_function = "def helper(x):\n    return x * factor\n"
+main_function = "def main_0(input_0):\n    res_0 = helper(input_0)\n    return res_0\n"
+
+
+class TestCodeFormatter(TestCase):
+
+    def setUp(self):
+        CodeFormatter.clear()
+
+    def tearDown(self):
+        CodeFormatter.clear()
+
+    def test_join_module_should_separate_fragments_with_pep8_blank_lines(self):
+        code = CodeFormatter.join_module(["import math\n"], ["factor = 2\n"], [helper_function, main_function],
+                                         FormattingMode.FAST)
+
+        self.assertEqual("import math\n\nfactor = 2\n\n\n" + helper_function + "\n\n" + main_function, code)
+
+    def test_fast_and_pretty_output_of_pep8_fragments_should_be_equal(self):
+        arguments = (["import math\n"], ["factor = 2\n"], [helper_function, main_function])
+
+        self.assertEqual(CodeFormatter.join_module(*arguments, FormattingMode.FAST),
+                         CodeFormatter.join_module(*arguments, FormattingMode.PRETTY))
+
+    def test_pretty_mode_should_format_fragments(self):
+        code = CodeFormatter.join_module([], ["factor=2\n"], ["def helper(x):\n\treturn x*factor\n"],
+                                         FormattingMode.PRETTY)
+
+        self.assertEqual("factor = 2\n\n\ndef helper(x):\n    return x*factor\n", code)
+
+    def test_batched_fragments_should_match_single_fragment_formatting(self):
+        fragments = ["def a(x):\n\treturn x\n", "y=1\n", "def b( x ):\n  return  x\n"]
+
+        self.assertEqual([autopep8.fix_code(fragment) for fragment in fragments],
+                         CodeFormatter.fix_fragments(fragments))
+
+    def test_only_changed_fragments_should_be_formatted_again(self):
+        CodeFormatter.fix_fragments([helper_function, main_function])
+        changed_main_function = main_function.replace("res_0", "res_1")
+
+        with patch.object(autopep8, "fix_code", wraps=autopep8.fix_code) as fix_code:
+            CodeFormatter.fix_fragments([helper_function, changed_main_function])
+
+        fix_code.assert_called_once_with(changed_main_function)
+        self.assertEqual({"hits": 1, "misses": 3, "size": 3, "max_size": CodeFormatter.max_size},
+                         CodeFormatter.get_info())
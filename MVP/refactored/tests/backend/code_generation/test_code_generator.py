@@ -1,10 +1,21 @@
-from unittest import TestCase
+import tempfile
+from unittest import TestCase, mock
 
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
 from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.code_generation.code_inspector import CodeInspector
+from MVP.refactored.backend.code_generation.node_group_resolver import NodeGroupResolver
 from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
 from MVP.refactored.frontend.canvas_objects.box import Box
 from MVP.refactored.frontend.canvas_objects.wire import Wire
 from MVP.refactored.frontend.windows.main_diagram import MainDiagram
+from MVP.refactored.tests.backend.diagram_fixtures import ChainProject
+from MVP.refactored.util.importer.json_importer.headless_json_importer import HeadlessJsonImporter
 
 class TestCodeGenerator(TestCase):
 
@@ -65,3 +76,190 @@ class TestCodeGenerator(TestCase):
         code = CodeGenerator.generate_code(self.custom_canvas)
         print(code)
         self.assertIn("def main", code)
+
+
+class TestMainFunctionConstruction(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            generator = ChainProject(chains=12, boxes=9, sub_boxes=3)
+            self.importer = HeadlessJsonImporter()
+            self.canvas_id = self.importer.load_project(generator.write(directory))
+        CodeGenerator.clear_cache()
+
+    def tearDown(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+
+    def test_parallel_construction_should_give_same_code_as_serial(self):
+        serial_code = CodeGenerator.generate_diagram_code(self.importer.receiver, self.canvas_id, FormattingMode.FAST)
+        CodeGenerator.clear_cache()
+        with mock.patch.object(CodeGenerator, "PARALLEL_MAIN_FUNCTION_THRESHOLD", 2), \
+                mock.patch("os.cpu_count", return_value=3):
+            parallel_code = CodeGenerator.generate_diagram_code(self.importer.receiver, self.canvas_id,
+                                                                FormattingMode.FAST, parallel=True)
+
+        self.assertEqual(serial_code, parallel_code)
+        for i in range(12):
+            self.assertIn(f"def main_{i}(", parallel_code)
+
+    def test_main_functions_should_not_be_constructed_in_process_pool_unless_parallel(self):
+        with mock.patch.object(CodeGenerator, "PARALLEL_MAIN_FUNCTION_THRESHOLD", 2), \
+                mock.patch("os.cpu_count", return_value=3), \
+                mock.patch("MVP.refactored.backend.code_generation.code_generator.ProcessPoolExecutor") as executor:
+            code = CodeGenerator.generate_diagram_code(self.importer.receiver, self.canvas_id, FormattingMode.FAST)
+
+        executor.assert_not_called()
+        self.assertIn("def main_11(", code)
+
+    def test_main_function_should_not_depend_on_other_main_functions(self):
+        code = CodeGenerator.generate_diagram_code(self.importer.receiver, self.canvas_id, FormattingMode.FAST)
+        hypergraphs = HypergraphManager.get_graphs_by_canvas_id(self.canvas_id)
+        box_functions = set().union(*(CodeGenerator.get_all_box_functions(hypergraph) for hypergraph in hypergraphs))
+        renamed_functions = CodeInspector.rename(CodeGenerator.get_box_functions_items_names(box_functions))[3]
+
+        main_function = CodeGenerator.construct_main_function(hypergraphs[5], renamed_functions, "main_5",
+                                                              NodeGroupResolver(self.importer.receiver))
+
+        self.assertIn(main_function, code)
+
+
+class TestIncrementalCodeGeneration(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+        self.generator = ChainProject(chains=6, boxes=9, sub_boxes=3)
+        with tempfile.TemporaryDirectory() as directory:
+            self.importer = HeadlessJsonImporter()
+            self.canvas_id = self.importer.load_project(self.generator.write(directory))
+        self.receiver = self.importer.receiver
+        self.project = self.generator.generate()["main_canvas"]
+
+    def tearDown(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+
+    def _generate(self) -> str:
+        return CodeGenerator.generate_diagram_code(self.receiver, self.canvas_id, FormattingMode.FAST)
+
+    def _generate_counting_main_functions(self) -> tuple[str, int]:
+        with mock.patch.object(CodeGenerator, "construct_main_function",
+                               wraps=CodeGenerator.construct_main_function) as construct_main_function:
+            code = self._generate()
+        return code, construct_main_function.call_count
+
+    def _generate_from_scratch(self) -> str:
+        CodeGenerator.clear_cache()
+        return self._generate()
+
+    def test_unchanged_diagram_should_reuse_all_main_functions(self):
+        code = self._generate()
+
+        self.assertEqual((code, 0), self._generate_counting_main_functions())
+
+    def test_wire_delete_should_construct_only_changed_main_functions(self):
+        self._generate()
+        output_id = self.project["io"]["outputs"][2]["id"]
+        wire_id = next(wire["id"] for wire in self.project["wires"] if wire["end_c"]["id"] == output_id)
+
+        self.receiver.receiver_callback(ActionType.WIRE_DELETE, resource_id=wire_id, canvas_id=self.canvas_id)
+        code, constructed = self._generate_counting_main_functions()
+
+        self.assertEqual(self._generate_from_scratch(), code)
+        self.assertEqual(2, constructed)  # chain without the output and the output alone
+        self.assertIn("def main_6(", code)
+
+    def test_set_function_should_change_code_of_the_box(self):
+        self._generate()
+        box_id = next(box["id"] for box in self.project["boxes"] if box["label"] == "" and
+                      box["box_function"]["main_function_name"] == "increment")
+        double = BoxFunction(file_code="def double(x):\n    return 2 * x\n", main_function_name="double")
+
+        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box_id, canvas_id=self.canvas_id,
+                                        box_function=double)
+        code = self._generate()
+
+        self.assertIn("def double_", code)
+        self.assertEqual(self._generate_from_scratch(), code)
+
+    def test_placeholders_of_unused_box_functions_should_be_evicted(self):
+        self._generate()
+        box_id = next(box["id"] for box in self.project["boxes"] if box["label"] == "" and
+                      box["box_function"]["main_function_name"] == "increment")
+        double = BoxFunction(file_code="def double(x):\n    return 2 * x\n", main_function_name="double")
+        triple = BoxFunction(file_code="def triple(x):\n    return 3 * x\n", main_function_name="triple")
+
+        for box_function in (double, triple):
+            self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box_id,
+                                            canvas_id=self.canvas_id, box_function=box_function)
+            code = self._generate()
+
+        self.assertNotIn(double, CodeGenerator.box_function_placeholders)
+        self.assertIn(triple, CodeGenerator.box_function_placeholders)
+        self.assertNotIn("\x00", code)
+        self.assertIn("def main_0(", code)
+
+
+class TestMainFunctionStatementOrder(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+        self.receiver = Receiver()
+        self.canvas_id = 1
+        self.receiver.add_new_canvas(self.canvas_id)
+
+        # diagram input -> spider 60 -> boxes "third", "first", "second" -> diagram outputs
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_INPUT, connection_id=10, connection_nr=0,
+                                        connection_side=ConnectionSide.RIGHT, canvas_id=self.canvas_id)
+        self.receiver.receiver_callback(ActionType.SPIDER_CREATE, resource_id=60, canvas_id=self.canvas_id)
+        self._add_wire(50, ConnectionInfo(0, ConnectionSide.RIGHT, 10), self._spider())
+        self.boxes = {name: self._add_box(box_id, name) for box_id, name in ((300, "third"), (100, "first"),
+                                                                               (200, "second"))}
+        for index, name in enumerate(self.boxes):
+            self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_OUTPUT, connection_id=20 + index,
+                                            connection_nr=index, connection_side=ConnectionSide.LEFT,
+                                            canvas_id=self.canvas_id)
+            self._add_wire(30 + index, self.boxes[name][1], ConnectionInfo(index, ConnectionSide.LEFT, 20 + index))
+
+    def tearDown(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+
+    def _spider(self) -> ConnectionInfo:
+        return ConnectionInfo(0, ConnectionSide.SPIDER, 60)
+
+    def _add_box(self, box_id: int, name: str) -> tuple[ConnectionInfo, ConnectionInfo]:
+        self.receiver.receiver_callback(ActionType.BOX_CREATE, generator_id=box_id, canvas_id=self.canvas_id)
+        self.receiver.receiver_callback(ActionType.BOX_ADD_LEFT, generator_id=box_id, connection_nr=0,
+                                        connection_id=box_id + 1, canvas_id=self.canvas_id)
+        self.receiver.receiver_callback(ActionType.BOX_ADD_RIGHT, generator_id=box_id, connection_nr=0,
+                                        connection_id=box_id + 2, canvas_id=self.canvas_id)
+        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box_id, canvas_id=self.canvas_id,
+                                        box_function=BoxFunction(file_code=f"def {name}(x):\n    return x\n",
+                                                                 main_function_name=name))
+        return (ConnectionInfo(0, ConnectionSide.LEFT, box_id + 1, box_id),
+                ConnectionInfo(0, ConnectionSide.RIGHT, box_id + 2, box_id))
+
+    def _add_wire(self, wire_id: int, start: ConnectionInfo, end: ConnectionInfo):
+        self.receiver.receiver_callback(ActionType.WIRE_CREATE, resource_id=wire_id, canvas_id=self.canvas_id,
+                                        start_connection=start, end_connection=end)
+
+    def _get_call_order(self) -> list[str]:
+        code = CodeGenerator.generate_diagram_code(self.receiver, self.canvas_id, FormattingMode.FAST)
+        main_function = code[code.index("def main_0("):]
+        return sorted(self.boxes, key=lambda name: main_function.index(f"= {name}_"))
+
+    def test_independent_boxes_should_be_called_in_creation_order_of_their_input_wires(self):
+        for wire_id, name in ((72, "second"), (70, "third"), (71, "first")):
+            self._add_wire(wire_id, self._spider(), self.boxes[name][0])
+
+        self.assertEqual(["second", "third", "first"], self._get_call_order())
+
+    def test_statement_order_should_not_depend_on_ids(self):
+        for wire_id, name in ((90, "first"), (80, "third"), (85, "second")):
+            self._add_wire(wire_id, self._spider(), self.boxes[name][0])
+
+        self.assertEqual(["first", "third", "second"], self._get_call_order())
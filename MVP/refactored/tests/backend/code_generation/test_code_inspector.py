@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from MVP.refactored.backend.code_generation import code_inspector
+from MVP.refactored.backend.code_generation.code_inspector import CodeInspector
+
+
+class HashableBoxFunction(SimpleNamespace):
+    def __hash__(self):
+        return id(self)
+
+
+def _create_box_function(index: int) -> HashableBoxFunction:
+    return HashableBoxFunction(
+        global_statements=[f"counter = {index}\n"],
+        helper_functions=["def helper(x):\n    return x * 2\n"],
+        main_function="def invoke(a):\n    global counter\n    counter += 1\n    return helper(a) + counter\n",
+        main_function_name="invoke",
+    )
+
+
+class TestCodeInspector(TestCase):
+
+    def setUp(self):
+        CodeInspector.clear_cache()
+
+    def tearDown(self):
+        CodeInspector.clear_cache()
+
+    def test_rename_code_should_apply_all_names_in_one_pass(self):
+        code = "def a(x):\n    return a_0(x)\n"
+
+        renamed = CodeInspector(names={"a": "a_0", "a_0": "a_0_0"}).rename_code(code)
+
+        self.assertEqual("def a_0(x):\n    return a_0_0(x)\n", renamed)
+
+    def test_rename_code_should_rename_globals_in_function_with_parameters(self):
+        code = "def invoke(a):\n    global counter\n    counter += 1\n    return a + counter\n"
+
+        renamed = CodeInspector(names={"counter": "counter_0"}).rename_code(code)
+
+        self.assertEqual("def invoke(a):\n    global counter_0\n    counter_0 += 1\n    return a + counter_0\n",
+                         renamed)
+
+    def test_rename_code_should_not_rename_parameters(self):
+        code = "def invoke(counter):\n    return counter\n"
+
+        renamed = CodeInspector(names={"counter": "counter_0"}).rename_code(code)
+
+        self.assertEqual(code, renamed)
+
+    def test_refactor_code_should_rename_single_name(self):
+        renamed = CodeInspector().refactor_code("x = helper(1)\n", "helper", "helper_1")
+
+        self.assertEqual("x = helper_1(1)\n", renamed)
+
+    def test_rename_should_add_index_to_every_box_function(self):
+        box_functions = [_create_box_function(i) for i in range(2)]
+        items_names = {box_function: {"counter", "helper", "invoke"} for box_function in box_functions}
+
+        global_statements, helper_functions, main_functions, new_names = CodeInspector.rename(items_names)
+
+        self.assertEqual({"counter_0 = 0\n", "counter_1 = 1\n"}, global_statements)
+        self.assertEqual({"def helper_0(x):\n    return x * 2\n", "def helper_1(x):\n    return x * 2\n"},
+                         helper_functions)
+        self.assertEqual(2, len(main_functions))
+        self.assertEqual(["invoke_0", "invoke_1"], [new_names[box_function] for box_function in box_functions])
+
+    def test_rename_in_process_pool_should_give_same_result(self):
+        box_functions = [_create_box_function(i) for i in range(4)]
+        items_names = {box_function: {"counter", "helper", "invoke"} for box_function in box_functions}
+
+        sequential = CodeInspector.rename(items_names)
+        CodeInspector.clear_cache()
+        try:
+            with patch.object(CodeInspector, "PARALLEL_RENAME_THRESHOLD", 2):
+                parallel = CodeInspector.rename(items_names, parallel=True)
+                executor = CodeInspector.executor
+                CodeInspector.clear_cache()
+                CodeInspector.rename(items_names, parallel=True)
+
+            self.assertEqual(sequential, parallel)
+            self.assertIsNotNone(executor)
+            self.assertIs(executor, CodeInspector.executor)
+        finally:
+            CodeInspector.shutdown_executor()
+
+        self.assertIsNone(CodeInspector.executor)
+
+    def test_rename_should_not_start_process_pool_unless_parallel(self):
+        box_functions = [_create_box_function(i) for i in range(4)]
+
+        with patch.object(CodeInspector, "PARALLEL_RENAME_THRESHOLD", 2):
+            CodeInspector.rename({box_function: {"counter", "helper", "invoke"} for box_function in box_functions})
+
+        self.assertIsNone(CodeInspector.executor)
+
+    def test_rename_should_reuse_renamed_code_of_same_box_function(self):
+        box_functions = [_create_box_function(i) for i in range(2)]
+        CodeInspector.rename({box_function: {"counter", "helper", "invoke"} for box_function in box_functions})
+
+        with patch("MVP.refactored.backend.code_generation.code_inspector._rename_box_function_code",
+                   wraps=code_inspector._rename_box_function_code) as rename_box_function_code:
+            _, _, _, new_names = CodeInspector.rename({box_function: {"counter", "helper", "invoke"}
+                                                       for box_function in box_functions + [_create_box_function(2)]})
+
+        self.assertEqual(1, rename_box_function_code.call_count)
+        self.assertEqual(["invoke_0", "invoke_1", "invoke_2"], list(new_names.values()))
@@ -0,0 +1,127 @@
+from unittest import TestCase
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.code_generation.hypergraph_optimizer import HypergraphOptimizer
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.runtime.diagram_runtime import DiagramRuntime
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.tests.backend.diagram_fixtures import ReceiverDiagram
+
+
+def create_box_function(code: str, main_function_name: str = "f") -> BoxFunction:
+    return BoxFunction(file_code=code, main_function_name=main_function_name)
+
+
+class TestHypergraphOptimizer(TestCase):
+
+    def setUp(self):
+        HypergraphOptimizer.clear_cache()
+
+    def test_local_values_and_pure_functions_as_arguments_should_be_pure(self):
+        box_function = create_box_function("def key(item):\n    return -item\n\n\n"
+                                           "def f(x, y):\n    total = 0\n    total += y\n"
+                                           "    return sorted(x, key=key), max(x, key=abs), total\n")
+
+        self.assertTrue(HypergraphOptimizer.analyze(box_function).is_pure)
+
+    def test_arithmetic_and_helper_calls_should_be_pure(self):
+        box_function = create_box_function("def half(x):\n    return x / 2\n\n\n"
+                                           "def f(x, y):\n    return max(abs(half(x) + y), 1)\n")
+
+        self.assertTrue(HypergraphOptimizer.analyze(box_function).is_pure)
+        self.assertTrue(HypergraphOptimizer.analyze(BoxFunction(predefined_function_file_name="add",
+                                                                is_predefined_function=True)).is_pure)
+
+    def test_side_effects_should_not_be_pure(self):
+        for code in ("def f(x):\n    print(x)\n    return x\n",
+                     "from random import random\n\n\ndef f(x):\n    return x + random()\n",
+                     "def f(x):\n    x[0] = 1\n    return x\n",
+                     "def f(x):\n    global y\n    y = x\n    return x\n",
+                     "def f(x):\n    x += [1]\n    return x\n",
+                     "def f(x):\n    return sorted(x, key=print)\n",
+                     "def f(x, y):\n    return sorted(x, key=y.append)\n"):
+            with self.subTest(code=code):
+                self.assertFalse(HypergraphOptimizer.analyze(create_box_function(code)).is_pure)
+
+    def test_copies_should_be_counted_only_for_copy_functions(self):
+        copy_function = BoxFunction(predefined_function_file_name="copy", is_predefined_function=True)
+
+        self.assertEqual(2, HypergraphOptimizer.analyze(copy_function).copies)
+        self.assertEqual(3, HypergraphOptimizer.analyze(create_box_function("def f(x):\n    return x, x, x\n")).copies)
+        self.assertEqual(0, HypergraphOptimizer.analyze(create_box_function("def f(x, y):\n    return x, y\n")).copies)
+        self.assertEqual(0, HypergraphOptimizer.analyze(create_box_function("def f(x):\n    return x, 1\n")).copies)
+
+
+class TestMainFunctionOptimization(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+        DiagramRuntime.clear_cache()
+        increment = create_box_function("def increment(x):\n    return x + 1\n", "increment")
+        multiply = create_box_function("def multiply(x, y):\n    return x * y\n", "multiply")
+        negate = create_box_function("def negate(x):\n    return -x\n", "negate")
+        copy_function = BoxFunction(predefined_function_file_name="copy", is_predefined_function=True)
+
+        # input -> increment twice on the same spider -> multiply -> copy -> outputs, negate of the product is dead
+        self.builder = builder = ReceiverDiagram()
+        spiders = [builder.add_spider() for _ in range(4)]
+        builder.add_wire(builder.add_input(0), spiders[0])
+        for spider in spiders[1:3]:
+            left, right = builder.add_box(1, 1, increment)
+            builder.add_wire(spiders[0], left[0])
+            builder.add_wire(right[0], spider)
+        left, right = builder.add_box(2, 1, multiply)
+        builder.add_wire(spiders[1], left[0])
+        builder.add_wire(spiders[2], left[1])
+        builder.add_wire(right[0], spiders[3])
+        left, right = builder.add_box(1, 1, negate)
+        builder.add_wire(spiders[3], left[0])
+        builder.add_wire(right[0], builder.add_spider())
+        left, right = builder.add_box(1, 2, copy_function)
+        builder.add_wire(spiders[3], left[0])
+        for i, connection in enumerate(right):
+            builder.add_wire(connection, builder.add_output(i))
+
+    def tearDown(self):
+        CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS = False
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+        DiagramRuntime.clear_cache()
+
+    def _generate(self, optimize: bool) -> str:
+        CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS = optimize
+        CodeGenerator.clear_cache()
+        return CodeGenerator.generate_diagram_code(self.builder.receiver, self.builder.canvas_id, FormattingMode.FAST)
+
+    def test_dead_repeated_and_copy_calls_should_not_be_emitted(self):
+        code = self._generate(True)
+
+        main_function = code[code.index("def main_0"):]
+        self.assertEqual(2, main_function.count(" = "))  # increment once and multiply
+        self.assertNotIn("negate", main_function)
+        self.assertIn("return res_1, res_1", main_function)
+        self.assertEqual(5, self._generate(False).count("    res_"))
+
+    def test_box_functions_without_calls_should_not_be_emitted(self):
+        code = self._generate(True)
+
+        self.assertNotIn("def negate", code)
+        self.assertNotIn("def invoke", code)  # copy box
+        self.assertIn("def invoke", self._generate(False))
+
+    def test_optimization_should_be_opt_in(self):
+        self.assertFalse(CodeGenerator.OPTIMIZE_MAIN_FUNCTIONS)
+
+    def test_optimized_code_should_give_same_results(self):
+        results = []
+        for optimize in (False, True):
+            namespace = {}
+            exec(self._generate(optimize), namespace)
+            compiled = DiagramRuntime.compile_diagram(self.builder.receiver, self.builder.canvas_id)[0]
+            results.append((namespace["main_0"](4), compiled(4)))
+            DiagramRuntime.clear_cache()
+
+        self.assertEqual([((25, 25), (25, 25))] * 2, results)
+        self.assertEqual(2, len(DiagramRuntime.compile_diagram(self.builder.receiver, self.builder.canvas_id)[0].steps))
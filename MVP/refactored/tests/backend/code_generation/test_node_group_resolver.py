@@ -0,0 +1,74 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from MVP.refactored.backend.code_generation.node_group_resolver import NodeGroupResolver
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+
+
+class TestNodeGroupResolver(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        self.receiver = Receiver()
+        self.canvas_id = 1
+        self.box_id = 2  # compound box, its sub diagram canvas has the same id
+        self.receiver.add_new_canvas(self.canvas_id)
+
+        self.receiver.receiver_callback(ActionType.BOX_CREATE, generator_id=self.box_id, canvas_id=self.canvas_id)
+        self.receiver.receiver_callback(ActionType.BOX_COMPOUND, generator_id=self.box_id, canvas_id=self.canvas_id,
+                                        new_canvas_id=self.box_id)
+        self.receiver.add_new_canvas(self.box_id)
+
+        # outer diagram input -> wire 20 -> compound box left connection 11
+        diagram_input = self._add_diagram_input(10, self.canvas_id)
+        self.receiver.receiver_callback(ActionType.BOX_ADD_LEFT, generator_id=self.box_id, connection_nr=0,
+                                        connection_id=11, canvas_id=self.canvas_id)
+        self._add_wire(20, self.canvas_id, diagram_input,
+                       ConnectionInfo(0, ConnectionSide.LEFT, 11, self.box_id))
+
+        # sub diagram input 12 -> wire 21 -> sub diagram output 13
+        sub_diagram_input = self._add_diagram_input(12, self.box_id)
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_OUTPUT, connection_id=13, connection_nr=0,
+                                        connection_side=ConnectionSide.LEFT, canvas_id=self.box_id)
+        self._add_wire(21, self.box_id, sub_diagram_input, ConnectionInfo(0, ConnectionSide.LEFT, 13))
+
+        self.outer_wire = HypergraphManager.get_node_by_node_id(20)
+        self.inner_wire = HypergraphManager.get_node_by_node_id(21)
+
+    def tearDown(self):
+        HypergraphManager.clear()
+
+    def _add_diagram_input(self, connection_id: int, canvas_id: int) -> ConnectionInfo:
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_INPUT, connection_id=connection_id, connection_nr=0,
+                                        connection_side=ConnectionSide.RIGHT, canvas_id=canvas_id)
+        return ConnectionInfo(0, ConnectionSide.RIGHT, connection_id)
+
+    def _add_wire(self, wire_id: int, canvas_id: int, start: ConnectionInfo, end: ConnectionInfo):
+        self.receiver.receiver_callback(ActionType.WIRE_CREATE, resource_id=wire_id, canvas_id=canvas_id,
+                                        start_connection=start, end_connection=end)
+
+    def test_input_of_compound_box_should_resolve_to_sub_diagram_node_group(self):
+        resolver = NodeGroupResolver(self.receiver)
+
+        self.assertEqual(self.inner_wire.node_group_hash(), resolver.get_input_actual_node_group_hash(self.outer_wire))
+
+    def test_node_not_connected_to_compound_box_should_resolve_to_own_group(self):
+        resolver = NodeGroupResolver(self.receiver)
+
+        self.assertEqual(self.inner_wire.node_group_hash(), resolver.get_input_actual_node_group_hash(self.inner_wire))
+        self.assertEqual(self.outer_wire.node_group_hash(), resolver.get_output_actual_node_group_hash(self.outer_wire))
+
+    def test_sub_diagram_should_be_scanned_once(self):
+        resolver = NodeGroupResolver(self.receiver)
+
+        with patch.object(resolver, "_add_sub_diagram_ports", wraps=resolver._add_sub_diagram_ports) as scan:
+            first = resolver.get_input_actual_node_group_hash(self.outer_wire)
+            resolver.input_hashes.clear()
+            second = resolver.get_input_actual_node_group_hash(self.outer_wire)
+
+        self.assertEqual(first, second)
+        scan.assert_called_once()
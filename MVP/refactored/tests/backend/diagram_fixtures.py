@@ -0,0 +1,194 @@
+"""
+Small diagrams shared by backend tests.
+
+ChainProject writes projects in the ProjectExporter schema for HeadlessJsonImporter, every chain is a separate
+hypergraph:
+
+    input -> spider -> [compound box ->] spider -> increment -> spider -> add -> spider -> ... -> output
+
+"add" boxes take the latest spider of the chain and the first spider of the chain.
+ReceiverDiagram creates diagram resources directly through Receiver callbacks.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+
+BOX_FUNCTIONS = {
+    "increment": "def increment(x):\n    return x + 1\n",
+    "add": "def add(a, b):\n    return a + b\n",
+}
+
+
+class ChainProject:
+    """Builds project dicts, ids are unique over the project and given in creation order."""
+
+    def __init__(self, chains: int = 1, boxes: int = 3, sub_boxes: int = 0):
+        """
+        :param chains: number of chains (hypergraphs) on the main canvas
+        :param boxes: number of atomic boxes in every chain of the main canvas
+        :param sub_boxes: number of increment boxes in the sub diagram of the compound box that starts every chain
+            of the main canvas, 0 creates no compound boxes
+        """
+        self.chains = chains
+        self.boxes = boxes
+        self.sub_boxes = sub_boxes
+        self.next_id = 0
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def generate(self) -> dict:
+        """Return project dict, can be called again to get the same project."""
+        self.next_id = 0
+        canvas = self.create_canvas()
+        for chain in range(self.chains):
+            self.add_chain(canvas, chain, self.boxes, self.sub_boxes, None)
+        return {"file_name": "chains.json", "date": 0, "main_canvas": canvas}
+
+    def write(self, directory: str, name: str = "chains") -> str:
+        """Write project JSON and box functions to the directory, return path of the JSON file."""
+        os.makedirs(os.path.join(directory, "box_functions"), exist_ok=True)
+        for function_name, code in BOX_FUNCTIONS.items():
+            with open(os.path.join(directory, "box_functions", f"{function_name}.py"), "w") as file:
+                file.write(code)
+        json_file_path = os.path.join(directory, f"{name}.json")
+        with open(json_file_path, "w") as file:
+            json.dump(self.generate(), file)
+        return json_file_path
+
+    @staticmethod
+    def create_canvas() -> dict:
+        return {"boxes": [], "spiders": [], "io": {"inputs": [], "outputs": []}, "wires": []}
+
+    def add_chain(self, canvas: dict, chain: int, boxes: int, sub_boxes: int, source_box_id: int | None):
+        diagram_input = self.create_connection(self.new_id(), "right", chain, source_box_id)
+        canvas["io"]["inputs"].append(diagram_input)
+        spiders = [self.add_spider(canvas)]
+        self.add_wire(canvas, diagram_input, spiders[0])
+
+        if sub_boxes:
+            box, left, right = self.add_box(canvas, 1, None)
+            box["label"] = f"sub_{box['id']}"
+            box["sub_diagram"] = self.create_canvas()
+            self.add_chain(box["sub_diagram"], 0, sub_boxes, 0, box["id"])
+            spiders.append(self.connect_box(canvas, [spiders[-1]], left, right))
+        for step in range(boxes):
+            if step % 2:
+                box, left, right = self.add_box(canvas, 2, "add")
+                spiders.append(self.connect_box(canvas, [spiders[-1], spiders[0]], left, right))
+            else:
+                box, left, right = self.add_box(canvas, 1, "increment")
+                spiders.append(self.connect_box(canvas, [spiders[-1]], left, right))
+
+        diagram_output = self.create_connection(self.new_id(), "left", chain, source_box_id)
+        canvas["io"]["outputs"].append(diagram_output)
+        self.add_wire(canvas, spiders[-1], diagram_output)
+
+    def connect_box(self, canvas: dict, inputs: list[dict], left: list[dict], right: list[dict]) -> dict:
+        """Wire the input spiders to the box, return the new spider of its output."""
+        for spider, connection in zip(inputs, left):
+            self.add_wire(canvas, spider, connection)
+        spider = self.add_spider(canvas)
+        self.add_wire(canvas, right[0], spider)
+        return spider
+
+    def add_box(self, canvas: dict, inputs: int, function_name: str | None) -> tuple[dict, list[dict], list[dict]]:
+        box_id = self.new_id()
+        left = [self.create_connection(self.new_id(), "left", i, box_id) for i in range(inputs)]
+        right = [self.create_connection(self.new_id(), "right", 0, box_id)]
+        box = {"id": box_id, "x": 0, "y": 0, "size": [60, 60], "label": "", "connections": left + right,
+               "sub_diagram": None, "locked": True, "shape": "rectangle"}
+        if function_name:
+            box["box_function"] = {"relative_location": f"./box_functions/{function_name}.py",
+                                   "name": f"{function_name}.py", "main_function_name": function_name}
+        canvas["boxes"].append(box)
+        return box, left, right
+
+    def add_spider(self, canvas: dict) -> dict:
+        spider = {"id": self.new_id(), "x": 0, "y": 0, "connections": [], "type": "GENERIC"}
+        canvas["spiders"].append(spider)
+        return spider
+
+    def add_wire(self, canvas: dict, start: dict, end: dict):
+        wire_id = self.new_id()
+        canvas["wires"].append({"id": wire_id,
+                                "start_c": self.get_wire_end(start, wire_id),
+                                "end_c": self.get_wire_end(end, wire_id)})
+
+    @classmethod
+    def get_wire_end(cls, canvas_object: dict, wire_id: int) -> dict:
+        """Return connection dict of the wire end, spider gets a new spider connection."""
+        if "side" in canvas_object:
+            canvas_object.update({"has_wire": True, "wire_id": wire_id})
+            return canvas_object
+        connection = cls.create_connection(canvas_object["id"], "spider", len(canvas_object["connections"]), None)
+        connection.update({"spider": True, "has_wire": True, "wire_id": wire_id})
+        canvas_object["connections"].append(connection)
+        return connection
+
+    @staticmethod
+    def create_connection(connection_id: int, side: str, index: int, box_id: int | None) -> dict:
+        return {"id": connection_id, "side": side, "index": index, "spider": False, "box_id": box_id,
+                "has_wire": False, "wire_id": None, "type": "GENERIC"}
+
+
+class ReceiverDiagram:
+    """Creates diagram resources with unique ids on one canvas through Receiver callbacks."""
+
+    def __init__(self, canvas_id: int = 0):
+        self.receiver: Receiver = Receiver()
+        self.canvas_id: int = canvas_id
+        self.next_id: int = canvas_id
+        self.receiver.add_new_canvas(canvas_id)
+
+    def new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def add_box(self, inputs: int, outputs: int,
+                box_function: BoxFunction) -> tuple[list[ConnectionInfo], list[ConnectionInfo]]:
+        """Add box with given box function, return its left and right connections."""
+        box_id = self.new_id()
+        self.receiver.receiver_callback(ActionType.BOX_CREATE, generator_id=box_id, canvas_id=self.canvas_id)
+        left, right = [], []
+        for connections, action, side, amount in ((left, ActionType.BOX_ADD_LEFT, ConnectionSide.LEFT, inputs),
+                                                  (right, ActionType.BOX_ADD_RIGHT, ConnectionSide.RIGHT, outputs)):
+            for i in range(amount):
+                connection_id = self.new_id()
+                self.receiver.receiver_callback(action, generator_id=box_id, connection_nr=i,
+                                                connection_id=connection_id, canvas_id=self.canvas_id)
+                connections.append(ConnectionInfo(i, side, connection_id, box_id))
+        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box_id, canvas_id=self.canvas_id,
+                                        box_function=box_function)
+        return left, right
+
+    def add_input(self, index: int) -> ConnectionInfo:
+        connection_id = self.new_id()
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_INPUT, connection_id=connection_id, connection_nr=index,
+                                        connection_side=ConnectionSide.RIGHT, canvas_id=self.canvas_id)
+        return ConnectionInfo(index, ConnectionSide.RIGHT, connection_id)
+
+    def add_output(self, index: int) -> ConnectionInfo:
+        connection_id = self.new_id()
+        self.receiver.receiver_callback(ActionType.DIAGRAM_ADD_OUTPUT, connection_id=connection_id,
+                                        connection_nr=index, connection_side=ConnectionSide.LEFT,
+                                        canvas_id=self.canvas_id)
+        return ConnectionInfo(index, ConnectionSide.LEFT, connection_id)
+
+    def add_spider(self) -> ConnectionInfo:
+        spider_id = self.new_id()
+        self.receiver.receiver_callback(ActionType.SPIDER_CREATE, resource_id=spider_id, canvas_id=self.canvas_id)
+        return ConnectionInfo(0, ConnectionSide.SPIDER, spider_id)
+
+    def add_wire(self, start: ConnectionInfo, end: ConnectionInfo):
+        self.receiver.receiver_callback(ActionType.WIRE_CREATE, resource_id=self.new_id(), canvas_id=self.canvas_id,
+                                        start_connection=start, end_connection=end)
@@ -466,3 +466,58 @@ class TestHypergraph(TestCase):
         self.assertIn(self.edge2.id, self.hypergraph.edges)
         self.assertEqual(self.hypergraph.edges[self.edge1.id], self.edge1)
         self.assertEqual(self.hypergraph.edges[self.edge2.id], self.edge2)
+
+    # Test get_hyper_edges_in_topological_order
+    # --------------------------------------
+    def _connect(self, source: Node, hyper_edge: HyperEdge, target: Node):
+        hyper_edge.append_source_node(source)
+        source.append_output(hyper_edge)
+        hyper_edge.append_target_node(target)
+        target.append_input(hyper_edge)
+        self.hypergraph.nodes[source.id] = source
+        self.hypergraph.nodes[target.id] = target
+
+    def test_topological_order_follows_dependencies(self):
+        # node0 -edge0-> node1 -edge1-> node2 -edge2-> node3, edges added in reverse order
+        self._connect(self.node2, self.edge2, self.node3)
+        self._connect(self.node1, self.edge1, self.node2)
+        self._connect(self.node0, self.edge0, self.node1)
+        self.hypergraph.add_edges([self.edge2, self.edge1, self.edge0])
+        self.hypergraph.update_hypergraph_source()
+
+        self.assertEqual([self.edge0, self.edge1, self.edge2], self.hypergraph.get_hyper_edges_in_topological_order())
+
+    def test_topological_order_keeps_hyper_edge_order_of_same_pass(self):
+        # edge0 and edge2 depend only on node0, edge1 depends on edge0
+        self._connect(self.node0, self.edge0, self.node1)
+        self._connect(self.node1, self.edge1, self.node2)
+        self._connect(self.node0, self.edge2, self.node3)
+        self.hypergraph.add_edges([self.edge1, self.edge0, self.edge2])
+        self.hypergraph.update_hypergraph_source()
+
+        self.assertEqual([self.edge0, self.edge2, self.edge1], self.hypergraph.get_hyper_edges_in_topological_order())
+
+    def test_topological_order_with_cycle_raises_error(self):
+        self._connect(self.node0, self.edge0, self.node3)
+        self._connect(self.node1, self.edge1, self.node2)
+        self._connect(self.node2, self.edge2, self.node1)
+        self.hypergraph.add_edges([self.edge0, self.edge1, self.edge2])
+        self.hypergraph.update_hypergraph_source()
+
+        with self.assertRaises(ValueError) as context:
+            self.hypergraph.get_hyper_edges_in_topological_order()
+        self.assertIn(str(self.edge1.id), str(context.exception))
+        self.assertIn(str(self.edge2.id), str(context.exception))
+
+    def test_topological_order_is_cached_until_invalidated(self):
+        self._connect(self.node0, self.edge0, self.node1)
+        self.hypergraph.add_edge(self.edge0)
+        self.hypergraph.update_hypergraph_source()
+        self.assertEqual([self.edge0], self.hypergraph.get_hyper_edges_in_topological_order())
+
+        self._connect(self.node1, self.edge1, self.node2)
+        self.hypergraph.edges[self.edge1.id] = self.edge1
+        self.assertEqual([self.edge0], self.hypergraph.get_hyper_edges_in_topological_order())
+
+        self.hypergraph.invalidate_hyper_edge_order()
+        self.assertEqual([self.edge0, self.edge1], self.hypergraph.get_hyper_edges_in_topological_order())
@@ -10,14 +10,14 @@ from MVP.refactored.backend.hypergraph.hypergraph import Hypergraph
 class TestHypergraphManager(TestCase):
 
     def setUp(self):
-        HypergraphManager.hypergraphs.clear()
+        HypergraphManager.clear()
         self.sample_node = Node(1)
         self.sample_node_ = Node(2)
         self.sample_hypergraph = Hypergraph(canvas_id=123)
         self.sample_hyper_edge = HyperEdge(10)
 
     def tearDown(self):
-        HypergraphManager.hypergraphs.clear()
+        HypergraphManager.clear()
 
     # TEST: Node creation and registration
     # ----------------------------------------------------------
@@ -176,3 +176,84 @@ class TestHypergraphManager(TestCase):
             HypergraphManager.swap_hyper_edge_id(prev_id=10, new_id=20)
 
         graph.swap_hyper_edge_id.assert_called_once_with(10, 20)
+
+    # TEST: Connected component index
+    # ----------------------------------------------------------
+    def test_connecting_nodes_keeps_id_of_bigger_hypergraph(self):
+        node_a = HypergraphManager.create_new_node(1, 321)
+        node_b = HypergraphManager.create_new_node(2, 321)
+        HypergraphManager.union_nodes(node_a, 2)
+        bigger_hypergraph = HypergraphManager.get_graph_by_node_id(node_a.id)
+        node_c = HypergraphManager.create_new_node(3, 321)
+
+        HypergraphManager.connect_node_with_output_hyper_edge(node_c, 13)
+        HypergraphManager.connect_node_with_input_hyper_edge(node_b, 13)
+
+        self.assertIs(bigger_hypergraph, HypergraphManager.get_graph_by_node_id(node_c.id))
+        self.assertIs(bigger_hypergraph, HypergraphManager.get_graph_by_hyper_edge_id(13))
+        self.assertEqual([bigger_hypergraph], HypergraphManager.get_graphs_by_canvas_id(321))
+
+    def test_hypergraph_source_is_updated_after_connecting_nodes(self):
+        node_a = HypergraphManager.create_new_node(1, 321)
+        node_b = HypergraphManager.create_new_node(2, 321)
+
+        HypergraphManager.connect_node_with_output_hyper_edge(node_a, 12)
+        HypergraphManager.connect_node_with_input_hyper_edge(node_b, 12)
+
+        hypergraph = HypergraphManager.get_graph_by_node_id(node_a.id)
+        self.assertEqual([node_a], hypergraph.get_hypergraph_source())
+
+    def test_get_graphs_by_canvas_id_returns_graphs_in_node_creation_order(self):
+        node_a = HypergraphManager.create_new_node(1, 321)
+        node_b = HypergraphManager.create_new_node(2, 321)
+        node_c = HypergraphManager.create_new_node(3, 321)
+        HypergraphManager.union_nodes(node_c, 1)
+
+        hypergraphs = HypergraphManager.get_graphs_by_canvas_id(321)
+
+        self.assertEqual(2, len(hypergraphs))
+        self.assertIn(node_a, hypergraphs[0].get_all_nodes())
+        self.assertEqual([node_b], hypergraphs[1].get_all_nodes())
+
+    def test_remove_last_node_removes_hypergraph(self):
+        node = HypergraphManager.create_new_node(1, 321)
+
+        HypergraphManager.remove_node(node.id)
+
+        self.assertEqual([], HypergraphManager.get_graphs_by_canvas_id(321))
+        self.assertIsNone(HypergraphManager.get_graph_by_node_id(node.id))
+
+    def test_swap_hyper_edge_id_updates_index(self):
+        node = HypergraphManager.create_new_node(1, 321)
+        HypergraphManager.connect_node_with_output_hyper_edge(node, 14)
+
+        HypergraphManager.swap_hyper_edge_id(14, 15)
+
+        self.assertIsNone(HypergraphManager.get_graph_by_hyper_edge_id(14))
+        self.assertIs(HypergraphManager.get_graph_by_node_id(node.id),
+                      HypergraphManager.get_graph_by_hyper_edge_id(15))
+        self.assertEqual(15, HypergraphManager.get_hyper_edge_by_id(15).id)
+
+    def test_get_graph_by_id_follows_combine_and_split(self):
+        node_a = HypergraphManager.create_new_node(1, 321)
+        node_b = HypergraphManager.create_new_node(2, 321)
+        graph_a = HypergraphManager.get_graph_by_node_id(node_a.id)
+        graph_b = HypergraphManager.get_graph_by_node_id(node_b.id)
+
+        HypergraphManager.connect_node_with_output_hyper_edge(node_a, 16)
+        HypergraphManager.connect_node_with_input_hyper_edge(node_b, 16)
+        combined = HypergraphManager.get_graph_by_node_id(node_a.id)
+        removed = graph_b if combined is graph_a else graph_a
+
+        self.assertIs(combined, HypergraphManager.get_graph_by_id(combined.id))
+        self.assertIsNone(HypergraphManager.get_graph_by_id(removed.id))
+
+        HypergraphManager.remove_hyper_edge(16)
+        split = HypergraphManager.get_graph_by_node_id(node_b.id)
+
+        self.assertIs(split, HypergraphManager.get_graph_by_id(split.id))
+        self.assertIs(combined, HypergraphManager.get_graph_by_id(combined.id))
+
+        HypergraphManager.remove_hypergraph(split)
+
+        self.assertIsNone(HypergraphManager.get_graph_by_id(split.id))
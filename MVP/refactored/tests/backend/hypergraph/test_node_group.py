@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+from MVP.refactored.backend.hypergraph.node import Node
+
+
+def _create_nodes(count: int) -> list[Node]:
+    return [Node(i) for i in range(count)]
+
+
+class TestNodeGroup(TestCase):
+    def setUp(self):
+        self.nodes = _create_nodes(5)
+        self.node0, self.node1, self.node2, self.node3, self.node4 = self.nodes
+
+    def test_union_should_merge_groups(self):
+        self.node0.union(self.node1)
+        self.node2.union(self.node3)
+        self.node1.union(self.node3)
+
+        group = self.node0.get_node_group()
+        self.assertIs(group, self.node3.get_node_group())
+        self.assertEqual(sorted(group.members), [0, 1, 2, 3])
+        self.assertIsNot(group, self.node4.get_node_group())
+
+    def test_group_id_and_hash_should_be_same_for_all_members(self):
+        self.node2.union(self.node1)
+        self.node1.union(self.node3)
+
+        self.assertEqual(self.node2.get_node_group().id, 1)
+        self.assertEqual(self.node1.node_group_hash(), self.node3.node_group_hash())
+        self.assertEqual(self.node2.node_group_hash(), hash((1, 2, 3)))
+        self.assertNotEqual(self.node1.node_group_hash(), self.node4.node_group_hash())
+
+    def test_remove_self_should_split_group(self):
+        self.node0.union(self.node1)
+        self.node1.union(self.node2)
+        self.node2.union(self.node3)
+
+        self.node1.remove_self()
+
+        self.assertEqual(self.node0.get_united_with_nodes(), [])
+        self.assertCountEqual(self.node2.get_united_with_nodes(), [self.node3])
+        self.assertEqual(self.node1.get_united_with_nodes(), [])
+
+    def test_remove_self_should_keep_group_connected_by_other_path(self):
+        self.node0.union(self.node1)
+        self.node1.union(self.node2)
+        self.node0.union(self.node2)
+
+        self.node1.remove_self()
+
+        self.assertCountEqual(self.node0.get_united_with_nodes(), [self.node2])
+
+    def test_aggregated_hyper_edges_should_be_updated_after_change(self):
+        edge0 = HyperEdge(100)
+        edge1 = HyperEdge(101)
+        self.node0.union(self.node1)
+        self.node0.append_output(edge0)
+        self.assertEqual(self.node1.get_output_hyper_edges(), [edge0])
+
+        self.node1.append_output(edge1)
+        self.assertCountEqual(self.node0.get_output_hyper_edges(), [edge0, edge1])
+
+        self.node0.remove_output(edge0)
+        self.assertEqual(self.node0.get_output_hyper_edges(), [edge1])
+
+    def test_aggregated_hyper_edges_should_not_contain_duplicates(self):
+        edge = HyperEdge(100)
+        self.node0.union(self.node1)
+        self.node0.append_input(edge)
+        self.node1.append_input(edge)
+
+        self.assertEqual(self.node0.get_input_hyper_edges(), [edge])
+
+    def test_assigning_directly_connected_to_should_update_group(self):
+        self.node0.directly_connected_to = [self.node1, self.node2]
+        self.assertCountEqual(self.node0.get_united_with_nodes(), [self.node1, self.node2])
+
+        self.node0.directly_connected_to = [self.node1]
+        self.assertCountEqual(self.node0.get_united_with_nodes(), [self.node1])
+        self.assertEqual(self.node2.get_united_with_nodes(), [])
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from MVP.refactored.backend.hypergraph import traversal
+from MVP.refactored.backend.hypergraph.hyper_edge import HyperEdge
+from MVP.refactored.backend.hypergraph.node import Node
+
+
+class TestTraversal(TestCase):
+    def setUp(self):
+        # node0 -> edge10 -> node1 = node2 -> edge11 -> node3, node4 is not connected
+        self.node0, self.node1, self.node2, self.node3, self.node4 = [Node(i) for i in range(5)]
+        self.edge10 = HyperEdge(10)
+        self.edge11 = HyperEdge(11)
+        self._connect(self.node0, self.edge10, self.node1)
+        self._connect(self.node2, self.edge11, self.node3)
+        self.node1.union(self.node2)
+
+    @staticmethod
+    def _connect(source: Node, hyper_edge: HyperEdge, target: Node):
+        hyper_edge.append_source_node(source)
+        source.append_output(hyper_edge)
+        hyper_edge.append_target_node(target)
+        target.append_input(hyper_edge)
+
+    def test_bfs_should_return_every_node_once_in_level_order(self):
+        result = list(traversal.bfs([self.node0], traversal.get_children_and_united_nodes))
+
+        self.assertEqual([self.node0, self.node1, self.node2, self.node3], result)
+
+    def test_dfs_should_return_every_node_once(self):
+        result = list(traversal.dfs([self.node3], traversal.get_connected_nodes))
+
+        self.assertEqual(self.node3, result[0])
+        self.assertCountEqual([self.node0, self.node1, self.node2, self.node3], result)
+
+    def test_bfs_should_skip_visited_nodes(self):
+        visited = {self.node1.id, self.node2.id}
+
+        result = list(traversal.bfs([self.node0], traversal.get_output_nodes, visited))
+
+        self.assertEqual([self.node0], result)
+        self.assertIn(self.node0.id, visited)
+
+    def test_bfs_connected_should_return_nodes_and_hyper_edges_of_component(self):
+        result = list(traversal.bfs_connected([self.node3]))
+
+        self.assertCountEqual([self.node0, self.node1, self.node2, self.node3, self.edge10, self.edge11], result)
+        self.assertNotIn(self.node4, result)
+
+    def test_bfs_connected_should_reuse_visited_sets(self):
+        visited_nodes: set[int] = set()
+        visited_hyper_edges: set[int] = set()
+        list(traversal.bfs_connected([self.node0], visited_nodes, visited_hyper_edges))
+
+        self.assertEqual([], list(traversal.bfs_connected([self.node3], visited_nodes, visited_hyper_edges)))
+        self.assertEqual([self.node4], list(traversal.bfs_connected([self.node4], visited_nodes, visited_hyper_edges)))
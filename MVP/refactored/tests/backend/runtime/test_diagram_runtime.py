@@ -0,0 +1,216 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.runtime.diagram_runtime import CompiledHypergraph, DiagramRuntime
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.tests.backend.diagram_fixtures import ChainProject, ReceiverDiagram
+from MVP.refactored.util.importer.json_importer.headless_json_importer import HeadlessJsonImporter
+
+
+def create_split_project(generator: ChainProject) -> dict:
+    """Input -> split box with two outputs -> both outputs to one spider -> spider to two diagram outputs."""
+    canvas = generator.create_canvas()
+    diagram_input = generator.create_connection(generator.new_id(), "right", 0, None)
+    canvas["io"]["inputs"].append(diagram_input)
+    box, left, right = generator.add_box(canvas, 1, None)
+    box["box_function"] = {"relative_location": "./box_functions/split.py", "name": "split.py",
+                           "main_function_name": "split"}
+    right.append(generator.create_connection(generator.new_id(), "right", 1, box["id"]))
+    box["connections"].append(right[1])
+    spider = generator.add_spider(canvas)
+    diagram_outputs = [generator.create_connection(generator.new_id(), "left", i, None) for i in range(2)]
+    canvas["io"]["outputs"].extend(diagram_outputs)
+
+    generator.add_wire(canvas, diagram_input, left[0])
+    for connection in right:
+        generator.add_wire(canvas, connection, spider)
+    for diagram_output in diagram_outputs:
+        generator.add_wire(canvas, spider, diagram_output)
+    return {"main_canvas": canvas}
+
+
+def compile_single_box(code: str, main_function_name: str) -> CompiledHypergraph:
+    """Compile diagram input -> box with the box function -> diagram output."""
+    diagram = ReceiverDiagram()
+    left, right = diagram.add_box(1, 1, BoxFunction(file_code=code, main_function_name=main_function_name))
+    diagram.add_wire(diagram.add_input(0), left[0])
+    diagram.add_wire(right[0], diagram.add_output(0))
+    compiled, = DiagramRuntime.compile_diagram(diagram.receiver, diagram.canvas_id)
+    return compiled
+
+
+class TestDiagramRuntime(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+        DiagramRuntime.clear_cache()
+        self.importer = HeadlessJsonImporter()
+        self.receiver = self.importer.receiver
+
+    def tearDown(self):
+        HypergraphManager.clear()
+        CodeGenerator.clear_cache()
+        DiagramRuntime.clear_cache()
+
+    def _load_synthetic_project(self) -> tuple[int, dict]:
+        generator = ChainProject(chains=6, boxes=9, sub_boxes=3)
+        with tempfile.TemporaryDirectory() as directory:
+            canvas_id = self.importer.load_project(generator.write(directory))
+        return canvas_id, generator.generate()["main_canvas"]
+
+    def _run_generated_code(self, canvas_id: int) -> dict:
+        namespace = {}
+        exec(CodeGenerator.generate_diagram_code(self.receiver, canvas_id, FormattingMode.FAST), namespace)
+        return namespace
+
+    def test_compiled_hypergraphs_should_give_same_results_as_generated_code(self):
+        canvas_id, _ = self._load_synthetic_project()
+        namespace = self._run_generated_code(canvas_id)
+
+        compiled_hypergraphs = DiagramRuntime.compile_diagram(self.receiver, canvas_id)
+
+        self.assertEqual(6, len(compiled_hypergraphs))
+        for i, compiled in enumerate(compiled_hypergraphs):
+            for value in (0, 5, -3):
+                self.assertEqual(namespace[f"main_{i}"](value), compiled(value))
+
+    def test_tuple_outputs_and_spiders_should_give_same_results_as_generated_code(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "box_functions"))
+            with open(os.path.join(directory, "box_functions", "split.py"), "w") as file:
+                file.write("def split(x):\n    return x, -x\n")
+            with open(os.path.join(directory, "split.json"), "w") as file:
+                json.dump(create_split_project(ChainProject()), file)
+            canvas_id = self.importer.load_project(os.path.join(directory, "split.json"))
+        namespace = self._run_generated_code(canvas_id)
+
+        compiled, = DiagramRuntime.compile_diagram(self.receiver, canvas_id)
+
+        self.assertEqual(((3, -3), (3, -3)), compiled(3))
+        self.assertEqual(namespace["main_0"](3), compiled(3))
+
+    def test_unchanged_hypergraphs_and_box_functions_should_be_compiled_once(self):
+        canvas_id, project = self._load_synthetic_project()
+        compiled_hypergraphs = DiagramRuntime.compile_diagram(self.receiver, canvas_id)
+        box = next(box for box in project["boxes"]
+                   if box.get("box_function", {}).get("main_function_name") == "increment")
+        hypergraph_index = next(i for i, compiled in enumerate(compiled_hypergraphs)
+                                if any(edge.id == box["id"] for edge in compiled.hypergraph.get_all_hyper_edges()))
+
+        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box["id"], canvas_id=canvas_id,
+                                        box_function=BoxFunction(file_code="def double(x):\n    return 2 * x\n",
+                                                                 main_function_name="double"))
+        recompiled = DiagramRuntime.compile_diagram(self.receiver, canvas_id)
+
+        self.assertEqual(3, len(DiagramRuntime.functions))  # increment, add and double
+        for i, (compiled, new_compiled) in enumerate(zip(compiled_hypergraphs, recompiled)):
+            if i == hypergraph_index:
+                self.assertIsNot(compiled, new_compiled)
+            else:
+                self.assertIs(compiled, new_compiled)
+        self.assertEqual(self._run_generated_code(canvas_id)[f"main_{hypergraph_index}"](1),
+                         recompiled[hypergraph_index](1))
+
+    def test_wrong_number_of_inputs_should_raise(self):
+        canvas_id, _ = self._load_synthetic_project()
+        compiled = DiagramRuntime.compile_diagram(self.receiver, canvas_id)[0]
+
+        with self.assertRaises(ValueError):
+            compiled(1, 2)
+
+    def test_batch_should_give_same_results_as_rows(self):
+        canvas_id, _ = self._load_synthetic_project()
+        rows = np.arange(-5, 5)
+
+        for compiled in DiagramRuntime.compile_diagram(self.receiver, canvas_id):
+            np.testing.assert_array_equal([compiled(row) for row in rows], compiled.run_batch(rows))
+
+    def test_batch_should_call_elementwise_box_functions_with_arrays(self):
+        canvas_id, _ = self._load_synthetic_project()
+        compiled = DiagramRuntime.compile_diagram(self.receiver, canvas_id)[0]
+
+        compiled.run_batch(np.arange(10))
+
+        self.assertTrue(DiagramRuntime.batch_functions)
+        for function, batch_function in DiagramRuntime.batch_functions.items():
+            self.assertIs(function, batch_function)
+
+    def test_box_function_rejecting_arrays_should_be_vectorized(self):
+        canvas_id, project = self._load_synthetic_project()
+        box = next(box for box in project["boxes"]
+                   if box.get("box_function", {}).get("main_function_name") == "increment")
+        self.receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=box["id"], canvas_id=canvas_id,
+                                        box_function=BoxFunction(file_code="def absolute(x):\n"
+                                                                           "    if x < 0:\n"
+                                                                           "        return -x\n"
+                                                                           "    return x\n",
+                                                                 main_function_name="absolute"))
+        rows = np.arange(-5, 5)
+
+        for compiled in DiagramRuntime.compile_diagram(self.receiver, canvas_id):
+            np.testing.assert_array_equal([compiled(row) for row in rows], compiled.run_batch(rows))
+        self.assertEqual(1, sum(function is not batch_function
+                                for function, batch_function in DiagramRuntime.batch_functions.items()))
+
+    def test_frame_columns_should_be_inputs(self):
+        canvas_id, _ = self._load_synthetic_project()
+        compiled = DiagramRuntime.compile_diagram(self.receiver, canvas_id)[0]
+        frame = pd.DataFrame({"label": ["a", "b", "c"], "value": [1.0, 2.5, 4.0]})
+
+        np.testing.assert_array_equal(compiled.run_batch(np.array([1.0, 2.5, 4.0])),
+                                      compiled.run_frame(frame, ["value"]))
+
+    def test_batch_called_per_row_should_not_take_type_of_first_row(self):
+        compiled = compile_single_box("def half(x):\n    return 0 if x < 0 else x / 2\n", "half")
+
+        np.testing.assert_array_equal([0, 1.5, 2.5], compiled.run_batch(np.array([-1, 3, 5])))
+
+    def test_batch_should_call_impure_box_function_once_per_row(self):
+        calls = []
+        compiled = compile_single_box("def record(x):\n    calls.append(x)\n    return x\n", "record")
+        function = compiled.steps[0][0]
+        function.__globals__["calls"] = calls
+
+        np.testing.assert_array_equal([1, 2, 3], compiled.run_batch(np.array([1, 2, 3])))
+        self.assertEqual([1, 2, 3], calls)
+
+    def test_batch_functions_should_be_evicted_with_compiled_functions(self):
+        compiled = compile_single_box("def triple(x):\n    return 3 * x\n", "triple")
+        compiled.run_batch(np.arange(3))
+        function = compiled.steps[0][0]
+
+        with mock.patch.object(DiagramRuntime, "max_functions_size", 1):
+            DiagramRuntime.get_function(BoxFunction(file_code="def other(x):\n    return x\n",
+                                                    main_function_name="other"))
+
+        self.assertNotIn(function, DiagramRuntime.batch_functions)
+
+    def test_batch_should_raise_division_error_of_row(self):
+        compiled = compile_single_box("def invert(x):\n    return 1 / x\n", "invert")
+
+        np.testing.assert_array_equal([1.0, 0.5], compiled.run_batch(np.array([1, 2])))
+        with self.assertRaises(ZeroDivisionError):
+            compiled.run_batch(np.array([0, 1]))
+        np.testing.assert_array_equal([0.25], compiled.run_batch(np.array([4])))
+
+    def test_batch_should_raise_overflow_error_of_row(self):
+        compiled = compile_single_box("def power(x):\n    return 10.0 ** x\n", "power")
+
+        with self.assertRaises(OverflowError):
+            compiled.run_batch(np.array([1.0, 400.0]))
+
+    def test_batch_with_integer_arrays_should_wrap_around(self):
+        compiled = compile_single_box("def square(x):\n    return x * x\n", "square")
+
+        self.assertEqual(2 ** 80, compiled(2 ** 40))
+        self.assertEqual(0, compiled.run_batch(np.array([2 ** 40]))[0])
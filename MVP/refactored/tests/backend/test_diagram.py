@@ -0,0 +1,131 @@
+import json
+from unittest import TestCase
+
+from MVP.refactored.backend.diagram import Diagram
+from MVP.refactored.backend.generator import Generator
+from MVP.refactored.backend.resource import Resource
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+
+
+class TestDiagram(TestCase):
+
+    def setUp(self):
+        self.diagram = Diagram()
+
+    def test_added_objects_should_be_found_by_id(self):
+        box, wire, spider = Generator(1), Resource(2), Resource(3)
+        self.diagram.add_box(box)
+        self.diagram.add_resource(wire)
+        self.diagram.add_spider(spider)
+
+        self.assertIs(box, self.diagram.get_generator_by_id(1))
+        self.assertIs(wire, self.diagram.get_resource_by_id(2))
+        self.assertIs(spider, self.diagram.get_spider_by_id(3))
+        self.assertIsNone(self.diagram.get_generator_by_id(2))
+
+    def test_object_with_existing_id_should_not_be_added_again(self):
+        box = Generator(1)
+        self.diagram.add_box(box)
+        self.diagram.add_box(Generator(1))
+
+        self.assertEqual([box], self.diagram.boxes)
+        self.assertIs(box, self.diagram.get_generator_by_id(1))
+
+    def test_removed_objects_should_not_be_found(self):
+        self.diagram.add_boxes([Generator(1), Generator(2)])
+        self.diagram.add_spider(Resource(3))
+        self.diagram.remove_box_by_id(1)
+        self.diagram.remove_spider(Resource(3))
+
+        self.assertIsNone(self.diagram.get_generator_by_id(1))
+        self.assertEqual([2], [box.id for box in self.diagram.boxes])
+        self.assertIsNone(self.diagram.get_spider_by_id(3))
+        self.assertEqual([], self.diagram.spiders)
+
+    def test_inputs_and_outputs_should_be_found_by_id_and_index(self):
+        first_input = ConnectionInfo(0, ConnectionSide.RIGHT, 10)
+        second_input = ConnectionInfo(1, ConnectionSide.RIGHT, 11)
+        diagram_output = ConnectionInfo(0, ConnectionSide.LEFT, 12)
+        self.diagram.add_input(first_input)
+        self.diagram.add_input(second_input)
+        self.diagram.add_output(diagram_output)
+
+        self.assertIs(second_input, self.diagram.get_input_by_id(11))
+        self.assertIs(second_input, self.diagram.get_input_by_index(1))
+        self.assertIs(diagram_output, self.diagram.get_output_by_index(0))
+
+        self.diagram.remove_input(10)
+        self.diagram.remove_output(12)
+
+        self.assertIsNone(self.diagram.get_input_by_id(10))
+        self.assertIsNone(self.diagram.get_input_by_index(0))
+        self.assertIsNone(self.diagram.get_output_by_id(12))
+        self.assertEqual([second_input], self.diagram.input)
+
+    def test_box_should_be_found_by_new_id(self):
+        box = Generator(1)
+        self.diagram.add_box(box)
+
+        self.diagram.set_box_id(1, 5)
+
+        self.assertEqual(5, box.id)
+        self.assertIs(box, self.diagram.get_generator_by_id(5))
+        self.assertIsNone(self.diagram.get_generator_by_id(1))
+
+    def test_removed_wire_should_be_removed_from_spider(self):
+        spider = Resource(3)
+        spider.spider = True
+        wire = Resource(2)
+        connection = ConnectionInfo(0, ConnectionSide.SPIDER, 3)
+        spider.add_spider_connection(connection)
+        wire.add_spider_connection(connection)
+        self.diagram.add_spider(spider)
+        self.diagram.add_resource(wire)
+
+        self.diagram.remove_resource_by_id(2)
+
+        self.assertIsNone(self.diagram.get_resource_by_id(2))
+        self.assertEqual([], spider.get_spider_connections())
+
+    def test_input_should_be_found_by_shifted_index(self):
+        first_input = ConnectionInfo(0, ConnectionSide.RIGHT, 10)
+        second_input = ConnectionInfo(1, ConnectionSide.RIGHT, 11)
+        self.diagram.add_input(first_input)
+        self.diagram.add_input(second_input)
+
+        self.diagram.remove_input(10)
+        second_input.index -= 1
+
+        self.assertIs(second_input, self.diagram.get_input_by_index(0))
+        self.assertIsNone(self.diagram.get_input_by_index(1))
+
+    def test_imported_diagram_should_be_indexed(self):
+        diagram_input = ConnectionInfo(0, ConnectionSide.RIGHT, 10)
+        diagram_output = ConnectionInfo(0, ConnectionSide.LEFT, 12)
+
+        self.diagram._from_dict({"input": [diagram_input], "output": [diagram_output.to_list()],
+                                 "boxes": [], "resources": [{"id": 2, "connections": []}]})
+
+        self.assertIs(diagram_input, self.diagram.get_input_by_id(10))
+        self.assertIs(diagram_input, self.diagram.get_input_by_index(0))
+        self.assertEqual(12, self.diagram.get_output_by_id(12).id)
+        self.assertEqual(12, self.diagram.get_output_by_index(0).id)
+        self.assertEqual(2, self.diagram.get_resource_by_id(2).id)
+
+    def test_box_connections_should_be_restored_after_json_round_trip(self):
+        box = Generator(1)
+        box.add_left(ConnectionInfo(0, ConnectionSide.LEFT, 7, 1))
+        box.add_right(ConnectionInfo(0, ConnectionSide.RIGHT, 8, 1))
+        self.diagram.add_box(box)
+        self.diagram.add_input(ConnectionInfo(0, ConnectionSide.RIGHT, 10))
+
+        data = json.loads(json.dumps(self.diagram._to_dict(), default=ConnectionInfo.to_list))
+        imported = Diagram()
+        imported._from_dict(data)
+
+        imported_box = imported.get_generator_by_id(1)
+        self.assertEqual(7, imported_box.get_left_by_id(7).id)
+        self.assertEqual(1, imported_box.get_left_by_id(7).box_id)
+        self.assertEqual(ConnectionSide.RIGHT, imported_box.get_right_by_id(8).side)
+        self.assertEqual(10, imported.get_input_by_index(0).id)
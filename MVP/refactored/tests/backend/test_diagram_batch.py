@@ -0,0 +1,113 @@
+from unittest import TestCase
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.code_generation.code_generator import CodeGenerator
+from MVP.refactored.backend.diagram_batch import DiagramBatch
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.GeneratorType import GeneratorType
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+
+CANVAS_ID = 0
+ADD_BOX_ID = 1
+COMPOUND_BOX_ID = 5  # sub diagram canvas has the same id
+
+
+def _wires() -> list[tuple[int, int, ConnectionInfo, ConnectionInfo]]:
+    # input 10 -> spider 30 -> add box both inputs -> compound box (input 50 -> output 51) -> output 12
+    spider = ConnectionInfo(0, ConnectionSide.SPIDER, 30, related_resource_id=30)
+    return [(CANVAS_ID, 20, ConnectionInfo(0, ConnectionSide.RIGHT, 10), spider),
+            (CANVAS_ID, 21, ConnectionInfo(0, ConnectionSide.SPIDER, 30, related_resource_id=30),
+             ConnectionInfo(0, ConnectionSide.LEFT, 2, ADD_BOX_ID)),
+            (CANVAS_ID, 22, ConnectionInfo(0, ConnectionSide.SPIDER, 30, related_resource_id=30),
+             ConnectionInfo(1, ConnectionSide.LEFT, 3, ADD_BOX_ID)),
+            (CANVAS_ID, 23, ConnectionInfo(0, ConnectionSide.RIGHT, 4, ADD_BOX_ID),
+             ConnectionInfo(0, ConnectionSide.LEFT, 6, COMPOUND_BOX_ID)),
+            (COMPOUND_BOX_ID, 52, ConnectionInfo(0, ConnectionSide.RIGHT, 50, COMPOUND_BOX_ID),
+             ConnectionInfo(0, ConnectionSide.LEFT, 51, COMPOUND_BOX_ID)),
+            (CANVAS_ID, 24, ConnectionInfo(0, ConnectionSide.RIGHT, 7, COMPOUND_BOX_ID),
+             ConnectionInfo(0, ConnectionSide.LEFT, 12))]
+
+
+class TestDiagramBatch(TestCase):
+
+    def setUp(self):
+        HypergraphManager.clear()
+        self.add_function = BoxFunction(predefined_function_file_name="add", is_predefined_function=True)
+
+    def tearDown(self):
+        HypergraphManager.clear()
+
+    def _build_with_callbacks(self) -> Receiver:
+        receiver = Receiver()
+        receiver.add_new_canvas(CANVAS_ID)
+        for box_id, left, right in ((ADD_BOX_ID, [2, 3], [4]), (COMPOUND_BOX_ID, [6], [7])):
+            receiver.receiver_callback(ActionType.BOX_CREATE, generator_id=box_id, canvas_id=CANVAS_ID)
+            for action, connection_ids in ((ActionType.BOX_ADD_LEFT, left), (ActionType.BOX_ADD_RIGHT, right)):
+                for i, connection_id in enumerate(connection_ids):
+                    receiver.receiver_callback(action, generator_id=box_id, connection_nr=i,
+                                               connection_id=connection_id, canvas_id=CANVAS_ID)
+        receiver.receiver_callback(ActionType.BOX_SET_FUNCTION, generator_id=ADD_BOX_ID, canvas_id=CANVAS_ID,
+                                   box_function=self.add_function)
+        receiver.receiver_callback(ActionType.BOX_COMPOUND, generator_id=COMPOUND_BOX_ID, canvas_id=CANVAS_ID,
+                                   new_canvas_id=COMPOUND_BOX_ID)
+        receiver.add_new_canvas(COMPOUND_BOX_ID)
+        receiver.receiver_callback(ActionType.SPIDER_CREATE, resource_id=30, canvas_id=CANVAS_ID)
+        for canvas_id, input_id, output_id in ((CANVAS_ID, 10, 12), (COMPOUND_BOX_ID, 50, 51)):
+            receiver.receiver_callback(ActionType.DIAGRAM_ADD_INPUT, connection_id=input_id, connection_nr=0,
+                                       connection_side=ConnectionSide.RIGHT, canvas_id=canvas_id)
+            receiver.receiver_callback(ActionType.DIAGRAM_ADD_OUTPUT, connection_id=output_id, connection_nr=0,
+                                       connection_side=ConnectionSide.LEFT, canvas_id=canvas_id)
+        for canvas_id, wire_id, start, end in _wires():
+            receiver.receiver_callback(ActionType.WIRE_CREATE, resource_id=wire_id, canvas_id=canvas_id,
+                                       start_connection=start, end_connection=end)
+        return receiver
+
+    def _build_with_batch(self) -> Receiver:
+        batch = DiagramBatch()
+        batch.add_box(CANVAS_ID, ADD_BOX_ID, [2, 3], [4], self.add_function)
+        batch.add_box(CANVAS_ID, COMPOUND_BOX_ID, [6], [7], sub_diagram_id=COMPOUND_BOX_ID)
+        batch.add_spider(CANVAS_ID, 30)
+        for canvas_id, input_id, output_id in ((CANVAS_ID, 10, 12), (COMPOUND_BOX_ID, 50, 51)):
+            batch.add_input(canvas_id, input_id, 0)
+            batch.add_output(canvas_id, output_id, 0)
+        for canvas_id, wire_id, start, end in _wires():
+            batch.add_wire(canvas_id, wire_id, start, end)
+
+        receiver = Receiver()
+        receiver.build_diagram(batch)
+        return receiver
+
+    def test_batch_should_build_same_diagrams_as_callbacks(self):
+        callback_diagrams = self._build_with_callbacks().diagrams
+        HypergraphManager.clear()
+        batch_diagrams = self._build_with_batch().diagrams
+
+        self.assertEqual(callback_diagrams.keys(), batch_diagrams.keys())
+        for canvas_id, diagram in callback_diagrams.items():
+            self.assertEqual([box.to_dict() for box in diagram.boxes],
+                             [box.to_dict() for box in batch_diagrams[canvas_id].boxes])
+            self.assertEqual([wire.id for wire in diagram.resources],
+                             [wire.id for wire in batch_diagrams[canvas_id].resources])
+            self.assertEqual([spider.id for spider in diagram.spiders],
+                             [spider.id for spider in batch_diagrams[canvas_id].spiders])
+
+    def test_batch_should_generate_same_code_as_callbacks(self):
+        callback_code = CodeGenerator.generate_diagram_code(self._build_with_callbacks(), CANVAS_ID,
+                                                            FormattingMode.FAST)
+        HypergraphManager.clear()
+        batch_code = CodeGenerator.generate_diagram_code(self._build_with_batch(), CANVAS_ID, FormattingMode.FAST)
+
+        self.assertEqual(callback_code, batch_code)
+        namespace = {}
+        exec(batch_code, namespace)
+        self.assertEqual(6, namespace["main_0"](3))
+
+    def test_compound_box_should_get_sub_diagram_id(self):
+        box = self._build_with_batch().get_generator_by_id(COMPOUND_BOX_ID, CANVAS_ID)
+
+        self.assertEqual(GeneratorType.COMPOUND, box.type)
+        self.assertEqual(COMPOUND_BOX_ID, box.get_sub_diagram_id())
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from MVP.refactored.backend.generator import Generator
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+
+
+class TestGenerator(TestCase):
+
+    def setUp(self):
+        self.box = Generator(1)
+        self.left = [ConnectionInfo(i, ConnectionSide.LEFT, 10 + i, related_object=self.box) for i in range(3)]
+        for connection in self.left:
+            self.box.add_left(connection)
+        self.right = ConnectionInfo(0, ConnectionSide.RIGHT, 20, related_object=self.box)
+        self.box.add_right(self.right)
+
+    def test_connections_should_be_found_by_id(self):
+        self.assertIs(self.left[1], self.box.get_left_by_id(11))
+        self.assertIs(self.right, self.box.get_right_by_id(20))
+        self.assertIsNone(self.box.get_left_by_id(20))
+
+    def test_connection_with_existing_id_should_not_be_added_again(self):
+        self.box.add_left(ConnectionInfo(0, ConnectionSide.LEFT, 11))
+
+        self.assertEqual(self.left, self.box.get_left())
+        self.assertIs(self.left[1], self.box.get_left_by_id(11))
+
+    def test_removed_connection_should_not_be_found(self):
+        self.box.remove_left(10)
+        self.box.remove_all_right()
+
+        self.assertIsNone(self.box.get_left_by_id(10))
+        self.assertIs(self.left[2], self.box.get_left_by_id(12))
+        self.assertEqual(1, self.left[2].index)
+        self.assertIsNone(self.box.get_right_by_id(20))
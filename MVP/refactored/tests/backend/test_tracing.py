@@ -0,0 +1,81 @@
+import io
+import logging
+from unittest import TestCase
+from unittest.mock import patch
+
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.tracing import Tracer, Tracing
+from MVP.refactored.backend.types.ActionType import ActionType
+from MVP.refactored.backend.types.trace_subsystem import TraceSubsystem
+
+
+class CountingArgument:
+    """Argument that counts how many times it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "argument"
+
+
+class TestTracing(TestCase):
+
+    def setUp(self):
+        self.tracer = Tracer("MVP.refactored.backend.hypergraph.test")
+
+    def tearDown(self):
+        Tracing.stop_recording()
+        for subsystem in TraceSubsystem:
+            logging.getLogger(subsystem.value).setLevel(logging.NOTSET)
+        HypergraphManager.clear()
+
+    def test_disabled_tracer_should_not_format_arguments(self):
+        argument = CountingArgument()
+
+        self.tracer.debug("Creating node %s", argument)
+
+        self.assertFalse(self.tracer.is_enabled_for(logging.DEBUG))
+        self.assertEqual(0, argument.formatted)
+
+    def test_level_should_be_set_per_subsystem(self):
+        Tracing.set_level(TraceSubsystem.HYPERGRAPH, logging.DEBUG)
+
+        with self.assertLogs("MVP.refactored.backend.hypergraph", logging.DEBUG) as logs:
+            HypergraphManager.create_new_node(1, 0)
+        self.assertIn("Creating new node with id 1", "\n".join(logs.output))
+        self.assertFalse(Tracer(TraceSubsystem.RECEIVER.value).is_enabled_for(logging.DEBUG))
+
+    def test_recorder_should_keep_last_events_and_format_them_on_dump(self):
+        recorder = Tracing.start_recording(size=2)
+        argument = CountingArgument()
+
+        for i in range(3):
+            self.tracer.debug("Event %s %s", i, argument)
+        self.assertEqual(0, argument.formatted)
+
+        stream = io.StringIO()
+        Tracing.dump_recording(stream)
+
+        self.assertNotIn("Event 0", stream.getvalue())
+        self.assertIn("DEBUG - MVP.refactored.backend.hypergraph.test - Event 2 argument", stream.getvalue())
+        self.assertEqual(0, len(recorder.events))
+
+    def test_failed_callback_should_dump_recorded_events(self):
+        Tracing.start_recording()
+        receiver = Receiver()
+
+        with patch.object(Tracing, "dump_recording") as dump_recording:
+            with self.assertRaises(KeyError):
+                receiver.receiver_callback(ActionType.BOX_CREATE, generator_id=1, canvas_id=404)
+        dump_recording.assert_called_once()
+
+    def test_configure_should_reject_unknown_subsystem(self):
+        with self.assertRaises(ValueError):
+            Tracing.configure("renderer=debug")
+
+        Tracing.configure("hypergraph=info", buffer_size=10)
+        self.assertEqual(logging.INFO, logging.getLogger(TraceSubsystem.HYPERGRAPH.value).level)
+        self.assertEqual(10, Tracing.recorder.events.maxlen)
@@ -0,0 +1,24 @@
+from unittest import TestCase
+
+from MVP.refactored.benchmarks.pipeline_benchmark import compare
+
+
+def create_results(seconds: float, exponent: float) -> dict:
+    return {"files": {"500.py": {"elements": 625, "stages": {"code_generation": {"seconds": seconds}}}},
+            "growth_exponents": {"code_generation": exponent}}
+
+
+class TestPipelineBenchmark(TestCase):
+
+    def test_slower_machine_should_not_be_regression_by_default(self):
+        self.assertEqual([], compare(create_results(3.0, 1.2), create_results(1.0, 1.1), 0.3))
+
+    def test_faster_growth_should_be_regression(self):
+        regressions = compare(create_results(1.0, 2.1), create_results(1.0, 1.1), 0.3)
+
+        self.assertEqual(["code_generation: grows as elements ^ 2.1, baseline elements ^ 1.1"], regressions)
+
+    def test_times_should_be_compared_with_tolerance(self):
+        regressions = compare(create_results(3.0, 1.1), create_results(1.0, 1.1), 0.3, tolerance=1.5)
+
+        self.assertEqual(["500.py code_generation: 3000.0 ms, baseline 1000.0 ms"], regressions)
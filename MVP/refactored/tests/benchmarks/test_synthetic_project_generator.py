@@ -0,0 +1,53 @@
+import tempfile
+from unittest import TestCase
+
+from MVP.refactored.backend.code_generation.batch_code_generator import generate_project_code
+from MVP.refactored.backend.hypergraph.hypergraph_manager import HypergraphManager
+from MVP.refactored.backend.types.formatting_mode import FormattingMode
+from MVP.refactored.benchmarks.synthetic_project_generator import SyntheticProjectGenerator
+from MVP.refactored.util.importer.json_importer.headless_json_importer import HeadlessJsonImporter
+
+
+class TestSyntheticProjectGenerator(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+        HypergraphManager.clear()
+
+    def test_same_seed_should_give_same_project(self):
+        parameters = {"box_count": 50, "hypergraphs": 3, "depth": 1, "width": 2, "sub_box_count": 4}
+
+        self.assertEqual(SyntheticProjectGenerator(**parameters, seed=7).generate(),
+                         SyntheticProjectGenerator(**parameters, seed=7).generate())
+        self.assertNotEqual(SyntheticProjectGenerator(**parameters, seed=7).generate(),
+                            SyntheticProjectGenerator(**parameters, seed=8).generate())
+
+    def test_spider_should_not_have_more_consumers_than_degree(self):
+        canvas = SyntheticProjectGenerator(box_count=200, spider_degree=2, add_probability=1).generate()["main_canvas"]
+
+        for spider in canvas["spiders"]:
+            consumers = [wire for wire in canvas["wires"] if wire["start_c"]["id"] == spider["id"]]
+            self.assertLessEqual(len(consumers), 2)
+
+    def test_project_should_be_loaded_as_parallel_hypergraphs(self):
+        generator = SyntheticProjectGenerator(box_count=30, hypergraphs=3, depth=2, width=1, sub_box_count=3)
+        json_file_path = generator.write(self.temporary_directory.name)
+
+        canvas_id = HeadlessJsonImporter().load_project(json_file_path)
+
+        self.assertEqual(3, len(HypergraphManager.get_graphs_by_canvas_id(canvas_id)))
+
+    def test_generated_code_of_project_should_run(self):
+        # input -> increment -> increment -> output
+        generator = SyntheticProjectGenerator(box_count=2, add_probability=0, seed=3)
+        project = generator.generate()
+        json_file_path = generator.write(self.temporary_directory.name)
+
+        namespace = {}
+        exec(generate_project_code(json_file_path, FormattingMode.FAST), namespace)
+
+        self.assertEqual(2, len(project["main_canvas"]["boxes"]))
+        self.assertEqual(5, namespace["main_0"](3))
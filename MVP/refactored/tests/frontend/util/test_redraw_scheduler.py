@@ -0,0 +1,221 @@
+from unittest import TestCase
+
+from MVP.refactored.frontend.canvas_objects.types.detail_level import DetailLevel
+from MVP.refactored.frontend.util.redraw_scheduler import RedrawScheduler
+from MVP.refactored.frontend.util.spatial_index import SpatialIndex
+
+
+class FakeCanvas:
+    def __init__(self, width=800, height=600):
+        self.width = width
+        self.height = height
+        self.idle_callbacks = {}
+        self.scroll_region = None
+        self.total_scale = 1.0
+        self.spatial_index = SpatialIndex()
+        self.rectangles = {}
+        self.next_item = 1
+
+    def after_idle(self, callback):
+        after_id = f"after#{len(self.idle_callbacks)}"
+        self.idle_callbacks[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.idle_callbacks.pop(after_id, None)
+
+    def run_idle_callbacks(self):
+        callbacks = list(self.idle_callbacks.values())
+        self.idle_callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    @staticmethod
+    def canvasx(x):
+        return x
+
+    @staticmethod
+    def canvasy(y):
+        return y
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def bbox(self, _):
+        return 0, 0, self.width, self.height
+
+    def configure(self, scrollregion):
+        self.scroll_region = scrollregion
+
+    def create_rectangle(self, *coordinates, **_):
+        self.next_item += 1
+        self.rectangles[self.next_item] = coordinates
+        return self.next_item
+
+    def delete(self, item):
+        del self.rectangles[item]
+
+
+class Item:
+    def __init__(self, x, y, collapsible=False):
+        self.x = x
+        self.y = y
+        self.collapsible = collapsible
+        self.redraw_count = 0
+        self.detail = DetailLevel.FULL
+
+    def get_bounds(self):
+        return self.x, self.y, self.x + 10, self.y + 10
+
+    def redraw(self):
+        self.redraw_count += 1
+
+    def set_detail(self, detail):
+        self.detail = detail
+
+
+class BatchItem(Item):
+    batches = []
+
+    @staticmethod
+    def redraw_all(items):
+        BatchItem.batches.append(items)
+
+
+class TestRedrawScheduler(TestCase):
+
+    def setUp(self):
+        self.canvas = FakeCanvas()
+        self.scheduler = RedrawScheduler(self.canvas, margin=100, collapsible=lambda item: item.collapsible)
+
+    def add_items(self, *items):
+        for item in items:
+            self.canvas.spatial_index.insert(item, item.get_bounds())
+        return items
+
+    def test_schedule_should_redraw_once_per_idle_pass(self):
+        item = Item(10, 10)
+        for _ in range(50):
+            self.scheduler.schedule([item])
+
+        self.assertEqual(1, len(self.canvas.idle_callbacks))
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual(1, item.redraw_count)
+        self.assertNotIn(item, self.scheduler)
+
+    def test_redraw_should_skip_items_outside_viewport_until_flush(self):
+        visible, near, hidden = Item(10, 10), Item(850, 10), Item(5000, 10)
+        self.scheduler.schedule([visible, near, hidden])
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual([1, 1, 0], [visible.redraw_count, near.redraw_count, hidden.redraw_count])
+        self.assertEqual(DetailLevel.HIDDEN, hidden.detail)
+        self.assertIn(hidden, self.scheduler)
+
+        self.scheduler.flush()
+
+        self.assertEqual(1, hidden.redraw_count)
+        self.assertNotIn(hidden, self.scheduler)
+
+    def test_hidden_item_should_be_redrawn_when_moved_into_view(self):
+        item = Item(5000, 10)
+        self.scheduler.schedule([item])
+        self.canvas.run_idle_callbacks()
+        item.x = 100
+        self.scheduler.schedule([])
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual(1, item.redraw_count)
+
+    def test_hidden_item_should_be_redrawn_when_viewport_grows(self):
+        item = Item(1000, 10)
+        self.scheduler.schedule([item])
+        self.canvas.run_idle_callbacks()
+        self.canvas.width = 1600
+        self.scheduler.schedule([], update_scroll_region=True)
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual(1, item.redraw_count)
+        self.assertEqual(DetailLevel.FULL, item.detail)
+        self.assertNotIn(item, self.scheduler)
+
+    def test_discard_should_not_redraw_deleted_item(self):
+        item = Item(10, 10)
+        self.scheduler.schedule([item])
+        self.scheduler.discard(item)
+        self.scheduler.flush()
+
+        self.assertEqual(0, item.redraw_count)
+        self.assertEqual({}, self.canvas.idle_callbacks)
+
+    def test_schedule_should_update_scroll_region_after_pass(self):
+        self.scheduler.schedule([], update_scroll_region=True)
+
+        self.assertIsNone(self.canvas.scroll_region)
+        self.canvas.run_idle_callbacks()
+        self.assertEqual((0, 0, 800, 600), self.canvas.scroll_region)
+
+    def test_low_zoom_should_use_low_detail_and_zoom_in_should_restore_it(self):
+        item = Item(10, 10)
+        self.canvas.total_scale = 0.3
+        self.scheduler.schedule([item])
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual(DetailLevel.LOW, item.detail)
+
+        self.canvas.total_scale = 1.0
+        self.scheduler.schedule([item])
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual(DetailLevel.FULL, item.detail)
+
+    def test_flush_full_detail_should_draw_full_detail_at_low_zoom_until_next_pass(self):
+        drawn, scheduled = Item(10, 10), Item(5000, 10)
+        self.canvas.total_scale = 0.3
+        self.scheduler.schedule([drawn])
+        self.canvas.run_idle_callbacks()
+        self.scheduler.schedule([scheduled])
+
+        self.scheduler.flush_full_detail([drawn, scheduled])
+
+        self.assertEqual([DetailLevel.FULL] * 2, [drawn.detail, scheduled.detail])
+        self.assertEqual([2, 1], [drawn.redraw_count, scheduled.redraw_count])
+
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual(DetailLevel.LOW, drawn.detail)
+
+    def test_dense_cluster_should_collapse_to_aggregate_at_low_zoom(self):
+        cluster = self.add_items(*(Item(10 + 20 * i, 10 + 20 * i, collapsible=True) for i in range(4)))
+        sparse = self.add_items(Item(300, 300, collapsible=True), Item(310, 320, collapsible=True))
+        self.canvas.total_scale = 0.3
+        self.scheduler.schedule(cluster + sparse)
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual([DetailLevel.COLLAPSED] * 4, [item.detail for item in cluster])
+        self.assertEqual([0] * 4, [item.redraw_count for item in cluster])
+        self.assertEqual([DetailLevel.LOW] * 2, [item.detail for item in sparse])
+        self.assertEqual([(10, 10, 80, 80)], list(self.canvas.rectangles.values()))
+
+        self.canvas.total_scale = 1.0
+        self.scheduler.schedule([])
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual([DetailLevel.FULL] * 4, [item.detail for item in cluster])
+        self.assertEqual([1] * 4, [item.redraw_count for item in cluster])
+        self.assertEqual({}, self.canvas.rectangles)
+
+    def test_items_with_redraw_all_should_be_redrawn_together(self):
+        items = [BatchItem(10 * i, 10) for i in range(3)]
+        single = Item(10, 10)
+        BatchItem.batches.clear()
+        self.scheduler.schedule(items + [single])
+        self.canvas.run_idle_callbacks()
+
+        self.assertEqual([items], BatchItem.batches)
+        self.assertEqual(1, single.redraw_count)
+        self.assertEqual([0] * 3, [item.redraw_count for item in items])
@@ -0,0 +1,88 @@
+from random import Random
+from unittest import TestCase
+
+from MVP.refactored.frontend.util.spatial_index import SpatialIndex
+
+
+class Item:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+class TestSpatialIndex(TestCase):
+
+    def setUp(self):
+        self.index = SpatialIndex(cell_size=50)
+        self.a, self.b, self.c = Item("a"), Item("b"), Item("c")
+
+    def test_query_should_return_intersecting_items_in_insertion_order(self):
+        self.index.insert(self.c, (300, 300, 360, 360))
+        self.index.insert(self.a, (0, 0, 60, 60))
+        self.index.insert(self.b, (60, 0, 120, 60))
+
+        self.assertEqual([self.a, self.b], self.index.query(30, 30, 90, 40))
+        self.assertEqual([self.c, self.a, self.b], self.index.query(-1000, -1000, 1000, 1000))
+        self.assertEqual([self.a, self.b], self.index.query_point(60, 60))
+        self.assertEqual([], self.index.query_point(200, 200))
+
+    def test_insert_should_move_item_and_keep_its_order(self):
+        self.index.insert(self.a, (0, 0, 10, 10))
+        self.index.insert(self.b, (500, 0, 510, 10))
+        self.index.insert(self.a, (500, 5, 520, 15))
+
+        self.assertEqual([], self.index.query(0, 0, 10, 10))
+        self.assertEqual([self.a, self.b], self.index.query_point(505, 7))
+        self.assertEqual((500, 5, 520, 15), self.index.get_bounds(self.a))
+
+    def test_remove_should_remove_item_from_all_cells(self):
+        self.index.insert(self.a, (0, 0, 200, 200))
+        self.index.remove(self.a)
+        self.index.remove(self.b)
+
+        self.assertEqual(0, len(self.index))
+        self.assertNotIn(self.a, self.index)
+        self.assertEqual({}, self.index.cells)
+        self.assertEqual({}, self.index.columns)
+
+    def test_query_x_range_should_ignore_y_coordinates(self):
+        self.index.insert(self.a, (0, 0, 60, 60))
+        self.index.insert(self.b, (40, 10000, 100, 10060))
+        self.index.insert(self.c, (200, 0, 260, 60))
+
+        self.assertEqual([self.a, self.b], self.index.query_x_range(50, 150))
+
+    def test_snap_x_should_follow_snapped_center(self):
+        self.index.insert(self.a, (0, 0, 60, 60))
+        self.index.insert(self.b, (30, 200, 90, 260))
+        self.index.insert(self.c, (200, 400, 210, 410))
+
+        self.assertEqual((60, True), self.index.snap_x(25, 5, lambda item: True))
+        self.assertEqual((25, False), self.index.snap_x(25, 5, lambda item: item is not self.a))
+        self.assertEqual((500, False), self.index.snap_x(500, 30, lambda item: True))
+
+    def test_snap_x_should_match_checking_items_one_by_one(self):
+        random = Random(0)
+        items = []
+        for _ in range(300):
+            item = Item(str(len(items)))
+            x, width = random.uniform(-2000, 2000), random.uniform(5, 200)
+            self.index.insert(item, (x, random.uniform(-2000, 2000), x + width, 0))
+            items.append(item)
+
+        for _ in range(300):
+            center_x, half_width = random.uniform(-2200, 2200), random.uniform(5, 100)
+            expected_x, expected_found = center_x, False
+            for item in items:
+                x1, _, x2, _ = self.index.get_bounds(item)
+                if abs((x1 + x2) / 2 - expected_x) < (x2 - x1) / 2 + half_width:
+                    expected_x, expected_found = (x1 + x2) / 2, True
+
+            self.assertEqual((expected_x, expected_found), self.index.snap_x(center_x, half_width, lambda item: True))
+
+    def test_snap_x_should_not_snap_to_touching_items(self):
+        self.index.insert(self.a, (0, 0, 60, 60))
+
+        self.assertEqual((70, False), self.index.snap_x(70, 10, lambda item: True))
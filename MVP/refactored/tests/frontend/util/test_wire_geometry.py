@@ -0,0 +1,46 @@
+from random import Random
+from unittest import TestCase
+
+from MVP.refactored.frontend.util.wire_geometry import WireGeometry
+
+
+def reference_curved_line(start, end, det):
+    coordinates = [0] * (det * 2 + 2)
+    for i in range(det + 1):
+        t = i / det
+        coordinates[i * 2] = start[0] + (end[0] - start[0]) * t
+        coordinates[i * 2 + 1] = start[1] + (end[1] - start[1]) * (3 * t ** 2 - 2 * t ** 3)
+    return coordinates
+
+
+class TestWireGeometry(TestCase):
+
+    def setUp(self):
+        random = Random(0)
+        self.starts = [(random.uniform(-500, 500), random.uniform(-500, 500)) for _ in range(50)]
+        self.ends = [(random.uniform(-500, 500), random.uniform(-500, 500)) for _ in range(50)]
+        self.starts.append((10, 20))
+        self.ends.append((110, 20))
+
+    def test_curved_line_should_match_reference(self):
+        for det in (1, 5, 15):
+            for start, end in zip(self.starts, self.ends):
+                self.assertEqual(reference_curved_line(start, end, det), WireGeometry.curved_line(start, end, det))
+
+    def test_curved_lines_should_match_curved_line_of_every_wire(self):
+        for det in (1, 5, 15):
+            lines = WireGeometry.curved_lines(self.starts, self.ends, det)
+
+            self.assertEqual((len(self.starts), det * 2 + 2), lines.shape)
+            self.assertEqual([reference_curved_line(start, end, det) for start, end in zip(self.starts, self.ends)],
+                             lines.tolist())
+
+    def test_curved_lines_should_accept_no_wires(self):
+        self.assertEqual((0, 32), WireGeometry.curved_lines([], [], 15).shape)
+
+    def test_basis_should_be_computed_once_per_det(self):
+        WireGeometry.clear_cache()
+        basis = WireGeometry.get_basis(15)
+
+        self.assertIs(basis, WireGeometry.get_basis(15))
+        self.assertEqual([15], list(WireGeometry.bases))
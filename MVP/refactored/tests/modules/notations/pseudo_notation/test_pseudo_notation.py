@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+from MVP.refactored.modules.notations.pseudo_notation.pseudo_notation import PseudoNotation
+
+
+class FakeConnection:
+    def __init__(self, id_, location):
+        self.id = id_
+        self.location = location
+
+    def __eq__(self, other):
+        return isinstance(other, FakeConnection) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeWire:
+    def __init__(self, id_, start_connection, end_connection):
+        self.id = id_
+        self.start_connection = start_connection
+        self.end_connection = end_connection
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+
+class FakeCanvas:
+    def __init__(self, wires):
+        self.wires = wires
+
+
+class TestPseudoNotation(TestCase):
+
+    def setUp(self):
+        self.connections = [FakeConnection(10 + i, location) for i, location in
+                            enumerate([(0, 0), (100, 100), (0, 100), (100, 0), (0, 200), (100, 300)])]
+
+    def test_get_wires_intersections_should_find_crossing_wires(self):
+        a, b, c, d, e, f = self.connections
+        canvas = FakeCanvas([FakeWire(1, a, b), FakeWire(2, c, d), FakeWire(3, e, f)])
+
+        self.assertEqual({((50.0, 50.0), (1, 2))}, PseudoNotation().get_wires_intersections(canvas))
+
+    def test_get_wires_intersections_should_skip_wires_with_shared_connection(self):
+        a, b, c, _, _, _ = self.connections
+        canvas = FakeCanvas([FakeWire(1, a, b), FakeWire(2, c, b), FakeWire(3, a, c)])
+
+        self.assertEqual(set(), PseudoNotation().get_wires_intersections(canvas))
+
+    def test_get_wires_intersections_should_accept_single_wire(self):
+        a, b, _, _, _, _ = self.connections
+
+        self.assertEqual(set(), PseudoNotation().get_wires_intersections(FakeCanvas([FakeWire(1, a, b)])))
+
+    def test_are_wires_here_should_use_wire_curve_without_canvas_items(self):
+        _, _, _, _, e, f = self.connections
+        canvas = FakeCanvas([FakeWire(3, e, f)])  # no coords, the culled line on the canvas is not read
+
+        (y,), = PseudoNotation().are_wires_here(50, canvas.wires, canvas, [])
+
+        self.assertAlmostEqual(250, y, delta=10)
+        self.assertEqual([], PseudoNotation().are_wires_here(150, canvas.wires, canvas, []))
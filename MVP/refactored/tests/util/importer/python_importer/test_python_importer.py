@@ -0,0 +1,97 @@
+import io
+from unittest import TestCase
+from unittest.mock import patch
+
+from MVP.refactored.backend.box_functions.function_structure.function_parser import FunctionParser
+from MVP.refactored.util.importer.python_importer.python_importer import PythonImporter
+from MVP.refactored.util.name_allocator import NameAllocator
+
+SOURCE_CODE = """import math
+from os import path
+
+
+def add(a, b):
+    return a + b
+
+
+def scale(x):
+    factor = math.pi
+    return x * factor
+
+
+if __name__ == "__main__":
+    x = add(1, 2)
+    y = scale(x)
+"""
+
+
+class TestPythonImporter(TestCase):
+
+    def test_extract_should_not_parse_functions_again(self):
+        with patch.object(FunctionParser, "parse_function_code") as parse_function_code:
+            functions, imports, main_logic = PythonImporter._extract_data_from_source(SOURCE_CODE)
+
+        parse_function_code.assert_not_called()
+        self.assertEqual(["add", "scale"], list(functions))
+        self.assertEqual("def scale(x):\n    factor = math.pi\n    return x * factor", functions["scale"].main_function)
+        self.assertEqual(["import math", "from os import path"], imports)
+        self.assertEqual(2, len(main_logic.body_lines))
+
+    def test_function_structure_should_be_same_as_parsed_from_function_code(self):
+        functions, _, _ = PythonImporter._extract_data_from_source(SOURCE_CODE)
+
+        for box_function in functions.values():
+            self.assertEqual(FunctionParser.parse_function_code(box_function.main_function),
+                             box_function.function_structure)
+
+    def test_files_in_process_pool_should_give_same_result(self):
+        sources = [SOURCE_CODE, "def negate(x):\n    return -x\n"]
+
+        serial = PythonImporter.extract_data_from_files([io.StringIO(source) for source in sources])
+        with patch.object(PythonImporter, "PARALLEL_IMPORT_THRESHOLD", 0), \
+                patch.object(PythonImporter, "PARALLEL_IMPORT_MIN_FILES", 2), \
+                patch("os.cpu_count", return_value=2):
+            parallel = PythonImporter.extract_data_from_files([io.StringIO(source) for source in sources],
+                                                              parallel=True)
+
+        self.assertEqual([result[0] for result in serial], [result[0] for result in parallel])
+        self.assertEqual([result[1] for result in serial], [result[1] for result in parallel])
+        self.assertIsNone(parallel[1][2])
+
+    def test_files_should_be_parsed_in_process_pool_only_with_parallel_and_enough_files(self):
+        sources = [SOURCE_CODE, "def negate(x):\n    return -x\n"]
+
+        with patch.object(PythonImporter, "PARALLEL_IMPORT_THRESHOLD", 0), \
+                patch("os.cpu_count", return_value=2), \
+                patch("MVP.refactored.util.importer.python_importer.python_importer.ProcessPoolExecutor") as executor:
+            PythonImporter.extract_data_from_files([io.StringIO(source) for source in sources])
+            PythonImporter.extract_data_from_files([io.StringIO(source) for source in sources], parallel=True)
+
+        executor.assert_not_called()
+
+    def test_mocked_box_functions_should_get_numbered_names(self):
+        main_logic = FunctionParser.parse_function_code("x = a + 1\ny = a + 1\nz = b * b\n")
+        function_names = NameAllocator(["_fun_a___1_0"])
+
+        box_functions = [PythonImporter._create_mocked_box_function(code_line.assigned_value, function_names)
+                         for code_line in main_logic.body_lines]
+
+        self.assertEqual(["_fun_a___1_1", "_fun_a___1_2", "_fun_b___b_0"],
+                         [box_function.main_function_name for box_function in box_functions])
+        self.assertEqual("def _fun_b___b_0(b, var_0):\n\treturn b * var_0", box_functions[2].main_function)
+
+    def test_mocked_box_functions_should_replace_repeated_and_overlapping_constants(self):
+        main_logic = FunctionParser.parse_function_code("y = x - 0 + 0\nz = x + 10 - 1\n")
+        function_names = NameAllocator()
+
+        box_functions = [PythonImporter._create_mocked_box_function(code_line.assigned_value, function_names)
+                         for code_line in main_logic.body_lines]
+
+        self.assertEqual("def _fun_x___0___0_0(var_0, x, var_1):\n\treturn x - var_1 + var_0",
+                         box_functions[0].main_function)
+        self.assertEqual("def _fun_x___10___1_0(var_0, x, var_1):\n\treturn x + var_1 - var_0",
+                         box_functions[1].main_function)
+        for box_function, arguments, expected in ((box_functions[0], (0, 5, 0), 5), (box_functions[1], (1, 5, 10), 14)):
+            namespace = {}
+            exec(box_function.main_function, namespace)
+            self.assertEqual(expected, namespace[box_function.main_function_name](*arguments))
@@ -0,0 +1,24 @@
+import ast
+from unittest import TestCase
+
+from MVP.refactored.util.importer.python_importer.source_segments import SourceSegments
+
+
+class TestSourceSegments(TestCase):
+
+    def assert_same_as_ast(self, source_code: str):
+        segments = SourceSegments(source_code)
+        for node in ast.walk(ast.parse(source_code)):
+            self.assertEqual(ast.get_source_segment(source_code, node), segments.get(node))
+
+    def test_segments_should_match_ast_segments(self):
+        self.assert_same_as_ast("def add(a, b):\n    c = a + b\n    return c\n\n\nx = add(1,\n        2)\n")
+
+    def test_segments_should_match_ast_segments_with_other_line_endings(self):
+        self.assert_same_as_ast("def f(a):\r\n    return a\r\n\rdef g(b):\r    return f(b)\r\n")
+
+    def test_segments_should_match_ast_segments_with_unicode(self):
+        self.assert_same_as_ast("s = 'äöü' + 'õ'; t = len(s)\ndef f(x):\n    return 'ž' + x\n")
+
+    def test_node_without_location_should_have_no_segment(self):
+        self.assertIsNone(SourceSegments("x = 1\n").get(ast.Name(id="x")))
@@ -0,0 +1,23 @@
+from unittest import TestCase
+
+from MVP.refactored.util.name_allocator import NameAllocator
+
+
+class TestNameAllocator(TestCase):
+
+    def test_new_name_should_count_per_base_name(self):
+        names = NameAllocator()
+
+        self.assertEqual(["x_0", "x_1", "y_0", "x_2"],
+                         [names.new_name("x"), names.new_name("x"), names.new_name("y"), names.new_name("x")])
+
+    def test_new_name_should_skip_used_names(self):
+        names = NameAllocator(["x_0", "x_2"])
+        names.reserve("x_3")
+
+        self.assertEqual(["x_1", "x_4"], [names.new_name("x"), names.new_name("x")])
+
+    def test_new_name_should_be_valid_identifier(self):
+        names = NameAllocator()
+
+        self.assertEqual("_fun_a___1_0", names.new_name("fun_a + 1"))
@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from typing import TextIO
 from typing import List
 
+from MVP.refactored.backend.diagram_batch import DiagramBatch
+from MVP.refactored.backend.types.connection_side import ConnectionSide
 from MVP.refactored.frontend.components.custom_canvas import CustomCanvas
 
 
@@ -17,3 +19,54 @@ class Importer(ABC):
     @abstractmethod
     def load_everything_to_canvas(self, data: dict, canvas: CustomCanvas):
         pass
+
+    def load_to_canvas_in_batch(self, data: dict):
+        """
+        Load data to the canvas with receiver callbacks turned off and send created objects to the backend at once.
+
+        Objects that were on the canvas before the import are not sent again.
+        """
+        receiver = self.canvas.receiver
+        existing_ids = self.get_canvas_object_ids(self.canvas)
+        listener = receiver.listener
+        receiver.listener = False
+        try:
+            self.load_everything_to_canvas(data, self.canvas)
+        finally:
+            receiver.listener = listener
+
+        if listener and not self.canvas.is_search:
+            batch = DiagramBatch()
+            self.add_canvas_to_batch(self.canvas, batch, existing_ids)
+            receiver.build_diagram(batch)
+
+    @staticmethod
+    def get_canvas_object_ids(canvas: CustomCanvas) -> set[int]:
+        return {canvas_object.id for canvas_object in canvas.boxes + canvas.spiders + canvas.inputs + canvas.outputs
+                + canvas.wires}
+
+    def add_canvas_to_batch(self, canvas: CustomCanvas, batch: DiagramBatch, skipped_ids: set[int] = frozenset()):
+        for box in canvas.boxes:
+            if box.id in skipped_ids:
+                continue
+            connections = sorted(box.connections, key=lambda c: c.index)
+            batch.add_box(canvas.id, box.id,
+                          [c.id for c in connections if c.side == ConnectionSide.LEFT],
+                          [c.id for c in connections if c.side == ConnectionSide.RIGHT],
+                          box.get_box_function(),
+                          box.sub_diagram.id if box.sub_diagram else -1,
+                          box.label_text)
+            if box.sub_diagram:
+                self.add_canvas_to_batch(box.sub_diagram, batch)
+        for spider in canvas.spiders:
+            if spider.id not in skipped_ids:
+                batch.add_spider(canvas.id, spider.id)
+        for diagram_input in canvas.inputs:
+            if diagram_input.id not in skipped_ids:
+                batch.add_input(canvas.id, diagram_input.id, diagram_input.index)
+        for diagram_output in canvas.outputs:
+            if diagram_output.id not in skipped_ids:
+                batch.add_output(canvas.id, diagram_output.id, diagram_output.index)
+        for wire in canvas.wires:
+            if wire.id not in skipped_ids:
+                batch.add_wire(canvas.id, wire.id, *wire.connection_data_optimizer())
@@ -0,0 +1,92 @@
+import json
+import os
+
+from MVP.refactored.backend.box_functions.box_function import BoxFunction
+from MVP.refactored.backend.diagram_batch import DiagramBatch
+from MVP.refactored.backend.diagram_callback import Receiver
+from MVP.refactored.backend.types.connection_info import ConnectionInfo
+from MVP.refactored.backend.types.connection_side import ConnectionSide
+
+MAIN_CANVAS_ID = 0
+# main function name of the box functions of label-only boxes
+MISSING_FUNCTION_NAME = "missing_box_function"
+
+
+class HeadlessJsonImporter:
+    """
+    Loads projects saved by ProjectExporter straight into the Receiver, without Tk objects.
+
+    All resources are collected to a DiagramBatch in the same order as JsonImporter creates them
+    through canvas objects, and the diagram is built with one `Receiver.build_diagram` call.
+    Sub diagram of a box gets the canvas id that is equal to the box id, like the sub diagram canvas in the frontend.
+
+    Projects in the old format have boxes with only a label and no box function. JsonImporter only sets the label
+    of such boxes and code can not be generated for them. With stub_label_only_boxes, every such box gets a box
+    function that raises NotImplementedError when it is called, so code of the rest of the diagram can be generated.
+    Ids of the stubbed boxes are listed in stubbed_boxes.
+    """
+
+    def __init__(self, receiver: Receiver = None, stub_label_only_boxes: bool = False):
+        self.receiver: Receiver = receiver or Receiver()
+        self.project_directory: str = ""
+        self.stub_label_only_boxes: bool = stub_label_only_boxes
+        self.stubbed_boxes: list[int] = []
+
+    def load_project(self, json_file_path: str) -> int:
+        """Load project file, return id of the main canvas."""
+        with open(json_file_path, "r") as json_file:
+            data = json.load(json_file)
+        self.project_directory = os.path.dirname(json_file_path)
+
+        batch = DiagramBatch()
+        self.add_canvas_to_batch(data["main_canvas"], MAIN_CANVAS_ID, batch)
+        self.receiver.build_diagram(batch)
+        return MAIN_CANVAS_ID
+
+    def add_canvas_to_batch(self, data: dict, canvas_id: int, batch: DiagramBatch):
+        for box in data["boxes"]:
+            self.add_box_to_batch(box, canvas_id, batch)
+        for spider in data["spiders"]:
+            batch.add_spider(canvas_id, spider["id"])
+        for diagram_input in data["io"]["inputs"]:
+            batch.add_input(canvas_id, diagram_input["id"], diagram_input["index"])
+        for diagram_output in data["io"]["outputs"]:
+            batch.add_output(canvas_id, diagram_output["id"], diagram_output["index"])
+        for wire in data["wires"]:
+            batch.add_wire(canvas_id, wire["id"], self.get_connection_info(wire["start_c"]),
+                           self.get_connection_info(wire["end_c"]))
+
+    def add_box_to_batch(self, box: dict, canvas_id: int, batch: DiagramBatch):
+        if box.get("box_function"):
+            box_function = self.load_box_function(box["box_function"])
+        elif self.stub_label_only_boxes and not box["sub_diagram"]:
+            box_function = self.create_stub_function(box)
+        else:
+            box_function = None
+        connections = sorted(box["connections"], key=lambda c: c["index"])
+        batch.add_box(canvas_id, box["id"],
+                      [c["id"] for c in connections if c["side"] == ConnectionSide.LEFT],
+                      [c["id"] for c in connections if c["side"] == ConnectionSide.RIGHT],
+                      box_function,
+                      box["id"] if box["sub_diagram"] else -1,
+                      box["label"])
+        if box["sub_diagram"]:
+            self.add_canvas_to_batch(box["sub_diagram"], box["id"], batch)
+
+    def load_box_function(self, box_function_info: dict) -> BoxFunction:
+        box_function_path = os.path.join(self.project_directory, box_function_info["relative_location"])
+        with open(box_function_path, "r") as file:
+            return BoxFunction(main_function_name=box_function_info["main_function_name"], file_code=file.read())
+
+    def create_stub_function(self, box: dict) -> BoxFunction:
+        """Create box function of a label-only box, it raises NotImplementedError with the box label."""
+        self.stubbed_boxes.append(box["id"])
+        message = f"Box {box['id']} (label {box['label']!r}) has no box function (old project format)"
+        file_code = f"def {MISSING_FUNCTION_NAME}(*args):\n    raise NotImplementedError({message!r})\n"
+        return BoxFunction(main_function_name=MISSING_FUNCTION_NAME, file_code=file_code)
+
+    @staticmethod
+    def get_connection_info(connection: dict) -> ConnectionInfo:
+        """Create ConnectionInfo the same way as the wire creates it from the frontend connection."""
+        return ConnectionInfo(connection["index"], ConnectionSide(connection["side"]), connection["id"],
+                              connection["box_id"], connection["id"] if connection["spider"] else None)
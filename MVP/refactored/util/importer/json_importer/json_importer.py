@@ -51,7 +51,7 @@ class JsonImporter(Importer):
         self.load_static_variables(data)
         data = data["main_canvas"]
 
-        self.load_everything_to_canvas(data, self.canvas)
+        self.load_to_canvas_in_batch(data)
         return os.path.basename(json_file.name)
 
     def load_everything_to_canvas(self, data: dict, canvas: CustomCanvas) -> None:
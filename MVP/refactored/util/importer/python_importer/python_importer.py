@@ -1,5 +1,6 @@
 import ast
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 from typing import TextIO
 
@@ -15,7 +16,8 @@ from MVP.refactored.frontend.canvas_objects.spider import Spider
 from MVP.refactored.frontend.components.custom_canvas import CustomCanvas
 from MVP.refactored.frontend.windows.checkbox_dialog import CheckboxDialog
 from MVP.refactored.util.importer.importer import Importer
-from MVP.refactored.util.string_util import StringUtil
+from MVP.refactored.util.importer.python_importer.source_segments import SourceSegments
+from MVP.refactored.util.name_allocator import NameAllocator
 
 
 class PythonImporter(Importer):
@@ -23,6 +25,10 @@ class PythonImporter(Importer):
     ELEMENTS_Y_POSITION = 300
     BOXES_STARTING_X_POSITION = 200
     BOXES_ENDING_X_POSITION = 1200
+    # with parallel, files are parsed in a process pool when there are at least PARALLEL_IMPORT_MIN_FILES of them
+    # with at least PARALLEL_IMPORT_THRESHOLD characters in total
+    PARALLEL_IMPORT_THRESHOLD = 200_000
+    PARALLEL_IMPORT_MIN_FILES = 4
 
     def start_import(self, python_files: List[TextIO]) -> str:
         dialog = CheckboxDialog(self.canvas.main_diagram,
@@ -36,8 +42,8 @@ class PythonImporter(Importer):
         main_logic: FunctionStructure | None = None
         main_diagram_name = None
 
-        for python_file in python_files:
-            file_functions, file_imports, file_main_logic = PythonImporter._extract_data_from_file(python_file)
+        for python_file, (file_functions, file_imports, file_main_logic) in zip(
+                python_files, PythonImporter.extract_data_from_files(python_files)):
 
             all_functions.update(file_functions)
             all_imports.extend(file_imports)
@@ -58,7 +64,7 @@ class PythonImporter(Importer):
         first_function.imports = all_imports
 
         data = {"functions": all_functions, "main_logic": main_logic, "deep_generation": deep_generation}
-        self.load_everything_to_canvas(data, self.canvas)
+        self.load_to_canvas_in_batch(data)
 
         return main_diagram_name
 
@@ -66,6 +72,8 @@ class PythonImporter(Importer):
         functions = data["functions"]
         main_logic: FunctionStructure = data["main_logic"]
         deep_generation = data["deep_generation"]
+        # names of mocked box functions of this import
+        mocked_function_names = NameAllocator(list(functions) + list(canvas.main_diagram.label_content))
 
         main_logic_body_lines: List[CodeLine] = main_logic.body_lines
 
@@ -80,7 +88,8 @@ class PythonImporter(Importer):
         for code_line in main_logic_body_lines:
             box_x = PythonImporter._add_main_logic_code_line_to_canvas(
                 canvas, code_line, functions, boxes_by_assigned_variable,
-                box_right_connection_spiders, possible_outputs, box_x, boxes_gap, deep_generation
+                box_right_connection_spiders, possible_outputs, box_x, boxes_gap, deep_generation,
+                mocked_function_names
             )
 
         PythonImporter._add_outputs_to_canvas(canvas, possible_outputs, boxes_by_assigned_variable)
@@ -94,13 +103,15 @@ class PythonImporter(Importer):
                                             possible_outputs: set[str],
                                             box_x: int,
                                             boxes_gap: int,
-                                            deep_generation: bool) -> int:
+                                            deep_generation: bool,
+                                            mocked_function_names: NameAllocator) -> int:
         assigned_variables = code_line.assigned_variables
         assigned_value_elements = code_line.assigned_value.elements
 
         box_position = (box_x, PythonImporter.ELEMENTS_Y_POSITION)
         new_box = PythonImporter._add_box_to_canvas(
-            canvas, code_line, box_position, functions, len(assigned_variables), deep_generation
+            canvas, code_line, box_position, functions, len(assigned_variables), deep_generation,
+            mocked_function_names
         )
 
         for assigned_variable in code_line.assigned_variables:
@@ -134,7 +145,8 @@ class PythonImporter(Importer):
                            box_position: tuple,
                            functions: dict[str, BoxFunction],
                            assigned_variables_amount: int,
-                           deep_generation: bool) -> Box:
+                           deep_generation: bool,
+                           mocked_function_names: NameAllocator) -> Box:
         new_box = canvas.add_box(box_position)
         assigned_value = code_line.assigned_value
 
@@ -144,18 +156,22 @@ class PythonImporter(Importer):
             box_function = functions[function_name]
             create_sub_diagram = deep_generation
         else:
-            box_function = PythonImporter._create_mocked_box_function(assigned_value)
+            box_function = PythonImporter._create_mocked_box_function(assigned_value, mocked_function_names)
 
         canvas.main_diagram.add_function_to_label_content(box_function.main_function_name, box_function.main_function)
         new_box.set_label(box_function.main_function_name)
 
         if create_sub_diagram:
-            PythonImporter._create_box_sub_diagram(new_box, assigned_variables_amount, functions)
+            PythonImporter._create_box_sub_diagram(new_box, assigned_variables_amount, functions,
+                                                   mocked_function_names)
 
         return new_box
 
     @staticmethod
-    def _create_box_sub_diagram(box: Box, assigned_variables_amount: int, functions: dict[str, BoxFunction]) -> None:
+    def _create_box_sub_diagram(box: Box,
+                                assigned_variables_amount: int,
+                                functions: dict[str, BoxFunction],
+                                mocked_function_names: NameAllocator) -> None:
         function_structure: FunctionStructure = box.get_box_function().function_structure
         arguments = function_structure.arguments
 
@@ -173,13 +189,14 @@ class PythonImporter(Importer):
         for code_line in function_structure.body_lines:
             box_x = PythonImporter._add_box_function_structure_code_line_to_canvas(
                 sub_diagram_canvas, code_line, arguments, boxes_by_assigned_variable,
-                input_spiders, box_right_connection_spiders, functions, 0, box_x, boxes_gap
+                input_spiders, box_right_connection_spiders, functions, 0, box_x, boxes_gap, mocked_function_names
             )
 
         return_line = function_structure.return_line
         PythonImporter._add_box_function_structure_code_line_to_canvas(
             sub_diagram_canvas, return_line, arguments, boxes_by_assigned_variable,
-            input_spiders, box_right_connection_spiders, functions, assigned_variables_amount, box_x, boxes_gap
+            input_spiders, box_right_connection_spiders, functions, assigned_variables_amount, box_x, boxes_gap,
+            mocked_function_names
         )
 
     @staticmethod
@@ -206,13 +223,14 @@ class PythonImporter(Importer):
                                                         functions: dict[str, BoxFunction],
                                                         outputs_amount: int,
                                                         box_x: int,
-                                                        boxes_gap: int) -> int:
+                                                        boxes_gap: int,
+                                                        mocked_function_names: NameAllocator) -> int:
         assigned_variables: list[str] = code_line.assigned_variables
         assigned_value_elements = code_line.assigned_value.elements
 
         box_position = (box_x, PythonImporter.ELEMENTS_Y_POSITION)
         new_box = PythonImporter._add_box_to_canvas(
-            canvas, code_line, box_position, functions, len(assigned_variables), True
+            canvas, code_line, box_position, functions, len(assigned_variables), True, mocked_function_names
         )
 
         for assigned_variable in assigned_variables:
@@ -281,20 +299,29 @@ class PythonImporter(Importer):
             canvas.end_wire_to_connection(output, True)
 
     @staticmethod
-    def _create_mocked_box_function(assigned_value: AssignedValue) -> BoxFunction:
+    def _create_mocked_box_function(assigned_value: AssignedValue, function_names: NameAllocator) -> BoxFunction:
         value = assigned_value.value
-        main_function_name = StringUtil.generate_new_variable_name_from("fun_" + value)
-        code = str(assigned_value)
-        variables = []
+        main_function_name = function_names.new_name("fun_" + value)
+        expression = ast.parse(str(assigned_value), mode="eval")
+        called_nodes = {id(node.func) for node in ast.walk(expression) if isinstance(node, ast.Call)}
+        element_nodes = [node for node in ast.walk(expression) if isinstance(node, ast.Constant)
+                         or isinstance(node, ast.Name) and id(node) not in called_nodes]
+        variable_names = NameAllocator(node.id for node in ast.walk(expression) if isinstance(node, ast.Name))
+        for element in assigned_value.elements:
+            if element.type == CodeElementType.VARIABLE:
+                variable_names.reserve(element.value)
 
+        variables = []
         for element in assigned_value.elements:
             if element.type == CodeElementType.VARIABLE and element.value not in variables:
                 variables.append(element.value)
             else:
-                new_variable = StringUtil.generate_new_variable_name()
-                variables.append(new_variable)
-                occurrence = 1 if element.type == CodeElementType.CONSTANT else 2
-                code = StringUtil.replace_nth_occurrence(code, element.value, new_variable, occurrence)
+                variables.append(variable_names.new_name("var"))
+
+        # elements are in `ast.walk` order of the expression, replace the nodes by position so that a name or
+        # constant is never replaced inside another one
+        replacements = {id(node): variable for node, variable in zip(element_nodes, variables)}
+        code = ast.unparse(_NodeReplacer(replacements).visit(expression).body)
 
         main_function = f"def {main_function_name}({", ".join(variables)}):\n\treturn {code}"
         return BoxFunction(main_function_name=main_function_name, function = main_function)
@@ -317,18 +344,46 @@ class PythonImporter(Importer):
         else:
             return PythonImporter.BOXES_STARTING_X_POSITION
 
+    @staticmethod
+    def extract_data_from_files(python_files: List[TextIO], parallel: bool = False) -> list[tuple]:
+        """
+        Extract functions, imports and main logic of every file, see `_extract_data_from_source`.
+
+        :param parallel: if there are enough files and they are big enough, parse them in a process pool with
+            at most one worker per CPU. Only headless callers should set it, the GUI parses in its own process.
+        """
+        source_codes = [python_file.read() for python_file in python_files]
+        workers = min(len(source_codes), os.cpu_count() or 1)
+        if (parallel and workers > 1 and len(source_codes) >= PythonImporter.PARALLEL_IMPORT_MIN_FILES
+                and sum(map(len, source_codes)) >= PythonImporter.PARALLEL_IMPORT_THRESHOLD):
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(PythonImporter._extract_data_from_source, source_codes))
+        return [PythonImporter._extract_data_from_source(source_code) for source_code in source_codes]
+
     @staticmethod
     def _extract_data_from_file(python_file: TextIO) -> tuple:
+        return PythonImporter._extract_data_from_source(python_file.read())
+
+    @staticmethod
+    def _extract_data_from_source(source_code: str) -> tuple:
+        """
+        Extract functions, imports and main logic of the Python source code.
+
+        Source is parsed once, function sources are sliced from it and BoxFunctions are created from the parsed
+        function definitions, so nothing is parsed again.
+
+        :return: ({function name: BoxFunction}, import statements, main logic or None)
+        """
         functions = {}
         imports = []
         main_logic: FunctionStructure | None = None
 
-        source_code = python_file.read()
         tree = ast.parse(source_code)
+        segments = SourceSegments(source_code)
 
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
-                PythonImporter._extract_function(node, source_code, functions)
+                PythonImporter._extract_function(node, segments, functions)
 
         for node in tree.body:
             if isinstance(node, ast.Import):
@@ -349,13 +404,14 @@ class PythonImporter(Importer):
         return functions, imports, main_logic
 
     @staticmethod
-    def _extract_function(node, source_code: str, functions: dict) -> None:
+    def _extract_function(node, segments: SourceSegments, functions: dict) -> None:
         func_name = node.name
-        function = ast.get_source_segment(source_code, node)
+        function = segments.get(node)
         num_inputs = len(node.args.args)
 
         box_function = BoxFunction(
-            main_function_name=func_name, function=function, min_args=num_inputs, max_args=num_inputs
+            main_function_name=func_name, function=function, min_args=num_inputs, max_args=num_inputs,
+            function_structure=FunctionParser.parse_function_tree(node)
         )
         box_function.function_structure.convert_mutable_variables_to_immutable()
         functions[func_name] = box_function
@@ -374,3 +430,21 @@ class PythonImporter(Importer):
 
         for alias in node.names:
             imports.append(f"from {module} import {alias.name}")
+
+
+class _NodeReplacer(ast.NodeTransformer):
+    """Replaces the given Name and Constant nodes with names, nodes are given by their `id`."""
+
+    def __init__(self, replacements: dict[int, str]):
+        self.replacements = replacements
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        return self._replace(node)
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        return self._replace(node)
+
+    def _replace(self, node: ast.AST) -> ast.AST:
+        if id(node) in self.replacements:
+            return ast.copy_location(ast.Name(id=self.replacements[id(node)], ctx=ast.Load()), node)
+        return node
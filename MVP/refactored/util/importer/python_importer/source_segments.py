@@ -0,0 +1,35 @@
+import ast
+import re
+
+LINE_END = re.compile(r"\r\n?|\n")
+
+
+class SourceSegments:
+    """
+    Returns source code of AST nodes, like ast.get_source_segment.
+
+    ast.get_source_segment splits the whole source into lines on every call, so getting segments of all
+    functions of a file is quadratic in the file size. Here offsets of line starts are computed once
+    and every segment is a single slice of the source.
+    """
+
+    def __init__(self, source_code: str):
+        self.source_code: str = source_code
+        self.line_offsets: list[int] = [0] + [match.end() for match in LINE_END.finditer(source_code)]
+        self.line_offsets.append(len(source_code))
+
+    def get(self, node: ast.AST) -> str | None:
+        """Return source code of the node, None if the node has no location."""
+        if getattr(node, "end_lineno", None) is None or getattr(node, "end_col_offset", None) is None:
+            return None
+        start = self._get_offset(node.lineno, node.col_offset)
+        end = self._get_offset(node.end_lineno, node.end_col_offset)
+        return self.source_code[start:end]
+
+    def _get_offset(self, line_number: int, byte_offset: int) -> int:
+        """Convert line number and UTF-8 byte offset in the line (as in AST nodes) to offset in the source."""
+        line_start = self.line_offsets[line_number - 1]
+        line = self.source_code[line_start:self.line_offsets[line_number]]
+        if line.isascii():
+            return line_start + byte_offset
+        return line_start + len(line.encode()[:byte_offset].decode())
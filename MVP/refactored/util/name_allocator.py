@@ -0,0 +1,30 @@
+from typing import Iterable
+
+from MVP.refactored.util.string_util import StringUtil
+
+
+class NameAllocator:
+    """
+    Allocates unique variable names in one scope.
+
+    New name is the base name with the next number of the base name appended (x_0, x_1, ...).
+    Names that are already used in the scope are skipped, so the same code always gets the same names.
+    """
+
+    def __init__(self, used_names: Iterable[str] = ()):
+        self.used_names: set[str] = set(used_names)
+        self.counters: dict[str, int] = {}
+
+    def reserve(self, name: str):
+        """Mark the name used, it is never allocated."""
+        self.used_names.add(name)
+
+    def new_name(self, base_name: str) -> str:
+        base_name = StringUtil.to_identifier(base_name)
+        counter = self.counters.get(base_name, 0)
+        while f"{base_name}_{counter}" in self.used_names:
+            counter += 1
+        name = f"{base_name}_{counter}"
+        self.counters[base_name] = counter + 1
+        self.used_names.add(name)
+        return name
@@ -23,19 +23,11 @@ class StringUtil:
         return random_string
 
     @staticmethod
-    def generate_new_variable_name_from(variable_name: str) -> str:
-        """Generate a new variable name by appending a random suffix."""
-        suffix = StringUtil.generate_random_valid_string(10)
-        # Ensure the variable name is also valid
-        if not variable_name.isidentifier():
-            variable_name = '_' + ''.join(c if c.isalnum() or c == '_' else '_' for c in variable_name)
-        return f"{variable_name}_{suffix}"
-
-    @staticmethod
-    def generate_new_variable_name() -> str:
-        """Generate a new variable name by appending a random suffix."""
-        suffix = StringUtil.generate_random_valid_string(10)
-        return f"var_{suffix}"
+    def to_identifier(name: str) -> str:
+        """Return the name if it is a valid identifier, otherwise the name with invalid characters replaced."""
+        if name.isidentifier():
+            return name
+        return '_' + ''.join(c if c.isalnum() or c == '_' else '_' for c in name)
 
     @staticmethod
     def replace_nth_occurrence(text, old, new, n):
@@ -25,6 +25,7 @@ PRIMARY_SEARCH_COLOR = "cyan"
 SECONDARY_SEARCH_COLOR = "orange"
 BLACK = "black"
 WHITE = "white"
+AGGREGATE_COLOR = "gray80"
 
 
 SPIDER = "spider"